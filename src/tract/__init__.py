@@ -2,223 +2,393 @@
 
 Agents produce better outputs when their context is clean, coherent, and relevant.
 Tract makes context a managed, version-controlled resource.
+
+Public names are resolved lazily (PEP 562): ``import tract`` only loads
+this module, and each attribute imports its defining module on first
+access.  CLI and serverless cold starts therefore don't pay for
+SQLAlchemy, pydantic, rich or the LLM SDKs until they are used.
 """
 
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from tract._version import __version__
 
-# Core entry point
-from tract.tract import Tract
-
-# Content types
-from tract.models.content import (
-    BUILTIN_TYPE_HINTS,
-    ConfigContent,
-    ContentPayload,
-    ContentTypeHints,
-    DialogueContent,
-    FreeformContent,
-    InstructionContent,
-    ArtifactContent,
-    MetadataContent,
-    OutputContent,
-    ReasoningContent,
-    ToolIOContent,
-    validate_content,
-)
-
-# Commit and annotation types
-from tract.models.commit import CommitInfo, CommitMetadata, CommitOperation
-from tract.models.annotations import Priority, PriorityAnnotation, RetentionCriteria
-
-# Configuration
-from tract.models.config import TractConfig, TokenBudgetConfig, BudgetAction, LLMConfig, Operator, OperationConfigs, OperationClients, OperationPrompts, RetryConfig, ToolSummarizationConfig
-
-# Protocols and output types
-from tract.protocols import (
-    TokenCounter,
-    ContextCompiler,
-    Message,
-    CompiledContext,
-    CompileSnapshot,
-    TokenUsage,
-    ChatResponse,
-    ToolCall,
-    ToolCallDict,
-    ToolCallOpenAIDict,
-    ToolTurn,
-)
-
-# Branch model
-from tract.models.branch import BranchInfo
-
-# Merge models
-from tract.models.merge import (
-    ImportIssue,
-    ImportResult,
-    ConflictInfo,
-    MergeResult,
-    MergeStrategy,
-    RebaseResult,
-    RebaseWarning,
-)
-
-# Compression models
-from tract.models.compression import CompressResult, GCResult, ReorderWarning, ToolCompactResult, ToolDropResult
-
-# Compression prompts (for extending or selecting system prompts)
-from tract.prompts.summarize import (
-    DEFAULT_SUMMARIZE_SYSTEM,
-    CONVERSATION_SUMMARIZE_SYSTEM,
-    TOOL_SUMMARIZE_SYSTEM,
-    TOOL_CONTEXT_SUMMARIZE_SYSTEM,
-)
-
-# Session and spawn models
-from tract.session import Session
-from tract.models.session import SessionContent, SpawnInfo, CollapseResult
-
-# Operations data models
-from tract.operations.health import HealthReport
-from tract.operations.history import StatusInfo
-from tract.operations.diff import DiffResult, MessageDiff, DiffStat
-
-# Config index and middleware
-from tract.operations.config_index import ConfigIndex
-from tract.middleware import MiddlewareContext, MiddlewareEvent
-
-# Semantic gates
-from tract.gate import SemanticGate, GateResult
-
-# Semantic maintainers
-from tract.maintain import SemanticMaintainer, MaintainResult
-
-# Context view (unified context specification for LLM-powered operations)
-from tract.context_view import ContextView, BuiltContext, build_context, resolve_auto_peek, estimate_tokens
-
-# Context intelligence
-from tract.intelligence import CherryPickResult, DedupResult, cherry_pick, acherry_pick, deduplicate, adeduplicate
-
-# Autonomous operations
-from tract.autonomous import AutoSplitResult, AutoRebaseResult, AutoBranchResult, auto_split, aauto_split, auto_rebase, aauto_rebase, auto_branch, aauto_branch
-
-# Judgment (unified LLM-powered evaluation primitive)
-from tract.judgment import (
-    Judgment, JudgmentResult,
-    GateVerdict, MaintenancePlan, MaintenanceAction,
-    SelectionResult, DedupGroups, SplitPlan, BooleanDecision, RouteSelection,
-)
-
-# Policy (unified context management policy primitive)
-from tract.policy import (
-    Policy, PolicyContext, PolicyOutcome, PolicyEngine,
-    always, never, token_ratio_above, commit_count_above,
-    block_with_reason, pass_through,
-)
-
-# Routing
-from tract.routing import Route, RoutingTable, SemanticRouter, RoutingResult
-
-# Directive templates
-from tract.templates import DirectiveTemplate, list_templates, get_template, register_template
-
-# Workflow profiles
-from tract.profiles import (
-    WorkflowProfile,
-    get_profile as get_workflow_profile,
-    list_profiles as list_workflow_profiles,
-    register_profile as register_workflow_profile,
-)
-
-# LLM protocol (always available — these are just Protocol definitions)
-from tract.llm.protocols import LLMClient, AgentLoop
-from tract.llm.protocols import AsyncLLMClient, acall_llm
-
-# LLM error types (no external deps — always available)
-from tract.llm.errors import (
-    LLMClientError,
-    LLMConfigError,
-    LLMRateLimitError,
-    LLMAuthError,
-    LLMResponseError,
-    LLMToolUseError,
-)
-
-# LLM fallback client (no external deps — always available)
-from tract.llm.fallback import FallbackClient
-
-# LLM test utilities (no external deps — always available)
-from tract.llm.testing import MockLLMClient, ReplayLLMClient, FunctionLLMClient
-
-# Runner components (require optional dependencies: pip install tract-ai[runner])
-try:
-    from tract.llm.client import OpenAIClient
-    from tract.llm.anthropic_client import (
-        AnthropicClient,
-        StreamEvent,
-        TextDelta,
-        ToolCallStart,
-        ToolCallDelta,
-        ThinkingDelta,
-        UsageEvent,
-        MessageDone,
+# Defining module -> public names it provides.
+_LAZY_MODULES: dict[str, tuple[str, ...]] = {
+    "tract.tract": ("Tract", "CompileStrategy"),
+    "tract.models.content": (
+        "BUILTIN_TYPE_HINTS", "ConfigContent", "ContentPayload", "ContentTypeHints",
+        "DialogueContent", "FreeformContent", "InstructionContent", "ArtifactContent",
+        "MetadataContent", "OutputContent", "ReasoningContent", "ToolIOContent",
+        "validate_content",
+    ),
+    "tract.models.commit": ("CommitInfo", "CommitMetadata", "CommitOperation"),
+    "tract.models.annotations": ("Priority", "PriorityAnnotation", "RetentionCriteria"),
+    "tract.models.config": (
+        "TractConfig", "TokenBudgetConfig", "BudgetAction", "LLMConfig", "Operator",
+        "OperationConfigs", "OperationClients", "OperationPrompts", "RetryConfig",
+        "ToolSummarizationConfig",
+    ),
+    "tract.protocols": (
+        "TokenCounter", "ContextCompiler", "Message", "CompiledContext", "CompileSnapshot",
+        "TokenUsage", "ChatResponse", "ToolCall", "ToolCallDict", "ToolCallOpenAIDict",
+        "ToolTurn",
+    ),
+    "tract.models.branch": ("BranchInfo",),
+    "tract.models.merge": (
+        "ImportIssue", "ImportResult", "ConflictInfo", "MergeResult", "MergeStrategy",
+        "RebaseResult", "RebaseWarning",
+    ),
+    "tract.models.compression": (
+        "CompressResult", "GCResult", "ReorderWarning", "ToolCompactResult", "ToolDropResult",
+    ),
+    "tract.prompts.summarize": (
+        "DEFAULT_SUMMARIZE_SYSTEM", "CONVERSATION_SUMMARIZE_SYSTEM", "TOOL_SUMMARIZE_SYSTEM",
+        "TOOL_CONTEXT_SUMMARIZE_SYSTEM",
+    ),
+    "tract.session": ("Session",),
+    "tract.models.session": ("SessionContent", "SpawnInfo", "CollapseResult"),
+    "tract.operations.health": ("HealthReport",),
+    "tract.operations.history": ("StatusInfo",),
+    "tract.operations.diff": ("DiffResult", "MessageDiff", "DiffStat"),
+    "tract.operations.config_index": ("ConfigIndex",),
+    "tract.middleware": ("MiddlewareContext", "MiddlewareEvent"),
+    "tract.tracing": ("SpanRecord", "TraceCollector", "TraceSink", "Tracer"),
+    "tract.gate": ("SemanticGate", "GateResult"),
+    "tract.maintain": ("SemanticMaintainer", "MaintainResult"),
+    "tract.context_view": (
+        "ContextView", "BuiltContext", "build_context", "resolve_auto_peek", "estimate_tokens",
+    ),
+    "tract.intelligence": (
+        "CherryPickResult", "DedupResult", "cherry_pick", "acherry_pick", "deduplicate",
+        "adeduplicate",
+    ),
+    "tract.autonomous": (
+        "AutoSplitResult", "AutoRebaseResult", "AutoBranchResult", "auto_split", "aauto_split",
+        "auto_rebase", "aauto_rebase", "auto_branch", "aauto_branch",
+    ),
+    "tract.judgment": (
+        "Judgment", "JudgmentResult", "GateVerdict", "MaintenancePlan", "MaintenanceAction",
+        "SelectionResult", "DedupGroups", "SplitPlan", "BooleanDecision", "RouteSelection",
+    ),
+    "tract.policy": (
+        "Policy", "PolicyContext", "PolicyOutcome", "PolicyEngine", "always", "never",
+        "token_ratio_above", "commit_count_above", "block_with_reason", "pass_through",
+    ),
+    "tract.routing": ("Route", "RoutingTable", "SemanticRouter", "RoutingResult"),
+    "tract.templates": (
+        "DirectiveTemplate", "list_templates", "get_template", "register_template",
+    ),
+    "tract.profiles": ("WorkflowProfile",),
+    "tract.llm.protocols": ("LLMClient", "AgentLoop", "AsyncLLMClient", "acall_llm"),
+    "tract.llm.errors": (
+        "LLMClientError", "LLMConfigError", "LLMRateLimitError", "LLMAuthError",
+        "LLMResponseError", "LLMToolUseError",
+    ),
+    "tract.llm.fallback": ("FallbackClient",),
+    "tract.llm.testing": ("MockLLMClient", "ReplayLLMClient", "FunctionLLMClient"),
+    "tract.llm.client": ("OpenAIClient",),
+    "tract.llm.anthropic_client": (
+        "AnthropicClient", "StreamEvent", "TextDelta", "ToolCallStart", "ToolCallDelta",
+        "ThinkingDelta", "UsageEvent", "MessageDone",
+    ),
+    "tract.toolkit.models": (
+        "ToolDefinition", "ToolName", "ToolProfile", "ToolConfig", "ToolResult",
+    ),
+    "tract.toolkit.profiles": ("ProfileName",),
+    "tract.toolkit.executor": ("ToolExecutor",),
+    "tract.toolkit.presentation": ("ToolPresenter", "PresentationConfig"),
+    "tract.toolkit.discovery": ("get_discovery_tools",),
+    "tract.loop": ("LoopConfig", "LoopResult", "StepMetrics", "run_loop", "arun_loop"),
+    "tract.models.tools": ("hash_tool_schema",),
+    "tract.exceptions": (
+        "TraceError", "CommitNotFoundError", "BlobNotFoundError", "ContentValidationError",
+        "BudgetExceededError", "EditTargetError", "DetachedHeadError", "AmbiguousPrefixError",
+        "BranchExistsError", "BranchNotFoundError", "InvalidBranchNameError",
+        "UnmergedBranchError", "MergeError", "MergeConflictError", "NothingToMergeError",
+        "RebaseError", "ImportCommitError", "SemanticSafetyError", "CompressionError",
+        "GCError", "SpawnError", "SessionError", "TagNotRegisteredError", "CurationError",
+        "BlockedError", "ClosedError", "ThreadSafetyError", "RetryExhaustedError",
+    ),
+    "tract.formatting": ("StreamPrinter",),
+}
+
+# Public names exported under a different name than in their module.
+_LAZY_ALIASES: dict[str, tuple[str, str]] = {
+    "get_workflow_profile": ("tract.profiles", "get_profile"),
+    "list_workflow_profiles": ("tract.profiles", "list_profiles"),
+    "register_workflow_profile": ("tract.profiles", "register_profile"),
+}
+
+# Modules that need optional dependencies (pip install tract-ai[runner]);
+# their names behave as absent when the dependency is missing.
+_OPTIONAL_MODULES: frozenset[str] = frozenset({
+    "tract.llm.anthropic_client",
+    "tract.llm.client",
+    "tract.loop",
+    "tract.toolkit.discovery",
+    "tract.toolkit.executor",
+    "tract.toolkit.models",
+    "tract.toolkit.presentation",
+    "tract.toolkit.profiles",
+})
+
+_LAZY_ATTRS: dict[str, tuple[str, str]] = {
+    name: (module, name) for module, names in _LAZY_MODULES.items() for name in names
+}
+_LAZY_ATTRS.update(_LAZY_ALIASES)
+
+
+def __getattr__(name: str) -> Any:
+    target = _LAZY_ATTRS.get(name)
+    if target is None:
+        # Submodules stay reachable as attributes (``tract.llm.testing``)
+        try:
+            return importlib.import_module(f"{__name__}.{name}")
+        except ModuleNotFoundError as exc:
+            if exc.name != f"{__name__}.{name}":
+                raise
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attr = target
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError as exc:
+        if module_name not in _OPTIONAL_MODULES:
+            raise
+        raise AttributeError(
+            f"tract.{name} requires optional dependencies ({exc}). "
+            "Install them with: pip install tract-ai[runner]"
+        ) from exc
+    value = getattr(module, attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
+
+
+# Eager imports for type checkers and IDEs only
+if TYPE_CHECKING:
+    # Core entry point
+    from tract.tract import Tract
+
+    # Content types
+    from tract.models.content import (
+        BUILTIN_TYPE_HINTS,
+        ConfigContent,
+        ContentPayload,
+        ContentTypeHints,
+        DialogueContent,
+        FreeformContent,
+        InstructionContent,
+        ArtifactContent,
+        MetadataContent,
+        OutputContent,
+        ReasoningContent,
+        ToolIOContent,
+        validate_content,
+    )
+
+    # Commit and annotation types
+    from tract.models.commit import CommitInfo, CommitMetadata, CommitOperation
+    from tract.models.annotations import Priority, PriorityAnnotation, RetentionCriteria
+
+    # Configuration
+    from tract.models.config import TractConfig, TokenBudgetConfig, BudgetAction, LLMConfig, Operator, OperationConfigs, OperationClients, OperationPrompts, RetryConfig, ToolSummarizationConfig
+
+    # Protocols and output types
+    from tract.protocols import (
+        TokenCounter,
+        ContextCompiler,
+        Message,
+        CompiledContext,
+        CompileSnapshot,
+        TokenUsage,
+        ChatResponse,
+        ToolCall,
+        ToolCallDict,
+        ToolCallOpenAIDict,
+        ToolTurn,
+    )
+
+    # Branch model
+    from tract.models.branch import BranchInfo
+
+    # Merge models
+    from tract.models.merge import (
+        ImportIssue,
+        ImportResult,
+        ConflictInfo,
+        MergeResult,
+        MergeStrategy,
+        RebaseResult,
+        RebaseWarning,
+    )
+
+    # Compression models
+    from tract.models.compression import CompressResult, GCResult, ReorderWarning, ToolCompactResult, ToolDropResult
+
+    # Compression prompts (for extending or selecting system prompts)
+    from tract.prompts.summarize import (
+        DEFAULT_SUMMARIZE_SYSTEM,
+        CONVERSATION_SUMMARIZE_SYSTEM,
+        TOOL_SUMMARIZE_SYSTEM,
+        TOOL_CONTEXT_SUMMARIZE_SYSTEM,
+    )
+
+    # Session and spawn models
+    from tract.session import Session
+    from tract.models.session import SessionContent, SpawnInfo, CollapseResult
+
+    # Operations data models
+    from tract.operations.health import HealthReport
+    from tract.operations.history import StatusInfo
+    from tract.operations.diff import DiffResult, MessageDiff, DiffStat
+
+    # Config index and middleware
+    from tract.operations.config_index import ConfigIndex
+    from tract.middleware import MiddlewareContext, MiddlewareEvent
+
+    # Operation tracing
+    from tract.tracing import SpanRecord, TraceCollector, TraceSink, Tracer
+
+    # Semantic gates
+    from tract.gate import SemanticGate, GateResult
+
+    # Semantic maintainers
+    from tract.maintain import SemanticMaintainer, MaintainResult
+
+    # Context view (unified context specification for LLM-powered operations)
+    from tract.context_view import ContextView, BuiltContext, build_context, resolve_auto_peek, estimate_tokens
+
+    # Context intelligence
+    from tract.intelligence import CherryPickResult, DedupResult, cherry_pick, acherry_pick, deduplicate, adeduplicate
+
+    # Autonomous operations
+    from tract.autonomous import AutoSplitResult, AutoRebaseResult, AutoBranchResult, auto_split, aauto_split, auto_rebase, aauto_rebase, auto_branch, aauto_branch
+
+    # Judgment (unified LLM-powered evaluation primitive)
+    from tract.judgment import (
+        Judgment, JudgmentResult,
+        GateVerdict, MaintenancePlan, MaintenanceAction,
+        SelectionResult, DedupGroups, SplitPlan, BooleanDecision, RouteSelection,
     )
-except ImportError:
-    pass
-
-try:
-    from tract.toolkit.models import ToolDefinition, ToolName, ToolProfile, ToolConfig, ToolResult
-    from tract.toolkit.profiles import ProfileName
-    from tract.toolkit.executor import ToolExecutor
-    from tract.toolkit.presentation import ToolPresenter, PresentationConfig
-    from tract.toolkit.discovery import get_discovery_tools
-except ImportError:
-    pass
-
-try:
-    from tract.loop import LoopConfig, LoopResult, StepMetrics, run_loop, arun_loop
-except ImportError:
-    pass
-
-# Type aliases for IDE autocomplete
-from tract.tract import CompileStrategy
-
-# Tool tracking
-from tract.models.tools import hash_tool_schema
-
-# Exceptions
-from tract.exceptions import (
-    TraceError,
-    CommitNotFoundError,
-    BlobNotFoundError,
-    ContentValidationError,
-    BudgetExceededError,
-    EditTargetError,
-    DetachedHeadError,
-    AmbiguousPrefixError,
-    BranchExistsError,
-    BranchNotFoundError,
-    InvalidBranchNameError,
-    UnmergedBranchError,
-    MergeError,
-    MergeConflictError,
-    NothingToMergeError,
-    RebaseError,
-    ImportCommitError,
-    SemanticSafetyError,
-    CompressionError,
-    GCError,
-    SpawnError,
-    SessionError,
-    TagNotRegisteredError,
-    CurationError,
-    BlockedError,
-    ClosedError,
-    ThreadSafetyError,
-    RetryExhaustedError,
-)
-
-# Formatting utilities
-from tract.formatting import StreamPrinter
+
+    # Policy (unified context management policy primitive)
+    from tract.policy import (
+        Policy, PolicyContext, PolicyOutcome, PolicyEngine,
+        always, never, token_ratio_above, commit_count_above,
+        block_with_reason, pass_through,
+    )
+
+    # Routing
+    from tract.routing import Route, RoutingTable, SemanticRouter, RoutingResult
+
+    # Directive templates
+    from tract.templates import DirectiveTemplate, list_templates, get_template, register_template
+
+    # Workflow profiles
+    from tract.profiles import (
+        WorkflowProfile,
+        get_profile as get_workflow_profile,
+        list_profiles as list_workflow_profiles,
+        register_profile as register_workflow_profile,
+    )
+
+    # LLM protocol (always available — these are just Protocol definitions)
+    from tract.llm.protocols import LLMClient, AgentLoop
+    from tract.llm.protocols import AsyncLLMClient, acall_llm
+
+    # LLM error types (no external deps — always available)
+    from tract.llm.errors import (
+        LLMClientError,
+        LLMConfigError,
+        LLMRateLimitError,
+        LLMAuthError,
+        LLMResponseError,
+        LLMToolUseError,
+    )
+
+    # LLM fallback client (no external deps — always available)
+    from tract.llm.fallback import FallbackClient
+
+    # LLM test utilities (no external deps — always available)
+    from tract.llm.testing import MockLLMClient, ReplayLLMClient, FunctionLLMClient
+
+    # Runner components (require optional dependencies: pip install tract-ai[runner])
+    try:
+        from tract.llm.client import OpenAIClient
+        from tract.llm.anthropic_client import (
+            AnthropicClient,
+            StreamEvent,
+            TextDelta,
+            ToolCallStart,
+            ToolCallDelta,
+            ThinkingDelta,
+            UsageEvent,
+            MessageDone,
+        )
+    except ImportError:
+        pass
+
+    try:
+        from tract.toolkit.models import ToolDefinition, ToolName, ToolProfile, ToolConfig, ToolResult
+        from tract.toolkit.profiles import ProfileName
+        from tract.toolkit.executor import ToolExecutor
+        from tract.toolkit.presentation import ToolPresenter, PresentationConfig
+        from tract.toolkit.discovery import get_discovery_tools
+    except ImportError:
+        pass
+
+    try:
+        from tract.loop import LoopConfig, LoopResult, StepMetrics, run_loop, arun_loop
+    except ImportError:
+        pass
+
+    # Type aliases for IDE autocomplete
+    from tract.tract import CompileStrategy
+
+    # Tool tracking
+    from tract.models.tools import hash_tool_schema
+
+    # Exceptions
+    from tract.exceptions import (
+        TraceError,
+        CommitNotFoundError,
+        BlobNotFoundError,
+        ContentValidationError,
+        BudgetExceededError,
+        EditTargetError,
+        DetachedHeadError,
+        AmbiguousPrefixError,
+        BranchExistsError,
+        BranchNotFoundError,
+        InvalidBranchNameError,
+        UnmergedBranchError,
+        MergeError,
+        MergeConflictError,
+        NothingToMergeError,
+        RebaseError,
+        ImportCommitError,
+        SemanticSafetyError,
+        CompressionError,
+        GCError,
+        SpawnError,
+        SessionError,
+        TagNotRegisteredError,
+        CurationError,
+        BlockedError,
+        ClosedError,
+        ThreadSafetyError,
+        RetryExhaustedError,
+    )
+
+    # Formatting utilities
+    from tract.formatting import StreamPrinter
 
 __all__ = [
     "__version__",
@@ -294,6 +464,11 @@ __all__ = [
     "MaintainResult",
     "MiddlewareContext",
     "MiddlewareEvent",
+    # Operation tracing
+    "Tracer",
+    "TraceSink",
+    "TraceCollector",
+    "SpanRecord",
     # Context view
     "ContextView",
     "BuiltContext",
@@ -8,18 +8,35 @@ from __future__ import annotations
 
 import logging
 from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 
-from tract.engine.compiler import DefaultContextCompiler
+from tract.engine.compiler import DefaultContextCompiler, _normalize_dt
+from tract.engine.persistent import PersistentVector
 from tract.models.annotations import DEFAULT_TYPE_PRIORITIES, Priority
+from tract.models.commit import CommitOperation
 from tract.models.config import LLMConfig
-from tract.protocols import CompiledContext, CompileSnapshot, Message, TokenCounter
+from tract.protocols import (
+    CompiledContext,
+    CompileSnapshot,
+    Message,
+    TokenCounter,
+    ToolCall,
+    _copy_compiled,
+)
+from tract.tracing import Tracer
 
 if TYPE_CHECKING:
     from tract.models.commit import CommitInfo
     from tract.protocols import ContextCompiler
-    from tract.storage.repositories import CommitRepository
-    from tract.storage.schema import CommitRow
+    from tract.storage.repositories import (
+        CommitParentRepository,
+        CommitRepository,
+        CompileSnapshotRepository,
+    )
+    from tract.storage.schema import AnnotationRow, CommitRow
 
 logger = logging.getLogger(__name__)
 
@@ -27,12 +44,74 @@ logger = logging.getLogger(__name__)
 RESPONSE_PRIMER_TOKENS = 3
 
 
+@dataclass(frozen=True)
+class CompileVariant:
+    """Compile parameters that select a non-default cached snapshot.
+
+    Default compiles (``strategy="full"`` with no other options) use the
+    plain per-HEAD cache; every other parameter combination is cached
+    under ``(head_hash, variant)``.  Build instances with :meth:`of` so
+    parameters that cannot affect the output are normalized away.
+    """
+
+    strategy: str = "full"
+    strategy_k: int = 0
+    recent_ratio: float | None = None
+    include_reasoning: bool = False
+    include_edit_annotations: bool = False
+    at_time: datetime | None = None
+    at_commit: str | None = None
+
+    @classmethod
+    def of(
+        cls,
+        *,
+        strategy: str = "full",
+        strategy_k: int = 5,
+        recent_ratio: float | None = None,
+        include_reasoning: bool = False,
+        include_edit_annotations: bool = False,
+        at_time: datetime | None = None,
+        at_commit: str | None = None,
+    ) -> CompileVariant:
+        """Build a variant, dropping parameters the strategy ignores."""
+        adaptive = strategy == "adaptive"
+        return cls(
+            strategy=strategy,
+            strategy_k=strategy_k if adaptive and recent_ratio is None else 0,
+            recent_ratio=recent_ratio if adaptive else None,
+            include_reasoning=include_reasoning,
+            include_edit_annotations=include_edit_annotations,
+            at_time=at_time,
+            at_commit=at_commit,
+        )
+
+    @property
+    def historical(self) -> bool:
+        """Whether the compile is bounded by ``at_time`` / ``at_commit``."""
+        return self.at_time is not None or self.at_commit is not None
+
+    @property
+    def extends_on_append(self) -> bool:
+        """Whether an APPEND can be applied incrementally (fixed window)."""
+        return (
+            self.strategy in ("messages", "adaptive")
+            and self.recent_ratio is None
+            and not self.include_reasoning
+            and not self.include_edit_annotations
+            and not self.historical
+        )
+
+
 class CacheManager:
     """LRU compile-snapshot cache with incremental patching.
 
     Manages an OrderedDict-based LRU cache of CompileSnapshot objects.
     Supports O(1) incremental extension for APPEND commits, in-memory
     patching for EDIT commits, and annotation-aware invalidation.
+    Snapshot fields are persistent vectors, so a derived snapshot shares
+    storage with its parent and the LRU holds near-identical entries for
+    roughly the cost of one.
 
     Token counts use per-message tracking: each message's token count
     (including per-message overhead) is stored in the snapshot.  The
@@ -40,6 +119,10 @@ class CacheManager:
     After ``record_usage()`` calibrates the total with API-reported counts,
     subsequent incremental operations preserve that API base and only add
     tiktoken-computed deltas for new/changed messages.
+
+    When a ``snapshot_repo`` is supplied, snapshots can also be written to
+    a persistent tier (see :meth:`persist`) and resumed by a later process
+    (see :meth:`load_persisted`).
     """
 
     def __init__(
@@ -49,15 +132,29 @@ class CacheManager:
         compiler: ContextCompiler,
         token_counter: TokenCounter,
         commit_repo: CommitRepository,
+        parent_repo: CommitParentRepository | None = None,
+        snapshot_repo: CompileSnapshotRepository | None = None,
+        tract_id: str | None = None,
+        tracer: Tracer | None = None,
     ) -> None:
         self._cache: OrderedDict[str, CompileSnapshot] = OrderedDict()
         self._maxsize = maxsize
         self._compiler = compiler
         self._token_counter = token_counter
         self._commit_repo = commit_repo
+        self._parent_repo = parent_repo
+        self._snapshot_repo = snapshot_repo
+        self._tract_id = tract_id
         # API-reported token overrides that survive cache eviction.
         # Keyed by head_hash -> (token_count, token_source).
         self._api_overrides: dict[str, tuple[int, str]] = {}
+        # Last snapshot object written to the persistent tier, so repeated
+        # persist() calls for an unchanged head are free.
+        self._last_persisted: CompileSnapshot | None = None
+        # Snapshots for non-default compile parameters, LRU like _cache.
+        self._variants: OrderedDict[tuple[str, CompileVariant], CompileSnapshot] = OrderedDict()
+        # Hit/miss/evict counters go to the tracer (no-op unless enabled).
+        self._tracer = tracer if tracer is not None else Tracer()
 
     # ------------------------------------------------------------------
     # LRU primitives
@@ -67,9 +164,11 @@ class CacheManager:
         """Get snapshot from LRU cache.  Returns None on miss."""
         if head_hash not in self._cache:
             logger.debug("Cache miss: %s", head_hash[:12])
+            self._tracer.count("compile_cache.miss")
             return None
         self._cache.move_to_end(head_hash)
         logger.debug("Cache hit: %s", head_hash[:12])
+        self._tracer.count("compile_cache.hit")
         return self._cache[head_hash]
 
     def put(self, head_hash: str, snapshot: CompileSnapshot) -> None:
@@ -81,16 +180,41 @@ class CacheManager:
             evicted_key, _ = self._cache.popitem(last=False)
             self._api_overrides.pop(evicted_key, None)
             logger.debug("Cache evict: %s", evicted_key[:12])
+            self._tracer.count("compile_cache.evict")
         logger.debug("Cache put: %s (size=%d)", head_hash[:12], len(self._cache))
 
     def clear(self) -> None:
-        """Clear all cached snapshots and API overrides."""
-        size = len(self._cache)
+        """Clear all cached snapshots, variants and API overrides."""
+        size = len(self._cache) + len(self._variants)
         self._cache.clear()
+        self._variants.clear()
         self._api_overrides.clear()
         if size > 0:
             logger.debug("Cache cleared (%d entries)", size)
 
+    def get_variant(self, head_hash: str, variant: CompileVariant) -> CompileSnapshot | None:
+        """Get the snapshot cached for *variant* at *head_hash*, or None."""
+        key = (head_hash, variant)
+        snapshot = self._variants.get(key)
+        if snapshot is None:
+            self._tracer.count("compile_cache.variant_miss")
+        else:
+            self._variants.move_to_end(key)
+            self._tracer.count("compile_cache.variant_hit")
+        return snapshot
+
+    def put_variant(
+        self, head_hash: str, variant: CompileVariant, snapshot: CompileSnapshot
+    ) -> None:
+        """Store a variant snapshot, evicting the LRU variant if at capacity."""
+        key = (head_hash, variant)
+        if key in self._variants:
+            self._variants.move_to_end(key)
+        self._variants[key] = snapshot
+        while len(self._variants) > self._maxsize:
+            self._variants.popitem(last=False)
+            self._tracer.count("compile_cache.evict")
+
     def store_api_override(self, head_hash: str, token_count: int, token_source: str) -> None:
         """Store an API-reported token override that survives cache eviction."""
         self._api_overrides[head_hash] = (token_count, token_source)
@@ -107,11 +231,16 @@ class CacheManager:
     def to_compiled(snapshot: CompileSnapshot) -> CompiledContext:
         """Convert a CompileSnapshot to a CompiledContext for return.
 
-        Uses copy-on-output for generation_configs to prevent user mutations
-        of the returned CompiledContext from corrupting the cached snapshot.
-        Populates per-message token counts from the snapshot.
+        Messages with per-message token counts and parsed generation
+        configs are materialized once and memoized on the snapshot, so
+        repeated compiles of an unchanged HEAD skip that work.  Each call
+        still returns fresh list copies (copy-on-output), so mutating a
+        returned CompiledContext never corrupts the cached snapshot.
         """
-        msgs = list(snapshot.messages)
+        view = snapshot._compiled
+        if view is not None:
+            return _copy_compiled(view)
+        msgs: list[Message] | PersistentVector[Message] = snapshot.messages
         if snapshot.message_token_counts and len(snapshot.message_token_counts) == len(msgs):
             msgs = [
                 Message(
@@ -121,15 +250,19 @@ class CacheManager:
                 )
                 for m, tc in zip(snapshot.messages, snapshot.message_token_counts)
             ]
-        return CompiledContext(
-            messages=msgs,
+        view = CompiledContext(
+            messages=list(msgs),
             token_count=snapshot.token_count,
             commit_count=snapshot.commit_count,
             token_source=snapshot.token_source,
-            generation_configs=[LLMConfig.from_dict(c) if c else None for c in snapshot.generation_configs],
+            generation_configs=[
+                LLMConfig.from_dict(c) if c else None for c in snapshot.generation_configs
+            ],
             commit_hashes=list(snapshot.commit_hashes),
             priorities=list(snapshot.priorities),
         )
+        object.__setattr__(snapshot, "_compiled", view)
+        return _copy_compiled(view)
 
     def build_snapshot(
         self, head_hash: str, result: CompiledContext
@@ -142,7 +275,7 @@ class CacheManager:
         """
         if not isinstance(self._compiler, DefaultContextCompiler):
             return None
-        messages = tuple(result.messages)
+        messages = PersistentVector(result.messages)
         per_msg = self._compute_per_message_counts(messages)
         token_count = sum(per_msg) + RESPONSE_PRIMER_TOKENS if per_msg else 0
         return CompileSnapshot(
@@ -151,9 +284,11 @@ class CacheManager:
             commit_count=result.commit_count,
             token_count=token_count,
             token_source=result.token_source,
-            generation_configs=tuple(c.to_dict() if c is not None else {} for c in result.generation_configs),
-            commit_hashes=tuple(result.commit_hashes),
-            priorities=tuple(result.priorities),
+            generation_configs=PersistentVector(
+                c.to_dict() if c is not None else {} for c in result.generation_configs
+            ),
+            commit_hashes=PersistentVector(result.commit_hashes),
+            priorities=PersistentVector(result.priorities),
             message_token_counts=per_msg,
         )
 
@@ -191,10 +326,18 @@ class CacheManager:
         return self._token_counter.count_messages([msg_dict]) - RESPONSE_PRIMER_TOKENS
 
     def _compute_per_message_counts(
-        self, messages: tuple[Message, ...] | list[Message]
-    ) -> tuple[int, ...]:
-        """Compute per-message token counts for all messages."""
-        return tuple(self._count_single_message_tokens(m) for m in messages)
+        self, messages: Sequence[Message]
+    ) -> PersistentVector[int]:
+        """Compute per-message token counts for all messages.
+
+        Counters that expose ``count_each_message`` (e.g.
+        :class:`~tract.engine.tokens.TiktokenCounter`) tokenize the whole
+        list in one batch; others are called once per message.
+        """
+        count_each = getattr(self._token_counter, "count_each_message", None)
+        if count_each is not None:
+            return PersistentVector(count_each([self._message_to_dict(m) for m in messages]))
+        return PersistentVector(self._count_single_message_tokens(m) for m in messages)
 
     @property
     def uses_default_compiler(self) -> bool:
@@ -218,27 +361,31 @@ class CacheManager:
         commit_row = self._commit_repo.get(commit_info.commit_hash)
         if commit_row is None:
             return
+        self.put(
+            commit_info.commit_hash,
+            self._appended_snapshot(commit_row, parent_snapshot),
+        )
 
+    def _appended_snapshot(
+        self, commit_row: CommitRow, parent_snapshot: CompileSnapshot
+    ) -> CompileSnapshot:
+        """Return *parent_snapshot* extended by one APPEND commit."""
         # Skip commits whose content type is not compilable (e.g. config, metadata)
         from tract.models.content import BUILTIN_TYPE_HINTS, ContentTypeHints as _CTH
         hints = BUILTIN_TYPE_HINTS.get(commit_row.content_type, _CTH())
         if not hints.compilable:
             # Still advance the cache HEAD so subsequent appends chain correctly
-            self.put(
-                commit_info.commit_hash,
-                CompileSnapshot(
-                    head_hash=commit_info.commit_hash,
-                    messages=parent_snapshot.messages,
-                    commit_count=parent_snapshot.commit_count,
-                    token_count=parent_snapshot.token_count,
-                    token_source=parent_snapshot.token_source,
-                    generation_configs=parent_snapshot.generation_configs,
-                    commit_hashes=parent_snapshot.commit_hashes,
-                    priorities=parent_snapshot.priorities,
-                    message_token_counts=parent_snapshot.message_token_counts,
-                ),
+            return CompileSnapshot(
+                head_hash=commit_row.commit_hash,
+                messages=parent_snapshot.messages,
+                commit_count=parent_snapshot.commit_count,
+                token_count=parent_snapshot.token_count,
+                token_source=parent_snapshot.token_source,
+                generation_configs=parent_snapshot.generation_configs,
+                commit_hashes=parent_snapshot.commit_hashes,
+                priorities=parent_snapshot.priorities,
+                message_token_counts=parent_snapshot.message_token_counts,
             )
-            return
 
         # Skip commits whose content type has a default SKIP priority
         # (e.g. reasoning). These are excluded from compile() output, so
@@ -249,21 +396,17 @@ class CacheManager:
         if default_priority == Priority.SKIP:
             # Still advance the cache HEAD so subsequent appends chain
             # correctly, but don't add the message to the snapshot.
-            self.put(
-                commit_info.commit_hash,
-                CompileSnapshot(
-                    head_hash=commit_info.commit_hash,
-                    messages=parent_snapshot.messages,
-                    commit_count=parent_snapshot.commit_count,
-                    token_count=parent_snapshot.token_count,
-                    token_source=parent_snapshot.token_source,
-                    generation_configs=parent_snapshot.generation_configs,
-                    commit_hashes=parent_snapshot.commit_hashes,
-                    priorities=parent_snapshot.priorities,
-                    message_token_counts=parent_snapshot.message_token_counts,
-                ),
+            return CompileSnapshot(
+                head_hash=commit_row.commit_hash,
+                messages=parent_snapshot.messages,
+                commit_count=parent_snapshot.commit_count,
+                token_count=parent_snapshot.token_count,
+                token_source=parent_snapshot.token_source,
+                generation_configs=parent_snapshot.generation_configs,
+                commit_hashes=parent_snapshot.commit_hashes,
+                priorities=parent_snapshot.priorities,
+                message_token_counts=parent_snapshot.message_token_counts,
             )
-            return
 
         # Cache requires DefaultContextCompiler for incremental message building
         if not isinstance(self._compiler, DefaultContextCompiler):
@@ -274,33 +417,144 @@ class CacheManager:
         new_message = self._compiler.build_message_for_commit(commit_row)
         new_config = dict(commit_row.generation_config_json or {})
 
-        new_messages = parent_snapshot.messages + (new_message,)
-        new_commit_hashes = parent_snapshot.commit_hashes + (commit_info.commit_hash,)
+        new_messages = parent_snapshot.messages.append(new_message)
+        new_commit_hashes = parent_snapshot.commit_hashes.append(commit_row.commit_hash)
 
         # O(1) token delta: count only the new message
         new_msg_tokens = self._count_single_message_tokens(new_message)
         if parent_snapshot.message_token_counts:
             # Delta-based: preserves API-calibrated base from record_usage()
             new_token_count = parent_snapshot.token_count + new_msg_tokens
-            new_msg_counts = parent_snapshot.message_token_counts + (new_msg_tokens,)
+            new_msg_counts = parent_snapshot.message_token_counts.append(new_msg_tokens)
         else:
             # Fallback: no per-message counts (legacy snapshot), full recount
             new_msg_counts = self._compute_per_message_counts(new_messages)
             new_token_count = sum(new_msg_counts) + RESPONSE_PRIMER_TOKENS if new_msg_counts else 0
 
-        self.put(
-            commit_info.commit_hash,
-            CompileSnapshot(
-                head_hash=commit_info.commit_hash,
-                messages=new_messages,
-                commit_count=parent_snapshot.commit_count + 1,
-                token_count=new_token_count,
-                token_source=parent_snapshot.token_source,
-                generation_configs=parent_snapshot.generation_configs + (new_config,),
-                commit_hashes=new_commit_hashes,
-                priorities=parent_snapshot.priorities + (default_priority.value,),
-                message_token_counts=new_msg_counts,
+        return CompileSnapshot(
+            head_hash=commit_row.commit_hash,
+            messages=new_messages,
+            commit_count=parent_snapshot.commit_count + 1,
+            token_count=new_token_count,
+            token_source=parent_snapshot.token_source,
+            generation_configs=parent_snapshot.generation_configs.append(new_config),
+            commit_hashes=new_commit_hashes,
+            priorities=parent_snapshot.priorities.append(default_priority.value),
+            message_token_counts=new_msg_counts,
+        )
+
+    def advance_variants(self, prev_head: str, commit_hash: str) -> None:
+        """Carry *prev_head*'s variant snapshots over to a new commit.
+
+        Historical variants whose window excludes the new commit are
+        unchanged by it and are re-keyed as-is.  Fixed-window
+        ``"messages"`` / ``"adaptive"`` variants are extended for APPEND
+        commits by demoting the message that leaves the full-detail window
+        and appending the new one.  Anything else is recompiled on demand.
+        """
+        entries = [
+            (variant, snapshot)
+            for (head, variant), snapshot in self._variants.items()
+            if head == prev_head
+        ]
+        if not entries:
+            return
+        commit_row = self._commit_repo.get(commit_hash)
+        if commit_row is None:
+            return
+        for variant, snapshot in entries:
+            advanced: CompileSnapshot | None = None
+            if variant.historical:
+                if self._outside_window(variant, snapshot, commit_row):
+                    advanced = snapshot
+            elif (
+                variant.extends_on_append
+                and commit_row.operation == CommitOperation.APPEND
+            ):
+                advanced = self._extended_variant(variant, commit_row, snapshot)
+            if advanced is not None:
+                self.put_variant(commit_hash, variant, advanced)
+
+    @staticmethod
+    def _outside_window(
+        variant: CompileVariant, snapshot: CompileSnapshot, commit_row: CommitRow
+    ) -> bool:
+        """Whether *commit_row* is newer than a historical variant's window."""
+        if variant.at_commit is not None:
+            # at_commit stops the walk at that commit only if it is on the
+            # chain; otherwise the compile covered the whole chain.
+            return variant.at_commit in snapshot.commit_hashes
+        if variant.at_time is None:
+            return False
+        return _normalize_dt(commit_row.created_at) > _normalize_dt(variant.at_time)
+
+    def _extended_variant(
+        self,
+        variant: CompileVariant,
+        commit_row: CommitRow,
+        parent: CompileSnapshot,
+    ) -> CompileSnapshot | None:
+        """Return *parent* (a fixed-window variant) extended by one APPEND.
+
+        Returns None when the change cannot be applied incrementally.
+        """
+        from tract.models.content import BUILTIN_TYPE_HINTS
+        from tract.models.content import ContentTypeHints as _CTH
+
+        hints = BUILTIN_TYPE_HINTS.get(commit_row.content_type, _CTH())
+        default_priority = DEFAULT_TYPE_PRIORITIES.get(
+            commit_row.content_type, Priority.NORMAL
+        )
+        if not hints.compilable or default_priority == Priority.SKIP:
+            return parent  # excluded from compile output
+        if commit_row.content_type == "instruction":
+            return None  # named-instruction dedup can drop earlier messages
+        counts = parent.message_token_counts
+        if len(counts) != len(parent.messages):
+            return None
+        if not isinstance(self._compiler, DefaultContextCompiler):
+            return None
+
+        full = self._compiler.build_message_for_commit(commit_row)
+        window = max(variant.strategy_k, 0)
+        new_message = full if window > 0 else self._summary_message(commit_row, full.role)
+
+        messages = parent.messages
+        token_count = parent.token_count
+        # The message at len - window leaves the full-detail window.
+        demote = len(messages) - window
+        if window > 0 and demote >= 0:
+            demoted_row = self._commit_repo.get(parent.commit_hashes[demote])
+            if demoted_row is None:
+                return None
+            summary = self._summary_message(demoted_row, messages[demote].role)
+            summary_tokens = self._count_single_message_tokens(summary)
+            token_count += summary_tokens - counts[demote]
+            messages = messages.set(demote, summary)
+            counts = counts.set(demote, summary_tokens)
+
+        new_tokens = self._count_single_message_tokens(new_message)
+        return CompileSnapshot(
+            head_hash=commit_row.commit_hash,
+            messages=messages.append(new_message),
+            commit_count=parent.commit_count + 1,
+            token_count=token_count + new_tokens,
+            token_source=parent.token_source,
+            generation_configs=parent.generation_configs.append(
+                dict(commit_row.generation_config_json or {})
             ),
+            commit_hashes=parent.commit_hashes.append(commit_row.commit_hash),
+            priorities=parent.priorities.append(default_priority.value),
+            message_token_counts=counts.append(new_tokens),
+        )
+
+    @staticmethod
+    def _summary_message(commit_row: CommitRow, role: str) -> Message:
+        """Messages-only rendering of a commit (mirrors the compiler)."""
+        return Message(
+            role=role,
+            content=commit_row.message or f"[{commit_row.content_type}] commit",
+            content_type=commit_row.content_type,
         )
 
     def patch_for_edit(
@@ -326,10 +580,10 @@ class CacheManager:
         if target_hash is None:
             return None
 
-        # Find position of the target commit in the snapshot (O(n) -> O(1) via dict)
-        hash_to_idx = {h: i for i, h in enumerate(parent_snapshot.commit_hashes)}
-        target_idx = hash_to_idx.get(target_hash)
-        if target_idx is None:
+        # Find position of the target commit in the snapshot
+        try:
+            target_idx = parent_snapshot.commit_hashes.index(target_hash)
+        except ValueError:
             return None  # Target not in snapshot
 
         # Cache requires DefaultContextCompiler for incremental message building
@@ -340,14 +594,15 @@ class CacheManager:
             )
         new_message = self._compiler.build_message_for_commit(edit_row)
 
-        # Replace message at target position
-        new_messages = list(parent_snapshot.messages)
-        new_messages[target_idx] = new_message
+        # Replace message at target position (path copy, shares the rest)
+        new_messages = parent_snapshot.messages.set(target_idx, new_message)
 
         # Handle generation_config: edit-inherits-original rule
-        new_configs = list(parent_snapshot.generation_configs)
+        new_configs = parent_snapshot.generation_configs
         if edit_row.generation_config_json is not None:
-            new_configs[target_idx] = dict(edit_row.generation_config_json)  # copy-on-input
+            new_configs = new_configs.set(
+                target_idx, dict(edit_row.generation_config_json),  # copy-on-input
+            )
         # else: keep original config at target_idx (edit-inherits-original)
 
         # O(1) token delta
@@ -355,24 +610,22 @@ class CacheManager:
         if parent_snapshot.message_token_counts and len(parent_snapshot.message_token_counts) > target_idx:
             old_msg_tokens = parent_snapshot.message_token_counts[target_idx]
             new_token_count = parent_snapshot.token_count - old_msg_tokens + new_msg_tokens
-            new_msg_counts = list(parent_snapshot.message_token_counts)
-            new_msg_counts[target_idx] = new_msg_tokens
-            new_msg_counts_tuple = tuple(new_msg_counts)
+            new_msg_counts = parent_snapshot.message_token_counts.set(target_idx, new_msg_tokens)
         else:
             # Fallback: full recount
-            new_msg_counts_tuple = self._compute_per_message_counts(new_messages)
-            new_token_count = sum(new_msg_counts_tuple) + RESPONSE_PRIMER_TOKENS if new_msg_counts_tuple else 0
+            new_msg_counts = self._compute_per_message_counts(new_messages)
+            new_token_count = sum(new_msg_counts) + RESPONSE_PRIMER_TOKENS if new_msg_counts else 0
 
         return CompileSnapshot(
             head_hash=new_head_hash,
-            messages=tuple(new_messages),
+            messages=new_messages,
             commit_count=parent_snapshot.commit_count,  # Same count (EDIT replaces, doesn't add)
             token_count=new_token_count,
             token_source=parent_snapshot.token_source,
-            generation_configs=tuple(new_configs),
+            generation_configs=new_configs,
             commit_hashes=parent_snapshot.commit_hashes,  # Same positions
             priorities=parent_snapshot.priorities,  # Same positions
-            message_token_counts=new_msg_counts_tuple,
+            message_token_counts=new_msg_counts,
         )
 
     def patch_for_annotate(
@@ -401,37 +654,34 @@ class CacheManager:
             if target_idx is None:
                 return snapshot  # Already not in snapshot
 
-            # Remove message, config, hash, priority, and token count at target position
-            new_messages = list(snapshot.messages)
-            new_configs = list(snapshot.generation_configs)
-            new_hashes = list(snapshot.commit_hashes)
-            new_priorities = list(snapshot.priorities)
-            new_msg_counts = list(snapshot.message_token_counts) if snapshot.message_token_counts else []
-            del new_messages[target_idx]
-            del new_configs[target_idx]
-            del new_hashes[target_idx]
+            # Remove message, config, hash, priority, and token count at
+            # target position (removal shifts positions, so these rebuild)
+            new_messages = snapshot.messages.delete(target_idx)
+            new_configs = snapshot.generation_configs.delete(target_idx)
+            new_hashes = snapshot.commit_hashes.delete(target_idx)
+            new_priorities = snapshot.priorities
             if new_priorities:
-                del new_priorities[target_idx]
+                new_priorities = new_priorities.delete(target_idx)
 
             # O(1) token delta
-            if new_msg_counts and len(new_msg_counts) > target_idx:
-                removed_tokens = new_msg_counts[target_idx]
-                del new_msg_counts[target_idx]
-                new_token_count = snapshot.token_count - removed_tokens
+            msg_counts = snapshot.message_token_counts
+            if msg_counts and len(msg_counts) > target_idx:
+                new_token_count = snapshot.token_count - msg_counts[target_idx]
+                new_msg_counts = msg_counts.delete(target_idx)
             else:
-                new_msg_counts = list(self._compute_per_message_counts(new_messages))
+                new_msg_counts = self._compute_per_message_counts(new_messages)
                 new_token_count = sum(new_msg_counts) + RESPONSE_PRIMER_TOKENS if new_msg_counts else 0
 
             return CompileSnapshot(
                 head_hash=snapshot.head_hash,
-                messages=tuple(new_messages),
+                messages=new_messages,
                 commit_count=snapshot.commit_count - 1,
                 token_count=new_token_count,
                 token_source=snapshot.token_source,
-                generation_configs=tuple(new_configs),
-                commit_hashes=tuple(new_hashes),
-                priorities=tuple(new_priorities),
-                message_token_counts=tuple(new_msg_counts),
+                generation_configs=new_configs,
+                commit_hashes=new_hashes,
+                priorities=new_priorities,
+                message_token_counts=new_msg_counts,
             )
         else:
             # NORMAL or PINNED
@@ -442,8 +692,7 @@ class CacheManager:
                     and target_idx < len(snapshot.priorities)
                     and snapshot.priorities[target_idx] != new_priority.value
                 ):
-                    new_priorities = list(snapshot.priorities)
-                    new_priorities[target_idx] = new_priority.value
+                    new_priorities = snapshot.priorities.set(target_idx, new_priority.value)
                     return CompileSnapshot(
                         head_hash=snapshot.head_hash,
                         messages=snapshot.messages,
@@ -452,9 +701,201 @@ class CacheManager:
                         token_source=snapshot.token_source,
                         generation_configs=snapshot.generation_configs,
                         commit_hashes=snapshot.commit_hashes,
-                        priorities=tuple(new_priorities),
+                        priorities=new_priorities,
                         message_token_counts=snapshot.message_token_counts,
                     )
                 return snapshot  # Already same priority, no change
             else:
                 return None  # Was skipped, need full recompile (don't have message content)
+
+    # ------------------------------------------------------------------
+    # Persistent snapshot tier
+    # ------------------------------------------------------------------
+
+    def _params_key(self) -> str:
+        """Identify the compile parameters a persisted snapshot depends on.
+
+        Snapshots built with a different tokenizer, tool-result format, or
+        role mapping are never reused.
+        """
+        token_source = self._token_source() or type(self._token_counter).__name__
+        fmt = getattr(self._compiler, "tool_result_format", "minimal")
+        key = f"strategy=full;format={fmt};tokens={token_source}"
+        role_map = getattr(self._compiler, "_type_to_role_override", None)
+        if role_map:
+            key += ";roles=" + ",".join(f"{k}:{v}" for k, v in sorted(role_map.items()))
+        return key
+
+    @staticmethod
+    def _snapshot_to_json(snapshot: CompileSnapshot) -> dict:
+        """Serialize a snapshot (minus head_hash) to a JSON-safe dict."""
+        messages = []
+        for m in snapshot.messages:
+            d: dict = {"role": m.role, "content": m.content}
+            if m.name is not None:
+                d["name"] = m.name
+            if m.tool_calls:
+                d["tool_calls"] = [tc.to_dict() for tc in m.tool_calls]
+            if m.tool_call_id is not None:
+                d["tool_call_id"] = m.tool_call_id
+            if m.content_type is not None:
+                d["content_type"] = m.content_type
+            messages.append(d)
+        return {
+            "messages": messages,
+            "commit_count": snapshot.commit_count,
+            "token_count": snapshot.token_count,
+            "token_source": snapshot.token_source,
+            "generation_configs": list(snapshot.generation_configs),
+            "commit_hashes": list(snapshot.commit_hashes),
+            "priorities": list(snapshot.priorities),
+            "message_token_counts": list(snapshot.message_token_counts),
+            "tool_hashes": list(snapshot.tool_hashes),
+        }
+
+    @staticmethod
+    def _snapshot_from_json(head_hash: str, data: dict) -> CompileSnapshot:
+        """Rebuild a snapshot written by :meth:`_snapshot_to_json`."""
+        messages = PersistentVector(
+            Message(
+                role=d["role"],
+                content=d["content"],
+                name=d.get("name"),
+                tool_calls=[ToolCall.from_dict(tc) for tc in d["tool_calls"]]
+                if d.get("tool_calls") else None,
+                tool_call_id=d.get("tool_call_id"),
+                content_type=d.get("content_type"),
+            )
+            for d in data["messages"]
+        )
+        return CompileSnapshot(
+            head_hash=head_hash,
+            messages=messages,
+            commit_count=data["commit_count"],
+            token_count=data["token_count"],
+            token_source=data["token_source"],
+            generation_configs=PersistentVector(data.get("generation_configs", ())),
+            commit_hashes=PersistentVector(data.get("commit_hashes", ())),
+            priorities=PersistentVector(data.get("priorities", ())),
+            message_token_counts=PersistentVector(data.get("message_token_counts", ())),
+            tool_hashes=PersistentVector(data.get("tool_hashes", ())),
+        )
+
+    def persist(self, head_hash: str) -> bool:
+        """Write the cached snapshot for *head_hash* to the persistent tier.
+
+        Stores the API override for the head alongside it and prunes the
+        tier to ``maxsize`` entries.  The caller owns the transaction.
+
+        Returns:
+            True if a row was written, False if persistence is disabled,
+            the head is not cached, or it was already written unchanged.
+        """
+        repo, tract_id = self._snapshot_repo, self._tract_id
+        if repo is None or tract_id is None or not self.uses_default_compiler:
+            return False
+        snapshot = self._cache.get(head_hash)
+        if snapshot is None or snapshot is self._last_persisted:
+            return False
+
+        from tract.operations.config_index import PERSIST_KEY
+        from tract.storage.schema import CompileSnapshotRow
+
+        override = self._api_overrides.get(head_hash)
+        repo.save(
+            CompileSnapshotRow(
+                tract_id=tract_id,
+                head_hash=head_hash,
+                params_key=self._params_key(),
+                snapshot_json=self._snapshot_to_json(snapshot),
+                annotation_watermark=repo.annotation_watermark(tract_id),
+                api_token_count=override[0] if override is not None else None,
+                api_token_source=override[1] if override is not None else None,
+                created_at=datetime.now(timezone.utc),
+            )
+        )
+        # Persisted config indexes share the table but not this budget
+        repo.prune(tract_id, self._maxsize, exclude=(PERSIST_KEY,))
+        self._last_persisted = snapshot
+        logger.debug("Cache persist: %s", head_hash[:12])
+        return True
+
+    def load_persisted(self, head_hash: str) -> CompileSnapshot | None:
+        """Resume a snapshot for *head_hash* from the persistent tier.
+
+        Looks up the nearest first-parent ancestor with a stored snapshot,
+        then replays the commits in between through the same APPEND and
+        EDIT patching used for live commits.  The result is put in the LRU.
+
+        Returns None (caller does a full compile) when nothing is stored,
+        when a merge commit lies in between, or when priority annotations
+        changed after the snapshot was written.
+        """
+        repo, tract_id = self._snapshot_repo, self._tract_id
+        if repo is None or tract_id is None or not self.uses_default_compiler:
+            return None
+
+        found = repo.find_nearest_ancestor(tract_id, head_hash, self._params_key())
+        if found is None:
+            return None
+        row, distance = found
+
+        # Commits after the snapshot head, root-first
+        pending: list[CommitRow] = []
+        if distance:
+            pending = list(self._commit_repo.get_ancestors(head_hash, limit=distance))
+            pending.reverse()
+            if self._parent_repo is not None and self._parent_repo.batch_get_parents(
+                [c.commit_hash for c in pending]
+            ):
+                logger.debug("Cache persist skip: merge after %s", row.head_hash[:12])
+                return None
+
+        newer = repo.annotations_since(tract_id, row.annotation_watermark)
+        if not self._annotations_allow_resume(newer, pending):
+            logger.debug("Cache persist skip: annotations changed after %s", row.head_hash[:12])
+            return None
+
+        snapshot = self._snapshot_from_json(row.head_hash, row.snapshot_json)
+        if row.api_token_count is not None:
+            self._api_overrides[row.head_hash] = (row.api_token_count, row.api_token_source or "")
+        if distance == 0:
+            self._last_persisted = snapshot
+
+        for commit_row in pending:
+            if commit_row.operation == CommitOperation.EDIT:
+                patched = self.patch_for_edit(snapshot, commit_row.commit_hash, commit_row)
+                if patched is None:
+                    return None
+                snapshot = patched
+            else:
+                snapshot = self._appended_snapshot(commit_row, snapshot)
+
+        self.put(head_hash, snapshot)
+        self._tracer.count("compile_cache.resume")
+        logger.debug(
+            "Cache resume: %s from %s (+%d commits)",
+            head_hash[:12], row.head_hash[:12], distance,
+        )
+        return snapshot
+
+    @staticmethod
+    def _annotations_allow_resume(
+        newer: list[AnnotationRow], pending: list[CommitRow]
+    ) -> bool:
+        """Check that annotations written after a snapshot don't affect output.
+
+        Only the automatic default-priority annotations of the *pending*
+        commits are allowed; anything else may change which messages a full
+        compile would include.
+        """
+        if not newer:
+            return True
+        pending_types = {c.commit_hash: c.content_type for c in pending}
+        for annotation in newer:
+            content_type = pending_types.get(annotation.target_hash)
+            if content_type is None:
+                return False
+            if annotation.priority != DEFAULT_TYPE_PRIORITIES.get(content_type, Priority.NORMAL):
+                return False
+        return True
@@ -8,7 +8,8 @@ from __future__ import annotations
 
 import json
 import logging
-from datetime import datetime, timezone
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
 from typing import TYPE_CHECKING
 
 from pydantic import BaseModel
@@ -141,29 +142,20 @@ class CommitEngine:
         # 6. Get current HEAD
         parent_hash = self._ref_repo.get_head(self._tract_id)
 
-        # 7. Check token budget
-        if self._token_budget and self._token_budget.max_tokens is not None:
-            total_tokens = token_count
-            if parent_hash is not None:
-                total_tokens += self._commit_repo.sum_ancestor_tokens(parent_hash)
-
-            if total_tokens > self._token_budget.max_tokens:
-                if self._token_budget.action == BudgetAction.REJECT:
-                    raise BudgetExceededError(total_tokens, self._token_budget.max_tokens)
-                elif self._token_budget.action == BudgetAction.WARN:
-                    logger.warning(
-                        "Token budget exceeded: %d tokens (max: %d)",
-                        total_tokens,
-                        self._token_budget.max_tokens,
-                    )
-                elif self._token_budget.action == BudgetAction.CALLBACK:
-                    if self._token_budget.callback is not None:
-                        self._token_budget.callback(total_tokens, self._token_budget.max_tokens)
-
-        # 8. Generate timestamp ISO and commit hash
+        # 7. Running chain total and generation (materialized on the parent row)
+        total_tokens = token_count
+        generation = 1
+        if parent_hash is not None:
+            total_tokens += self._commit_repo.sum_ancestor_tokens(parent_hash)
+            generation += self._commit_repo.get_generation(parent_hash)
+
+        # 8. Check token budget
+        self._check_budget(total_tokens)
+
+        # 9. Generate timestamp ISO and commit hash
         timestamp_iso = now.isoformat()
 
-        # 9. Compute commit hash
+        # 10. Compute commit hash
         operation_value = operation.value if isinstance(operation, CommitOperation) else operation
         c_commit_hash = compute_commit_hash(
             content_hash=c_hash,
@@ -174,7 +166,7 @@ class CommitEngine:
             edit_target=edit_target,
         )
 
-        # 10. Validate edit constraints
+        # 11. Validate edit constraints
         if operation == CommitOperation.EDIT:
             if edit_target is None:
                 raise EditTargetError("EDIT operation requires edit_target to be set")
@@ -188,10 +180,10 @@ class CommitEngine:
                     f"Cannot edit an EDIT commit: {edit_target}"
                 )
 
-        # 11. Normalize tags
+        # 12. Normalize tags
         effective_tags = list(tags) if tags else []
 
-        # 12. Create CommitRow and save
+        # 13. Create CommitRow and save
         commit_row = CommitRow(
             commit_hash=c_commit_hash,
             tract_id=self._tract_id,
@@ -202,6 +194,8 @@ class CommitEngine:
             edit_target=edit_target,
             message=message,
             token_count=token_count,
+            chain_token_total=total_tokens,
+            generation=generation,
             metadata_json=metadata,
             generation_config_json=generation_config,
             tags_json=effective_tags if effective_tags else None,
@@ -209,10 +203,10 @@ class CommitEngine:
         )
         self._commit_repo.save(commit_row)
 
-        # 13. Update HEAD
+        # 14. Update HEAD
         self._ref_repo.update_head(self._tract_id, c_commit_hash)
 
-        # 14. Auto-create priority annotation if content type has non-NORMAL default
+        # 15. Auto-create priority annotation if content type has non-NORMAL default
         default_priority = DEFAULT_TYPE_PRIORITIES.get(content_type, Priority.NORMAL)
         if default_priority != Priority.NORMAL:
             annotation = AnnotationRow(
@@ -224,7 +218,7 @@ class CommitEngine:
             )
             self._annotation_repo.save(annotation)
 
-        # 15. Return CommitInfo
+        # 16. Return CommitInfo
         return CommitInfo(
             commit_hash=c_commit_hash,
             tract_id=self._tract_id,
@@ -241,6 +235,162 @@ class CommitEngine:
             created_at=now,
         )
 
+    def create_commits(
+        self,
+        contents: Sequence[BaseModel],
+        *,
+        messages: Sequence[str | None] | None = None,
+        tags: Sequence[list[str] | None] | None = None,
+        metadata: dict | None = None,
+        generation_config: dict | None = None,
+    ) -> list[CommitInfo]:
+        """Create a chain of APPEND commits with bulk writes.
+
+        Equivalent to calling :meth:`create_commit` once per content, but
+        builds every blob, commit and annotation row in memory first
+        (chaining parent hashes and running token totals), writes each
+        table with one bulk insert, and moves HEAD once at the end.
+        Budget violations in REJECT mode raise before anything is written.
+
+        Args:
+            contents: Content models, oldest first.
+            messages: Optional per-content commit messages.
+            tags: Optional per-content tag lists.
+            metadata: Metadata dict applied to every commit.
+            generation_config: Generation config applied to every commit.
+
+        Returns:
+            CommitInfo for each new commit, in input order.
+
+        Raises:
+            BudgetExceededError: If token budget is exceeded in REJECT mode.
+        """
+        if not contents:
+            return []
+
+        parent_hash = self._ref_repo.get_head(self._tract_id)
+        total_tokens = (
+            self._commit_repo.sum_ancestor_tokens(parent_hash)
+            if parent_hash is not None
+            else 0
+        )
+        generation = (
+            self._commit_repo.get_generation(parent_hash)
+            if parent_hash is not None
+            else 0
+        )
+
+        blobs: dict[str, BlobRow] = {}
+        commit_rows: list[CommitRow] = []
+        annotation_rows: list[AnnotationRow] = []
+        infos: list[CommitInfo] = []
+        prev_time: datetime | None = None
+
+        texts = [extract_text_from_content(content) for content in contents]
+        count_texts = getattr(self._token_counter, "count_texts", None)
+        if count_texts is not None:
+            token_counts = count_texts(texts)
+        else:
+            token_counts = [self._token_counter.count_text(text) for text in texts]
+
+        for i, content in enumerate(contents):
+            content_dict = content.model_dump(mode="json")
+            content_type = content_dict.get("content_type", "unknown")
+            c_hash = compute_content_hash(content_dict)
+            token_count = token_counts[i]
+
+            # Strictly increasing timestamps keep log order stable
+            now = datetime.now(timezone.utc)
+            if prev_time is not None and now <= prev_time:
+                now = prev_time + timedelta(microseconds=1)
+            prev_time = now
+
+            if c_hash not in blobs:
+                blobs[c_hash] = self._build_blob_row(content_dict, token_count, now)
+
+            total_tokens += token_count
+            self._check_budget(total_tokens)
+
+            c_commit_hash = compute_commit_hash(
+                content_hash=c_hash,
+                parent_hash=parent_hash,
+                content_type=content_type,
+                operation=CommitOperation.APPEND.value,
+                timestamp_iso=now.isoformat(),
+            )
+            message = messages[i] if messages is not None else None
+            effective_tags = list(tags[i] or []) if tags is not None else []
+            generation += 1
+
+            commit_rows.append(CommitRow(
+                commit_hash=c_commit_hash,
+                tract_id=self._tract_id,
+                parent_hash=parent_hash,
+                content_hash=c_hash,
+                content_type=content_type,
+                operation=CommitOperation.APPEND,
+                edit_target=None,
+                message=message,
+                token_count=token_count,
+                chain_token_total=total_tokens,
+                generation=generation,
+                metadata_json=metadata,
+                generation_config_json=generation_config,
+                tags_json=effective_tags if effective_tags else None,
+                created_at=now,
+            ))
+
+            default_priority = DEFAULT_TYPE_PRIORITIES.get(content_type, Priority.NORMAL)
+            if default_priority != Priority.NORMAL:
+                annotation_rows.append(AnnotationRow(
+                    tract_id=self._tract_id,
+                    target_hash=c_commit_hash,
+                    priority=default_priority,
+                    reason=f"Default priority for {content_type}",
+                    created_at=now,
+                ))
+
+            infos.append(CommitInfo(
+                commit_hash=c_commit_hash,
+                tract_id=self._tract_id,
+                parent_hash=parent_hash,
+                content_hash=c_hash,
+                content_type=content_type,
+                operation=CommitOperation.APPEND,
+                edit_target=None,
+                message=message,
+                token_count=token_count,
+                metadata=metadata,
+                generation_config=generation_config,
+                tags=effective_tags,
+                created_at=now,
+            ))
+            parent_hash = c_commit_hash
+
+        self._blob_repo.save_many_if_absent(list(blobs.values()))
+        self._commit_repo.save_many(commit_rows)
+        self._annotation_repo.save_many(annotation_rows)
+        self._ref_repo.update_head(self._tract_id, infos[-1].commit_hash)
+        return infos
+
+    def _check_budget(self, total_tokens: int) -> None:
+        """Apply the configured token budget action to a chain total."""
+        if not self._token_budget or self._token_budget.max_tokens is None:
+            return
+        if total_tokens <= self._token_budget.max_tokens:
+            return
+        if self._token_budget.action == BudgetAction.REJECT:
+            raise BudgetExceededError(total_tokens, self._token_budget.max_tokens)
+        elif self._token_budget.action == BudgetAction.WARN:
+            logger.warning(
+                "Token budget exceeded: %d tokens (max: %d)",
+                total_tokens,
+                self._token_budget.max_tokens,
+            )
+        elif self._token_budget.action == BudgetAction.CALLBACK:
+            if self._token_budget.callback is not None:
+                self._token_budget.callback(total_tokens, self._token_budget.max_tokens)
+
     def create_merge_commit(
         self,
         content: BaseModel,
@@ -313,10 +463,19 @@ class CommitEngine:
             extra_parents=extra_parents,
         )
 
-        # 8. Normalize tags
+        # 8. Running chain total follows the first parent; the generation
+        #    is one past the highest of all parents
+        chain_token_total = token_count
+        if first_parent is not None:
+            chain_token_total += self._commit_repo.sum_ancestor_tokens(first_parent)
+        generation = 1 + max(
+            (self._commit_repo.get_generation(p) for p in parent_hashes), default=0,
+        )
+
+        # 9. Normalize tags
         effective_tags = list(tags) if tags else []
 
-        # 9. Create and save CommitRow
+        # 10. Create and save CommitRow
         commit_row = CommitRow(
             commit_hash=c_commit_hash,
             tract_id=self._tract_id,
@@ -327,6 +486,8 @@ class CommitEngine:
             edit_target=None,
             message=message,
             token_count=token_count,
+            chain_token_total=chain_token_total,
+            generation=generation,
             metadata_json=metadata,
             generation_config_json=generation_config,
             tags_json=effective_tags if effective_tags else None,
@@ -334,13 +495,13 @@ class CommitEngine:
         )
         self._commit_repo.save(commit_row)
 
-        # 10. Record all parents in commit_parents table
+        # 11. Record all parents in commit_parents table
         self._parent_repo.add_parents(c_commit_hash, parent_hashes)
 
-        # 11. Update HEAD
+        # 12. Update HEAD
         self._ref_repo.update_head(self._tract_id, c_commit_hash)
 
-        # 12. Return CommitInfo
+        # 13. Return CommitInfo
         return CommitInfo(
             commit_hash=c_commit_hash,
             tract_id=self._tract_id,
@@ -16,8 +16,10 @@ from tract.models.annotations import DEFAULT_TYPE_PRIORITIES, Priority
 from tract.models.config import LLMConfig
 from tract.models.content import BUILTIN_TYPE_HINTS
 from tract.protocols import CompiledContext, Message
+from tract.tracing import Tracer
 
 if TYPE_CHECKING:
+    from tract.operations.ancestry import AncestryGraph
     from tract.protocols import TokenCounter
     from tract.storage.repositories import (
         AnnotationRepository,
@@ -119,6 +121,7 @@ class DefaultContextCompiler:
         self._type_to_role_override = type_to_role_map or {}
         self._parent_repo = parent_repo
         self.tool_result_format: str = "minimal"
+        self.tracer: Tracer = Tracer()
 
     def compile(
         self,
@@ -181,20 +184,26 @@ class DefaultContextCompiler:
                 f"Invalid compile strategy {strategy!r}; must be one of {_valid_strategies}"
             )
 
+        tracer = self.tracer
+
         # Step 1: Walk commit chain (head -> root), then reverse to root -> head
-        commits = self._walk_chain(head_hash, at_time=at_time, at_commit=at_commit)
+        with tracer.span("compile.walk"):
+            commits = self._walk_chain(head_hash, at_time=at_time, at_commit=at_commit)
 
         if not commits:
             return CompiledContext(messages=[], token_count=0, commit_count=0, token_source="")
 
         # Step 2: Build edit resolution map
-        edit_map = self._build_edit_map(commits, at_time=at_time)
+        with tracer.span("compile.edit_map"):
+            edit_map = self._build_edit_map(commits, at_time=at_time)
 
         # Step 3: Build priority map
-        priority_map = self._build_priority_map(commits, at_time=at_time, include_reasoning=include_reasoning)
+        with tracer.span("compile.priority"):
+            priority_map = self._build_priority_map(commits, at_time=at_time, include_reasoning=include_reasoning)
 
         # Step 4: Build effective commit list
-        effective_commits, parsed_blob_cache = self._build_effective_commits(commits, edit_map, priority_map)
+        with tracer.span("compile.effective"):
+            effective_commits, parsed_blob_cache = self._build_effective_commits(commits, edit_map, priority_map)
 
         # Step 4b: Extract commit hashes for effective commits (parallel to messages)
         effective_commit_hashes = [c.commit_hash for c in effective_commits]
@@ -223,11 +232,12 @@ class DefaultContextCompiler:
             effective_strategy_k = max(1, int(len(effective_commits) * recent_ratio))
 
         # Step 5-6: Map to messages
-        messages = self._build_messages(
-            effective_commits, edit_map, include_edit_annotations,
-            strategy=strategy, strategy_k=effective_strategy_k,
-            parsed_blob_cache=parsed_blob_cache,
-        )
+        with tracer.span("compile.messages"):
+            messages = self._build_messages(
+                effective_commits, edit_map, include_edit_annotations,
+                strategy=strategy, strategy_k=effective_strategy_k,
+                parsed_blob_cache=parsed_blob_cache,
+            )
 
         # Step 7: Count tokens on compiled output
         messages_dicts = [
@@ -236,7 +246,8 @@ class DefaultContextCompiler:
             else {"role": m.role, "content": m.content, "name": m.name}
             for m in messages
         ]
-        token_count = self._token_counter.count_messages(messages_dicts)
+        with tracer.span("compile.tokenize", messages=len(messages_dicts)):
+            token_count = self._token_counter.count_messages(messages_dicts)
 
         encoding_name = getattr(self._token_counter, "encoding_name", "unknown")
         token_source = f"tiktoken:{encoding_name}" if encoding_name != "unknown" else ""
@@ -265,14 +276,19 @@ class DefaultContextCompiler:
         first-parent commits in order, then second-parent's unique commits
         before the merge point, in order.
         """
-        # First-parent walk (linear chain)
-        ancestors = self._commit_repo.get_ancestors(head_hash)
-        # ancestors is head-first (newest first), reverse to root-first
-        commits = list(reversed(ancestors))
+        # Load the whole ancestry in a fixed number of queries, then walk
+        # the first-parent chain (head-first) in memory.
+        from tract.operations.ancestry import load_ancestry
+
+        graph = load_ancestry(
+            self._commit_repo, head_hash, parent_repo=self._parent_repo,
+        )
+        # first_parent_chain is head-first (newest first), reverse to root-first
+        commits = list(reversed(graph.first_parent_chain(head_hash)))
 
         # If parent_repo is available, handle merge commits
         if self._parent_repo is not None:
-            commits = self._walk_with_merge_parents(commits)
+            commits = self._walk_with_merge_parents(commits, graph)
 
         # Apply at_commit filter: include only up to and including the specified hash
         if at_commit is not None:
@@ -293,6 +309,7 @@ class DefaultContextCompiler:
     def _walk_with_merge_parents(
         self,
         first_parent_commits: list[CommitRow],
+        graph: AncestryGraph,
     ) -> list[CommitRow]:
         """Expand a first-parent commit list to include merge parent branches.
 
@@ -300,22 +317,18 @@ class DefaultContextCompiler:
         the second parent's unique commits (not already in the list)
         are inserted before the merge commit in chronological order.
         """
-        # _walk_with_merge_parents is only called when _parent_repo is set
-        if self._parent_repo is None:
-            raise RuntimeError("_parent_repo must be set for merge-aware compilation")
-
         seen: set[str] = {c.commit_hash for c in first_parent_commits}
         result: list[CommitRow] = []
 
         for commit in first_parent_commits:
             # Check if this commit is a merge commit
-            parents = self._parent_repo.get_parents(commit.commit_hash)
+            parents = graph.parents(commit.commit_hash)
 
             if len(parents) >= 2:
                 # Walk the second parent's chain to find unique commits
                 second_parent_hash = parents[1]
                 second_branch_commits = self._collect_unique_ancestors(
-                    second_parent_hash, seen
+                    second_parent_hash, seen, graph
                 )
                 # Insert second branch's commits before the merge commit
                 for sc in second_branch_commits:
@@ -326,26 +339,18 @@ class DefaultContextCompiler:
 
         return result
 
+    @staticmethod
     def _collect_unique_ancestors(
-        self,
         start_hash: str,
         seen: set[str],
+        graph: AncestryGraph,
     ) -> list[CommitRow]:
         """Collect ancestors from start_hash that are not in 'seen'.
 
         Returns commits in chronological order (root to tip).
         Stops when hitting a commit already in 'seen'.
         """
-        unique: list[CommitRow] = []
-        current_hash: str | None = start_hash
-
-        while current_hash is not None and current_hash not in seen:
-            commit = self._commit_repo.get(current_hash)
-            if commit is None:
-                break
-            unique.append(commit)
-            current_hash = commit.parent_hash
-
+        unique = graph.first_parent_chain(start_hash, stop_at=seen)
         # Reverse to chronological order (root first)
         unique.reverse()
         return unique
@@ -626,24 +631,20 @@ class DefaultContextCompiler:
         else:
             full_start = 0
 
-        # Batch-fetch blobs needed for messages-only commits (role resolution),
-        # but skip any already present in parsed_blob_cache.
-        messages_only_hashes: list[str] = []
-        for i, c in enumerate(effective_commits):
-            is_messages_only = (
-                strategy == "messages"
-                or (strategy == "adaptive" and i < full_start)
+        # Batch-fetch every blob not already in parsed_blob_cache (full
+        # content and messages-only role resolution alike) in one query.
+        missing_hashes: list[str] = []
+        for c in effective_commits:
+            source_commit = edit_map.get(c.commit_hash, c)
+            if source_commit.content_hash not in parsed_blob_cache:
+                missing_hashes.append(source_commit.content_hash)
+
+        with self.tracer.span("compile.blob_fetch", blobs=len(missing_hashes)):
+            messages_blob_cache = (
+                self._blob_repo.batch_get(list(dict.fromkeys(missing_hashes)))
+                if missing_hashes
+                else {}
             )
-            if is_messages_only:
-                source_commit = edit_map.get(c.commit_hash, c)
-                if source_commit.content_hash not in parsed_blob_cache:
-                    messages_only_hashes.append(source_commit.content_hash)
-
-        messages_blob_cache = (
-            self._blob_repo.batch_get(messages_only_hashes)
-            if messages_only_hashes
-            else {}
-        )
 
         for i, c in enumerate(effective_commits):
             # Decide whether this commit gets messages-only treatment
@@ -672,9 +673,14 @@ class DefaultContextCompiler:
             else:
                 # Full content -- use parsed_blob_cache when available
                 source_commit = edit_map.get(c.commit_hash, c)
-                if source_commit.content_hash in parsed_blob_cache:
+                content_hash = source_commit.content_hash
+                if content_hash not in parsed_blob_cache:
+                    blob = messages_blob_cache.get(content_hash)
+                    if blob is not None:
+                        parsed_blob_cache[content_hash] = json.loads(blob.payload_json)
+                if content_hash in parsed_blob_cache:
                     msg = self._build_message_from_parsed(
-                        source_commit, parsed_blob_cache[source_commit.content_hash],
+                        source_commit, parsed_blob_cache[content_hash],
                     )
                 else:
                     msg = self.build_message_for_commit(source_commit)
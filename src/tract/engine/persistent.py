@@ -0,0 +1,223 @@
+"""Persistent (structure-sharing) vector for compile snapshots.
+
+A 32-way bit-partitioned trie with a detached tail, in the style of
+Clojure's ``PersistentVector``.  Every "mutation" returns a new vector that
+shares all untouched nodes with its source:
+
+- ``append`` copies at most the 32-slot tail plus one root-to-leaf path,
+  so it is amortised O(1) and a chain of N appends allocates O(N) in total.
+- ``set`` copies one root-to-leaf path: O(log32 n).
+- Indexing is O(log32 n); iteration is O(n) without intermediate copies.
+
+Nodes are plain tuples, so vectors are immutable and safe to share between
+threads and between parent/child cache entries.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any, Generic, TypeVar, overload
+
+T = TypeVar("T")
+
+_BITS = 5
+_WIDTH = 1 << _BITS
+_MASK = _WIDTH - 1
+
+
+def _tail_offset(count: int) -> int:
+    """Index of the first element held in the tail of a vector of *count*."""
+    if count < _WIDTH:
+        return 0
+    return ((count - 1) >> _BITS) << _BITS
+
+
+def _new_path(level: int, leaf: tuple) -> tuple:
+    """Wrap *leaf* in single-child nodes down from *level*."""
+    node = leaf
+    while level > 0:
+        node = (node,)
+        level -= _BITS
+    return node
+
+
+def _push_tail(last: int, level: int, parent: tuple, leaf: tuple) -> tuple:
+    """Return a copy of *parent* with *leaf* inserted; *last* is its final index."""
+    subidx = (last >> level) & _MASK
+    if level == _BITS:
+        child = leaf
+    elif subidx < len(parent):
+        child = _push_tail(last, level - _BITS, parent[subidx], leaf)
+    else:
+        child = _new_path(level - _BITS, leaf)
+    return parent[:subidx] + (child,) + parent[subidx + 1:]
+
+
+def _push_leaf(root: tuple, shift: int, size: int, leaf: tuple) -> tuple[tuple, int]:
+    """Insert a full *leaf* into the trie; *size* counts elements including it.
+
+    Returns the new ``(root, shift)``, growing the trie one level when the
+    current root is full.
+    """
+    if (size >> _BITS) > (1 << shift):
+        return (root, _new_path(shift, leaf)), shift + _BITS
+    return _push_tail(size - 1, shift, root, leaf), shift
+
+
+def _assoc(level: int, node: tuple, index: int, value: Any) -> tuple:
+    """Return a copy of the path to *index* under *node* with *value* set."""
+    subidx = (index >> level) & _MASK
+    if level == 0:
+        return node[:subidx] + (value,) + node[subidx + 1:]
+    child = _assoc(level - _BITS, node[subidx], index, value)
+    return node[:subidx] + (child,) + node[subidx + 1:]
+
+
+def _iter_leaves(node: tuple, level: int) -> Iterator[tuple]:
+    """Yield the leaves under *node* in index order."""
+    if level == 0:
+        yield node
+        return
+    for child in node:
+        yield from _iter_leaves(child, level - _BITS)
+
+
+class PersistentVector(Sequence[T], Generic[T]):
+    """Immutable sequence with O(1) append and O(log n) single-index update.
+
+    Behaves like a tuple for reading (``len``, indexing, slicing,
+    iteration, ``==`` against tuples and other vectors) and exposes
+    :meth:`append`, :meth:`set` and :meth:`delete`, which return new
+    vectors sharing structure with this one.
+    """
+
+    __slots__ = ("_count", "_root", "_shift", "_tail")
+
+    _count: int
+    _shift: int
+    _root: tuple
+    _tail: tuple
+
+    def __new__(cls, items: Iterable[T] = ()) -> PersistentVector[T]:
+        if isinstance(items, PersistentVector):
+            return items
+        values = items if isinstance(items, (list, tuple)) else list(items)
+        n = len(values)
+        tail_start = _tail_offset(n)
+        root: tuple = ()
+        shift = _BITS
+        for start in range(0, tail_start, _WIDTH):
+            root, shift = _push_leaf(
+                root, shift, start + _WIDTH, tuple(values[start:start + _WIDTH]),
+            )
+        return cls._make(n, shift, root, tuple(values[tail_start:]))
+
+    @classmethod
+    def _make(cls, count: int, shift: int, root: tuple, tail: tuple) -> PersistentVector[T]:
+        vec = object.__new__(cls)
+        vec._count = count
+        vec._shift = shift
+        vec._root = root
+        vec._tail = tail
+        return vec
+
+    # -- reading ----------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._count
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> tuple[T, ...]: ...
+
+    def __getitem__(self, index: int | slice) -> T | tuple[T, ...]:
+        if isinstance(index, slice):
+            return tuple(self)[index]
+        i = self._normalize(index)
+        return self._leaf_for(i)[i & _MASK]
+
+    def __iter__(self) -> Iterator[T]:
+        if self._count > len(self._tail):
+            for leaf in _iter_leaves(self._root, self._shift):
+                yield from leaf
+        yield from self._tail
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, PersistentVector):
+            if other is self:
+                return True
+            if other._count != self._count:
+                return False
+        elif isinstance(other, tuple):
+            if len(other) != self._count:
+                return False
+        else:
+            return NotImplemented
+        return all(a == b for a, b in zip(self, other))
+
+    def __hash__(self) -> int:
+        return hash(tuple(self))
+
+    def __repr__(self) -> str:
+        return f"PersistentVector({list(self)!r})"
+
+    def __add__(self, other: Iterable[T]) -> PersistentVector[T]:
+        return self.extend(other)
+
+    # -- structure-sharing updates ----------------------------------------
+
+    def append(self, value: T) -> PersistentVector[T]:
+        """Return a new vector with *value* added at the end."""
+        count = self._count
+        if count - _tail_offset(count) < _WIDTH:
+            return self._make(count + 1, self._shift, self._root, self._tail + (value,))
+        root, shift = _push_leaf(self._root, self._shift, count, self._tail)
+        return self._make(count + 1, shift, root, (value,))
+
+    def extend(self, values: Iterable[T]) -> PersistentVector[T]:
+        """Return a new vector with every item of *values* appended."""
+        vec = self
+        for value in values:
+            vec = vec.append(value)
+        return vec
+
+    def set(self, index: int, value: T) -> PersistentVector[T]:
+        """Return a new vector with the item at *index* replaced."""
+        i = self._normalize(index)
+        if i >= _tail_offset(self._count):
+            pos = i & _MASK
+            tail = self._tail[:pos] + (value,) + self._tail[pos + 1:]
+            return self._make(self._count, self._shift, self._root, tail)
+        root = _assoc(self._shift, self._root, i, value)
+        return self._make(self._count, self._shift, root, self._tail)
+
+    def delete(self, index: int) -> PersistentVector[T]:
+        """Return a new vector without the item at *index*.
+
+        Removal shifts every later element, so this rebuilds the vector
+        (O(n)); use it for rare structural edits only.
+        """
+        i = self._normalize(index)
+        values = list(self)
+        del values[i]
+        return type(self)(values)
+
+    # -- internals --------------------------------------------------------
+
+    def _normalize(self, index: int) -> int:
+        i = index + self._count if index < 0 else index
+        if not 0 <= i < self._count:
+            raise IndexError("PersistentVector index out of range")
+        return i
+
+    def _leaf_for(self, i: int) -> tuple[T, ...]:
+        if i >= _tail_offset(self._count):
+            return self._tail
+        node = self._root
+        level = self._shift
+        while level > 0:
+            node = node[(i >> level) & _MASK]
+            level -= _BITS
+        return node
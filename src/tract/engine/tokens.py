@@ -6,28 +6,82 @@ Both implement the TokenCounter protocol from protocols.py.
 
 from __future__ import annotations
 
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import tiktoken
+
+# Default capacity of the per-counter token-count memo.
+DEFAULT_MEMO_SIZE = 8192
+
+# Below this many uncached strings, encode_batch's thread pool costs more
+# than it saves.
+_BATCH_THRESHOLD = 4
+
 
 class TiktokenCounter:
     """Token counter using tiktoken (OpenAI's tokenizer).
 
-    Lazily imports tiktoken and caches the Encoding instance.
-    Falls back to o200k_base encoding if model is unknown.
+    Resolves the encoding name up front but defers loading the BPE ranks
+    (the expensive part of tiktoken) until the first count, so opening a
+    tract that never tokenizes stays cheap.  Falls back to o200k_base
+    encoding if model is unknown.
+
+    Counts are memoized in a bounded LRU keyed by a digest of the text, so
+    the commit engine, compiler and cache manager (which share one counter
+    per tract) never re-tokenize identical content.  Cache misses in
+    :meth:`count_texts` and :meth:`count_messages` are encoded together
+    with ``encode_batch``.
 
     Implements the TokenCounter protocol.
     """
 
-    def __init__(self, model: str = "gpt-4o", encoding_name: str | None = None) -> None:
+    def __init__(
+        self,
+        model: str = "gpt-4o",
+        encoding_name: str | None = None,
+        *,
+        memo_size: int = DEFAULT_MEMO_SIZE,
+        num_threads: int = 8,
+    ) -> None:
         import tiktoken
+        from tiktoken.model import encoding_name_for_model
 
-        if encoding_name is not None:
-            self._enc = tiktoken.get_encoding(encoding_name)
-        else:
+        if encoding_name is None:
             try:
-                self._enc = tiktoken.encoding_for_model(model)
+                encoding_name = encoding_name_for_model(model)
             except KeyError:
-                self._enc = tiktoken.get_encoding("o200k_base")
+                encoding_name = "o200k_base"
+        elif encoding_name not in tiktoken.list_encoding_names():
+            raise ValueError(f"Unknown encoding {encoding_name}")
 
-        self._encoding_name = self._enc.name
+        self._encoding_name = encoding_name
+        self._loaded_enc: tiktoken.Encoding | None = None
+        self._enc_lock = threading.Lock()
+        self._memo: OrderedDict[bytes, int] = OrderedDict()
+        self._memo_size = memo_size
+        self._memo_lock = threading.Lock()
+        self._num_threads = num_threads
+
+    @property
+    def _enc(self) -> tiktoken.Encoding:
+        """The tiktoken Encoding, loaded on first use."""
+        enc = self._loaded_enc
+        if enc is None:
+            with self._enc_lock:
+                enc = self._loaded_enc
+                if enc is None:
+                    import tiktoken
+
+                    enc = self._loaded_enc = tiktoken.get_encoding(self._encoding_name)
+        return enc
+
+    @_enc.setter
+    def _enc(self, enc: tiktoken.Encoding | None) -> None:
+        self._loaded_enc = enc
 
     @property
     def encoding_name(self) -> str:
@@ -45,7 +99,55 @@ class TiktokenCounter:
         """
         if not text:
             return 0
-        return len(self._enc.encode(text))
+        key = self._memo_key(text)
+        cached = self._memo_get(key)
+        if cached is not None:
+            return cached
+        count = len(self._enc.encode(text))
+        self._memo_put(key, count)
+        return count
+
+    def count_texts(self, texts: list[str]) -> list[int]:
+        """Count tokens for many strings at once.
+
+        Memoized strings are answered from the memo; the rest are encoded
+        in one ``encode_batch`` call across ``num_threads`` threads.
+
+        Args:
+            texts: The texts to tokenize.
+
+        Returns:
+            Token counts, one per input text, in input order.
+        """
+        counts = [0] * len(texts)
+        missing: dict[bytes, list[int]] = {}
+        missing_texts: list[str] = []
+        for i, text in enumerate(texts):
+            if not text:
+                continue
+            key = self._memo_key(text)
+            cached = self._memo_get(key)
+            if cached is not None:
+                counts[i] = cached
+            elif key in missing:
+                missing[key].append(i)
+            else:
+                missing[key] = [i]
+                missing_texts.append(text)
+
+        if missing_texts:
+            if len(missing_texts) < _BATCH_THRESHOLD:
+                encoded = [self._enc.encode(t) for t in missing_texts]
+            else:
+                encoded = self._enc.encode_batch(
+                    missing_texts, num_threads=self._num_threads
+                )
+            for (key, positions), tokens in zip(missing.items(), encoded):
+                count = len(tokens)
+                self._memo_put(key, count)
+                for i in positions:
+                    counts[i] = count
+        return counts
 
     def count_messages(self, messages: list[dict]) -> int:
         """Count tokens in a structured message list including overhead.
@@ -67,32 +169,76 @@ class TiktokenCounter:
         """
         if not messages:
             return 0
+        return sum(self.count_each_message(messages)) + 3  # response primer
+
+    def count_each_message(self, messages: list[dict]) -> list[int]:
+        """Count tokens per message, including per-message overhead.
+
+        The response primer is not included, so
+        ``count_messages(m) == sum(count_each_message(m)) + 3``.  All string
+        values across the list are tokenized with one :meth:`count_texts`
+        call.
 
-        total = 0
+        Args:
+            messages: List of message dicts, as for :meth:`count_messages`.
+
+        Returns:
+            One token count per message.
+        """
+        texts: list[str] = []
+        spans: list[tuple[int, int, int]] = []
         for message in messages:
-            total += 3  # per-message overhead
+            start = len(texts)
+            overhead = 3  # per-message overhead
             for key, value in message.items():
                 if isinstance(value, str):
-                    total += len(self._enc.encode(value))
+                    texts.append(value)
                 elif isinstance(value, (list, dict)):
-                    total += self._count_nested_tokens(value)
+                    self._collect_nested_strings(value, texts)
                 if key == "name":
-                    total += 1  # name field costs an extra token
-        total += 3  # response primer
-        return total
+                    overhead += 1  # name field costs an extra token
+            spans.append((start, len(texts), overhead))
+
+        counts = self.count_texts(texts)
+        return [overhead + sum(counts[start:end]) for start, end, overhead in spans]
 
-    def _count_nested_tokens(self, obj: object) -> int:
-        """Count tokens in nested structures (tool_calls lists, etc.)."""
-        total = 0
+    def _collect_nested_strings(self, obj: object, out: list[str]) -> None:
+        """Collect strings in nested structures (tool_calls lists, etc.)."""
         if isinstance(obj, str):
-            total += len(self._enc.encode(obj))
+            out.append(obj)
         elif isinstance(obj, dict):
             for value in obj.values():
-                total += self._count_nested_tokens(value)
+                self._collect_nested_strings(value, out)
         elif isinstance(obj, list):
             for item in obj:
-                total += self._count_nested_tokens(item)
-        return total
+                self._collect_nested_strings(item, out)
+
+    # ------------------------------------------------------------------
+    # Memo
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _memo_key(text: str) -> bytes:
+        """Digest used as the memo key, so the memo never holds full texts."""
+        return hashlib.blake2b(
+            text.encode("utf-8", "surrogatepass"), digest_size=16
+        ).digest()
+
+    def _memo_get(self, key: bytes) -> int | None:
+        with self._memo_lock:
+            count = self._memo.get(key)
+            if count is not None:
+                self._memo.move_to_end(key)
+            return count
+
+    def _memo_put(self, key: bytes, count: int) -> None:
+        if self._memo_size <= 0:
+            return
+        with self._memo_lock:
+            self._memo[key] = count
+            self._memo.move_to_end(key)
+            while len(self._memo) > self._memo_size:
+                self._memo.popitem(last=False)
 
 
 class NullTokenCounter:
@@ -107,6 +253,10 @@ class NullTokenCounter:
         """Always returns 0."""
         return 0
 
+    def count_texts(self, texts: list[str]) -> list[int]:
+        """Always returns 0 for every text."""
+        return [0] * len(texts)
+
     def count_messages(self, messages: list[dict]) -> int:
         """Always returns 0."""
         return 0
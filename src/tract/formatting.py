@@ -1233,6 +1233,8 @@ def pprint_gc_result(result: GCResult, *, file: IO[str] | None = None) -> None:
     body_parts.append(f"[bold]Tokens freed:[/bold]    [green]{result.tokens_freed}[/green]")
     body_parts.append(f"[bold]Source removed:[/bold]  {result.source_commits_removed}")
     body_parts.append(f"[bold]Duration:[/bold]        {result.duration_seconds:.2f}s")
+    if not result.complete:
+        body_parts.append("[yellow]Stopped at time limit; run gc again to continue[/yellow]")
 
     console.print(Panel(
         "\n".join(body_parts),
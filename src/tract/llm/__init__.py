@@ -3,33 +3,88 @@
 Provides OpenAI-compatible and Anthropic HTTP clients, pluggable
 LLM/resolver protocols, and a built-in conflict resolver for
 semantic merge operations.
+
+Names are resolved lazily, so ``httpx`` and the ``anthropic`` SDK are only
+imported when their client is first used.
 """
 
-from tract.llm.client import OpenAIClient
-from tract.llm.anthropic_client import (
-    AnthropicClient,
-    StreamEvent,
-    TextDelta,
-    ToolCallStart,
-    ToolCallDelta,
-    ThinkingDelta,
-    UsageEvent,
-    MessageDone,
-)
-from tract.llm.errors import (
-    LLMAuthError,
-    LLMClientError,
-    LLMConfigError,
-    LLMRateLimitError,
-    LLMResponseError,
-    LLMToolUseError,
-)
-from tract.llm.cache import CachingLLMClient
-from tract.llm.claude_code import ClaudeCodeClient, load_claude_code_credentials, create_claude_code_client
-from tract.llm.fallback import FallbackClient
-from tract.llm.protocols import LLMClient, Resolution, ResolverCallable
-from tract.llm.resolver import OpenAIResolver
-from tract.llm.testing import MockLLMClient, ReplayLLMClient, FunctionLLMClient
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+# Defining module -> public names it provides.
+_LAZY_MODULES: dict[str, tuple[str, ...]] = {
+    "tract.llm.client": ("OpenAIClient",),
+    "tract.llm.anthropic_client": (
+        "AnthropicClient", "StreamEvent", "TextDelta", "ToolCallStart", "ToolCallDelta",
+        "ThinkingDelta", "UsageEvent", "MessageDone",
+    ),
+    "tract.llm.errors": (
+        "LLMAuthError", "LLMClientError", "LLMConfigError", "LLMRateLimitError",
+        "LLMResponseError", "LLMToolUseError",
+    ),
+    "tract.llm.cache": ("CachingLLMClient",),
+    "tract.llm.claude_code": (
+        "ClaudeCodeClient", "load_claude_code_credentials", "create_claude_code_client",
+    ),
+    "tract.llm.fallback": ("FallbackClient",),
+    "tract.llm.protocols": ("LLMClient", "Resolution", "ResolverCallable"),
+    "tract.llm.resolver": ("OpenAIResolver",),
+    "tract.llm.testing": ("MockLLMClient", "ReplayLLMClient", "FunctionLLMClient"),
+}
+
+_LAZY_ATTRS: dict[str, str] = {
+    name: module for module, names in _LAZY_MODULES.items() for name in names
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        # Submodules stay reachable as attributes (``tract.llm.testing``)
+        try:
+            return importlib.import_module(f"{__name__}.{name}")
+        except ModuleNotFoundError as exc:
+            if exc.name != f"{__name__}.{name}":
+                raise
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
+
+
+# Eager imports for type checkers and IDEs only
+if TYPE_CHECKING:
+    from tract.llm.client import OpenAIClient
+    from tract.llm.anthropic_client import (
+        AnthropicClient,
+        StreamEvent,
+        TextDelta,
+        ToolCallStart,
+        ToolCallDelta,
+        ThinkingDelta,
+        UsageEvent,
+        MessageDone,
+    )
+    from tract.llm.errors import (
+        LLMAuthError,
+        LLMClientError,
+        LLMConfigError,
+        LLMRateLimitError,
+        LLMResponseError,
+        LLMToolUseError,
+    )
+    from tract.llm.cache import CachingLLMClient
+    from tract.llm.claude_code import ClaudeCodeClient, load_claude_code_credentials, create_claude_code_client
+    from tract.llm.fallback import FallbackClient
+    from tract.llm.protocols import LLMClient, Resolution, ResolverCallable
+    from tract.llm.resolver import OpenAIResolver
+    from tract.llm.testing import MockLLMClient, ReplayLLMClient, FunctionLLMClient
 
 __all__ = [
     "OpenAIClient",
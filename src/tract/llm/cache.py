@@ -4,8 +4,11 @@ Wraps any :class:`~tract.llm.protocols.LLMClient` and caches responses
 by hashing the request parameters (messages, model, temperature,
 max_tokens, and extra kwargs).  Cache hits bypass the network entirely.
 
-Storage is SQLite-backed for durability across sessions.  An in-memory
-mode (``":memory:"``) is available for testing.
+Storage is SQLite-backed for durability across sessions, fronted by a
+small in-memory LRU so repeated hits never touch the database.  Hit
+statistics are buffered and written in batches, and the store can be
+capped by entry count or total response bytes.  An in-memory mode
+(``":memory:"``) is available for testing.
 
 Example::
 
@@ -24,14 +27,18 @@ Example::
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import json
 import logging
 import os
 import sqlite3
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
 logger = logging.getLogger(__name__)
 
@@ -46,10 +53,31 @@ CREATE TABLE IF NOT EXISTS llm_cache (
     response    TEXT NOT NULL,
     model       TEXT,
     created_at  REAL NOT NULL,
-    hit_count   INTEGER DEFAULT 0
+    hit_count   INTEGER DEFAULT 0,
+    last_used   REAL,
+    size_bytes  INTEGER
 )
 """
 
+# Columns added after the first release, with their backfill expressions.
+_ADDED_COLUMNS = {
+    "last_used": ("REAL", "created_at"),
+    "size_bytes": ("INTEGER", "length(CAST(response AS BLOB))"),
+}
+
+# Eviction trims the store to this fraction of the cap so it runs rarely.
+_EVICT_LOW_WATER = 0.9
+
+
+def _decode(response_json: str) -> dict:
+    """Decode a stored response; each caller gets its own copy."""
+    response: dict = json.loads(response_json)
+    return response
+
+
+class _LeaderGone(Exception):
+    """Set on an in-flight call whose leader was interrupted; waiters retry."""
+
 
 def _make_cache_key(
     messages: list[dict[str, str]],
@@ -89,9 +117,22 @@ class CachingLLMClient:
       by default.  Set ``cache_all=True`` to cache non-zero temperature
       requests as well (useful for development/testing).
     * **TTL** — cached entries expire after ``ttl_seconds`` (default: 7 days).
-      Set to ``0`` to disable expiry.
-    * **Invalidation** — call :meth:`clear` to wipe the cache, or
-      :meth:`evict` to remove a specific entry.
+      Set to ``0`` to disable expiry.  Expired rows are overwritten by the
+      next response for the same request, or removed by :meth:`evict_expired`.
+    * **Memory tier** — the ``memory_entries`` most recently used responses
+      are kept in process, so repeated hits skip SQLite entirely.
+    * **Buffered stats** — hit counts and last-use times are written every
+      ``flush_every`` hits or ``flush_interval`` seconds (and on
+      :meth:`flush` / :meth:`close`), never on the hit itself.
+    * **Size cap** — with ``max_entries`` and/or ``max_bytes`` set, the
+      least recently used (``eviction="lru"``) or least hit
+      (``eviction="lfu"``) entries are evicted when a put exceeds the cap.
+    * **Single flight** — concurrent identical requests (threads or
+      coroutines, sync or async) share one provider call: the first caller
+      makes it and the others wait for its result (counted in ``coalesced``).
+      If the first caller is cancelled or interrupted, a waiter takes over.
+      The instance is safe to share across threads.
+    * **Invalidation** — call :meth:`clear` to wipe the cache.
     """
 
     def __init__(
@@ -101,10 +142,32 @@ class CachingLLMClient:
         cache_path: str | Path | None = None,
         cache_all: bool = True,
         ttl_seconds: float = 7 * 24 * 3600,  # 7 days
+        memory_entries: int = 256,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        eviction: Literal["lru", "lfu"] = "lru",
+        flush_every: int = 100,
+        flush_interval: float = 5.0,
     ) -> None:
+        if eviction not in ("lru", "lfu"):
+            raise ValueError(f"eviction must be 'lru' or 'lfu', got {eviction!r}")
         self._client = client
         self._cache_all = cache_all
         self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._eviction = eviction
+        self._flush_every = max(1, flush_every)
+        self._flush_interval = flush_interval
+
+        # Memory tier: cache_key -> (response JSON, created_at)
+        self._memory: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._memory_entries = memory_entries
+
+        # Buffered hit statistics: cache_key -> (hits, last_used)
+        self._pending: dict[str, tuple[int, float]] = {}
+        self._pending_hits = 0
+        self._last_flush = time.monotonic()
 
         # Resolve cache path
         if cache_path is None:
@@ -119,14 +182,25 @@ class CachingLLMClient:
             db_path.parent.mkdir(parents=True, exist_ok=True)
 
         self._db_path = db_path
-        self._conn = sqlite3.connect(str(db_path))
+        # One connection shared by all threads, serialized by _lock
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
         self._conn.execute("PRAGMA journal_mode=WAL")
         self._conn.execute(_CREATE_TABLE)
+        self._migrate()
         self._conn.commit()
 
+        # Approximate store totals, used to decide when to evict
+        self._entry_count, self._total_bytes = self._store_totals()
+
+        # In-flight provider calls by cache key; resolves to the response JSON
+        self._inflight: dict[str, Future[str]] = {}
+
         # Stats
         self.hits: int = 0
         self.misses: int = 0
+        self.evictions: int = 0
+        self.coalesced: int = 0
 
     # -- LLMClient protocol ---------------------------------------------------
 
@@ -142,34 +216,43 @@ class CachingLLMClient:
         """Send messages, returning a cached response if available."""
         # Decide whether this request is cacheable
         cacheable = self._cache_all or temperature in (None, 0, 0.0)
+        if not cacheable:
+            return self._client.chat(
+                messages, model=model, temperature=temperature, max_tokens=max_tokens, **kwargs,
+            )
 
-        if cacheable:
-            key = _make_cache_key(messages, model, temperature, max_tokens, kwargs)
-            cached = self._get(key)
+        key = _make_cache_key(messages, model, temperature, max_tokens, kwargs)
+        while True:
+            cached, flight, leader = self._claim(key)
             if cached is not None:
-                self.hits += 1
-                logger.debug("Cache HIT [%s…]", key[:12])
                 return cached
+            if leader:
+                break
+            try:
+                return _decode(flight.result())
+            except _LeaderGone:
+                continue
 
         # Cache miss — forward to the real client
-        response = self._client.chat(
-            messages,
-            model=model,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            **kwargs,
-        )
-
-        if cacheable:
-            self.misses += 1
-            logger.debug("Cache MISS [%s…], storing", key[:12])
-            self._put(key, response, model)
-
+        try:
+            response: dict = self._client.chat(
+                messages,
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **kwargs,
+            )
+        except BaseException as exc:
+            self._abandon(key, flight, exc)
+            raise
+        self._settle(key, flight, response, model)
         return response
 
     def close(self) -> None:
-        """Close the cache database and the wrapped client."""
-        self._conn.close()
+        """Flush buffered stats, then close the cache database and the wrapped client."""
+        with self._lock:
+            self.flush()
+            self._conn.close()
         self._client.close()
 
     def extract_content(self, response: dict) -> str:
@@ -193,43 +276,63 @@ class CachingLLMClient:
     ) -> dict:
         """Async chat with caching."""
         cacheable = self._cache_all or temperature in (None, 0, 0.0)
+        if not cacheable:
+            return await self._acall(messages, model, temperature, max_tokens, kwargs)
 
-        if cacheable:
-            key = _make_cache_key(messages, model, temperature, max_tokens, kwargs)
-            cached = self._get(key)
+        key = _make_cache_key(messages, model, temperature, max_tokens, kwargs)
+        # SQLite work runs in a thread so it never blocks the event loop
+        while True:
+            cached, flight, leader = await self._aclaim(key)
             if cached is not None:
-                self.hits += 1
                 return cached
+            if leader:
+                break
+            try:
+                # Shielded: cancelling a wrapped future cancels its source,
+                # which is shared with the leader and the other waiters.
+                return _decode(await asyncio.shield(asyncio.wrap_future(flight)))
+            except _LeaderGone:
+                continue
+
+        try:
+            response = await self._acall(messages, model, temperature, max_tokens, kwargs)
+        except BaseException as exc:
+            self._abandon(key, flight, exc)
+            raise
+        await asyncio.to_thread(self._settle, key, flight, response, model)
+        return response
 
-        # Forward to async client
+    async def _acall(
+        self,
+        messages: list[dict[str, str]],
+        model: str | None,
+        temperature: float | None,
+        max_tokens: int | None,
+        kwargs: dict[str, Any],
+    ) -> dict:
+        """Forward to the wrapped client's ``achat``, or run ``chat`` in a thread."""
         if hasattr(self._client, "achat"):
-            response = await self._client.achat(
+            return await self._client.achat(
                 messages,
                 model=model,
                 temperature=temperature,
                 max_tokens=max_tokens,
                 **kwargs,
             )
-        else:
-            import asyncio
-            response = await asyncio.to_thread(
-                self._client.chat,
-                messages,
-                model=model,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                **kwargs,
-            )
-
-        if cacheable:
-            self.misses += 1
-            self._put(key, response, model)
-
-        return response
+        return await asyncio.to_thread(
+            self._client.chat,
+            messages,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs,
+        )
 
     async def aclose(self) -> None:
         """Async close."""
-        self._conn.close()
+        with self._lock:
+            self.flush()
+            self._conn.close()
         if hasattr(self._client, "aclose"):
             await self._client.aclose()
         else:
@@ -239,10 +342,15 @@ class CachingLLMClient:
 
     def clear(self) -> int:
         """Delete all cached entries.  Returns the number of entries removed."""
-        cursor = self._conn.execute("SELECT COUNT(*) FROM llm_cache")
-        count = cursor.fetchone()[0]
-        self._conn.execute("DELETE FROM llm_cache")
-        self._conn.commit()
+        with self._lock:
+            cursor = self._conn.execute("SELECT COUNT(*) FROM llm_cache")
+            count = cursor.fetchone()[0]
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+            self._memory.clear()
+            self._pending.clear()
+            self._pending_hits = 0
+            self._entry_count, self._total_bytes = 0, 0
         logger.info("Cache cleared: %d entries removed", count)
         return count
 
@@ -251,20 +359,34 @@ class CachingLLMClient:
         if self._ttl <= 0:
             return 0
         cutoff = time.time() - self._ttl
-        cursor = self._conn.execute(
-            "DELETE FROM llm_cache WHERE created_at < ?", (cutoff,)
-        )
-        self._conn.commit()
-        removed = cursor.rowcount
+        with self._lock:
+            self._write_pending()
+            cursor = self._conn.execute(
+                "DELETE FROM llm_cache WHERE created_at < ?", (cutoff,)
+            )
+            self._conn.commit()
+            removed = cursor.rowcount
+            for key in [k for k, (_, created_at) in self._memory.items() if created_at < cutoff]:
+                del self._memory[key]
+            self._entry_count, self._total_bytes = self._store_totals()
         if removed:
             logger.info("Evicted %d expired cache entries", removed)
         return removed
 
+    def flush(self) -> None:
+        """Write buffered hit counts and last-use times to the database."""
+        with self._lock:
+            if self._pending:
+                self._write_pending()
+                self._conn.commit()
+            self._last_flush = time.monotonic()
+
     @property
     def size(self) -> int:
         """Number of entries currently in the cache."""
-        cursor = self._conn.execute("SELECT COUNT(*) FROM llm_cache")
-        return cursor.fetchone()[0]
+        with self._lock:
+            cursor = self._conn.execute("SELECT COUNT(*) FROM llm_cache")
+            return cursor.fetchone()[0]
 
     @property
     def stats(self) -> dict[str, int | float]:
@@ -272,7 +394,10 @@ class CachingLLMClient:
         return {
             "hits": self.hits,
             "misses": self.misses,
+            "evictions": self.evictions,
+            "coalesced": self.coalesced,
             "size": self.size,
+            "memory_size": len(self._memory),
             "hit_rate": round(
                 self.hits / max(self.hits + self.misses, 1) * 100, 1
             ),
@@ -280,40 +405,204 @@ class CachingLLMClient:
 
     # -- Internal --------------------------------------------------------------
 
-    def _get(self, key: str) -> dict | None:
-        """Fetch a cached response, respecting TTL."""
-        cursor = self._conn.execute(
-            "SELECT response, created_at FROM llm_cache WHERE cache_key = ?",
-            (key,),
-        )
-        row = cursor.fetchone()
-        if row is None:
-            return None
+    def _claim(self, key: str) -> tuple[dict | None, Future[str], bool]:
+        """Look up *key*, or join or start the in-flight call for it.
 
-        response_json, created_at = row
+        Returns ``(cached, flight, leader)``: a cached response, or the
+        in-flight future plus whether this caller must make the call and
+        settle it (leader) or just wait for it.
+        """
+        with self._lock:
+            cached = self._get(key)
+            if cached is not None:
+                self.hits += 1
+                logger.debug("Cache HIT [%s…]", key[:12])
+                return cached, Future(), False
+            flight = self._inflight.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                logger.debug("Cache WAIT [%s…], joining in-flight call", key[:12])
+                return None, flight, False
+            flight = self._inflight[key] = Future()
+            return None, flight, True
+
+    async def _aclaim(self, key: str) -> tuple[dict | None, Future[str], bool]:
+        """Run :meth:`_claim` in a thread, releasing the claim if cancelled."""
+        claim = asyncio.ensure_future(asyncio.to_thread(self._claim, key))
+        try:
+            return await asyncio.shield(claim)
+        except asyncio.CancelledError:
+            claim.add_done_callback(lambda done: self._release_claim(key, done))
+            raise
+
+    def _release_claim(self, key: str, claim: asyncio.Future) -> None:
+        """Abandon a leadership won by a caller that was cancelled meanwhile."""
+        if claim.cancelled() or claim.exception() is not None:
+            return
+        _, flight, leader = claim.result()
+        if leader:
+            self._abandon(key, flight, asyncio.CancelledError())
+
+    def _settle(self, key: str, flight: Future[str], response: dict, model: str | None) -> None:
+        """Store the leader's response and hand it to waiting callers."""
+        try:
+            with self._lock:
+                del self._inflight[key]
+                self.misses += 1
+                logger.debug("Cache MISS [%s…], storing", key[:12])
+                response_json = self._put(key, response, model)
+        except BaseException as exc:
+            flight.set_exception(exc)
+            raise
+        flight.set_result(response_json)
+
+    def _abandon(self, key: str, flight: Future[str], exc: BaseException) -> None:
+        """Release *key* after the leader's call failed.
+
+        Provider errors are passed to waiting callers.  If the leader itself
+        was cancelled or interrupted, waiters retry instead and one of them
+        takes over the call.
+        """
+        with self._lock:
+            self._inflight.pop(key, None)
+        flight.set_exception(exc if isinstance(exc, Exception) else _LeaderGone())
 
-        # Check TTL
-        if self._ttl > 0 and (time.time() - created_at) > self._ttl:
-            self._conn.execute(
-                "DELETE FROM llm_cache WHERE cache_key = ?", (key,)
-            )
-            self._conn.commit()
+    def _get(self, key: str) -> dict | None:
+        """Fetch a cached response, respecting TTL.  Never writes to disk."""
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+        else:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_cache WHERE cache_key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            entry = (row[0], row[1])
+
+        response_json, created_at = entry
+        now = time.time()
+        if self._ttl > 0 and (now - created_at) > self._ttl:
+            # Left in place; the miss that follows overwrites the row.
+            self._memory.pop(key, None)
             return None
 
-        # Bump hit count
+        self._remember(key, entry)
+        self._record_hit(key, now)
+        return _decode(response_json)
+
+    def _put(self, key: str, response: dict, model: str | None) -> str:
+        """Store a response in the cache.  Returns its JSON serialization."""
+        response_json = json.dumps(response, ensure_ascii=False)
+        size = len(response_json.encode())
+        now = time.time()
+        self._write_pending()
         self._conn.execute(
-            "UPDATE llm_cache SET hit_count = hit_count + 1 WHERE cache_key = ?",
-            (key,),
+            "INSERT OR REPLACE INTO llm_cache "
+            "(cache_key, response, model, created_at, hit_count, last_used, size_bytes) "
+            "VALUES (?, ?, ?, ?, 0, ?, ?)",
+            (key, response_json, model, now, now, size),
         )
+        self._entry_count += 1
+        self._total_bytes += size
+        if self._over_limit():
+            self._evict_to_limit(keep=key)
         self._conn.commit()
+        self._last_flush = time.monotonic()
+        self._remember(key, (response_json, now))
+        return response_json
+
+    def _remember(self, key: str, entry: tuple[str, float]) -> None:
+        """Put *entry* at the MRU end of the memory tier."""
+        if self._memory_entries <= 0:
+            return
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._memory_entries:
+            self._memory.popitem(last=False)
+
+    def _record_hit(self, key: str, now: float) -> None:
+        """Buffer a hit, flushing when the batch size or interval is reached."""
+        hits, _ = self._pending.get(key, (0, now))
+        self._pending[key] = (hits + 1, now)
+        self._pending_hits += 1
+        if (
+            self._pending_hits >= self._flush_every
+            or time.monotonic() - self._last_flush >= self._flush_interval
+        ):
+            self.flush()
+
+    def _write_pending(self) -> None:
+        """Apply buffered hit stats in the current transaction (no commit)."""
+        if not self._pending:
+            return
+        self._conn.executemany(
+            "UPDATE llm_cache SET hit_count = hit_count + ?, "
+            "last_used = MAX(COALESCE(last_used, 0), ?) WHERE cache_key = ?",
+            [(hits, last_used, key) for key, (hits, last_used) in self._pending.items()],
+        )
+        self._pending.clear()
+        self._pending_hits = 0
+
+    def _over_limit(self) -> bool:
+        return (
+            self._max_entries is not None and self._entry_count > self._max_entries
+        ) or (
+            self._max_bytes is not None and self._total_bytes > self._max_bytes
+        )
 
-        return json.loads(response_json)
-
-    def _put(self, key: str, response: dict, model: str | None) -> None:
-        """Store a response in the cache."""
-        self._conn.execute(
-            "INSERT OR REPLACE INTO llm_cache (cache_key, response, model, created_at, hit_count) "
-            "VALUES (?, ?, ?, ?, 0)",
-            (key, json.dumps(response, ensure_ascii=False), model, time.time()),
+    def _evict_to_limit(self, keep: str) -> None:
+        """Evict LRU/LFU entries down to the low-water mark of each cap.
+
+        *keep* is the entry just stored; it is never a victim, since under
+        LFU its zero hit count would otherwise rank it first.
+        """
+        # The running totals are approximate (replaced rows count twice)
+        self._entry_count, self._total_bytes = self._store_totals()
+        if not self._over_limit():
+            return
+        target_entries = (
+            int(self._max_entries * _EVICT_LOW_WATER) if self._max_entries is not None else None
         )
-        self._conn.commit()
+        target_bytes = (
+            int(self._max_bytes * _EVICT_LOW_WATER) if self._max_bytes is not None else None
+        )
+        order = "hit_count, last_used" if self._eviction == "lfu" else "last_used"
+        rows = self._conn.execute(
+            f"SELECT cache_key, size_bytes FROM llm_cache WHERE cache_key != ? ORDER BY {order}",
+            (keep,),
+        )
+        count, total = self._entry_count, self._total_bytes
+        victims: list[str] = []
+        for key, size in rows:
+            if (target_entries is None or count <= target_entries) and (
+                target_bytes is None or total <= target_bytes
+            ):
+                break
+            victims.append(key)
+            count -= 1
+            total -= size or 0
+        self._conn.executemany(
+            "DELETE FROM llm_cache WHERE cache_key = ?", [(key,) for key in victims]
+        )
+        for key in victims:
+            self._memory.pop(key, None)
+        self._entry_count, self._total_bytes = count, total
+        self.evictions += len(victims)
+        logger.debug("Evicted %d cache entries (%s)", len(victims), self._eviction)
+
+    def _store_totals(self) -> tuple[int, int]:
+        """Exact (entry count, total response bytes) of the store."""
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM llm_cache"
+        ).fetchone()
+        return count, total
+
+    def _migrate(self) -> None:
+        """Add columns missing from caches created by older versions."""
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(llm_cache)")}
+        for column, (sql_type, backfill) in _ADDED_COLUMNS.items():
+            if column not in existing:
+                self._conn.execute(f"ALTER TABLE llm_cache ADD COLUMN {column} {sql_type}")
+                self._conn.execute(f"UPDATE llm_cache SET {column} = {backfill}")
@@ -134,6 +134,16 @@ class LoopConfig:
     True (default): enabled with default config.
     False/None: disabled (raw output sent to LLM).
     PresentationConfig instance: enabled with custom config."""
+    parallel_tools: bool = False
+    """When True and the LLM issues several custom-handler tool calls in one
+    turn, the handlers run concurrently (thread pool for ``run_loop``,
+    asyncio tasks for ``arun_loop``).  Validation and ``pre_tool_execute``
+    middleware run for every call before any handler starts; results,
+    ``on_tool_result`` and ``post_tool_execute`` follow in call order.
+    Built-in tract tools always run sequentially on the loop's thread."""
+    max_tool_concurrency: int = 8
+    """Maximum number of handlers running at once when ``parallel_tools``
+    is enabled."""
 
 
 def run_loop(
@@ -186,6 +196,10 @@ def run_loop(
     from tract.tract import _retry_with_backoff
 
     cfg = config or LoopConfig()
+    if cfg.max_tool_concurrency < 1:
+        raise ValueError(
+            f"max_tool_concurrency must be >= 1, got {cfg.max_tool_concurrency}"
+        )
     client = llm_client or tract.llm_client
     if client is None:
         raise ValueError(
@@ -445,7 +459,17 @@ def run_loop(
             continue
 
         # 4. Execute tool calls
-        for tc in tool_call_list:
+        sequential_calls = tool_call_list
+        if tool_handlers is not None and _should_parallelize(
+            cfg, tool_call_list, tool_handlers,
+        ):
+            total_tool_calls += len(tool_call_list)
+            _run_tools_parallel(
+                tract, cfg, tool_call_list, tool_handlers,
+                executor, presenter, on_tool_result,
+            )
+            sequential_calls = []
+        for tc in sequential_calls:
             total_tool_calls += 1
             tc_name = tc["name"]
             tc_id = tc.get("id", "")
@@ -974,6 +998,212 @@ def _append_ephemeral_tool_result(
     })
 
 
+# ---------------------------------------------------------------------------
+# Parallel tool execution
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _PlannedToolCall:
+    """A tool call after validation and ``pre_tool_execute`` middleware."""
+
+    name: str
+    arguments: dict[str, Any]
+    metadata: dict[str, Any]
+    rejected: str | None = None  # error output when the call must not run
+
+
+def _should_parallelize(
+    cfg: LoopConfig,
+    tool_call_list: list[dict],
+    tool_handlers: dict[str, Callable[..., Any]] | None,
+) -> bool:
+    """Return True when at least two custom handlers could run concurrently."""
+    if not cfg.parallel_tools or not tool_handlers:
+        return False
+    return sum(1 for tc in tool_call_list if tc["name"] in tool_handlers) > 1
+
+
+def _plan_tool_calls(
+    tract: Tract, cfg: LoopConfig, tool_call_list: list[dict],
+) -> list[_PlannedToolCall]:
+    """Validate each call and run ``pre_tool_execute`` middleware, in order."""
+    plans: list[_PlannedToolCall] = []
+    for tc in tool_call_list:
+        plan = _PlannedToolCall(
+            name=tc["name"],
+            arguments=tc.get("arguments", {}),
+            metadata={"tool_call_id": tc.get("id", ""), "name": tc["name"]},
+        )
+        plans.append(plan)
+        if cfg.tool_validator is not None:
+            valid, err_msg = cfg.tool_validator(plan.name, plan.arguments)
+            if not valid:
+                plan.rejected = f"Tool validation failed: {err_msg or 'invalid arguments'}"
+                continue
+        try:
+            tract.middleware._run(
+                "pre_tool_execute",
+                pending={"tool_name": plan.name, "arguments": plan.arguments},
+            )
+        except BlockedError:
+            plan.rejected = "Tool execution blocked by middleware"
+    return plans
+
+
+def _invoke_handler(
+    handler: Callable[..., Any], arguments: dict[str, Any],
+) -> tuple[Any, Exception | None]:
+    """Call a sync handler, capturing its exception instead of raising."""
+    try:
+        return handler(**arguments), None
+    except Exception as exc:  # noqa: BLE001
+        return None, exc
+
+
+def _finish_tool_call(
+    tract: Tract,
+    plan: _PlannedToolCall,
+    output: str,
+    success: bool,
+    on_tool_result: Callable[[str, str, str], None] | None,
+) -> None:
+    """Commit a tool result, fire the callback, then ``post_tool_execute``."""
+    status: Literal["success", "error"] = "success" if success else "error"
+    _commit_tool_result(tract, plan.name, output, status, plan.metadata)
+    if on_tool_result:
+        on_tool_result(plan.name, output, status)
+    tract.middleware._run(
+        "post_tool_execute",
+        pending={"tool_name": plan.name, "result": output, "success": success},
+    )
+
+
+def _reject_tool_call(
+    tract: Tract,
+    plan: _PlannedToolCall,
+    on_tool_result: Callable[[str, str, str], None] | None,
+) -> None:
+    """Commit the error for a call that failed validation or was blocked."""
+    _commit_tool_result(tract, plan.name, plan.rejected or "", "error", plan.metadata)
+    if on_tool_result:
+        on_tool_result(plan.name, plan.rejected or "", "error")
+
+
+def _finish_handler_call(
+    tract: Tract,
+    plan: _PlannedToolCall,
+    outcome: tuple[Any, Exception | None],
+    on_tool_result: Callable[[str, str, str], None] | None,
+) -> None:
+    """Commit a custom handler's captured return value or exception."""
+    output, exc = outcome
+    if exc is None:
+        _finish_tool_call(tract, plan, str(output), True, on_tool_result)
+    else:
+        _finish_tool_call(tract, plan, f"{type(exc).__name__}: {exc}", False, on_tool_result)
+
+
+def _run_tools_parallel(
+    tract: Tract,
+    cfg: LoopConfig,
+    tool_call_list: list[dict],
+    tool_handlers: dict[str, Callable[..., Any]],
+    executor: Any,
+    presenter: Any,
+    on_tool_result: Callable[[str, str, str], None] | None,
+) -> None:
+    """Execute one turn's tool calls with custom handlers on a thread pool.
+
+    Handlers run concurrently (bounded by ``cfg.max_tool_concurrency``);
+    built-in tools touch the tract's session and so run sequentially here.
+    Every result is committed in the original call order.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    plans = _plan_tool_calls(tract, cfg, tool_call_list)
+    jobs = [
+        i for i, p in enumerate(plans)
+        if p.rejected is None and p.name in tool_handlers
+    ]
+    outcomes: dict[int, tuple[Any, Exception | None]] = {}
+    if jobs:
+        workers = min(cfg.max_tool_concurrency, len(jobs))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tract-tool") as pool:
+            futures = {
+                i: pool.submit(_invoke_handler, tool_handlers[plans[i].name], plans[i].arguments)
+                for i in jobs
+            }
+            outcomes = {i: f.result() for i, f in futures.items()}
+
+    for i, plan in enumerate(plans):
+        if plan.rejected is not None:
+            _reject_tool_call(tract, plan, on_tool_result)
+            continue
+        if i in outcomes:
+            _finish_handler_call(tract, plan, outcomes[i], on_tool_result)
+            continue
+        result = executor.execute(plan.name, plan.arguments)
+        output_text = result.output if result.success else result.error
+        if presenter:
+            output_text = presenter.present_result(result)
+        _finish_tool_call(tract, plan, output_text, result.success, on_tool_result)
+
+
+async def _arun_tools_parallel(
+    tract: Tract,
+    cfg: LoopConfig,
+    tool_call_list: list[dict],
+    tool_handlers: dict[str, Callable[..., Any]],
+    executor: Any,
+    presenter: Any,
+    on_tool_result: Callable[[str, str, str], None] | None,
+) -> None:
+    """Async version of :func:`_run_tools_parallel`.
+
+    Coroutine handlers are awaited as tasks; sync handlers go through
+    ``asyncio.to_thread``.  A semaphore bounds how many run at once.
+    """
+    import asyncio
+    import inspect
+
+    semaphore = asyncio.Semaphore(cfg.max_tool_concurrency)
+
+    async def _invoke(
+        handler: Callable[..., Any], arguments: dict[str, Any],
+    ) -> tuple[Any, Exception | None]:
+        async with semaphore:
+            try:
+                if inspect.iscoroutinefunction(handler):
+                    return await handler(**arguments), None
+                return await asyncio.to_thread(handler, **arguments), None
+            except Exception as exc:  # noqa: BLE001
+                return None, exc
+
+    plans = _plan_tool_calls(tract, cfg, tool_call_list)
+    jobs = [
+        i for i, p in enumerate(plans)
+        if p.rejected is None and p.name in tool_handlers
+    ]
+    results = await asyncio.gather(*(
+        _invoke(tool_handlers[plans[i].name], plans[i].arguments) for i in jobs
+    ))
+    outcomes = dict(zip(jobs, results))
+
+    for i, plan in enumerate(plans):
+        if plan.rejected is not None:
+            _reject_tool_call(tract, plan, on_tool_result)
+            continue
+        if i in outcomes:
+            _finish_handler_call(tract, plan, outcomes[i], on_tool_result)
+            continue
+        result = await asyncio.to_thread(executor.execute, plan.name, plan.arguments)
+        output_text = result.output if result.success else result.error
+        if presenter:
+            output_text = presenter.present_result(result)
+        _finish_tool_call(tract, plan, output_text, result.success, on_tool_result)
+
+
 # ---------------------------------------------------------------------------
 # Async loop
 # ---------------------------------------------------------------------------
@@ -1011,6 +1241,10 @@ async def arun_loop(
     from tract.tract import _aretry_with_backoff
 
     cfg = config or LoopConfig()
+    if cfg.max_tool_concurrency < 1:
+        raise ValueError(
+            f"max_tool_concurrency must be >= 1, got {cfg.max_tool_concurrency}"
+        )
     client = llm_client or tract.llm_client
     if client is None:
         raise ValueError(
@@ -1261,7 +1495,17 @@ async def arun_loop(
             continue
 
         # 4. Execute tool calls
-        for tc in tool_call_list:
+        sequential_calls = tool_call_list
+        if tool_handlers is not None and _should_parallelize(
+            cfg, tool_call_list, tool_handlers,
+        ):
+            total_tool_calls += len(tool_call_list)
+            await _arun_tools_parallel(
+                tract, cfg, tool_call_list, tool_handlers,
+                executor, presenter, on_tool_result,
+            )
+            sequential_calls = []
+        for tc in sequential_calls:
             total_tool_calls += 1
             tc_name = tc["name"]
             tc_id = tc.get("id", "")
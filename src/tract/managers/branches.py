@@ -14,7 +14,6 @@ if TYPE_CHECKING:
 
     from tract.engine.cache import CacheManager
     from tract.models.branch import BranchInfo
-    from tract.operations.config_index import ConfigIndex
     from tract.storage.repositories import (
         CommitParentRepository as ParentRepository,
         CommitRepository,
@@ -34,7 +33,7 @@ class BranchManager:
         cache: CacheManager,
         check_open: Callable[[], None],
         commit_session: Callable[[], None],
-        get_config_index: Callable[[], ConfigIndex | None],
+        invalidate_config: Callable[[], None],
     ) -> None:
         self._tract_id = tract_id
         self._ref_repo = ref_repo
@@ -43,7 +42,7 @@ class BranchManager:
         self._cache = cache
         self._check_open = check_open
         self._commit_session = commit_session
-        self._get_config_index = get_config_index
+        self._invalidate_config = invalidate_config
 
     def create(
         self,
@@ -111,9 +110,7 @@ class BranchManager:
             target, self._tract_id, self._commit_repo, self._ref_repo
         )
         self._commit_session()
-        config_index = self._get_config_index()
-        if config_index is not None:
-            config_index.invalidate()
+        self._invalidate_config()
         return commit_hash
 
     def checkout(self, target: str) -> str:
@@ -142,9 +139,7 @@ class BranchManager:
             target, self._tract_id, self._commit_repo, self._ref_repo
         )
         self._commit_session()
-        config_index = self._get_config_index()
-        if config_index is not None:
-            config_index.invalidate()
+        self._invalidate_config()
         return commit_hash
 
     def reset(
@@ -273,6 +273,7 @@ class CompressionManager:
         _commit_compression_fn: Callable,
         _partition_around_pinned_fn: Callable,
         _reconstruct_content_fn: Callable,
+        max_concurrency: int = 1,
     ) -> CompressResult:
         """Internal helper for sliding-window compression strategy.
 
@@ -305,6 +306,7 @@ class CompressionManager:
             system_prompt=system_prompt,
             type_registry=self._get_custom_type_registry(),
             two_stage=two_stage or False,
+            max_concurrency=max_concurrency,
         )
 
         if range_result is None:
@@ -595,6 +597,7 @@ class CompressionManager:
         triggered_by: str | None = None,
         strategy: str = "default",
         window_size: int = 5,
+        max_concurrency: int = 1,
     ) -> CompressResult:
         """Compress commit chains into summaries.
 
@@ -643,6 +646,10 @@ class CompressionManager:
                 older (PINNED commits always survive).
             window_size: For ``strategy="sliding_window"``: number of most-recent
                 commits to keep in full detail. Defaults to 5.
+            max_concurrency: Maximum number of independent groups (the runs
+                between PINNED commits) summarized at once in LLM mode.
+                Defaults to 1 (sequential).  Higher values run the LLM calls
+                on a thread pool, so the client must be thread-safe.
 
         Returns:
             :class:`CompressResult`.
@@ -684,6 +691,7 @@ class CompressionManager:
                 _commit_compression_fn=_commit_compression,
                 _partition_around_pinned_fn=_partition_around_pinned,
                 _reconstruct_content_fn=_reconstruct_content,
+                max_concurrency=max_concurrency,
             )
 
         # --- Default strategy (partition-around-pinned) ---
@@ -710,6 +718,7 @@ class CompressionManager:
             system_prompt=effective_system_prompt,
             type_registry=self._get_custom_type_registry(),
             two_stage=two_stage or False,
+            max_concurrency=max_concurrency,
         )
 
         return self._compress_finalize(
@@ -797,12 +806,21 @@ class CompressionManager:
         orphan_retention_days: int = 7,
         archive_retention_days: int | None = None,
         branch: str | None = None,
+        batch_size: int | None = None,
+        max_seconds: float | None = None,
     ) -> GCResult:
         """Garbage-collect unreachable commits.
 
         Removes commits not reachable from any branch tip, subject to
         configurable retention periods.
 
+        By default everything eligible is removed in one transaction.  With
+        ``batch_size`` the oldest eligible commits are removed in batches,
+        each committed on its own so the write lock is released in between;
+        ``max_seconds`` stops starting new batches once the time is spent,
+        and a later run continues where this one stopped.  Eligibility is
+        decided once, when the run starts.
+
         Args:
             orphan_retention_days: Days before orphaned commits become
                 eligible for removal. Default 7.
@@ -811,49 +829,90 @@ class CompressionManager:
                 means archives are never removed.
             branch: If set, only check this branch for reachability.
                 WARNING: commits reachable from other branches may be removed.
+            batch_size: Commits removed per transaction. None (default)
+                removes everything in a single transaction.
+            max_seconds: Time budget for a batched run.  Requires
+                ``batch_size``.
 
         Returns:
-            :class:`GCResult`.
+            :class:`GCResult`; ``complete`` is False if the time budget ran
+            out with eligible commits left.  ``duration_seconds`` covers the
+            whole run, planning as well as removal.
 
         Raises:
             CompressionError: If compression repository is not available.
+            ValueError: If ``batch_size`` < 1, or ``max_seconds`` is given
+                without ``batch_size``.
         """
         self._check_open()
+        import time
+
         from tract.exceptions import CompressionError
+        from tract.models.compression import GCResult
         from tract.operations.compression import execute_gc, plan_gc
 
-        if self._event_repo is None:
+        if batch_size is not None and batch_size < 1:
+            raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+        if max_seconds is not None and batch_size is None:
+            raise ValueError("max_seconds requires batch_size")
+
+        event_repo = self._event_repo
+        if event_repo is None:
             raise CompressionError("Compression repository not available")
 
-        if self._parent_repo is None:
+        parent_repo = self._parent_repo
+        if parent_repo is None:
             raise CompressionError("Parent repository not available")
 
         # Pre-GC middleware (can block)
         self._run_middleware("pre_gc")
 
-        # Plan phase: determine which commits to remove
-        commits_to_remove, tokens_to_free = plan_gc(
+        start = time.monotonic()
+        # Plan phase: reachability is computed once per run.  Removing
+        # unreachable commits cannot make others unreachable, so batches
+        # are slices of this plan.
+        commits_to_remove, _ = plan_gc(
             tract_id=self._tract_id,
             commit_repo=self._commit_repo,
             ref_repo=self._ref_repo,
-            parent_repo=self._parent_repo,
-            event_repo=self._event_repo,
+            parent_repo=parent_repo,
+            event_repo=event_repo,
             orphan_retention_days=orphan_retention_days,
             archive_retention_days=archive_retention_days,
             branch=branch,
         )
-
-        # Execute phase: remove commits
-        result = execute_gc(
-            tract_id=self._tract_id,
-            commits_to_remove=commits_to_remove,
-            commit_repo=self._commit_repo,
-            blob_repo=self._blob_repo,
-            event_repo=self._event_repo,
+        step = batch_size or max(len(commits_to_remove), 1)
+        batches: list[GCResult] = []
+        complete = True
+        offset = 0
+        while True:
+            # Execute phase: remove commits
+            batch = commits_to_remove[offset:offset + step]
+            offset += len(batch)
+            batches.append(execute_gc(
+                tract_id=self._tract_id,
+                commits_to_remove=batch,
+                commit_repo=self._commit_repo,
+                blob_repo=self._blob_repo,
+                event_repo=event_repo,
+            ))
+            self._cache.clear()
+            self._commit_session()
+
+            if offset >= len(commits_to_remove):
+                break
+            if max_seconds is not None and time.monotonic() - start >= max_seconds:
+                complete = False
+                break
+
+        return GCResult(
+            commits_removed=sum(b.commits_removed for b in batches),
+            blobs_removed=sum(b.blobs_removed for b in batches),
+            tokens_freed=sum(b.tokens_freed for b in batches),
+            source_commits_removed=sum(b.source_commits_removed for b in batches),
+            duration_seconds=time.monotonic() - start,
+            complete=complete,
         )
-        self._cache.clear()
-        self._commit_session()
-        return result
 
     def record_usage(
         self,
@@ -920,6 +979,9 @@ class CompressionManager:
             self._cache.put(target_hash, updated)
             # Persist override so it survives cache eviction
             self._cache.store_api_override(target_hash, context_tokens, token_source)
+            # Keep the persistent snapshot tier calibrated too
+            if self._cache.persist(target_hash):
+                self._commit_session()
             # Persist as compile record for cross-session durability
             if self._compile_record_repo is not None:
                 self._save_compile_record_fn(target_hash, context_tokens, updated.commit_count, token_source, updated.commit_hashes)
@@ -961,10 +1023,13 @@ class CompressionManager:
         triggered_by: str | None = None,
         strategy: str = "default",
         window_size: int = 5,
+        max_concurrency: int = 1,
     ) -> CompressResult:
         """Async version of :meth:`compress`.
 
         The LLM summarization is awaited; commit finalization is sync.
+        With ``max_concurrency > 1`` groups are summarized concurrently
+        (``asyncio.gather`` behind a semaphore).
         """
         from tract.operations.compression import (
             _classify_by_priority,
@@ -1000,6 +1065,7 @@ class CompressionManager:
                 _commit_compression_fn=_commit_compression,
                 _partition_around_pinned_fn=_partition_around_pinned,
                 _reconstruct_content_fn=_reconstruct_content,
+                max_concurrency=max_concurrency,
             )
 
         # Async LLM summarization
@@ -1026,6 +1092,7 @@ class CompressionManager:
             system_prompt=effective_system_prompt,
             type_registry=self._get_custom_type_registry(),
             two_stage=two_stage or False,
+            max_concurrency=max_concurrency,
         )
 
         return self._compress_finalize(
@@ -4,11 +4,13 @@ from __future__ import annotations
 
 import json
 import logging
+from collections import OrderedDict
 from dataclasses import fields as dc_fields, replace
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 
 from tract.models.config import LLMConfig, OperationClients, OperationConfigs, OperationPrompts
+from tract.tracing import Tracer, trace_llm_client
 
 if TYPE_CHECKING:
     from typing import Any, Callable
@@ -18,6 +20,7 @@ if TYPE_CHECKING:
     from tract.models.commit import CommitInfo
     from tract.models.config import TractConfig, ToolSummarizationConfig
     from tract.operations.config_index import ConfigIndex
+    from tract.storage.repositories import CompileSnapshotRepository
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +34,9 @@ _VALID_PROMPT_NAMES: frozenset[str] = frozenset({
     "split", "rebase", "branch", "route", "tool_compact", "peek",
 })
 
+# Per-commit config indexes kept in memory (see ConfigManager.config_index).
+_INDEX_CACHE_SIZE = 64
+
 
 class ConfigManager:
     """Configuration: configure, get_config, configure_llm, configure_operations, etc."""
@@ -66,6 +72,8 @@ class ConfigManager:
         commit_session: Callable | None = None,  # Callable
         commit_fn: Callable | None = None,  # Callable - Tract.commit
         get_head: Callable | None = None,  # Callable -> str|None
+        snapshot_repo: CompileSnapshotRepository | None = None,
+        tracer: Tracer | None = None,
     ) -> None:
         self._tract_id = tract_id
         self._commit_engine = commit_engine
@@ -82,8 +90,17 @@ class ConfigManager:
         self._commit_fn = commit_fn  # type: ignore[assignment]
         self._get_head = get_head or (lambda: self._ref_repo.get_head(self._tract_id))
 
-        # Lazy, stale-aware config index cache
+        self._snapshot_repo = snapshot_repo
+        self._tracer = tracer if tracer is not None else Tracer()
+
+        # Config index for the current HEAD, plus an LRU of indexes by
+        # commit hash.  An index only depends on its commit's ancestry, so
+        # cached entries never go stale; they are reused on checkout/reset
+        # and extended in O(keys) when HEAD advances by one commit.
         self._config_index: ConfigIndex | None = None
+        self._config_head: str | None = None
+        self._config_stale = False
+        self._indexes: OrderedDict[str, ConfigIndex] = OrderedDict()
 
     # ------------------------------------------------------------------
     # Properties delegating to LLMState
@@ -135,18 +152,134 @@ class ConfigManager:
 
     @property
     def config_index(self) -> ConfigIndex:
-        """Get the current config index (built/cached from DAG ancestry)."""
+        """Get the config index for the current HEAD.
+
+        Resolution order: the held index (same HEAD, not invalidated), the
+        per-commit LRU, the parent's cached index extended by HEAD alone,
+        a persisted index on the first-parent chain plus the commits after
+        it, and finally a full ancestry build.
+        """
+        from tract.operations.config_index import ConfigIndex as _ConfigIndex
+
+        head = self._get_head()
+        if head is None:
+            return _ConfigIndex()
+        index = self._config_index
+        if index is not None and not self._config_stale and self._config_head == head:
+            return index
+
+        index = self._indexes.get(head)
+        if index is None:
+            index = self._resolve_index(head)
+            self._indexes[head] = index
+            if len(self._indexes) > _INDEX_CACHE_SIZE:
+                self._indexes.popitem(last=False)
+        else:
+            self._indexes.move_to_end(head)
+        self._config_index, self._config_head = index, head
+        self._config_stale = False
+        return index
+
+    def advance(self, prev_head: str | None, commit_hash: str, content: Any) -> None:
+        """Derive the index of a commit just created on top of *prev_head*.
+
+        O(keys) for a config commit and O(1) otherwise.  Does nothing when
+        the parent's index is not cached; the next read resolves it lazily.
+        """
+        from tract.models.content import ConfigContent
+        from tract.operations.config_index import ConfigIndex as _ConfigIndex
+
+        base = self._indexes.get(prev_head) if prev_head else _ConfigIndex()
+        if base is None:
+            return
+        if isinstance(content, ConfigContent):
+            index = base.apply(content.settings)
+            self._persist_index(commit_hash, index)
+        elif getattr(content, "content_type", None) == "config":
+            return
+        else:
+            index = base
+        self._indexes[commit_hash] = index
+        if len(self._indexes) > _INDEX_CACHE_SIZE:
+            self._indexes.popitem(last=False)
+
+    def _resolve_index(self, head: str) -> ConfigIndex:
+        """Compute the config index of *head* on an LRU miss."""
         from tract.operations.config_index import ConfigIndex as _ConfigIndex
 
-        if self._config_index is None or self._config_index.is_stale:
-            head = self._get_head()
-            if head is None:
-                return _ConfigIndex()
-            self._config_index = _ConfigIndex.build(
+        row = self._commit_repo.get(head)
+        if row is None:
+            return _ConfigIndex()
+        is_merge = self._parent_repo is not None and bool(self._parent_repo.get_parents(head))
+        if not is_merge:
+            if row.parent_hash is None:
+                base: ConfigIndex | None = _ConfigIndex()
+            else:
+                base = self._indexes.get(row.parent_hash)
+            if base is not None:
+                index = base.extend([row], self._blob_repo)
+                if index is not base:
+                    self._persist_index(head, index)
+                return index
+
+        persisted = self._load_persisted_index(head)
+        if persisted is not None:
+            index = persisted
+        else:
+            index = _ConfigIndex.build(
                 self._commit_repo, self._blob_repo, head,
                 parent_repo=self._parent_repo,
             )
-        return self._config_index
+        self._persist_index(head, index)
+        return index
+
+    def _load_persisted_index(self, head: str) -> ConfigIndex | None:
+        """Resume from the nearest persisted index on HEAD's first-parent chain.
+
+        Returns None when nothing is stored or a merge commit lies between
+        the stored index and *head*.
+        """
+        from tract.operations.config_index import PERSIST_KEY
+        from tract.operations.config_index import ConfigIndex as _ConfigIndex
+
+        if self._snapshot_repo is None:
+            return None
+        found = self._snapshot_repo.find_nearest_ancestor(self._tract_id, head, PERSIST_KEY)
+        if found is None:
+            return None
+        row, distance = found
+        pending = list(self._commit_repo.get_ancestors(head, limit=distance)) if distance else []
+        pending.reverse()
+        if pending and self._parent_repo is not None and self._parent_repo.batch_get_parents(
+            [c.commit_hash for c in pending]
+        ):
+            return None
+        return _ConfigIndex.from_json(row.snapshot_json).extend(pending, self._blob_repo)
+
+    def _persist_index(self, head: str, index: ConfigIndex) -> None:
+        """Store *index* next to the compile snapshots (when persistence is on).
+
+        Only the newest index per tract is kept, outside the compile
+        snapshots' own prune budget.  Only flushed: the row is committed
+        with the caller's transaction, so reads made mid-operation never
+        commit partial state.
+        """
+        from tract.operations.config_index import PERSIST_KEY
+        from tract.storage.schema import CompileSnapshotRow
+
+        if self._snapshot_repo is None:
+            return
+        self._snapshot_repo.save(
+            CompileSnapshotRow(
+                tract_id=self._tract_id,
+                head_hash=head,
+                params_key=PERSIST_KEY,
+                snapshot_json=index.to_json(),
+                annotation_watermark=0,
+                created_at=datetime.now(timezone.utc),
+            )
+        )
+        self._snapshot_repo.prune(self._tract_id, 1, params_key=PERSIST_KEY)
 
     # ------------------------------------------------------------------
     # Public methods
@@ -186,9 +319,13 @@ class ConfigManager:
         return info
 
     def invalidate_cache(self) -> None:
-        """Mark the cached config index as stale so it rebuilds on next access."""
-        if self._config_index is not None:
-            self._config_index.invalidate()
+        """Re-resolve the config index for HEAD on next access.
+
+        Per-commit indexes stay cached: they depend only on immutable
+        ancestry, and may be shared with other readers, so they are never
+        marked stale themselves.
+        """
+        self._config_stale = True
 
     def configure_llm(
         self,
@@ -573,10 +710,10 @@ class ConfigManager:
         Two-level lookup: per-operation client > tract-level default.
         """
         client = getattr(self._llm_state.operation_clients, operation, None)
+        if client is None:
+            client = self._llm_state.llm_client
         if client is not None:
-            return client
-        if self._llm_state.llm_client is not None:
-            return self._llm_state.llm_client
+            return trace_llm_client(client, self._tracer, operation)
         raise RuntimeError(
             "No LLM client configured. Pass api_key= to Tract.open() "
             "or call configure_llm(client)."
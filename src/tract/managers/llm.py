@@ -658,6 +658,8 @@ class LLMManager:
         step_budget: int | None = None,
         tool_validator: Callable | None = None,
         auto_compress_threshold: float | None = None,
+        parallel_tools: bool = False,
+        max_tool_concurrency: int = 8,
     ) -> LoopResult:  # noqa: F821
         """Run the default agent loop on this tract.
 
@@ -703,6 +705,11 @@ class LLMManager:
             auto_compress_threshold: Float 0.0-1.0. When compiled context
                 exceeds this fraction of ``max_tokens``, the loop
                 auto-compresses before the next LLM call.
+            parallel_tools: Run independent custom tool handlers from a
+                single LLM turn concurrently. Results are still committed
+                in the order the LLM issued the calls.
+            max_tool_concurrency: Upper bound on concurrently running
+                handlers when ``parallel_tools`` is enabled.
 
         Returns:
             LoopResult with status, reason, steps, and tool_calls.
@@ -742,6 +749,8 @@ class LLMManager:
             step_budget=step_budget,
             tool_validator=tool_validator,
             auto_compress_threshold=auto_compress_threshold,
+            parallel_tools=parallel_tools,
+            max_tool_concurrency=max_tool_concurrency,
         )
         return run_loop(
             tract,
@@ -1098,6 +1107,8 @@ class LLMManager:
         step_budget: int | None = None,
         tool_validator: Callable | None = None,
         auto_compress_threshold: float | None = None,
+        parallel_tools: bool = False,
+        max_tool_concurrency: int = 8,
     ) -> LoopResult:
         """Async version of :meth:`run`.
 
@@ -1139,6 +1150,8 @@ class LLMManager:
             step_budget=step_budget,
             tool_validator=tool_validator,
             auto_compress_threshold=auto_compress_threshold,
+            parallel_tools=parallel_tools,
+            max_tool_concurrency=max_tool_concurrency,
         )
         return await arun_loop(
             tract,
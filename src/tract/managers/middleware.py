@@ -9,6 +9,8 @@ from __future__ import annotations
 import uuid
 from typing import TYPE_CHECKING, Literal, cast
 
+from tract.tracing import Tracer
+
 if TYPE_CHECKING:
     from collections.abc import Callable
     from typing import Any
@@ -29,6 +31,7 @@ class MiddlewareManager:
         get_head: Callable[[], str | None],
         tract_ref: Callable,  # returns the Tract instance
         policy_engine: Any = None,
+        tracer: Tracer | None = None,
     ) -> None:
         self._check_open = check_open
         self._persist_behavioral_spec = persist_behavioral_spec
@@ -37,6 +40,7 @@ class MiddlewareManager:
         self._get_head = get_head
         self._tract_ref = tract_ref
         self._policy_engine = policy_engine
+        self._tracer = tracer if tracer is not None else Tracer()
 
         # Owned state
         self._middleware: dict[str, list[tuple[str, Callable]]] = {}
@@ -297,8 +301,9 @@ class MiddlewareManager:
                 target=kwargs.get("target"),
                 pending=kwargs.get("pending"),
             )
-            for _id, fn in list(handlers):
-                fn(ctx)
+            with self._tracer.span(f"middleware.{event}", handlers=len(handlers)):
+                for _id, fn in list(handlers):
+                    fn(ctx)
 
             # Fire policies after middleware handlers
             if self._policy_engine is not None:
@@ -312,6 +317,7 @@ class MiddlewareManager:
                         branch=self._get_current_branch() or "",
                         head=self._get_head() or "",
                     )
-                    self._policy_engine.fire(event, policy_ctx)
+                    with self._tracer.span(f"policy.{event}"):
+                        self._policy_engine.fire(event, policy_ctx)
         finally:
             self._in_middleware_events.discard(event)
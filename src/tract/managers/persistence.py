@@ -32,7 +32,11 @@ if TYPE_CHECKING:
         OperationEventRepository,
         PersistenceRepository,
         RefRepository,
+        TagAnnotationRepository,
+        TagRegistryRepository,
+        ToolSchemaRepository,
     )
+    from tract.operations.archive import ArchiveTarget
 
 logger = logging.getLogger(__name__)
 
@@ -67,6 +71,9 @@ class PersistenceManager:
         commit_session: Callable[[], None],
         get_head: Callable[[], str | None],
         row_to_info: Callable,
+        tool_schema_repo: ToolSchemaRepository | None = None,
+        get_tag_annotation_repo: Callable[[], TagAnnotationRepository | None] | None = None,
+        get_tag_registry_repo: Callable[[], TagRegistryRepository | None] | None = None,
     ) -> None:
         self._tract_id = tract_id
         self._commit_repo = commit_repo
@@ -93,6 +100,9 @@ class PersistenceManager:
         self._commit_session = commit_session
         self._get_head = get_head
         self._row_to_info = row_to_info
+        self._tool_schema_repo = tool_schema_repo
+        self._get_tag_annotation_repo = get_tag_annotation_repo or (lambda: None)
+        self._get_tag_registry_repo = get_tag_registry_repo or (lambda: None)
 
         # Owned state
         self._quarantined: list[str] = []
@@ -231,8 +241,7 @@ class PersistenceManager:
         """
         if self._compile_record_repo is None:
             return []
-        effectives = self._compile_record_repo.get_effectives(record_id)
-        return [e.commit_hash for e in effectives]
+        return self._compile_record_repo.get_commit_hashes(record_id)
 
     def token_checkpoints(self, limit: int = 100) -> list:
         """API-calibrated token checkpoints, newest first.
@@ -395,7 +404,8 @@ class PersistenceManager:
             The exported dict contains full commit details, but
             :meth:`load_state` only replays content payloads -- it does not
             reconstruct the original DAG. See :meth:`load_state` for the
-            list of what is and is not preserved on import.
+            list of what is and is not preserved on import.  Use
+            :meth:`export_archive` for a structural backup.
 
         Args:
             include_blobs: If True (default), include full content payloads.
@@ -429,6 +439,14 @@ class PersistenceManager:
             parent_repo=self._parent_repo,
         )
 
+        hashes = [c.commit_hash for c in ancestry]
+        parents_by_hash = self._parent_repo.batch_get_parents(hashes) if self._parent_repo else {}
+        blobs = (
+            self._blob_repo.batch_get(list({c.content_hash for c in ancestry}))
+            if include_blobs else {}
+        )
+        annotations = self._annotation_repo.batch_get_latest(hashes)
+
         for commit_row in ancestry:
             entry: dict = {
                 "hash": commit_row.commit_hash,
@@ -439,16 +457,15 @@ class PersistenceManager:
                 "created_at": commit_row.created_at.isoformat() if commit_row.created_at else None,
             }
 
-            # Parent hashes -- get_parents returns list[str]
+            # Parent hashes -- only merge commits have parent-table rows
             if self._parent_repo:
-                parents = self._parent_repo.get_parents(commit_row.commit_hash)
-                entry["parents"] = parents
+                entry["parents"] = parents_by_hash.get(commit_row.commit_hash, [])
             else:
                 entry["parents"] = [commit_row.parent_hash] if commit_row.parent_hash else []
 
             # Blob content
             if include_blobs:
-                blob = self._blob_repo.get(commit_row.content_hash)
+                blob = blobs.get(commit_row.content_hash)
                 if blob:
                     entry["content_hash"] = commit_row.content_hash
                     entry["payload"] = blob.payload_json
@@ -459,7 +476,7 @@ class PersistenceManager:
                 entry["content_hash"] = commit_row.content_hash
 
             # Annotations
-            ann = self._annotation_repo.get_latest(commit_row.commit_hash)
+            ann = annotations.get(commit_row.commit_hash)
             if ann:
                 entry["priority"] = ann.priority.value if hasattr(ann.priority, "value") else str(ann.priority)
 
@@ -583,6 +600,83 @@ class PersistenceManager:
 
         return loaded
 
+    def export_archive(
+        self,
+        target: ArchiveTarget,
+        *,
+        compression: str | None = None,
+        page_size: int = 500,
+    ) -> int:
+        """Stream the whole tract (all branches) to a DAG-preserving archive.
+
+        Unlike :meth:`export_state`, the archive keeps original hashes,
+        merge parents, annotation history and tags, and is written page by
+        page instead of being built in memory.  See
+        :mod:`tract.operations.archive` for the record format.
+
+        Args:
+            target: Path or binary file object to write to.
+            compression: ``"gzip"``, ``"zstd"`` or None (inferred from a
+                ``.gz``/``.zst`` suffix).  zstd needs
+                ``pip install tract-ai[zstd]``.
+            page_size: Commits fetched per round-trip.
+
+        Returns:
+            Number of commits written.
+        """
+        self._check_open()
+        from tract.operations.archive import open_archive_writer, write_archive
+
+        with open_archive_writer(target, compression) as out:
+            return write_archive(
+                out,
+                page_size=page_size,
+                **self._archive_repos(),
+            )
+
+    def import_archive(self, source: ArchiveTarget, *, page_size: int = 500) -> int:
+        """Bulk-load an archive written by :meth:`export_archive`.
+
+        Commits are inserted verbatim (same hashes and parents) and owned
+        by this tract; branches and HEAD are restored from the archive.
+        Commits already present are skipped, so re-importing is a no-op.
+        Compression is detected automatically.
+
+        Args:
+            source: Path or binary file object to read from.
+            page_size: Records inserted per bulk statement.
+
+        Returns:
+            Number of commits inserted.
+
+        Raises:
+            ValueError: If the archive is invalid, unsupported or truncated.
+        """
+        self._check_open()
+        from tract.operations.archive import open_archive_reader, read_archive
+
+        with open_archive_reader(source) as lines:
+            inserted = read_archive(
+                lines,
+                page_size=page_size,
+                **self._archive_repos(),
+            )
+        self._commit_session()
+        return inserted
+
+    def _archive_repos(self) -> dict[str, Any]:
+        return {
+            "tract_id": self._tract_id,
+            "commit_repo": self._commit_repo,
+            "blob_repo": self._blob_repo,
+            "parent_repo": self._parent_repo,
+            "annotation_repo": self._annotation_repo,
+            "ref_repo": self._ref_repo,
+            "tag_annotation_repo": self._get_tag_annotation_repo(),
+            "tag_registry_repo": self._get_tag_registry_repo(),
+            "tool_schema_repo": self._tool_schema_repo,
+        }
+
     # ------------------------------------------------------------------
     # Behavioral spec persistence
     # ------------------------------------------------------------------
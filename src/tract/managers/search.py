@@ -57,6 +57,8 @@ class SearchManager:
         commit_fn: Callable | None = None,
         tag_annotation_repo=None,
         tract_ref: Any = None,
+        search_index_repo=None,
+        tag_index_repo=None,
     ) -> None:
         self._tract_id = tract_id
         self._commit_repo = commit_repo
@@ -82,6 +84,8 @@ class SearchManager:
         self._commit_fn = commit_fn  # type: ignore[assignment]
         self._tag_annotation_repo = tag_annotation_repo
         self._tract_ref = tract_ref
+        self._search_index_repo = search_index_repo
+        self._tag_index_repo = tag_index_repo
 
     # ------------------------------------------------------------------
     # Log / ancestry
@@ -121,34 +125,15 @@ class SearchManager:
             entries = [self._row_to_info(row) for row in ancestors]
             return self._enrich(entries)
 
-        # Tag filtering: walk more commits and filter
-        ancestors = self._get_ancestors(
-            current_head, limit=500, op_filter=op_filter,
+        # Tag filtering: immutable + mutable tags from the tag index
+        rows = self._tag_index_repo.get_commits(
+            tags,
+            match=tag_match,
+            ancestor_of=current_head,
+            op_filter=op_filter,
+            limit=limit,
         )
-        tag_set = set(tags)
-
-        # Batch-fetch annotation tags for all ancestor commits
-        annotation_map: dict[str, list[str]] = {}
-        if self._tag_annotation_repo is not None:
-            all_hashes = [r.commit_hash for r in ancestors]
-            annotation_map = self._tag_annotation_repo.batch_get_tags(all_hashes)
-
-        results: list[CommitInfo] = []
-        for row in ancestors:
-            # Combine immutable + mutable tags
-            commit_tags = set(row.tags_json) if row.tags_json else set()
-            commit_tags.update(annotation_map.get(row.commit_hash, []))
-
-            if tag_match == "any":
-                if commit_tags & tag_set:
-                    results.append(self._row_to_info(row))
-            else:  # "all"
-                if tag_set <= commit_tags:
-                    results.append(self._row_to_info(row))
-
-            if len(results) >= limit:
-                break
-        return self._enrich(results)
+        return self._enrich([self._row_to_info(row) for row in rows])
 
     # ------------------------------------------------------------------
     # Find / search
@@ -168,13 +153,22 @@ class SearchManager:
     ) -> list[CommitInfo]:
         """Search commits by content, tags, content type, or metadata.
 
-        Walks the ancestry of the specified branch (or current HEAD) and
-        returns commits matching **all** provided criteria (AND logic).
+        Searches the ancestry of the specified branch (or current HEAD) and
+        returns commits matching **all** provided criteria (AND logic),
+        newest first.
+
+        *content* (case-sensitive substring) and *pattern* (regex) match
+        the text extracted from each commit's content.  They are answered
+        from the full-text index, so the whole history is searched; without
+        the index, only the most recent ``max(limit * 10, 500)`` ancestors
+        are scanned.  *tag* (immutable or mutable) is answered from the
+        tag index over the whole history.
         """
         self._check_open_fn()
         import re
 
         from tract.exceptions import BranchNotFoundError
+        from tract.storage.sqlite import extract_search_text
 
         # Resolve starting commit hash
         if branch is not None:
@@ -187,18 +181,49 @@ class SearchManager:
         if start_hash is None:
             return []
 
-        # Pre-compile regex if provided
-        compiled_re = re.compile(pattern) if pattern is not None else None
+        text_query = content is not None or pattern is not None
+        use_index = (
+            text_query
+            and self._search_index_repo is not None
+            and self._search_index_repo.available
+        )
 
-        # Walk a generous window of ancestors for filtering
-        scan_limit = max(limit * 10, 500)
-        ancestors = self._get_ancestors(start_hash, limit=scan_limit)
+        compiled_re = None
+        tag_resolved = False
+        if use_index:
+            # Text, content type and ancestry are resolved in SQL; the
+            # limit is only pushed down when no Python-side filter follows.
+            python_filters = tag is not None or metadata_key is not None
+            ancestors = self._search_index_repo.search(
+                content,
+                pattern=pattern,
+                case_sensitive=True,
+                ancestor_of=start_hash,
+                content_type=content_type,
+                ranked=False,
+                limit=None if python_filters else limit,
+            )
+        else:
+            # Pre-compile regex if provided
+            compiled_re = re.compile(pattern) if pattern is not None else None
+
+            if tag is not None:
+                # The tag index yields every tagged ancestor, however old
+                ancestors = self._tag_index_repo.get_commits(
+                    [tag], ancestor_of=start_hash,
+                )
+                tag_resolved = True
+            else:
+                # Walk a generous window of ancestors for filtering
+                scan_limit = max(limit * 10, 500)
+                ancestors = self._get_ancestors(start_hash, limit=scan_limit)
 
-        # Batch-fetch annotation tags if tag filter is active
-        annotation_map: dict[str, list[str]] = {}
-        if tag is not None and self._tag_annotation_repo is not None:
-            all_hashes = [r.commit_hash for r in ancestors]
-            annotation_map = self._tag_annotation_repo.batch_get_tags(all_hashes)
+        tagged: set[str] = set()
+        if tag is not None and not tag_resolved:
+            tagged = {
+                r.commit_hash
+                for r in self._tag_index_repo.get_commits([tag], ancestor_of=start_hash)
+            }
 
         results: list[CommitInfo] = []
         for row in ancestors:
@@ -215,19 +240,16 @@ class SearchManager:
                     continue
 
             # --- tag filter (immutable + mutable) ---
-            if tag is not None:
-                commit_tags: set[str] = set(row.tags_json) if row.tags_json else set()
-                commit_tags.update(annotation_map.get(row.commit_hash, []))
-                if tag not in commit_tags:
-                    continue
+            if tag is not None and not tag_resolved and row.commit_hash not in tagged:
+                continue
 
-            # --- content / pattern filters (load blob lazily) ---
-            if content is not None or compiled_re is not None:
+            # --- content / pattern filters (unindexed: load blob lazily) ---
+            if text_query and not use_index:
                 blob = self._blob_repo.get(row.content_hash)
                 if blob is None:
                     continue
                 try:
-                    blob_text = blob.payload_json
+                    blob_text = extract_search_text(blob.payload_json)
                 except Exception:
                     logger.debug(
                         "Skipping blob %s: payload unreadable", row.content_hash,
@@ -673,14 +695,8 @@ class SearchManager:
                 )
             )
 
-        fetch_limit = None if op_filter is not None else limit
-        all_rows = list(
-            self._commit_repo.get_ancestors_with_merges(start_hash, limit=fetch_limit)
+        return list(
+            self._commit_repo.get_ancestors_with_merges(
+                start_hash, limit=limit, op_filter=op_filter,
+            )
         )
-
-        if op_filter is not None:
-            all_rows = [r for r in all_rows if r.operation == op_filter]
-            if limit is not None:
-                all_rows = all_rows[:limit]
-
-        return all_rows
@@ -21,6 +21,7 @@ if TYPE_CHECKING:
         CommitParentRepository as ParentRepository,
         CommitRepository,
         TagAnnotationRepository,
+        TagIndexRepository,
         TagRegistryRepository,
     )
 
@@ -43,6 +44,7 @@ class TagManager:
         get_ancestors: Callable,  # was _get_merge_aware_ancestors
         row_to_info: Callable,  # was _commit_engine._row_to_info
         get_head: Callable[[], str | None],
+        tag_index_repo: TagIndexRepository,
     ) -> None:
         self._tract_id = tract_id
         self._get_tag_annotation_repo = get_tag_annotation_repo
@@ -57,6 +59,7 @@ class TagManager:
         self._get_ancestors = get_ancestors
         self._row_to_info = row_to_info
         self._get_head = get_head
+        self._tag_index_repo = tag_index_repo
 
     def add(self, target_hash: str, tag_name: str) -> None:
         """Add a mutable tag annotation to a commit.
@@ -118,16 +121,7 @@ class TagManager:
         Returns:
             Deduplicated list of tag names.
         """
-        tags: set[str] = set()
-        # Immutable tags from CommitRow
-        commit_row = self._commit_repo.get(target_hash)
-        if commit_row is not None and commit_row.tags_json:
-            tags.update(commit_row.tags_json)
-        # Mutable annotation tags
-        if self._get_tag_annotation_repo() is not None:
-            annotation_tags = self._get_tag_annotation_repo().get_tags(target_hash)
-            tags.update(annotation_tags)
-        return sorted(tags)
+        return self._tag_index_repo.get_tags(target_hash)
 
     def register(self, name: str, description: str | None = None) -> None:
         """Register a new tag name.
@@ -155,44 +149,28 @@ class TagManager:
 
         Returns:
             List of dicts with ``name``, ``description``, ``auto_created``,
-            and ``count`` keys.
+            and ``count`` keys.  ``count`` is the number of commits reachable
+            from HEAD carrying the tag, immutably or as an annotation --
+            the same scope :meth:`query` searches.
         """
         if self._get_tag_registry_repo() is None:
             return []
         rows = self._get_tag_registry_repo().list_all(self._tract_id)
-        tag_names = [r.tag_name for r in rows]
-
-        # Count annotation tags in batch
-        annotation_counts: dict[str, int] = {}
-        if self._get_tag_annotation_repo() is not None:
-            for tn in tag_names:
-                annotation_hashes = self._get_tag_annotation_repo().get_commits_by_tag(
-                    self._tract_id, tn,
-                )
-                annotation_counts[tn] = len(annotation_hashes)
-
-        # Walk ancestors ONCE, count immutable tags across all registered tags
-        immutable_counts: dict[str, int] = {tn: 0 for tn in tag_names}
         head = self._get_head()
+        counts: dict[str, int] = {}
         if head is not None:
-            tag_name_set = set(tag_names)
-            ancestors = self._get_ancestors(head, limit=500)
-            for ancestor in ancestors:
-                if ancestor.tags_json:
-                    for t in ancestor.tags_json:
-                        if t in tag_name_set:
-                            immutable_counts[t] = immutable_counts.get(t, 0) + 1
-
-        result = []
-        for row in rows:
-            count = annotation_counts.get(row.tag_name, 0) + immutable_counts.get(row.tag_name, 0)
-            result.append({
+            counts = self._tag_index_repo.count_commits(
+                [r.tag_name for r in rows], ancestor_of=head,
+            )
+        return [
+            {
                 "name": row.tag_name,
                 "description": row.description,
                 "auto_created": bool(row.auto_created),
-                "count": count,
-            })
-        return result
+                "count": counts.get(row.tag_name, 0),
+            }
+            for row in rows
+        ]
 
     def query(
         self,
@@ -219,33 +197,10 @@ class TagManager:
         if head is None:
             return []
 
-        # Walk ancestors ONCE and reuse
-        ancestors = self._get_ancestors(head, limit=500)
-
-        # Batch-fetch annotation tags for all ancestors
-        annotation_map: dict[str, builtins.list[str]] = {}
-        if self._get_tag_annotation_repo() is not None:
-            all_hashes = [r.commit_hash for r in ancestors]
-            annotation_map = self._get_tag_annotation_repo().batch_get_tags(all_hashes)
-
-        tag_set = set(tags)
-        results: builtins.list[CommitInfo] = []
-        for row in ancestors:
-            # Combine immutable + mutable tags
-            commit_tags = set(row.tags_json) if row.tags_json else set()
-            commit_tags.update(annotation_map.get(row.commit_hash, []))
-
-            if match == "any":
-                if commit_tags & tag_set:
-                    results.append(self._row_to_info(row))
-            else:  # "all"
-                if tag_set <= commit_tags:
-                    results.append(self._row_to_info(row))
-
-            if len(results) >= limit:
-                break
-
-        return results
+        rows = self._tag_index_repo.get_commits(
+            tags, match=match, ancestor_of=head, limit=limit,
+        )
+        return [self._row_to_info(row) for row in rows]
 
     def _seed_base(self) -> None:
         """Seed the tag registry with base tags (idempotent)."""
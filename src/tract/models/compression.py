@@ -104,7 +104,9 @@ class ToolDropResult:
 class GCResult:
     """Result of a garbage collection operation.
 
-    Tracks what was removed and how much space was freed.
+    Tracks what was removed and how much space was freed.  ``complete``
+    is False when a time-sliced run stopped with eligible commits left;
+    running GC again continues from the oldest remaining one.
     """
 
     commits_removed: int
@@ -112,6 +114,7 @@ class GCResult:
     tokens_freed: int
     source_commits_removed: int
     duration_seconds: float
+    complete: bool = True
 
     def pprint(self) -> None:
         """Pretty-print this GC result using rich formatting."""
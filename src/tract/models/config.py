@@ -66,6 +66,7 @@ class TractConfig(BaseModel):
     token_budget: Optional[TokenBudgetConfig] = None
     default_branch: str = "main"
     compile_cache_maxsize: int = 8
+    compile_cache_persist: bool = False
     delete_branch_on_merge: bool = False
 
 
@@ -13,6 +13,88 @@ if TYPE_CHECKING:
     from tract.storage.schema import CommitRow
 
 
+class AncestryGraph:
+    """In-memory view of every commit reachable from a head.
+
+    Built by :func:`load_ancestry` with a fixed number of queries (one
+    recursive CTE for the rows, plus chunked lookups for merge parents),
+    so callers can walk first-parent chains and merge parents without a
+    database round-trip per commit.
+    """
+
+    __slots__ = ("_merge_parents", "_rows")
+
+    def __init__(
+        self,
+        rows: dict[str, CommitRow],
+        merge_parents: dict[str, list[str]] | None = None,
+    ) -> None:
+        self._rows = rows
+        self._merge_parents = merge_parents or {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, commit_hash: object) -> bool:
+        return commit_hash in self._rows
+
+    def get(self, commit_hash: str) -> CommitRow | None:
+        """Return the loaded row for *commit_hash*, or None if unreachable."""
+        return self._rows.get(commit_hash)
+
+    def parents(self, commit_hash: str) -> list[str]:
+        """Return commit_parents entries for a commit, ordered by position.
+
+        Empty for non-merge commits (mirrors ``CommitParentRepository.get_parents``).
+        """
+        return self._merge_parents.get(commit_hash, [])
+
+    def first_parent_chain(
+        self,
+        start_hash: str,
+        *,
+        stop_at: set[str] | None = None,
+    ) -> list[CommitRow]:
+        """Follow ``parent_hash`` from *start_hash*, newest first.
+
+        Stops at the root, at a commit that was not loaded, or (exclusive)
+        at the first commit whose hash is in *stop_at*.
+        """
+        chain: list[CommitRow] = []
+        current: str | None = start_hash
+        while current is not None:
+            if stop_at is not None and current in stop_at:
+                break
+            row = self._rows.get(current)
+            if row is None:
+                break
+            chain.append(row)
+            current = row.parent_hash
+        return chain
+
+
+def load_ancestry(
+    commit_repo: CommitRepository,
+    head_hash: str,
+    *,
+    parent_repo: CommitParentRepository | None = None,
+) -> AncestryGraph:
+    """Load the ancestry of *head_hash* into an :class:`AncestryGraph`.
+
+    Without *parent_repo* only the first-parent chain is fetched.  With it,
+    every commit reachable through merge parents is fetched too, and the
+    ordered parent lists of all loaded commits are batch-loaded.
+    """
+    if parent_repo is None:
+        rows = commit_repo.get_ancestors(head_hash)
+        return AncestryGraph({r.commit_hash: r for r in rows})
+
+    rows = commit_repo.get_ancestors_with_merges(head_hash)
+    row_map = {r.commit_hash: r for r in rows}
+    merge_parents = parent_repo.batch_get_parents(list(row_map))
+    return AncestryGraph(row_map, merge_parents)
+
+
 def walk_ancestry(
     commit_repo: CommitRepository,
     blob_repo: BlobRepository,
@@ -20,6 +102,7 @@ def walk_ancestry(
     *,
     content_type_filter: set[str] | None = None,
     parent_repo: CommitParentRepository | None = None,
+    graph: AncestryGraph | None = None,
 ) -> list[CommitRow]:
     """Walk DAG ancestry from head, optionally filtering by content type.
 
@@ -32,21 +115,24 @@ def walk_ancestry(
         content_type_filter: If provided, only include commits whose
             content_type is in this set. None = include all.
         parent_repo: If provided, used for merge-parent walking.
+        graph: Pre-loaded ancestry of *head_hash*.  Loaded on demand
+            via :func:`load_ancestry` when omitted.
     """
-    # get_ancestors returns newest-first; reverse to root-first
-    ancestors = list(commit_repo.get_ancestors(head_hash))
+    if graph is None:
+        graph = load_ancestry(commit_repo, head_hash, parent_repo=parent_repo)
+
+    # first_parent_chain returns newest-first; reverse to root-first below
+    ancestors = graph.first_parent_chain(head_hash)
 
     # Handle merge parents if parent_repo is available
     if parent_repo is not None:
         seen = {c.commit_hash for c in ancestors}
         extra: list[CommitRow] = []
         for commit in ancestors:
-            merge_parents = parent_repo.get_parents(commit.commit_hash)
-            for parent_hash in merge_parents:
+            for parent_hash in graph.parents(commit.commit_hash):
                 if parent_hash not in seen:
                     # Walk the merge parent's ancestors too
-                    merge_ancestors = list(commit_repo.get_ancestors(parent_hash))
-                    for ma in merge_ancestors:
+                    for ma in graph.first_parent_chain(parent_hash):
                         if ma.commit_hash not in seen:
                             seen.add(ma.commit_hash)
                             extra.append(ma)
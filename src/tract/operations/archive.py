@@ -0,0 +1,453 @@
+"""Streaming tract archives -- DAG-preserving export and import.
+
+An archive is newline-delimited JSON, one record per line, optionally
+gzip- or zstd-compressed.  Records carry storage rows verbatim, so an
+imported tract keeps its original commit hashes, parents (including merge
+parents), edit targets, annotations and tags:
+
+- ``header``: format marker, version, source tract id, HEAD and branch.
+- ``tag_def``: tag registry entries.
+- ``blob``: a content blob, written once, before the first commit using it.
+- ``tool``: a tool schema, written once, before the first commit using it.
+- ``commit``: a commit row, plus ``parents``/``tools`` when it has any.
+  Commits are written parents-first.
+- ``annotation`` / ``tag``: priority and tag annotation rows.
+- ``branch``: a branch ref.
+- ``end``: record counts; its absence marks a truncated archive.
+
+Both directions stream: the writer pages through history with batched blob
+and annotation lookups, and the reader bulk-inserts one page of records at
+a time, so neither holds a whole history in memory.
+"""
+
+from __future__ import annotations
+
+import enum
+import gzip
+import io
+import json
+import os
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, BinaryIO, Union
+
+from tract.storage.schema import (
+    AnnotationRow,
+    BlobRow,
+    CommitRow,
+    TagAnnotationRow,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from tract.storage.repositories import (
+        AnnotationRepository,
+        BlobRepository,
+        CommitParentRepository,
+        CommitRepository,
+        RefRepository,
+        TagAnnotationRepository,
+        TagRegistryRepository,
+        ToolSchemaRepository,
+    )
+
+ARCHIVE_FORMAT = "tract-archive"
+ARCHIVE_VERSION = 1
+
+ArchiveTarget = Union[str, "os.PathLike[str]", BinaryIO]
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_COMPRESSIONS = ("gzip", "zstd")
+_SUFFIX_COMPRESSION = {".gz": "gzip", ".gzip": "gzip", ".zst": "zstd", ".zstd": "zstd"}
+
+
+# ---------------------------------------------------------------------------
+# Compressed stream handling
+# ---------------------------------------------------------------------------
+
+
+def _zstandard() -> Any:
+    try:
+        import zstandard  # type: ignore[import-not-found]
+    except ImportError as exc:
+        raise ImportError(
+            "zstd archives require the 'zstandard' package: "
+            "pip install tract-ai[zstd]"
+        ) from exc
+    return zstandard
+
+
+@contextmanager
+def _open_binary(target: ArchiveTarget, mode: str) -> Iterator[BinaryIO]:
+    if isinstance(target, (str, os.PathLike)):
+        with open(target, mode) as fh:
+            yield fh  # type: ignore[misc]
+    else:
+        yield target
+
+
+def _peek(raw: BinaryIO, size: int) -> bytes:
+    peek = getattr(raw, "peek", None)
+    if peek is not None:
+        head: bytes = peek(size)[:size]
+        return head
+    pos = raw.tell()
+    head = raw.read(size)
+    raw.seek(pos)
+    return head
+
+
+@contextmanager
+def open_archive_writer(
+    target: ArchiveTarget, compression: str | None = None
+) -> Iterator[IO[str]]:
+    """Open *target* for writing archive lines.
+
+    Args:
+        target: A path or a binary file object (left open on exit).
+        compression: ``"gzip"``, ``"zstd"`` or None.  When None and
+            *target* is a path, it is inferred from the suffix
+            (``.gz``, ``.zst``).
+
+    Raises:
+        ValueError: If *compression* is not a supported codec.
+        ImportError: If zstd is requested without ``zstandard`` installed.
+    """
+    if compression is None and isinstance(target, (str, os.PathLike)):
+        compression = _SUFFIX_COMPRESSION.get(Path(target).suffix.lower())
+    if compression is not None and compression not in _COMPRESSIONS:
+        raise ValueError(
+            f"compression must be one of {_COMPRESSIONS} or None, got {compression!r}"
+        )
+    codec = _zstandard() if compression == "zstd" else None
+
+    with _open_binary(target, "wb") as raw:
+        stream: Any = None
+        if compression == "gzip":
+            stream = gzip.GzipFile(fileobj=raw, mode="wb")
+        elif codec is not None:
+            stream = codec.ZstdCompressor().stream_writer(raw, closefd=False)
+        text = io.TextIOWrapper(stream or raw, encoding="utf-8", newline="\n")
+        try:
+            yield text
+        finally:
+            text.detach()
+            if stream is not None:
+                stream.close()
+
+
+@contextmanager
+def open_archive_reader(source: ArchiveTarget) -> Iterator[IO[str]]:
+    """Open *source* for reading archive lines, detecting compression.
+
+    gzip and zstd streams are recognised by their magic bytes, so the
+    file name does not matter.  File objects are left open on exit.
+    """
+    with _open_binary(source, "rb") as raw:
+        magic = _peek(raw, len(_ZSTD_MAGIC))
+        stream: Any = None
+        if magic.startswith(_GZIP_MAGIC):
+            stream = gzip.GzipFile(fileobj=raw, mode="rb")
+        elif magic == _ZSTD_MAGIC:
+            stream = _zstandard().ZstdDecompressor().stream_reader(raw, closefd=False)
+        text = io.TextIOWrapper(stream or raw, encoding="utf-8")
+        try:
+            yield text
+        finally:
+            text.detach()
+            if stream is not None:
+                stream.close()
+
+
+# ---------------------------------------------------------------------------
+# Row (de)serialization
+# ---------------------------------------------------------------------------
+
+
+def _encode_row(row: object) -> dict:
+    """Column values of *row* as JSON-ready data (autoincrement ids dropped)."""
+    data: dict[str, Any] = {}
+    for column in row.__table__.columns:  # type: ignore[attr-defined]
+        if column.autoincrement is True:
+            continue
+        value = getattr(row, column.key)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, enum.Enum):
+            value = value.value
+        data[column.key] = value
+    return data
+
+
+def _decode_row(model: type, data: dict, **overrides: Any) -> Any:
+    """Build a *model* row from :func:`_encode_row` output."""
+    values: dict[str, Any] = {}
+    for column in model.__table__.columns:  # type: ignore[attr-defined]
+        if column.key not in data:
+            continue
+        value = data[column.key]
+        if value is not None:
+            try:
+                python_type = column.type.python_type
+            except NotImplementedError:
+                python_type = None
+            if python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif python_type is not None and hasattr(python_type, "__members__"):
+                value = python_type(value)
+        values[column.key] = value
+    values.update(overrides)
+    return model(**values)
+
+
+# ---------------------------------------------------------------------------
+# Writer
+# ---------------------------------------------------------------------------
+
+
+def write_archive(
+    out: IO[str],
+    *,
+    tract_id: str,
+    commit_repo: CommitRepository,
+    blob_repo: BlobRepository,
+    parent_repo: CommitParentRepository,
+    annotation_repo: AnnotationRepository,
+    ref_repo: RefRepository,
+    tag_annotation_repo: TagAnnotationRepository | None = None,
+    tag_registry_repo: TagRegistryRepository | None = None,
+    tool_schema_repo: ToolSchemaRepository | None = None,
+    page_size: int = 500,
+) -> int:
+    """Stream every commit of *tract_id* to *out* as archive records.
+
+    All branches are exported, together with ancestors owned by other
+    tracts (a spawned tract's shared prefix) so the archive is
+    self-contained.  Each page of commits costs one query per related
+    table; blobs and tool schemas are deduplicated across the archive.
+
+    Returns:
+        Number of commit records written.
+    """
+
+    def emit(kind: str, data: dict) -> None:
+        out.write(json.dumps({"type": kind, **data}, ensure_ascii=False, separators=(",", ":")))
+        out.write("\n")
+
+    emit("header", {
+        "format": ARCHIVE_FORMAT,
+        "version": ARCHIVE_VERSION,
+        "tract_id": tract_id,
+        "head": ref_repo.get_head(tract_id),
+        "branch": ref_repo.get_current_branch(tract_id),
+        "exported_at": datetime.now(timezone.utc).isoformat(),
+    })
+    if tag_registry_repo is not None:
+        for tag_def in tag_registry_repo.list_all(tract_id):
+            emit("tag_def", _encode_row(tag_def))
+
+    seen_blobs: set[str] = set()
+    seen_tools: set[str] = set()
+    written = 0
+    for page in commit_repo.iter_history(tract_id, page_size=page_size):
+        hashes = [c.commit_hash for c in page]
+
+        new_blobs = list(dict.fromkeys(c.content_hash for c in page if c.content_hash not in seen_blobs))
+        blobs = blob_repo.batch_get(new_blobs)
+        for content_hash in new_blobs:
+            if content_hash in blobs:
+                emit("blob", _encode_row(blobs[content_hash]))
+        seen_blobs.update(new_blobs)
+
+        tools: dict[str, list[str]] = {}
+        if tool_schema_repo is not None:
+            tools = tool_schema_repo.batch_get_commit_tool_hashes(hashes)
+            for tool_hashes in tools.values():
+                for tool_hash in tool_hashes:
+                    if tool_hash in seen_tools:
+                        continue
+                    seen_tools.add(tool_hash)
+                    schema = tool_schema_repo.get(tool_hash)
+                    if schema is not None:
+                        emit("tool", _encode_row(schema))
+
+        parents = parent_repo.batch_get_parents(hashes)
+        for commit in page:
+            record = _encode_row(commit)
+            if commit.commit_hash in parents:
+                record["parents"] = parents[commit.commit_hash]
+            if commit.commit_hash in tools:
+                record["tools"] = tools[commit.commit_hash]
+            emit("commit", record)
+
+        for history in annotation_repo.batch_get_history(hashes).values():
+            for ann in history:
+                if ann.tract_id == tract_id:
+                    emit("annotation", _encode_row(ann))
+        if tag_annotation_repo is not None:
+            for rows in tag_annotation_repo.batch_get_rows(hashes).values():
+                for tag_row in rows:
+                    if tag_row.tract_id == tract_id:
+                        emit("tag", _encode_row(tag_row))
+        written += len(page)
+
+    for name in ref_repo.list_branches(tract_id):
+        emit("branch", {"name": name, "commit_hash": ref_repo.get_branch(tract_id, name)})
+    emit("end", {"commits": written, "blobs": len(seen_blobs)})
+    return written
+
+
+# ---------------------------------------------------------------------------
+# Reader
+# ---------------------------------------------------------------------------
+
+
+class _ImportBatch:
+    """Buffered archive records, flushed in foreign-key order."""
+
+    def __init__(self) -> None:
+        self.blobs: list[BlobRow] = []
+        self.tools: list[dict] = []
+        self.commits: list[CommitRow] = []
+        self.links: list[dict] = []
+        self.annotations: list[AnnotationRow] = []
+        self.tags: list[TagAnnotationRow] = []
+        self.size = 0
+
+
+def read_archive(
+    lines: IO[str],
+    *,
+    tract_id: str,
+    commit_repo: CommitRepository,
+    blob_repo: BlobRepository,
+    parent_repo: CommitParentRepository,
+    annotation_repo: AnnotationRepository,
+    ref_repo: RefRepository,
+    tag_annotation_repo: TagAnnotationRepository | None = None,
+    tag_registry_repo: TagRegistryRepository | None = None,
+    tool_schema_repo: ToolSchemaRepository | None = None,
+    page_size: int = 500,
+) -> int:
+    """Bulk-insert the records of an archive into *tract_id*.
+
+    Rows are stored verbatim; commits owned by the archived tract are
+    re-homed to *tract_id*, foreign ancestors keep their owner.  Commits
+    that already exist are left untouched, and so are their parents and
+    annotations, which makes re-importing an archive a no-op.  Branch refs
+    and HEAD are restored from the archive, replacing same-named branches.
+
+    The caller owns the transaction: on error nothing is committed here,
+    so it can roll back.
+
+    Returns:
+        Number of commits inserted.
+
+    Raises:
+        ValueError: If the stream is not a tract archive, has an
+            unsupported version, or is truncated.
+    """
+    header: dict | None = None
+    source_id: str | None = None
+    batch = _ImportBatch()
+    inserted: set[str] = set()
+    tag_defs: list[dict] = []
+    branches: dict[str, str] = {}
+    ended = False
+
+    def owner(data: dict) -> str:
+        return tract_id if data.get("tract_id") == source_id else data["tract_id"]
+
+    def flush() -> None:
+        nonlocal batch
+        blob_repo.save_many_if_absent(batch.blobs)
+        if tool_schema_repo is not None:
+            for tool in batch.tools:
+                tool_schema_repo.store(
+                    tool["content_hash"], tool["name"], tool["schema_json"],
+                    datetime.fromisoformat(tool["created_at"]),
+                )
+        inserted.update(commit_repo.save_many_if_absent(batch.commits))
+        for link in batch.links:
+            if link["commit_hash"] not in inserted:
+                continue
+            if link.get("parents"):
+                parent_repo.add_parents(link["commit_hash"], link["parents"])
+            if link.get("tools") and tool_schema_repo is not None:
+                for position, tool_hash in enumerate(link["tools"]):
+                    tool_schema_repo.link_to_commit(link["commit_hash"], tool_hash, position)
+        annotation_repo.save_many([a for a in batch.annotations if a.target_hash in inserted])
+        if tag_annotation_repo is not None:
+            tag_annotation_repo.save_many([t for t in batch.tags if t.target_hash in inserted])
+        batch = _ImportBatch()
+
+    for lineno, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            raise ValueError(f"Corrupt tract archive at line {lineno}: {exc}") from exc
+        kind = record.pop("type", None)
+
+        if header is None:
+            if kind != "header" or record.get("format") != ARCHIVE_FORMAT:
+                raise ValueError("Not a tract archive (missing header record)")
+            if record.get("version") != ARCHIVE_VERSION:
+                raise ValueError(
+                    f"Unsupported tract archive version {record.get('version')!r} "
+                    f"(expected {ARCHIVE_VERSION})"
+                )
+            header = record
+            source_id = record.get("tract_id")
+            continue
+
+        if kind == "blob":
+            batch.blobs.append(_decode_row(BlobRow, record))
+        elif kind == "tool":
+            batch.tools.append(record)
+        elif kind == "commit":
+            batch.commits.append(_decode_row(CommitRow, record, tract_id=owner(record)))
+            if record.get("parents") or record.get("tools"):
+                batch.links.append(record)
+        elif kind == "annotation":
+            batch.annotations.append(_decode_row(AnnotationRow, record, tract_id=owner(record)))
+        elif kind == "tag":
+            batch.tags.append(_decode_row(TagAnnotationRow, record, tract_id=owner(record)))
+        elif kind == "tag_def":
+            tag_defs.append(record)
+        elif kind == "branch":
+            branches[record["name"]] = record["commit_hash"]
+        elif kind == "end":
+            ended = True
+            break
+        batch.size += 1
+        if batch.size >= page_size:
+            flush()
+
+    if header is None:
+        raise ValueError("Not a tract archive (empty stream)")
+    if not ended:
+        raise ValueError("Truncated tract archive: missing end record")
+    flush()
+
+    if tag_registry_repo is not None and tag_defs:
+        known = tag_registry_repo.batch_is_registered(tract_id, [d["tag_name"] for d in tag_defs])
+        for tag_def in tag_defs:
+            if tag_def["tag_name"] not in known:
+                tag_registry_repo.register(
+                    tract_id, tag_def["tag_name"], tag_def.get("description"),
+                    bool(tag_def.get("auto_created")),
+                    datetime.fromisoformat(tag_def["created_at"]),
+                )
+
+    for name, commit_hash in branches.items():
+        ref_repo.set_branch(tract_id, name, commit_hash)
+    if header.get("branch") in branches:
+        ref_repo.attach_head(tract_id, header["branch"])
+    elif header.get("head"):
+        ref_repo.detach_head(tract_id, header["head"])
+    return len(inserted)
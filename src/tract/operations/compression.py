@@ -19,7 +19,7 @@ import logging
 import re
 import uuid
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import TYPE_CHECKING
 
 from tract.exceptions import CompressionError
@@ -498,6 +498,61 @@ def _summarize_group(
     return content
 
 
+def _check_max_concurrency(max_concurrency: int) -> None:
+    if max_concurrency < 1:
+        raise ValueError(f"max_concurrency must be >= 1, got {max_concurrency}")
+
+
+def _summarize_groups(
+    texts: list[str],
+    llm_client: LLMClient,
+    token_counter: TokenCounter,
+    *,
+    retention_instructions: list[list[str]],
+    max_concurrency: int = 1,
+    target_tokens: int | None = None,
+    instructions: str | None = None,
+    system_prompt: str | None = None,
+    llm_kwargs: dict | None = None,
+) -> list[str]:
+    """Summarize independent groups, up to *max_concurrency* at a time.
+
+    Message texts must be built beforehand: only the LLM calls run on the
+    worker threads, so repositories are never touched off the caller's
+    thread.  Summaries are returned in group order.  If any group fails,
+    groups that have not started yet are cancelled and the first failure
+    in group order is raised.
+    """
+    _check_max_concurrency(max_concurrency)
+
+    def _one(gidx: int) -> str:
+        return _summarize_group(
+            texts[gidx], llm_client, token_counter,
+            target_tokens=target_tokens,
+            instructions=instructions,
+            system_prompt=system_prompt,
+            llm_kwargs=llm_kwargs,
+            retention_instructions=retention_instructions[gidx] or None,
+        )
+
+    if max_concurrency == 1 or len(texts) <= 1:
+        return [_one(gidx) for gidx in range(len(texts))]
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(
+        max_workers=min(max_concurrency, len(texts)),
+        thread_name_prefix="tract-summarize",
+    ) as pool:
+        futures = [pool.submit(_one, gidx) for gidx in range(len(texts))]
+        try:
+            return [f.result() for f in futures]
+        except BaseException:
+            for f in futures:
+                f.cancel()
+            raise
+
+
 def compress_range(
     tract_id: str,
     commit_repo: CommitRepository,
@@ -523,6 +578,7 @@ def compress_range(
     type_registry: dict[str, type] | None = None,
     triggered_by: str | None = None,
     two_stage: bool = False,
+    max_concurrency: int = 1,
 ) -> CompressRangeResult:
     """Core compression operation.
 
@@ -557,6 +613,9 @@ def compress_range(
         generation_config: Optional generation config to record on summary commits.
         type_registry: Optional custom content type registry.
         triggered_by: Optional provenance string (e.g. "trigger:auto_compress").
+        max_concurrency: Maximum number of groups summarized at once in
+            LLM mode.  Values above 1 run the LLM calls on a thread pool,
+            so the client must be thread-safe.
 
     Returns:
         CompressRangeResult with summary data and metadata.
@@ -649,26 +708,23 @@ def compress_range(
         )
 
     # f. Generate summaries
+    summaries: list[str | None]
     if content is not None:
         # Manual mode: single summary placed at group 0, subsequent groups
         # are absorbed (their commits replaced without a separate summary).
         summaries = [content] + [None] * (len(groups) - 1)  # type: ignore[list-item]  # None marks groups to absorb
     elif llm_client is not None:
-        # LLM mode: one summary per group
-        summaries = []
-        for gidx, group in enumerate(groups):
-            text = _build_messages_text(group, blob_repo)
-            g_ret_instructions = group_retention_instructions[gidx]
-
-            summary = _summarize_group(
-                text, llm_client, token_counter,
-                target_tokens=target_tokens,
-                instructions=instructions,
-                system_prompt=system_prompt,
-                llm_kwargs=llm_kwargs,
-                retention_instructions=g_ret_instructions or None,
-            )
-            summaries.append(summary)
+        # LLM mode: one summary per group (groups are independent)
+        summaries = list(_summarize_groups(
+            [_build_messages_text(group, blob_repo) for group in groups],
+            llm_client, token_counter,
+            retention_instructions=group_retention_instructions,
+            max_concurrency=max_concurrency,
+            target_tokens=target_tokens,
+            instructions=instructions,
+            system_prompt=system_prompt,
+            llm_kwargs=llm_kwargs,
+        ))
     else:
         raise CompressionError(
             "No LLM client configured and no manual content provided. "
@@ -715,6 +771,7 @@ def sliding_window_compress(
     type_registry: dict[str, type] | None = None,
     triggered_by: str | None = None,
     two_stage: bool = False,
+    max_concurrency: int = 1,
 ) -> CompressRangeResult | None:
     """Compress commits outside a sliding window.
 
@@ -743,6 +800,7 @@ def sliding_window_compress(
         type_registry: Optional custom content type registry.
         triggered_by: Optional provenance string.
         two_stage: Whether to use two-stage summarization.
+        max_concurrency: Maximum number of groups summarized at once.
 
     Returns:
         CompressRangeResult with summary data and metadata, or None if
@@ -836,23 +894,21 @@ def sliding_window_compress(
         )
 
     # 8. Generate summaries
+    summaries: list[str | None]
     if content is not None:
         # Manual mode: single summary for first group, rest absorbed
         summaries = [content] + [None] * (len(groups) - 1)  # type: ignore[list-item]  # None marks groups to absorb
     elif llm_client is not None:
-        summaries = []
-        for gidx, group in enumerate(groups):
-            text = _build_messages_text(group, blob_repo)
-            g_ret_instructions = group_retention_instructions[gidx]
-            summary = _summarize_group(
-                text, llm_client, token_counter,
-                target_tokens=target_tokens,
-                instructions=instructions,
-                system_prompt=system_prompt,
-                llm_kwargs=llm_kwargs,
-                retention_instructions=g_ret_instructions or None,
-            )
-            summaries.append(summary)
+        summaries = list(_summarize_groups(
+            [_build_messages_text(group, blob_repo) for group in groups],
+            llm_client, token_counter,
+            retention_instructions=group_retention_instructions,
+            max_concurrency=max_concurrency,
+            target_tokens=target_tokens,
+            instructions=instructions,
+            system_prompt=system_prompt,
+            llm_kwargs=llm_kwargs,
+        ))
     else:
         raise CompressionError(
             "No LLM client configured and no manual content provided. "
@@ -1155,57 +1211,41 @@ def _clear_head_for_root(
 # ===========================================================================
 
 
-def _get_all_reachable(
+def _gc_roots(
     tract_id: str,
     ref_repo: RefRepository,
     commit_repo: CommitRepository,
-    parent_repo: CommitParentRepository,
     *,
     branch: str | None = None,
-) -> set[str]:
-    """Get all reachable commit hashes from branch tips (and detached HEAD).
+) -> list[str]:
+    """Get the commits whose ancestry garbage collection must keep.
 
-    If ``branch`` is specified, only that branch's ancestors are considered.
-    Otherwise, all branches AND a potentially detached HEAD are scanned.
+    If ``branch`` is specified, only that branch's tip is a root.
+    Otherwise every branch tip AND a potentially detached HEAD are.
+    History other tracts build on (e.g. ``shared_prefix`` spawn children)
+    is always kept.
 
     Args:
         tract_id: Tract identifier.
         ref_repo: Ref repository for branch listings.
-        commit_repo: Commit repository for hash lookups.
-        parent_repo: Parent repository for multi-parent traversal.
-        branch: Optional specific branch to scan.
+        commit_repo: Commit repository for shared-root lookups.
+        branch: Optional specific branch to keep.
 
     Returns:
-        Set of reachable commit hashes.
+        Root commit hashes, without duplicates.
     """
-    from tract.operations.dag import get_all_ancestors
-
-    reachable: set[str] = set()
-
     if branch is not None:
-        # Scan only the specified branch
-        tip = ref_repo.get_branch(tract_id, branch)
-        if tip is not None:
-            reachable |= get_all_ancestors(tip, commit_repo, parent_repo)
-        return reachable
-
-    # Scan ALL branches, passing stop_at to short-circuit on already-known commits
-    for branch_name in ref_repo.list_branches(tract_id):
-        tip = ref_repo.get_branch(tract_id, branch_name)
-        if tip is not None:
-            reachable |= get_all_ancestors(
-                tip, commit_repo, parent_repo, stop_at=reachable
-            )
-
-    # Also check detached HEAD (may point to a commit not on any branch)
-    if ref_repo.is_detached(tract_id):
-        head = ref_repo.get_head(tract_id)
-        if head is not None:
-            reachable |= get_all_ancestors(
-                head, commit_repo, parent_repo, stop_at=reachable
-            )
-
-    return reachable
+        tips = [ref_repo.get_branch(tract_id, branch)]
+    else:
+        tips = [
+            ref_repo.get_branch(tract_id, name)
+            for name in ref_repo.list_branches(tract_id)
+        ]
+        # Detached HEAD may point to a commit not on any branch
+        if ref_repo.is_detached(tract_id):
+            tips.append(ref_repo.get_head(tract_id))
+    tips.extend(commit_repo.get_shared_roots(tract_id))
+    return list(dict.fromkeys(tip for tip in tips if tip is not None))
 
 
 def _normalize_dt(dt: datetime) -> datetime:
@@ -1225,11 +1265,14 @@ def plan_gc(
     orphan_retention_days: int = 7,
     archive_retention_days: int | None = None,
     branch: str | None = None,
+    limit: int | None = None,
 ) -> tuple[list[CommitRow], int]:
     """Plan phase of garbage collection -- determine what to remove.
 
     Finds all commits not reachable from any branch tip (or a specific
     branch), then identifies eligible ones based on age and archive status.
+    Reachability and retention are evaluated in one database query, so
+    only the commits to remove are loaded.
 
     Args:
         tract_id: Tract identifier.
@@ -1241,40 +1284,25 @@ def plan_gc(
         archive_retention_days: If set, days before archived commits become
             eligible for removal. None means archives are never removed.
         branch: If set, only this branch's reachability is considered.
+        limit: If set, plan at most this many commits, oldest first.
 
     Returns:
         Tuple of (commits_to_remove, tokens_to_free).
     """
-    # a. Find reachable commits
-    reachable = _get_all_reachable(
-        tract_id, ref_repo, commit_repo, parent_repo, branch=branch,
-    )
-
-    # b. Find all commits in tract
-    all_commits = commit_repo.get_all(tract_id)
-
-    # c. Compute unreachable
-    unreachable = [c for c in all_commits if c.commit_hash not in reachable]
-
-    # d. Classify and apply retention
+    roots = _gc_roots(tract_id, ref_repo, commit_repo, branch=branch)
     now = _normalize_dt(datetime.now(timezone.utc))
-    commits_to_remove: list[CommitRow] = []
-    tokens_to_free = 0
-
-    for commit in unreachable:
-        is_archive = event_repo.is_source_of(commit.commit_hash)
-        created = _normalize_dt(commit.created_at)
-        age_days = (now - created).total_seconds() / 86400
-
-        if is_archive:
-            if archive_retention_days is not None and age_days >= archive_retention_days:
-                commits_to_remove.append(commit)
-                tokens_to_free += commit.token_count
-        else:
-            if age_days >= orphan_retention_days:
-                commits_to_remove.append(commit)
-                tokens_to_free += commit.token_count
-
+    commits_to_remove = list(commit_repo.get_gc_candidates(
+        tract_id,
+        roots,
+        orphan_cutoff=now - timedelta(days=orphan_retention_days),
+        archive_cutoff=(
+            now - timedelta(days=archive_retention_days)
+            if archive_retention_days is not None
+            else None
+        ),
+        limit=limit,
+    ))
+    tokens_to_free = sum(c.token_count for c in commits_to_remove)
     return commits_to_remove, tokens_to_free
 
 
@@ -1287,6 +1315,10 @@ def execute_gc(
 ) -> GCResult:
     """Execute phase of garbage collection -- actually delete commits.
 
+    Commits, their provenance and dependent rows, newly orphaned blobs and
+    emptied operation events are removed with set-based bulk statements
+    in the caller's transaction.
+
     Args:
         tract_id: Tract identifier.
         commits_to_remove: List of CommitRow objects to delete.
@@ -1301,33 +1333,22 @@ def execute_gc(
 
     start = time.monotonic()
 
-    blobs_removed = 0
-    tokens_freed = 0
-    source_commits_removed = 0
-
-    for commit in commits_to_remove:
-        content_hash = commit.content_hash
-        tokens_freed += commit.token_count
-
-        # Track archive status before deleting provenance
-        if event_repo.is_source_of(commit.commit_hash):
-            source_commits_removed += 1
+    commit_hashes = [c.commit_hash for c in commits_to_remove]
+    content_hashes = [c.content_hash for c in commits_to_remove]
+    tokens_freed = sum(c.token_count for c in commits_to_remove)
 
-        # Clean up operation event provenance
-        event_repo.delete_commit(commit.commit_hash)
+    # Track archive status before deleting provenance
+    source_commits_removed = len(event_repo.filter_sources(commit_hashes))
 
-        # Delete the commit
-        commit_repo.delete(commit.commit_hash)
+    # Delete the commits (and their operation event provenance)
+    commit_repo.delete_many(commit_hashes)
 
-        # Try to delete the blob if no other commit references it
-        if blob_repo.delete_if_orphaned(content_hash):
-            blobs_removed += 1
+    # Delete blobs no other commit references
+    blobs_removed = blob_repo.delete_orphaned(content_hashes)
 
     # Clean up orphaned OperationEvent records (no sources AND no results left)
-    all_event_ids = event_repo.get_all_ids(tract_id)
-    for eid in all_event_ids:
-        if not event_repo.get_commits(eid, "source") and not event_repo.get_commits(eid, "result"):
-            event_repo.delete_event(eid)
+    if commit_hashes:
+        event_repo.delete_empty_events(tract_id)
 
     duration = time.monotonic() - start
 
@@ -1377,11 +1398,6 @@ def gc(
 
     Returns:
         GCResult with removal counts and duration.
-
-    Note:
-        Loads all commits for the tract into memory. This is acceptable for
-        conversation-scale data (hundreds to low thousands of commits) but
-        may need optimization for very large tracts.
     """
     commits_to_remove, _ = plan_gc(
         tract_id, commit_repo, ref_repo, parent_repo, event_repo,
@@ -1442,6 +1458,59 @@ async def _asummarize_group(
     return content
 
 
+async def _asummarize_groups(
+    texts: list[str],
+    llm_client: LLMClient,
+    token_counter: TokenCounter,
+    *,
+    retention_instructions: list[list[str]],
+    max_concurrency: int = 1,
+    target_tokens: int | None = None,
+    instructions: str | None = None,
+    system_prompt: str | None = None,
+    llm_kwargs: dict | None = None,
+) -> list[str]:
+    """Async version of :func:`_summarize_groups`.
+
+    Groups are gathered concurrently behind a semaphore of
+    *max_concurrency*.  Once a group fails, groups still waiting for the
+    semaphore are skipped; after all in-flight calls settle, the first
+    failure in group order is raised.
+    """
+    import asyncio
+
+    _check_max_concurrency(max_concurrency)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    failed = False
+
+    async def _one(gidx: int) -> str | None:
+        nonlocal failed
+        async with semaphore:
+            if failed:
+                return None
+            try:
+                return await _asummarize_group(
+                    texts[gidx], llm_client, token_counter,
+                    target_tokens=target_tokens,
+                    instructions=instructions,
+                    system_prompt=system_prompt,
+                    llm_kwargs=llm_kwargs,
+                    retention_instructions=retention_instructions[gidx] or None,
+                )
+            except Exception:
+                failed = True
+                raise
+
+    results = await asyncio.gather(
+        *(_one(gidx) for gidx in range(len(texts))),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return results  # type: ignore[return-value]  # no failures -> all str
+
+
 async def acompress_range(
     tract_id: str,
     commit_repo: CommitRepository,
@@ -1467,11 +1536,13 @@ async def acompress_range(
     type_registry: dict[str, type] | None = None,
     triggered_by: str | None = None,
     two_stage: bool = False,
+    max_concurrency: int = 1,
 ) -> CompressRangeResult:
     """Async version of :func:`compress_range`.
 
     The LLM calls (_asummarize_group, guidance generation) are awaited;
     all local operations (DAG walking, classification, etc.) remain sync.
+    Up to *max_concurrency* groups are summarized concurrently.
     """
     from tract.llm.protocols import acall_llm
 
@@ -1554,23 +1625,20 @@ async def acompress_range(
         )
 
     # f. Generate summaries
+    summaries: list[str | None]
     if content is not None:
         summaries = [content] + [None] * (len(groups) - 1)
     elif llm_client is not None:
-        summaries = []
-        for gidx, group in enumerate(groups):
-            text = _build_messages_text(group, blob_repo)
-            g_ret_instructions = group_retention_instructions[gidx]
-
-            summary = await _asummarize_group(
-                text, llm_client, token_counter,
-                target_tokens=target_tokens,
-                instructions=instructions,
-                system_prompt=system_prompt,
-                llm_kwargs=llm_kwargs,
-                retention_instructions=g_ret_instructions or None,
-            )
-            summaries.append(summary)
+        summaries = list(await _asummarize_groups(
+            [_build_messages_text(group, blob_repo) for group in groups],
+            llm_client, token_counter,
+            retention_instructions=group_retention_instructions,
+            max_concurrency=max_concurrency,
+            target_tokens=target_tokens,
+            instructions=instructions,
+            system_prompt=system_prompt,
+            llm_kwargs=llm_kwargs,
+        ))
     else:
         raise CompressionError(
             "No LLM client configured and no manual content provided. "
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Mapping, Sequence
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
@@ -12,17 +13,25 @@ if TYPE_CHECKING:
         CommitParentRepository,
         CommitRepository,
     )
+    from tract.storage.schema import CommitRow
+
+# ``params_key`` under which resolved indexes are persisted in the
+# compile-snapshot table, next to the compile snapshots themselves.
+PERSIST_KEY = "config-index"
 
 
 class ConfigIndex:
     """Per-key config resolution from DAG ancestry.
 
-    Walks ancestry, collects content_type="config" commits, resolves
-    per-key with DAG precedence (closer to HEAD wins).
+    Collects content_type="config" commits root-first and layers their
+    settings, so the commit closest to HEAD wins per key.  Indexes are
+    immutable snapshots of one head: :meth:`extend` returns a new index for
+    a descendant instead of mutating this one, which lets callers cache an
+    index per commit hash and derive a child's in O(keys).
     """
 
-    def __init__(self) -> None:
-        self._settings: dict[str, tuple[Any, int]] = {}  # key -> (value, dag_distance)
+    def __init__(self, settings: Mapping[str, Any] | None = None) -> None:
+        self._settings: dict[str, Any] = dict(settings) if settings else {}
         self._stale: bool = False
 
     @classmethod
@@ -38,33 +47,42 @@ class ConfigIndex:
         """Build index by walking ancestry and collecting config commits."""
         from tract.operations.ancestry import walk_ancestry
 
-        idx = cls()
         config_commits = walk_ancestry(
             commit_repo, blob_repo, head_hash,
             content_type_filter={"config"},
             parent_repo=parent_repo,
         )
-        # config_commits is root-first; distance = len - 1 - i (so HEAD-closest = 0)
-        total = len(config_commits)
-        for i, commit_row in enumerate(config_commits):
-            distance = total - 1 - i
-            blob = blob_repo.get(commit_row.content_hash)
+        return cls().extend(config_commits, blob_repo)
+
+    def extend(self, commits: Sequence[CommitRow], blob_repo: BlobRepository) -> ConfigIndex:
+        """Return the index after *commits* (root-first) are applied on top.
+
+        Non-config commits are ignored; config blobs are fetched in one
+        batch.  Returns ``self`` when *commits* contains no config commit.
+        """
+        configs = [c for c in commits if c.content_type == "config"]
+        if not configs:
+            return self
+        blobs = blob_repo.batch_get(list({c.content_hash for c in configs}))
+        settings = dict(self._settings)
+        for commit_row in configs:
+            blob = blobs.get(commit_row.content_hash)
             if blob is None:
                 continue
-            payload = json.loads(blob.payload_json)
-            settings = payload.get("settings", {})
-            for key, value in settings.items():
-                existing = idx._settings.get(key)
-                if existing is None or distance < existing[1]:
-                    idx._settings[key] = (value, distance)
-        return idx
+            settings.update(json.loads(blob.payload_json).get("settings", {}))
+        return type(self)(settings)
+
+    def apply(self, settings: Mapping[str, Any]) -> ConfigIndex:
+        """Return a new index with one config commit's *settings* on top."""
+        if not settings:
+            return self
+        merged = dict(self._settings)
+        merged.update(settings)
+        return type(self)(merged)
 
     def get(self, key: str, default: Any = None) -> Any:
         """Resolve a config value. None values are treated as 'not set'."""
-        entry = self._settings.get(key)
-        if entry is None:
-            return default
-        value = entry[0]
+        value = self._settings.get(key)
         if value is None:
             return default
         return value
@@ -72,10 +90,19 @@ class ConfigIndex:
     def get_all(self) -> dict[str, Any]:
         """Resolve all config key-value pairs (excluding None/unset)."""
         return {
-            key: val for key, (val, _dist) in self._settings.items()
+            key: val for key, val in self._settings.items()
             if val is not None
         }
 
+    def to_json(self) -> dict:
+        """Serialize the resolved settings (None values included)."""
+        return {"settings": dict(self._settings)}
+
+    @classmethod
+    def from_json(cls, data: Mapping[str, Any]) -> ConfigIndex:
+        """Rebuild an index written by :meth:`to_json`."""
+        return cls(data.get("settings"))
+
     def invalidate(self) -> None:
         """Mark index as stale (requires rebuild on next access)."""
         self._stale = True
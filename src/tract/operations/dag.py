@@ -2,12 +2,18 @@
 
 These utilities operate on the commit DAG, following both first-parent
 (CommitRow.parent_hash) and extra parents (CommitParentRow) for merge commits.
+
+Ancestry questions are answered by :class:`CommitGraph`, an in-memory
+commit-graph index in the spirit of git's commit-graph file: the parent
+adjacency and materialized generation numbers of the relevant history are
+loaded with one recursive query, and every walk after that is pure Python.
 """
 
 from __future__ import annotations
 
-from collections import deque
-from collections.abc import Iterator
+import heapq
+import itertools
+from collections.abc import Iterable
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -15,63 +21,159 @@ if TYPE_CHECKING:
     from tract.storage.schema import CommitRow
 
 
-def _bfs_walk(
-    start: str,
-    commit_repo: CommitRepository,
-    parent_repo: CommitParentRepository | None,
-    *,
-    stop_at: set[str] | None = None,
-) -> Iterator[str]:
-    """BFS walk from a start hash, yielding each visited commit hash once.
+class CommitGraph:
+    """Reachability index over commit generations and parent adjacency.
 
-    Follows both first-parent (parent_hash) and extra parents from
-    the commit_parents table (merge commits).
+    A commit's generation is 1 for roots and otherwise one more than its
+    highest parent, so an ancestor always has a strictly lower generation
+    than its descendants.  Walks use this to stop early: an ancestry check
+    never explores below the candidate's generation, and the merge base is
+    found by visiting commits in decreasing generation order.
 
-    Args:
-        start: Starting commit hash.
-        commit_repo: Commit repository for hash lookups.
-        parent_repo: Parent repository for multi-parent traversal.
-        stop_at: Optional set of known-visited hashes. When a commit is
-            in this set, it is yielded but its parents are not enqueued.
-            This avoids redundant walks when building reachability sets
-            across multiple branches.
+    Nodes are loaded from ``commit_repo.get_commit_graph`` on demand, so one
+    graph can serve several queries (e.g. every branch tip during GC) with
+    a single round-trip for the shared history.
     """
-    visited: set[str] = set()
-    queue: deque[str] = deque([start])
-    while queue:
-        current = queue.popleft()
-        if current in visited:
-            continue
-        visited.add(current)
-        yield current
-        # Short-circuit: if this commit is already known reachable,
-        # skip expanding its parents (they are already in stop_at).
-        if stop_at is not None and current in stop_at:
-            continue
-        commit = commit_repo.get(current)
-        if commit and commit.parent_hash:
-            queue.append(commit.parent_hash)
-        if parent_repo is not None:
-            for extra in parent_repo.get_parents(current):
-                if extra not in visited:
-                    queue.append(extra)
-
-
-def _get_parents(
-    commit_hash: str,
-    commit_repo: CommitRepository,
-    parent_repo: CommitParentRepository | None,
-) -> list[str]:
-    """Return all parent hashes (first-parent + extra merge parents) for a commit."""
-    parents: list[str] = []
-    commit = commit_repo.get(commit_hash)
-    if commit and commit.parent_hash:
-        parents.append(commit.parent_hash)
-    if parent_repo is not None:
-        for extra in parent_repo.get_parents(commit_hash):
-            if extra not in parents:
-                parents.append(extra)
-    return parents
+
+    def __init__(self, commit_repo: CommitRepository) -> None:
+        self._commit_repo = commit_repo
+        self._nodes: dict[str, tuple[int, tuple[str, ...]]] = {}
+        self._generations: dict[str, int] = {}
+        self._absent: set[str] = set()
+
+    def load(self, commit_hashes: Iterable[str], *, min_generation: int = 0) -> None:
+        """Load the ancestry of *commit_hashes* not already in the graph."""
+        missing = [
+            h for h in dict.fromkeys(commit_hashes)
+            if h not in self._nodes and h not in self._absent
+        ]
+        if not missing:
+            return
+        self._nodes.update(
+            self._commit_repo.get_commit_graph(missing, min_generation=min_generation)
+        )
+        self._absent.update(h for h in missing if h not in self._nodes)
+
+    def parents(self, commit_hash: str) -> tuple[str, ...]:
+        """Return the first parent followed by any merge parents."""
+        node = self._nodes.get(commit_hash)
+        if node is None:
+            self.load([commit_hash])
+            node = self._nodes.get(commit_hash)
+        return node[1] if node is not None else ()
+
+    def generation(self, commit_hash: str) -> int:
+        """Return the generation of *commit_hash* (0 if it is unknown).
+
+        Commits stored without a generation are resolved from their
+        parents and memoized.
+        """
+        gen = self._generations.get(commit_hash)
+        if gen is not None:
+            return gen
+        stack = [commit_hash]
+        while stack:
+            current = stack[-1]
+            if current in self._generations:
+                stack.pop()
+                continue
+            parents = self.parents(current)
+            node = self._nodes.get(current)
+            if node is None:
+                self._generations[current] = 0
+                stack.pop()
+                continue
+            if node[0] > 0:
+                self._generations[current] = node[0]
+                stack.pop()
+                continue
+            pending = [p for p in parents if p not in self._generations]
+            if pending:
+                stack.extend(pending)
+                continue
+            self._generations[current] = 1 + max(
+                (self._generations[p] for p in parents), default=0,
+            )
+            stack.pop()
+        return self._generations[commit_hash]
+
+    def ancestors(
+        self,
+        commit_hash: str,
+        *,
+        stop_at: set[str] | None = None,
+    ) -> set[str]:
+        """Return *commit_hash* and every commit reachable from it.
+
+        Commits in *stop_at* are included but their parents are not
+        explored.
+        """
+        self.load([commit_hash])
+        seen: set[str] = set()
+        stack = [commit_hash]
+        while stack:
+            current = stack.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            if stop_at is not None and current in stop_at:
+                continue
+            stack.extend(p for p in self.parents(current) if p not in seen)
+        return seen
+
+    def is_ancestor(self, potential_ancestor: str, commit_hash: str) -> bool:
+        """Return True if *potential_ancestor* is reachable from *commit_hash*."""
+        if potential_ancestor == commit_hash:
+            return True
+        self.load([potential_ancestor])
+        floor = self.generation(potential_ancestor)
+        self.load([commit_hash], min_generation=floor)
+        seen: set[str] = {commit_hash}
+        stack = [commit_hash]
+        while stack:
+            for parent in self.parents(stack.pop()):
+                if parent == potential_ancestor:
+                    return True
+                if parent in seen:
+                    continue
+                seen.add(parent)
+                if floor == 0 or self.generation(parent) > floor:
+                    stack.append(parent)
+        return False
+
+    def merge_base(self, hash_a: str, hash_b: str) -> str | None:
+        """Return a lowest common ancestor of two commits, or None.
+
+        Paints commits reachable from each side, visiting them in
+        decreasing generation order.  Every descendant of a commit has a
+        higher generation and is visited first, so the first commit found
+        painted by both sides is a common ancestor that no other common
+        ancestor descends from.
+        """
+        if hash_a == hash_b:
+            return hash_a
+        self.load([hash_a, hash_b])
+        side_a, side_b = 1, 2
+        paint = {hash_a: side_a, hash_b: side_b}
+        order = itertools.count()
+        heap = [
+            (-self.generation(hash_a), next(order), hash_a),
+            (-self.generation(hash_b), next(order), hash_b),
+        ]
+        heapq.heapify(heap)
+        while heap:
+            _, _, current = heapq.heappop(heap)
+            flags = paint[current]
+            if flags == side_a | side_b:
+                return current
+            for parent in self.parents(current):
+                seen = paint.get(parent, 0)
+                if seen | flags != seen:
+                    paint[parent] = seen | flags
+                    heapq.heappush(
+                        heap, (-self.generation(parent), next(order), parent),
+                    )
+        return None
 
 
 def find_merge_base(
@@ -79,65 +181,30 @@ def find_merge_base(
     parent_repo: CommitParentRepository | None,
     hash_a: str,
     hash_b: str,
+    *,
+    graph: CommitGraph | None = None,
 ) -> str | None:
     """Find the lowest common ancestor (merge base) of two commits.
 
-    Uses simultaneous two-frontier BFS: both sides expand level-by-level
-    in alternation, and the first node seen by both frontiers is the LCA.
-    This is guaranteed to find the *closest* common ancestor, unlike a
-    one-side-materialize approach which can return suboptimal results on
-    diamond DAGs.
+    Both ancestries are loaded into a :class:`CommitGraph` in one query
+    and walked in decreasing generation order, so the result is a closest
+    common ancestor even on diamond DAGs.
 
     Args:
         commit_repo: Commit repository for hash lookups.
-        parent_repo: Parent repository for multi-parent traversal.
+        parent_repo: Parent repository for multi-parent traversal.  Merge
+            parents are read through the commit graph; kept for API
+            compatibility.
         hash_a: First commit hash.
         hash_b: Second commit hash.
+        graph: Optional graph to reuse across several queries.
 
     Returns:
         The commit hash of the merge base, or None if no common ancestor.
     """
-    # Trivial case: same commit.
-    if hash_a == hash_b:
-        return hash_a
-
-    seen_a: set[str] = {hash_a}
-    seen_b: set[str] = {hash_b}
-    queue_a: deque[str] = deque([hash_a])
-    queue_b: deque[str] = deque([hash_b])
-
-    # Check initial overlap (one is already an ancestor of the other).
-    if hash_a in seen_b:
-        return hash_a
-    if hash_b in seen_a:
-        return hash_b
-
-    while queue_a or queue_b:
-        # Expand one level of frontier A.
-        if queue_a:
-            level_size = len(queue_a)
-            for _ in range(level_size):
-                current = queue_a.popleft()
-                for parent in _get_parents(current, commit_repo, parent_repo):
-                    if parent not in seen_a:
-                        if parent in seen_b:
-                            return parent
-                        seen_a.add(parent)
-                        queue_a.append(parent)
-
-        # Expand one level of frontier B.
-        if queue_b:
-            level_size = len(queue_b)
-            for _ in range(level_size):
-                current = queue_b.popleft()
-                for parent in _get_parents(current, commit_repo, parent_repo):
-                    if parent not in seen_b:
-                        if parent in seen_a:
-                            return parent
-                        seen_b.add(parent)
-                        queue_b.append(parent)
-
-    return None
+    if graph is None:
+        graph = CommitGraph(commit_repo)
+    return graph.merge_base(hash_a, hash_b)
 
 
 def get_all_ancestors(
@@ -146,6 +213,7 @@ def get_all_ancestors(
     parent_repo: CommitParentRepository | None,
     *,
     stop_at: set[str] | None = None,
+    graph: CommitGraph | None = None,
 ) -> set[str]:
     """Get all ancestor hashes of a commit (including itself).
 
@@ -157,11 +225,14 @@ def get_all_ancestors(
         parent_repo: Parent repository for multi-parent traversal.
         stop_at: Optional set of known-reachable hashes to short-circuit
             the walk. Parents of commits in this set are not explored.
+        graph: Optional graph to reuse across several queries.
 
     Returns:
         Set of all ancestor commit hashes (including commit_hash).
     """
-    return set(_bfs_walk(commit_hash, commit_repo, parent_repo, stop_at=stop_at))
+    if graph is None:
+        graph = CommitGraph(commit_repo)
+    return graph.ancestors(commit_hash, stop_at=stop_at)
 
 
 def get_branch_commits(
@@ -202,22 +273,24 @@ def is_ancestor(
     parent_repo: CommitParentRepository | None,
     potential_ancestor: str,
     commit_hash: str,
+    *,
+    graph: CommitGraph | None = None,
 ) -> bool:
     """Check if potential_ancestor is reachable from commit_hash.
 
-    Uses early-termination BFS via _bfs_walk — stops as soon as the
-    target is found, avoiding the cost of building the complete ancestor set.
+    Only history with a generation above the candidate's is loaded and
+    walked, since nothing below it can lead back to the candidate.
 
     Args:
         commit_repo: Commit repository for hash lookups.
         parent_repo: Parent repository for multi-parent traversal.
         potential_ancestor: The commit hash to check as ancestor.
         commit_hash: The commit hash to walk backwards from.
+        graph: Optional graph to reuse across several queries.
 
     Returns:
         True if potential_ancestor is reachable from commit_hash.
     """
-    for h in _bfs_walk(commit_hash, commit_repo, parent_repo):
-        if h == potential_ancestor:
-            return True
-    return False
+    if graph is None:
+        graph = CommitGraph(commit_repo)
+    return graph.is_ancestor(potential_ancestor, commit_hash)
@@ -69,7 +69,7 @@ def check_health(
     Returns:
         HealthReport with validation results and any warnings.
     """
-    from tract.operations.dag import get_all_ancestors
+    from tract.operations.dag import CommitGraph
 
     report = HealthReport()
 
@@ -102,23 +102,22 @@ def check_health(
 
     # Check 3 & 4: Reachability + branch HEAD validity (single pass over branches)
     reachable: set[str] = set()
-    branch_tips: dict[str, str | None] = {}
-
-    for branch_name in branches:
-        tip = ref_repo.get_branch(tract_id, branch_name)
-        branch_tips[branch_name] = tip
-        if tip is not None:
-            reachable |= get_all_ancestors(
-                tip, commit_repo, parent_repo, stop_at=reachable
-            )
+    branch_tips: dict[str, str | None] = {
+        name: ref_repo.get_branch(tract_id, name) for name in branches
+    }
+    tips = [tip for tip in branch_tips.values() if tip is not None]
 
     # Also check detached HEAD
     if ref_repo.is_detached(tract_id):
         head = ref_repo.get_head(tract_id)
         if head is not None:
-            reachable |= get_all_ancestors(
-                head, commit_repo, parent_repo, stop_at=reachable
-            )
+            tips.append(head)
+
+    # One commit-graph load covers the shared history of every tip
+    graph = CommitGraph(commit_repo)
+    graph.load(tips)
+    for tip in tips:
+        reachable |= graph.ancestors(tip, stop_at=reachable)
 
     orphans = all_commits.keys() - reachable
     report.orphan_count = len(orphans)
@@ -129,10 +128,10 @@ def check_health(
         )
 
     # Check 4: Branch HEAD validity (reuses tips fetched in check 3)
-    for branch_name, tip in branch_tips.items():
-        if tip and tip not in all_commits:
+    for branch_name, branch_tip in branch_tips.items():
+        if branch_tip and branch_tip not in all_commits:
             report.warnings.append(
-                f"Branch '{branch_name}' HEAD points to missing commit {tip[:8]}"
+                f"Branch '{branch_name}' HEAD points to missing commit {branch_tip[:8]}"
             )
             report.healthy = False
 
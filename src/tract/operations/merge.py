@@ -14,7 +14,12 @@ from tract.exceptions import MergeError, NothingToMergeError
 from tract.models.commit import CommitInfo, CommitOperation
 from tract.models.merge import ConflictInfo, ConflictType, MergeResult, MergeStrategy
 from tract.operations import row_to_info as _row_to_info
-from tract.operations.dag import find_merge_base, get_branch_commits, is_ancestor
+from tract.operations.dag import (
+    CommitGraph,
+    find_merge_base,
+    get_branch_commits,
+    is_ancestor,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -342,7 +347,8 @@ def merge_branches(
         raise NothingToMergeError(source_branch)
 
     # --- Fast-forward check ---
-    if is_ancestor(commit_repo, parent_repo, current_hash, source_hash):
+    graph = CommitGraph(commit_repo)
+    if is_ancestor(commit_repo, parent_repo, current_hash, source_hash, graph=graph):
         if not no_ff:
             # Fast-forward: move branch pointer to source tip
             ref_repo.set_branch(tract_id, current_branch, source_hash)
@@ -357,7 +363,9 @@ def merge_branches(
             )
 
     # --- Find merge base ---
-    merge_base = find_merge_base(commit_repo, parent_repo, current_hash, source_hash)
+    merge_base = find_merge_base(
+        commit_repo, parent_repo, current_hash, source_hash, graph=graph,
+    )
 
     # Check if source is already merged (source tip is ancestor of current)
     if merge_base == source_hash:
@@ -19,7 +19,12 @@ from tract.models.merge import (
     RebaseWarning,
 )
 from tract.operations import row_to_info as _row_to_info
-from tract.operations.dag import find_merge_base, get_all_ancestors, get_branch_commits
+from tract.operations.dag import (
+    CommitGraph,
+    find_merge_base,
+    get_all_ancestors,
+    get_branch_commits,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -327,8 +332,11 @@ def plan_rebase(
     if current_tip == target_tip:
         return None
 
-    # Find merge base
-    merge_base = find_merge_base(commit_repo, parent_repo, current_tip, target_tip)
+    # Find merge base; the graph is reused for the target ancestry below
+    graph = CommitGraph(commit_repo)
+    merge_base = find_merge_base(
+        commit_repo, parent_repo, current_tip, target_tip, graph=graph,
+    )
 
     # If target is already an ancestor of current (current is ahead), nothing to replay
     if merge_base == target_tip:
@@ -345,16 +353,16 @@ def plan_rebase(
         return None
 
     # Pre-flight: block if any commit in replay range has merge parents
-    for c in commits_to_replay:
-        parents = parent_repo.get_parents(c.commit_hash)
-        if parents:
-            raise RebaseError("Cannot rebase branch containing merge commits")
+    if parent_repo.batch_get_parents([c.commit_hash for c in commits_to_replay]):
+        raise RebaseError("Cannot rebase branch containing merge commits")
 
     # Build info list for original commits
     original_infos = [_row_to_info(c) for c in commits_to_replay]
 
     # Get target branch ancestors for EDIT target checking
-    target_ancestors = get_all_ancestors(target_tip, commit_repo, parent_repo)
+    target_ancestors = get_all_ancestors(
+        target_tip, commit_repo, parent_repo, graph=graph,
+    )
 
     # Semantic safety checks
     warnings: list[RebaseWarning] = []
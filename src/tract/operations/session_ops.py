@@ -8,19 +8,22 @@ and list_tracts functionality.
 from __future__ import annotations
 
 import json
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from typing import TYPE_CHECKING
 
 from sqlalchemy import func, select
 
 from tract.models.commit import CommitInfo
+from tract.protocols import _copy_compiled
 from tract.storage.schema import BlobRow, CommitRow
 
 if TYPE_CHECKING:
     from sqlalchemy import Engine
     from sqlalchemy.orm import Session, sessionmaker
 
-    from tract.protocols import CompiledContext
+    from tract.protocols import CompiledContext, TokenCounter
     from tract.storage.sqlite import SqliteSpawnPointerRepository
 
 
@@ -126,17 +129,59 @@ def search(
     term: str,
     *,
     tract_id: str | None = None,
+    branch: str | None = None,
+    content_type: str | None = None,
+    limit: int | None = None,
 ) -> list[CommitInfo]:
-    """Search for commits matching a term in blob content.
+    """Search for commits whose content contains a term.
+
+    Matching is a case-insensitive substring test on the text extracted
+    from each commit's content, answered from the full-text index and
+    ranked by relevance.  Without the index (SQLite built without FTS5)
+    blob payloads are scanned with LIKE and results are oldest first.
 
     Args:
         session: SQLAlchemy session.
-        term: Search term (matched via LIKE on blob payload).
+        term: Search term.
         tract_id: Optional filter to a specific tract.
+        branch: Optional branch of *tract_id* whose history to search.
+        content_type: Optional filter to a content type.
+        limit: Maximum number of results.
 
     Returns:
         List of matching CommitInfo.
+
+    Raises:
+        ValueError: If *branch* is given without *tract_id*.
+        BranchNotFoundError: If *branch* does not exist.
     """
+    from tract.storage.sqlite import (
+        SqliteCommitRepository,
+        SqliteRefRepository,
+        SqliteSearchIndexRepository,
+    )
+
+    head: str | None = None
+    if branch is not None:
+        if tract_id is None:
+            raise ValueError("search(branch=...) requires tract_id")
+        from tract.exceptions import BranchNotFoundError
+
+        head = SqliteRefRepository(session).get_branch(tract_id, branch)
+        if head is None:
+            raise BranchNotFoundError(branch)
+
+    index = SqliteSearchIndexRepository(session)
+    if index.available:
+        rows = index.search(
+            term,
+            tract_id=tract_id,
+            ancestor_of=head,
+            content_type=content_type,
+            limit=limit,
+        )
+        return [_row_to_commit_info(row) for row in rows]
+
     # Escape LIKE wildcards
     escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
@@ -156,12 +201,54 @@ def search(
     ).order_by(CommitRow.created_at.asc())
 
     if tract_id is not None:
-        commit_stmt = commit_stmt.where(CommitRow.tract_id == tract_id)
+        from tract.storage.sqlite import _tract_scope
+
+        commit_stmt = commit_stmt.where(
+            _tract_scope(session, tract_id, CommitRow.commit_hash, CommitRow.tract_id)
+        )
+    if content_type is not None:
+        commit_stmt = commit_stmt.where(CommitRow.content_type == content_type)
+    if limit is not None and head is None:
+        commit_stmt = commit_stmt.limit(limit)
 
     rows = session.execute(commit_stmt).scalars().all()
+    if head is not None:
+        reachable = {
+            r.commit_hash
+            for r in SqliteCommitRepository(session).get_ancestors_with_merges(head)
+        }
+        rows = [r for r in rows if r.commit_hash in reachable][:limit]
     return [_row_to_commit_info(row) for row in rows]
 
 
+class CompileAtMemo:
+    """Bounded, thread-safe memo of :func:`compile_at` results.
+
+    Entries are keyed by tract, resolved HEAD, the historical bound and the
+    tract's annotation watermark, so new commits or priority changes never
+    serve a stale result.  Cached values are read-only views.
+    """
+
+    def __init__(self, maxsize: int = 64) -> None:
+        self._entries: OrderedDict[tuple, CompiledContext] = OrderedDict()
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> CompiledContext | None:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: tuple, value: CompiledContext) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+
 def compile_at(
     session_factory: sessionmaker[Session],
     engine: Engine,
@@ -169,6 +256,8 @@ def compile_at(
     *,
     at_time: datetime | None = None,
     at_commit: str | None = None,
+    token_counter: TokenCounter | None = None,
+    memo: CompileAtMemo | None = None,
 ) -> CompiledContext:
     """Compile any tract at a historical point-in-time.
 
@@ -180,6 +269,10 @@ def compile_at(
         tract_id: The tract to compile.
         at_time: Compile as of this datetime.
         at_commit: Compile up to this commit hash.
+        token_counter: Optional shared token counter.  A new
+            ``TiktokenCounter`` is built when omitted.
+        memo: Optional :class:`CompileAtMemo`.  When given, repeated
+            compiles of the same point return a shared read-only result.
 
     Returns:
         CompiledContext for the tract at the specified point.
@@ -205,7 +298,8 @@ def compile_at(
         annotation_repo = SqliteAnnotationRepository(session)
         parent_repo = SqliteCommitParentRepository(session)
 
-        token_counter = TiktokenCounter(encoding_name=config.tokenizer_encoding)
+        if token_counter is None:
+            token_counter = TiktokenCounter(encoding_name=config.tokenizer_encoding)
 
         compiler = DefaultContextCompiler(
             commit_repo=commit_repo,
@@ -222,12 +316,26 @@ def compile_at(
 
             return CompiledContext(messages=[], token_count=0, commit_count=0, token_source="")
 
-        return compiler.compile(
+        key: tuple | None = None
+        if memo is not None:
+            from tract.storage.sqlite import SqliteCompileSnapshotRepository
+
+            watermark = SqliteCompileSnapshotRepository(session).annotation_watermark(tract_id)
+            key = (tract_id, head_hash, at_time, at_commit, watermark)
+            cached = memo.get(key)
+            if cached is not None:
+                return _copy_compiled(cached)
+
+        result = compiler.compile(
             tract_id,
             head_hash,
             at_time=at_time,
             at_commit=at_commit,
         )
+        if memo is not None and key is not None:
+            memo.put(key, result)
+            return _copy_compiled(result)
+        return result
     finally:
         session.close()
 
@@ -5,6 +5,7 @@ Provides:
 - collapse_tract(): Compress child tract history into a summary commit in parent
 - _head_snapshot(): Compile parent context and seed child with it
 - _full_clone(): Replay all parent commits into child tract
+- _shared_prefix(): Point child HEAD at the parent's commits (zero-copy)
 - _selective_clone(): Replay filtered subset of parent commits into child tract
 """
 
@@ -49,6 +50,7 @@ def spawn_tract(
     include_instructions: bool = True,
     inherit_tools: bool = False,
     context_budget: int | None = None,
+    token_counter: TokenCounter | None = None,
 ) -> Tract:
     """Create a child tract linked to parent via spawn pointer.
 
@@ -59,7 +61,10 @@ def spawn_tract(
         parent_tract: The parent Tract instance.
         purpose: Description of the child's task.
         inheritance: Inheritance mode: "head_snapshot" (default), "full_clone",
-            or "selective".
+            "selective", or "shared_prefix".  ``shared_prefix`` copies
+            nothing: the child's HEAD starts at the parent's HEAD commit and
+            new child commits build on it, so spawning costs O(1)
+            regardless of parent history length.
         display_name: Optional human-readable name for the child.
         max_tokens: Max tokens for head_snapshot (truncates from oldest).
         filter_func: For selective mode: callable ``(commit_row) -> bool``
@@ -78,6 +83,9 @@ def spawn_tract(
             child. For head_snapshot this is wired to ``max_tokens``. For
             selective mode, commits exceeding the budget are dropped
             (oldest non-instruction first).
+        token_counter: Optional shared token counter for the child (e.g.
+            the owning session's).  A new ``TiktokenCounter`` is built when
+            omitted.
 
     Returns:
         The new child Tract instance.
@@ -86,7 +94,7 @@ def spawn_tract(
         SpawnError: If inheritance mode is invalid.
         ValueError: If selective mode is used without any filter criteria.
     """
-    if inheritance not in ("head_snapshot", "full_clone", "selective"):
+    if inheritance not in ("head_snapshot", "full_clone", "selective", "shared_prefix"):
         raise SpawnError(f"Unknown inheritance mode: {inheritance}")
 
     if inheritance == "selective":
@@ -172,7 +180,7 @@ def spawn_tract(
     child_parent_repo = SqliteCommitParentRepository(child_session)
     child_event_repo = SqliteOperationEventRepository(child_session)
 
-    child_token_counter = TiktokenCounter(
+    child_token_counter = token_counter or TiktokenCounter(
         encoding_name=child_config.tokenizer_encoding,
     )
 
@@ -236,6 +244,9 @@ def spawn_tract(
             token_counter=child_token_counter,
         )
         child_session.commit()
+    elif inheritance == "shared_prefix":
+        _shared_prefix(parent_head, child_ref_repo, child_tract_id)
+        child_session.commit()
 
     # Build child Tract instance
     child = Tract(
@@ -257,6 +268,16 @@ def spawn_tract(
     child._create_managers()
     child._create_deferred_managers()
 
+    # A shared-prefix child compiles exactly what the parent compiled, so a
+    # warm parent snapshot can seed the child's cache.
+    if inheritance == "shared_prefix" and parent_head is not None:
+        snapshot = parent_tract._cache.get(parent_head)
+        if (
+            snapshot is not None
+            and parent_tract._cache._params_key() == child._cache._params_key()
+        ):
+            child._cache.put(parent_head, snapshot)
+
     # Inherit tools from parent if requested
     if inherit_tools:
         parent_tools = parent_tract.tools.get()
@@ -316,6 +337,41 @@ def _head_snapshot(
     return info.commit_hash
 
 
+def _shared_prefix(
+    parent_head: str | None,
+    child_ref_repo,
+    child_tract_id: str,
+) -> str | None:
+    """Point the child's HEAD at the parent's HEAD commit.
+
+    Commits and blobs are immutable and content-addressed, so the child
+    can reference the parent's history directly; its own commits are new
+    rows chained onto ``parent_head`` (copy-on-write).  Nothing is read,
+    re-hashed or re-tokenized.
+
+    Annotations are keyed by commit hash, so priority changes on inherited
+    commits are visible to both tracts (as with ``Session.deploy``
+    branches).
+
+    Inherited commits keep the parent's ``tract_id``.  Tract-scoped
+    lookups (hash prefixes, search, config, tag and edit-history queries)
+    reach them through the recorded fork point; ownership queries such as
+    ``get_all``, export and GC still cover only the child's own commits.
+
+    Args:
+        parent_head: Parent HEAD captured before the spawn commit.
+        child_ref_repo: Child's ref repository.
+        child_tract_id: The child tract identifier.
+
+    Returns:
+        Child's HEAD hash, or None if the parent is empty.
+    """
+    if parent_head is None:
+        return None
+    child_ref_repo.update_head(child_tract_id, parent_head)
+    return parent_head
+
+
 def _full_clone(
     parent_tract,
     child_commit_engine: CommitEngine,
@@ -13,6 +13,7 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import TYPE_CHECKING, Literal, Protocol, TypedDict, runtime_checkable
 
+from tract.engine.persistent import PersistentVector
 from tract.models.config import LLMConfig
 
 if TYPE_CHECKING:
@@ -459,6 +460,28 @@ def _add_cache_control_to_message(messages: list[dict], idx: int) -> None:
     # else: empty list — nothing to annotate.
 
 
+_EMPTY_VECTOR: PersistentVector = PersistentVector()
+
+
+def _copy_compiled(result: CompiledContext) -> CompiledContext:
+    """Return *result* with fresh copies of its list fields.
+
+    Cached results are handed out through this copy-on-output guard so
+    that callers mutating the returned lists never corrupt the cache.
+    Messages and configs are frozen and shared, so the copy is shallow.
+    """
+    return CompiledContext(
+        messages=list(result.messages),
+        token_count=result.token_count,
+        commit_count=result.commit_count,
+        token_source=result.token_source,
+        generation_configs=list(result.generation_configs),
+        commit_hashes=list(result.commit_hashes),
+        priorities=list(result.priorities),
+        tools=list(result.tools),
+    )
+
+
 @dataclass(frozen=True)
 class CompileSnapshot:
     """Cached intermediate compilation state for incremental extension.
@@ -470,18 +493,43 @@ class CompileSnapshot:
 
     ``token_count`` equals ``sum(message_token_counts) + RESPONSE_PRIMER_TOKENS``
     when tiktoken-sourced, or the API-reported prompt_tokens when API-sourced.
+
+    The per-position fields are :class:`~tract.engine.persistent.PersistentVector`
+    instances (tuples and lists passed in are converted), so a snapshot
+    extended by one commit or patched at one index shares storage with the
+    snapshot it was derived from.
     """
 
     head_hash: str
-    messages: tuple[Message, ...]
+    messages: PersistentVector[Message]
     commit_count: int
     token_count: int
     token_source: str
-    generation_configs: tuple[dict, ...] = ()
-    commit_hashes: tuple[str, ...] = ()
-    priorities: tuple[str, ...] = ()
-    message_token_counts: tuple[int, ...] = ()
-    tool_hashes: tuple[str, ...] = ()
+    generation_configs: PersistentVector[dict] = _EMPTY_VECTOR
+    commit_hashes: PersistentVector[str] = _EMPTY_VECTOR
+    priorities: PersistentVector[str] = _EMPTY_VECTOR
+    message_token_counts: PersistentVector[int] = _EMPTY_VECTOR
+    tool_hashes: PersistentVector[str] = _EMPTY_VECTOR
+    # Memoized CompiledContext template (see CacheManager.to_compiled)
+    _compiled: CompiledContext | None = field(
+        default=None, init=False, repr=False, compare=False,
+    )
+
+    def __post_init__(self) -> None:
+        for name in _SNAPSHOT_VECTOR_FIELDS:
+            value = getattr(self, name)
+            if not isinstance(value, PersistentVector):
+                object.__setattr__(self, name, PersistentVector(value))
+
+
+_SNAPSHOT_VECTOR_FIELDS = (
+    "messages",
+    "generation_configs",
+    "commit_hashes",
+    "priorities",
+    "message_token_counts",
+    "tool_hashes",
+)
 
 
 @dataclass(frozen=True)
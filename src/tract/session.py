@@ -15,6 +15,7 @@ Usage::
 from __future__ import annotations
 
 import logging
+import threading
 import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
@@ -23,6 +24,7 @@ from tract.exceptions import CurationError, SessionError
 from tract.storage.repositories import RefRepository
 from tract.models.config import TractConfig
 from tract.models.session import CollapseResult
+from tract.operations.session_ops import CompileAtMemo
 from tract.operations.spawn import (
     collapse_tract,
     spawn_tract,
@@ -35,7 +37,7 @@ if TYPE_CHECKING:
     from sqlalchemy import Engine
     from sqlalchemy.orm import sessionmaker
 
-    from tract.protocols import CompiledContext
+    from tract.protocols import CompiledContext, TokenCounter
     from tract.models.commit import CommitInfo
     from tract.tract import Tract
 
@@ -109,6 +111,34 @@ class _BranchScopedRefProxy(RefRepository):
         return self._real.get_symbolic_ref(tract_id, ref_name)
 
 
+class _SharedComponents:
+    """Immutable, thread-safe components shared by every tract in a session.
+
+    Repositories, commit engines and compilers are bound to a tract's own
+    SQLAlchemy session and stay per-tract.  Token counters hold no
+    per-tract state, so one instance per encoding is reused by every
+    tract, spawned child and deploy child in the session -- which also
+    shares the counter's token-count memo across sub-agents.
+    """
+
+    def __init__(self) -> None:
+        self._token_counters: dict[str, TokenCounter] = {}
+        self._lock = threading.Lock()
+
+    def token_counter(self, encoding_name: str) -> TokenCounter:
+        """Return the session's token counter for *encoding_name*."""
+        counter = self._token_counters.get(encoding_name)
+        if counter is None:
+            from tract.engine.tokens import TiktokenCounter
+
+            with self._lock:
+                counter = self._token_counters.get(encoding_name)
+                if counter is None:
+                    counter = TiktokenCounter(encoding_name=encoding_name)
+                    self._token_counters[encoding_name] = counter
+        return counter
+
+
 class Session:
     """Multi-agent entry point backed by a single shared SQLite DB.
 
@@ -132,6 +162,8 @@ class Session:
         self._autonomy = autonomy
         self._tracts: dict[str, Tract] = {}
         self._closed = False
+        self._shared = _SharedComponents()
+        self._compile_at_memo = CompileAtMemo()
         # Keep the session used by spawn_repo alive
         self._spawn_session = spawn_repo._session
 
@@ -196,7 +228,6 @@ class Session:
         """
         from tract.engine.commit import CommitEngine
         from tract.engine.compiler import DefaultContextCompiler
-        from tract.engine.tokens import TiktokenCounter
         from tract.storage.sqlite import (
             SqliteAnnotationRepository,
             SqliteBlobRepository,
@@ -224,10 +255,8 @@ class Session:
         parent_repo = SqliteCommitParentRepository(session)
         event_repo = SqliteOperationEventRepository(session)
 
-        # Token counter
-        token_counter = TiktokenCounter(
-            encoding_name=config.tokenizer_encoding,
-        )
+        # Token counter (shared across the session)
+        token_counter = self._shared.token_counter(config.tokenizer_encoding)
 
         # Commit engine
         commit_engine = CommitEngine(
@@ -391,7 +420,9 @@ class Session:
         Args:
             parent: The parent Tract.
             purpose: Description of the child's task.
-            inheritance: "head_snapshot" (default), "full_clone", or "selective".
+            inheritance: "head_snapshot" (default), "full_clone", "selective",
+                or "shared_prefix" (zero-copy: the child builds directly on
+                the parent's commits).
             display_name: Optional human-readable name for the child.
             max_tokens: Max tokens for head_snapshot truncation.
             filter_func: For selective mode: callable ``(commit_row) -> bool``.
@@ -444,6 +475,7 @@ class Session:
             include_instructions=include_instructions,
             inherit_tools=inherit_tools,
             context_budget=context_budget,
+            token_counter=self._shared.token_counter(TractConfig().tokenizer_encoding),
         )
         self._tracts[child.tract_id] = child
         child._session_owner = self
@@ -625,7 +657,6 @@ class Session:
         )
         from tract.engine.commit import CommitEngine
         from tract.engine.compiler import DefaultContextCompiler
-        from tract.engine.tokens import TiktokenCounter
         from tract.tract import Tract as _Tract
 
         # 1. Create new branch from parent HEAD (without switching)
@@ -654,9 +685,7 @@ class Session:
         # not the shared HEAD symbolic ref.
         child_ref_repo = _BranchScopedRefProxy(real_ref_repo, branch_name)
 
-        child_token_counter = TiktokenCounter(
-            encoding_name=child_config.tokenizer_encoding,
-        )
+        child_token_counter = self._shared.token_counter(child_config.tokenizer_encoding)
 
         child_commit_engine = CommitEngine(
             commit_repo=child_commit_repo,
@@ -693,6 +722,8 @@ class Session:
             event_repo=child_event_repo,
         )
         child._spawn_repo = self._spawn_repo
+        # Same tract_id, same stored blobs: share the parent's content types
+        child._custom_type_registry = parent._custom_type_registry
 
         # Set up tag repos on child so get_tags() works
         child._tag_annotation_repo = SqliteTagAnnotationRepository(child_session)
@@ -841,20 +872,39 @@ class Session:
         return _timeline(self._spawn_session, limit=limit)
 
     def search(
-        self, term: str, *, tract_id: str | None = None
+        self,
+        term: str,
+        *,
+        tract_id: str | None = None,
+        branch: str | None = None,
+        content_type: str | None = None,
+        limit: int | None = None,
     ) -> list[CommitInfo]:
         """Search for commits matching a term across tracts.
 
+        Uses the full-text index over commit content; results are ranked
+        by relevance, best match first.
+
         Args:
-            term: Search term (matched via LIKE on blob content).
+            term: Search term (case-insensitive substring of the content text).
             tract_id: Optional filter to a specific tract.
+            branch: Optional branch of *tract_id* whose history to search.
+            content_type: Optional filter to a content type.
+            limit: Maximum number of results.
 
         Returns:
             List of matching CommitInfo.
         """
         from tract.operations.session_ops import search as _search
 
-        return _search(self._spawn_session, term, tract_id=tract_id)
+        return _search(
+            self._spawn_session,
+            term,
+            tract_id=tract_id,
+            branch=branch,
+            content_type=content_type,
+            limit=limit,
+        )
 
     def compile_at(
         self,
@@ -870,6 +920,9 @@ class Session:
             at_time: Compile as of this datetime.
             at_commit: Compile up to this commit hash.
 
+        Results are memoized per resolved HEAD, bound and annotation
+        state, so repeated calls return the same read-only context.
+
         Returns:
             CompiledContext for the tract at the specified point.
         """
@@ -881,6 +934,8 @@ class Session:
             tract_id,
             at_time=at_time,
             at_commit=at_commit,
+            token_counter=self._shared.token_counter(TractConfig().tokenizer_encoding),
+            memo=self._compile_at_memo,
         )
 
     def resume(self) -> Tract | None:
@@ -1010,12 +1065,16 @@ def _curate_keep_tags(child: Tract, keep_tags: list[str]) -> None:
     """
     from tract.models.annotations import Priority
 
-    tag_set = set(keep_tags)
     chain = _get_commit_chain(child)
+    if not chain:
+        return
+    kept = {
+        row.commit_hash
+        for row in child._tag_index_repo.get_commits(keep_tags, ancestor_of=child.head)
+    }
 
     for row in chain:
-        commit_tags = set(child.get_tags(row.commit_hash))
-        if not (commit_tags & tag_set):
+        if row.commit_hash not in kept:
             child.annotate(row.commit_hash, Priority.SKIP, reason="curation:keep_tags")
 
 
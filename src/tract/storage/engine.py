@@ -7,12 +7,15 @@ session factory creation, and database initialization.
 from __future__ import annotations
 
 import json
+import logging
 
 from sqlalchemy import Engine, create_engine, event, select
 from sqlalchemy.orm import Session, sessionmaker
 
 from tract.storage.schema import Base, TraceMetaRow
 
+logger = logging.getLogger(__name__)
+
 
 def create_trace_engine(
     db_path: str = ":memory:",
@@ -163,27 +166,241 @@ def _migrate_compressions_v5_to_v6(engine: Engine) -> None:
         conn.commit()
 
 
+def _backfill_chain_token_totals(engine: Engine) -> None:
+    """Add and populate commits.chain_token_total (v13 -> v14).
+
+    The column is added with ALTER TABLE when missing, then every commit's
+    total is computed in one pass over (commit_hash, parent_hash,
+    token_count) and written back with a single executemany.
+    """
+    from sqlalchemy import text
+
+    with engine.connect() as conn:
+        columns = [
+            r[1]
+            for r in conn.execute(text("PRAGMA table_info(commits)")).fetchall()
+        ]
+        if "chain_token_total" not in columns:
+            conn.execute(text(
+                "ALTER TABLE commits ADD COLUMN "
+                "chain_token_total INTEGER NOT NULL DEFAULT 0"
+            ))
+
+        rows = conn.execute(
+            text("SELECT commit_hash, parent_hash, token_count FROM commits")
+        ).fetchall()
+        parents = {r[0]: r[1] for r in rows}
+        counts = {r[0]: r[2] or 0 for r in rows}
+
+        totals: dict[str, int] = {}
+        for start in parents:
+            # Climb to the nearest commit whose total is known (or a root),
+            # then unwind, so every commit is visited once overall.
+            pending: list[str] = []
+            current: str | None = start
+            while current is not None and current in parents and current not in totals:
+                pending.append(current)
+                current = parents[current]
+            base = totals.get(current, 0) if current is not None else 0
+            for commit_hash in reversed(pending):
+                base += counts[commit_hash]
+                totals[commit_hash] = base
+
+        if totals:
+            conn.execute(
+                text(
+                    "UPDATE commits SET chain_token_total = :total "
+                    "WHERE commit_hash = :ch"
+                ),
+                [{"total": t, "ch": ch} for ch, t in totals.items()],
+            )
+        conn.commit()
+
+
+def _backfill_commit_generations(engine: Engine) -> None:
+    """Add and populate commits.generation (v16 -> v17).
+
+    Roots get generation 1 and every other commit one more than the
+    highest generation among its primary and merge parents.  Parent
+    adjacency is read in two queries and resolved in memory with an
+    explicit stack, so deep histories do not hit the recursion limit.
+    """
+    from sqlalchemy import text
+
+    with engine.connect() as conn:
+        columns = [
+            r[1]
+            for r in conn.execute(text("PRAGMA table_info(commits)")).fetchall()
+        ]
+        if "generation" not in columns:
+            conn.execute(text(
+                "ALTER TABLE commits ADD COLUMN "
+                "generation INTEGER NOT NULL DEFAULT 0"
+            ))
+
+        parents: dict[str, list[str]] = {
+            r[0]: [r[1]] if r[1] else []
+            for r in conn.execute(
+                text("SELECT commit_hash, parent_hash FROM commits")
+            ).fetchall()
+        }
+        for commit_hash, parent_hash in conn.execute(
+            text("SELECT commit_hash, parent_hash FROM commit_parents")
+        ).fetchall():
+            if commit_hash in parents and parent_hash not in parents[commit_hash]:
+                parents[commit_hash].append(parent_hash)
+
+        generations: dict[str, int] = {}
+        for start in parents:
+            stack = [start]
+            while stack:
+                current = stack[-1]
+                if current in generations:
+                    stack.pop()
+                    continue
+                pending = [
+                    p for p in parents[current]
+                    if p in parents and p not in generations
+                ]
+                if pending:
+                    stack.extend(pending)
+                    continue
+                generations[current] = 1 + max(
+                    (generations.get(p, 0) for p in parents[current]), default=0,
+                )
+                stack.pop()
+
+        if generations:
+            conn.execute(
+                text(
+                    "UPDATE commits SET generation = :gen "
+                    "WHERE commit_hash = :ch"
+                ),
+                [{"gen": g, "ch": ch} for ch, g in generations.items()],
+            )
+        conn.commit()
+
+
+def _add_compile_record_delta_columns(engine: Engine) -> None:
+    """Add the delta-encoding columns to compile_records (v17 -> v18).
+
+    Existing records keep NULL ``base_record_id`` and ``effective_count``,
+    which marks them as full checkpoints in the pre-delta format.
+    """
+    from sqlalchemy import text
+
+    with engine.connect() as conn:
+        columns = [
+            r[1]
+            for r in conn.execute(text("PRAGMA table_info(compile_records)")).fetchall()
+        ]
+        for name, ddl in (
+            ("base_record_id", "VARCHAR(64)"),
+            ("keep_prefix", "INTEGER NOT NULL DEFAULT 0"),
+            ("keep_suffix", "INTEGER NOT NULL DEFAULT 0"),
+            ("effective_count", "INTEGER"),
+            ("delta_depth", "INTEGER NOT NULL DEFAULT 0"),
+        ):
+            if name not in columns:
+                conn.execute(text(f"ALTER TABLE compile_records ADD COLUMN {name} {ddl}"))
+        conn.commit()
+
+
+def _backfill_current_annotations(engine: Engine) -> None:
+    """Populate current_annotations from annotation history (v18 -> v19).
+
+    Each annotated commit points at its newest annotation: the latest
+    ``created_at``, highest id on ties.
+    """
+    from sqlalchemy import text
+
+    Base.metadata.tables["current_annotations"].create(engine, checkfirst=True)
+    with engine.connect() as conn:
+        conn.execute(text("DELETE FROM current_annotations"))
+        conn.execute(text("""
+            INSERT INTO current_annotations (target_hash, tract_id, annotation_id, created_at)
+            SELECT a.target_hash, a.tract_id, a.id, a.created_at
+            FROM annotations a
+            WHERE NOT EXISTS (
+                SELECT 1 FROM annotations b
+                WHERE b.target_hash = a.target_hash
+                  AND (b.created_at > a.created_at
+                       OR (b.created_at = a.created_at AND b.id > a.id))
+            )
+        """))
+        conn.commit()
+
+
+def _backfill_tag_index(engine: Engine) -> None:
+    """Index existing commit tags and tag annotations (v19 -> v20)."""
+    from tract.storage.sqlite import SqliteTagIndexRepository
+
+    Base.metadata.tables["commit_tags"].create(engine, checkfirst=True)
+    with sessionmaker(bind=engine)() as session:
+        SqliteTagIndexRepository(session).reindex()
+        session.commit()
+
+
+def _create_search_index(engine: Engine) -> None:
+    """Create the ``blob_fts`` FTS5 table backing full-text search.
+
+    Idempotent.  Skipped on non-SQLite backends and on SQLite builds
+    without FTS5, in which case search falls back to scanning blobs.
+    """
+    from sqlalchemy import text
+    from sqlalchemy.exc import OperationalError
+
+    if engine.dialect.name != "sqlite":
+        return
+    try:
+        with engine.connect() as conn:
+            conn.execute(text(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS blob_fts "
+                "USING fts5(body, tokenize='trigram')"
+            ))
+            conn.commit()
+    except OperationalError:
+        logger.warning("SQLite FTS5 unavailable; full-text search index disabled")
+
+
+def _backfill_search_index(engine: Engine) -> None:
+    """Index every existing blob in ``blob_fts`` (v15 -> v16)."""
+    from tract.storage.sqlite import SqliteSearchIndexRepository
+
+    with sessionmaker(bind=engine)() as session:
+        SqliteSearchIndexRepository(session).reindex()
+        session.commit()
+
+
 def init_db(engine: Engine) -> None:
     """Initialize the database: create all tables and set schema version.
 
     Creates all tables defined in Base.metadata, then sets schema_version.
-    For new databases, schema_version is set to "13".
-    For existing v1 databases, migrates v1->v2->...->v13.
-    For existing v2 databases, migrates v2->v3->...->v13.
-    For existing v3 databases, migrates v3->v4->...->v13.
-    For existing v4 databases, migrates v4->v5->...->v13 (trigger tables).
-    For existing v5 databases, migrates v5->v6->...->v13 (unified operation events).
-    For existing v6 databases, migrates v6->v7->v8->v9->v10->v11->v12->v13 (retention_json on annotations).
-    For existing v7 databases, migrates v7->v8->v9->v10->v11->v12->v13 (tool tracking tables).
-    For existing v8 databases, migrates v8->v9->v10->v11->v12->v13 (instruction columns on operation_events).
-    For existing v9 databases, migrates v9->v10->v11->v12->v13 (tags system).
-    For existing v10 databases, migrates v10->v11->v12->v13 (persistence tables).
-    For existing v11 databases, migrates v11->v12->v13 (config provenance).
-    For existing v12 databases, migrates v12->v13 (behavioral specs).
+    For new databases, schema_version is set to "20".
+    For existing v1 databases, migrates v1->v2->...->v14->v15->v16->v17->v18->v19->v20.
+    For existing v2 databases, migrates v2->v3->...->v14->v15->v16->v17->v18->v19->v20.
+    For existing v3 databases, migrates v3->v4->...->v14->v15->v16->v17->v18->v19->v20.
+    For existing v4 databases, migrates v4->v5->...->v13->v14->v15->v16->v17->v18->v19->v20 (trigger tables).
+    For existing v5 databases, migrates v5->v6->...->v13->v14->v15->v16->v17->v18->v19->v20 (unified operation events).
+    For existing v6 databases, migrates v6->v7->v8->v9->v10->v11->v12->v13->v14->v15->v16->v17->v18->v19->v20 (retention_json on annotations).
+    For existing v7 databases, migrates v7->v8->v9->v10->v11->v12->v13->v14->v15->v16->v17->v18->v19->v20 (tool tracking tables).
+    For existing v8 databases, migrates v8->v9->v10->v11->v12->v13->v14->v15->v16->v17->v18->v19->v20 (instruction columns on operation_events).
+    For existing v9 databases, migrates v9->v10->v11->v12->v13->v14->v15->v16->v17->v18->v19->v20 (tags system).
+    For existing v10 databases, migrates v10->v11->v12->v13->v14->v15->v16->v17->v18->v19->v20 (persistence tables).
+    For existing v11 databases, migrates v11->v12->v13->v14->v15->v16->v17->v18->v19->v20 (config provenance).
+    For existing v12 databases, migrates v12->v13->v14->v15->v16->v17->v18->v19->v20 (behavioral specs).
+    For existing v13 databases, migrates v13->v14->v15->v16->v17->v18->v19->v20 (chain_token_total on commits).
+    For existing v14 databases, migrates v14->v15->v16->v17->v18->v19->v20 (compile_snapshots table).
+    For existing v15 databases, migrates v15->v16->v17->v18->v19->v20 (full-text search index).
+    For existing v16 databases, migrates v16->v17->v18->v19->v20 (commit generation numbers).
+    For existing v17 databases, migrates v17->v18->v19->v20 (delta-encoded compile records).
+    For existing v18 databases, migrates v18->v19->v20 (current-annotation pointers).
+    For existing v19 databases, migrates v19->v20 (unified commit tag index).
     """
     from sqlalchemy import text
 
     Base.metadata.create_all(engine)
+    _create_search_index(engine)
 
     SessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
     with SessionLocal() as session:
@@ -192,8 +409,8 @@ def init_db(engine: Engine) -> None:
         ).scalar_one_or_none()
 
         if existing is None:
-            # New database: set schema version to 13
-            session.add(TraceMetaRow(key="schema_version", value="13"))
+            # New database: set schema version to 20
+            session.add(TraceMetaRow(key="schema_version", value="20"))
             session.commit()
         elif existing.value == "1":
             # Migrate v1 -> v2: create commit_parents table
@@ -455,3 +672,38 @@ def init_db(engine: Engine) -> None:
             Base.metadata.tables["behavioral_specs"].create(engine, checkfirst=True)
             existing.value = "13"
             session.commit()
+        if existing is not None and existing.value == "13":
+            # Migrate v13 -> v14: materialized running token totals on commits
+            _backfill_chain_token_totals(engine)
+            existing.value = "14"
+            session.commit()
+        if existing is not None and existing.value == "14":
+            # Migrate v14 -> v15: persisted compile snapshots
+            Base.metadata.tables["compile_snapshots"].create(engine, checkfirst=True)
+            existing.value = "15"
+            session.commit()
+        if existing is not None and existing.value == "15":
+            # Migrate v15 -> v16: full-text search index over blob text
+            _backfill_search_index(engine)
+            existing.value = "16"
+            session.commit()
+        if existing is not None and existing.value == "16":
+            # Migrate v16 -> v17: commit-graph generation numbers
+            _backfill_commit_generations(engine)
+            existing.value = "17"
+            session.commit()
+        if existing is not None and existing.value == "17":
+            # Migrate v17 -> v18: delta-encoded compile records
+            _add_compile_record_delta_columns(engine)
+            existing.value = "18"
+            session.commit()
+        if existing is not None and existing.value == "18":
+            # Migrate v18 -> v19: materialized current-annotation pointers
+            _backfill_current_annotations(engine)
+            existing.value = "19"
+            session.commit()
+        if existing is not None and existing.value == "19":
+            # Migrate v19 -> v20: unified commit tag index
+            _backfill_tag_index(engine)
+            existing.value = "20"
+            session.commit()
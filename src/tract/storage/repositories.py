@@ -9,7 +9,7 @@ Concrete implementations are in sqlite.py.
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -22,6 +22,7 @@ if TYPE_CHECKING:
         CommitRow,
         CompileEffectiveRow,
         CompileRecordRow,
+        CompileSnapshotRow,
         ConfigChangeRow,
         OperationCommitRow,
         OperationConfigRow,
@@ -46,6 +47,24 @@ class CommitRepository(ABC):
         """Save a commit to storage."""
         ...
 
+    @abstractmethod
+    def save_many(self, commits: Sequence[CommitRow]) -> None:
+        """Insert many new commits with a single bulk statement.
+
+        Rows are written as-is and are not added to the session's
+        identity map.
+        """
+        ...
+
+    @abstractmethod
+    def save_many_if_absent(self, commits: Sequence[CommitRow]) -> set[str]:
+        """Bulk-insert the commits whose hash is not stored yet.
+
+        Used to import commits verbatim; existing commits are left
+        untouched.  Returns the hashes that were actually inserted.
+        """
+        ...
+
     @abstractmethod
     def get_ancestors(
         self,
@@ -114,11 +133,46 @@ class CommitRepository(ABC):
     def sum_ancestor_tokens(self, commit_hash: str) -> int:
         """Sum token_count for all ancestors in the parent chain (inclusive).
 
-        Uses a single SQL query instead of loading all ancestor rows.
+        Reads the commit's materialized ``chain_token_total`` column, so the
+        cost is independent of chain length.  Returns 0 if commit_hash is
+        not found.
+        """
+        ...
+
+    @abstractmethod
+    def get_generation(self, commit_hash: str) -> int:
+        """Read the materialized commit-graph generation of a commit.
+
         Returns 0 if commit_hash is not found.
         """
         ...
 
+    @abstractmethod
+    def get_commit_graph(
+        self,
+        start_hashes: Sequence[str],
+        *,
+        min_generation: int = 0,
+    ) -> dict[str, tuple[int, tuple[str, ...]]]:
+        """Load generation numbers and parent adjacency for an ancestry.
+
+        Collects every commit reachable from *start_hashes* through primary
+        and merge parents in a single recursive query.  Commits whose
+        generation is below *min_generation* are returned but their parents
+        are not explored, which bounds ancestry checks to the relevant
+        slice of history.
+
+        Args:
+            start_hashes: Commit hashes to start from.
+            min_generation: Lowest generation whose parents are followed.
+                Commits with an uncomputed generation (0) are always followed.
+
+        Returns:
+            Map of commit hash to ``(generation, parents)``, where parents
+            lists the first parent followed by any extra merge parents.
+        """
+        ...
+
     @abstractmethod
     def get_by_prefix(self, prefix: str, tract_id: str | None = None) -> CommitRow | None:
         """Find commit by hash prefix (min 4 chars).
@@ -133,6 +187,30 @@ class CommitRepository(ABC):
         """Get all commits for a tract, ordered by created_at ascending."""
         ...
 
+    @abstractmethod
+    def iter_history(
+        self, tract_id: str, *, page_size: int = 500
+    ) -> Iterator[Sequence[CommitRow]]:
+        """Stream a tract's commits in pages, parents before children.
+
+        Includes ancestors that belong to other tracts (e.g. the prefix
+        shared by a spawned tract), so every page only references commits
+        from the same or earlier pages.  Ordered by (generation,
+        commit_hash); only one page is held in memory at a time.
+        """
+        ...
+
+    @abstractmethod
+    def get_shared_roots(self, tract_id: str) -> set[str]:
+        """Get this tract's commits that other tracts build on.
+
+        A commit is a shared root when a commit of another tract uses it as
+        a parent (primary or merge), or a ref of another tract points at it
+        -- e.g. after a ``shared_prefix`` spawn.  GC treats these, and their
+        ancestors, as reachable.
+        """
+        ...
+
     @abstractmethod
     def get_edits_for(self, commit_hash: str, tract_id: str) -> Sequence[CommitRow]:
         """Get the original commit and all its edits in chronological order.
@@ -152,7 +230,11 @@ class CommitRepository(ABC):
 
     @abstractmethod
     def get_ancestors_with_merges(
-        self, start_hash: str, limit: int | None = None
+        self,
+        start_hash: str,
+        limit: int | None = None,
+        *,
+        op_filter: object | None = None,
     ) -> Sequence[CommitRow]:
         """Walk ancestry following both primary parents and merge parents.
 
@@ -163,6 +245,7 @@ class CommitRepository(ABC):
         Args:
             start_hash: Starting commit hash.
             limit: Maximum number of rows to return.
+            op_filter: If set, only include commits with this CommitOperation.
 
         Returns:
             Ancestor CommitRows in reverse chronological order.
@@ -186,6 +269,46 @@ class CommitRepository(ABC):
         """Delete a commit by hash. Also cleans up CommitParentRow entries."""
         ...
 
+    @abstractmethod
+    def delete_many(self, commit_hashes: Sequence[str]) -> None:
+        """Set-based variant of :meth:`delete` for many commits at once.
+
+        Related rows are removed and references from surviving commits
+        are nullified with one statement per table and chunk of hashes.
+        """
+        ...
+
+    @abstractmethod
+    def get_gc_candidates(
+        self,
+        tract_id: str,
+        roots: Sequence[str],
+        *,
+        orphan_cutoff: datetime,
+        archive_cutoff: datetime | None = None,
+        limit: int | None = None,
+    ) -> Sequence[CommitRow]:
+        """Get this tract's commits that garbage collection may remove.
+
+        A commit qualifies when it is not reachable from any of *roots*
+        (following primary and merge parents) and is old enough: commits
+        that are the source of an operation event (archives) must be
+        created at or before *archive_cutoff* (never, when None), all
+        others at or before *orphan_cutoff*.  Reachability and retention
+        are evaluated in a single query.
+
+        Args:
+            tract_id: Tract identifier to scope the query.
+            roots: Commit hashes whose ancestry is kept.
+            orphan_cutoff: Latest creation time of removable orphans.
+            archive_cutoff: Latest creation time of removable archives.
+            limit: Maximum number of commits to return.
+
+        Returns:
+            Matching commits ordered by created_at ascending (oldest first).
+        """
+        ...
+
 
 class BlobRepository(ABC):
     """Abstract interface for blob storage operations."""
@@ -203,6 +326,11 @@ class BlobRepository(ABC):
         """
         ...
 
+    @abstractmethod
+    def save_many_if_absent(self, blobs: Sequence[BlobRow]) -> None:
+        """Bulk variant of :meth:`save_if_absent` (one executemany)."""
+        ...
+
     @abstractmethod
     def batch_get(self, content_hashes: list[str]) -> dict[str, BlobRow]:
         """Get multiple blobs by content hash in a single query.
@@ -222,6 +350,76 @@ class BlobRepository(ABC):
         """
         ...
 
+    @abstractmethod
+    def delete_orphaned(self, content_hashes: Sequence[str]) -> int:
+        """Delete every blob in *content_hashes* that no commit references.
+
+        Set-based variant of :meth:`delete_if_orphaned`.  Returns the
+        number of blobs deleted.
+        """
+        ...
+
+
+class SearchIndexRepository(ABC):
+    """Abstract interface for the full-text index over blob text.
+
+    Blobs are indexed once per content hash when they are stored and
+    removed when they are garbage collected.  Queries join the index back
+    to commits so results can be scoped by tract, ancestry and content type.
+    """
+
+    @property
+    @abstractmethod
+    def available(self) -> bool:
+        """Whether the backing index exists (e.g. SQLite built with FTS5)."""
+        ...
+
+    @abstractmethod
+    def index_blobs(self, blobs: Sequence[BlobRow]) -> None:
+        """Add blobs to the index.  Already-indexed hashes are skipped."""
+        ...
+
+    @abstractmethod
+    def remove(self, content_hashes: Sequence[str]) -> None:
+        """Remove blobs from the index."""
+        ...
+
+    @abstractmethod
+    def reindex(self) -> int:
+        """Index every stored blob that is missing from the index.
+
+        Returns the number of blobs added.
+        """
+        ...
+
+    @abstractmethod
+    def search(
+        self,
+        text: str | None = None,
+        *,
+        pattern: str | None = None,
+        case_sensitive: bool = False,
+        tract_id: str | None = None,
+        ancestor_of: str | None = None,
+        content_type: str | None = None,
+        ranked: bool = True,
+        limit: int | None = None,
+    ) -> Sequence[CommitRow]:
+        """Find commits whose content matches *text* and/or *pattern*.
+
+        Args:
+            text: Substring to look for in the extracted content text.
+            pattern: Regular expression the extracted text must match.
+            case_sensitive: Match *text* case-sensitively.
+            tract_id: Only include commits of this tract.
+            ancestor_of: Only include this commit and its ancestors
+                (primary and merge parents).
+            content_type: Only include commits of this content type.
+            ranked: Order by relevance (best first) instead of newest first.
+            limit: Maximum number of commits to return.
+        """
+        ...
+
 
 class RefRepository(ABC):
     """Abstract interface for ref (branch/HEAD pointer) operations."""
@@ -313,6 +511,15 @@ class CommitParentRepository(ABC):
         """
         ...
 
+    @abstractmethod
+    def batch_get_parents(self, commit_hashes: Sequence[str]) -> dict[str, list[str]]:
+        """Get ordered parent hashes for many commits at once.
+
+        Commits with no entries in the parent table are omitted from the
+        result.  Each list is ordered by position.
+        """
+        ...
+
     @abstractmethod
     def add_parents(self, commit_hash: str, parent_hashes: list[str]) -> None:
         """Batch add parents for a commit. Position = list index."""
@@ -332,6 +539,11 @@ class AnnotationRepository(ABC):
         """Save an annotation (append-only)."""
         ...
 
+    @abstractmethod
+    def save_many(self, annotations: Sequence[AnnotationRow]) -> None:
+        """Insert many annotations with a single bulk statement."""
+        ...
+
     @abstractmethod
     def get_history(self, target_hash: str) -> Sequence[AnnotationRow]:
         """Get all annotations for a commit, ordered by created_at ascending."""
@@ -348,6 +560,15 @@ class AnnotationRepository(ABC):
         """
         ...
 
+    @abstractmethod
+    def batch_get_history(self, target_hashes: list[str]) -> dict[str, list[AnnotationRow]]:
+        """Get the full annotation history of many commits at once.
+
+        Returns a dict mapping target_hash to its annotations ordered by
+        created_at ascending.  Commits with no annotations are omitted.
+        """
+        ...
+
 
 class OperationEventRepository(ABC):
     """Abstract interface for unified operation event storage.
@@ -400,6 +621,11 @@ class OperationEventRepository(ABC):
         """Get all source commit hashes for a tract across all events."""
         ...
 
+    @abstractmethod
+    def filter_sources(self, commit_hashes: Sequence[str]) -> set[str]:
+        """Return the subset of *commit_hashes* that are a source in any event."""
+        ...
+
     @abstractmethod
     def get_all_ids(self, tract_id: str) -> list[str]:
         """Get all event IDs for a tract."""
@@ -415,6 +641,93 @@ class OperationEventRepository(ABC):
         """Delete an event and all its commit associations."""
         ...
 
+    @abstractmethod
+    def delete_empty_events(self, tract_id: str) -> int:
+        """Delete a tract's events that have no source or result commits left.
+
+        Returns the number of events deleted.
+        """
+        ...
+
+
+class TagIndexRepository(ABC):
+    """Abstract interface for the unified commit tag index.
+
+    Holds one membership per commit and tag for each source: immutable
+    tags set at commit time (``"commit"``) and mutable tag annotations
+    (``"annotation"``).  The commit and tag-annotation repositories keep
+    it up to date; queries combine both sources.
+    """
+
+    @abstractmethod
+    def index_commits(self, commits: Sequence[CommitRow]) -> None:
+        """Add the immutable tags of *commits*."""
+        ...
+
+    @abstractmethod
+    def index_annotations(self, rows: Sequence[TagAnnotationRow]) -> None:
+        """Add mutable tag annotations.  Already-indexed tags are skipped."""
+        ...
+
+    @abstractmethod
+    def unindex_annotation(self, commit_hash: str, tag: str) -> None:
+        """Remove the mutable membership of *tag* on *commit_hash*."""
+        ...
+
+    @abstractmethod
+    def reindex(self) -> int:
+        """Index every stored commit tag and tag annotation that is missing.
+
+        Returns the number of memberships added.
+        """
+        ...
+
+    @abstractmethod
+    def get_tags(self, commit_hash: str) -> list[str]:
+        """All tags of a commit (both sources), sorted and deduplicated."""
+        ...
+
+    @abstractmethod
+    def get_commits(
+        self,
+        tags: Sequence[str],
+        *,
+        match: str = "any",
+        tract_id: str | None = None,
+        ancestor_of: str | None = None,
+        op_filter: object | None = None,
+        limit: int | None = None,
+    ) -> Sequence[CommitRow]:
+        """Commits carrying any (``match="any"``) or all (``"all"``) of *tags*.
+
+        Args:
+            tags: Tag names to look for.
+            match: ``"any"`` or ``"all"``.
+            tract_id: Only include commits of this tract.
+            ancestor_of: Only include this commit and its ancestors
+                (primary and merge parents).
+            op_filter: Only include commits with this operation.
+            limit: Maximum number of commits to return.
+
+        Returns commits newest first.
+        """
+        ...
+
+    @abstractmethod
+    def count_commits(
+        self,
+        tags: Sequence[str],
+        *,
+        tract_id: str | None = None,
+        ancestor_of: str | None = None,
+    ) -> dict[str, int]:
+        """Number of distinct commits carrying each of *tags*.
+
+        Scoped like :meth:`get_commits`: by *tract_id* and/or to the
+        merge-aware ancestry of *ancestor_of*.
+        """
+        ...
+
 
 class CompileRecordRepository(ABC):
     """Abstract interface for compile record storage.
@@ -457,7 +770,95 @@ class CompileRecordRepository(ABC):
 
     @abstractmethod
     def get_effectives(self, record_id: str) -> list[CompileEffectiveRow]:
-        """Get effective commits for a compile record, ordered by position."""
+        """Get the stored effective rows for a compile record, ordered by position.
+
+        For a delta-encoded record these are only the positions it changed;
+        use :meth:`get_commit_hashes` for the full list.
+        """
+        ...
+
+    @abstractmethod
+    def save_effectives(
+        self,
+        record_id: str,
+        commit_hashes: Sequence[str],
+        base: tuple[str, Sequence[str]] | None = None,
+    ) -> None:
+        """Store a record's effective commits, delta-encoded against *base*.
+
+        *base* is ``(record_id, commit_hashes)`` of an earlier record of the
+        same tract, typically the previous one on the same branch.  Without
+        a usable base, or when a checkpoint is due, the full list is stored.
+        """
+        ...
+
+    @abstractmethod
+    def get_commit_hashes(self, record_id: str) -> list[str]:
+        """Reconstruct the ordered effective commit hashes of a record.
+
+        Commits removed since the record was written are omitted.  Returns
+        an empty list for an unknown record.
+        """
+        ...
+
+
+class CompileSnapshotRepository(ABC):
+    """Abstract interface for persisted compile-cache snapshots.
+
+    Snapshots are keyed by (tract_id, head_hash, params_key).  Saving an
+    existing key replaces it.
+    """
+
+    @abstractmethod
+    def get(
+        self, tract_id: str, head_hash: str, params_key: str
+    ) -> CompileSnapshotRow | None:
+        """Get the snapshot stored for a head. Returns None if not found."""
+        ...
+
+    @abstractmethod
+    def save(self, row: CompileSnapshotRow) -> None:
+        """Insert or replace a snapshot."""
+        ...
+
+    @abstractmethod
+    def find_nearest_ancestor(
+        self, tract_id: str, head_hash: str, params_key: str
+    ) -> tuple[CompileSnapshotRow, int] | None:
+        """Find the closest first-parent ancestor of *head_hash* with a snapshot.
+
+        *head_hash* itself counts as distance 0.
+
+        Returns:
+            ``(row, distance)`` where distance is the number of commits
+            between the snapshot head and *head_hash*, or None.
+        """
+        ...
+
+    @abstractmethod
+    def prune(
+        self,
+        tract_id: str,
+        keep: int,
+        *,
+        params_key: str | None = None,
+        exclude: Sequence[str] = (),
+    ) -> int:
+        """Delete all but the *keep* most recent snapshots. Returns count deleted.
+
+        With *params_key* only rows stored under that key are considered;
+        rows whose key is in *exclude* are never counted or deleted.
+        """
+        ...
+
+    @abstractmethod
+    def annotation_watermark(self, tract_id: str) -> int:
+        """Return the highest annotation id for a tract (0 if none)."""
+        ...
+
+    @abstractmethod
+    def annotations_since(self, tract_id: str, watermark: int) -> list[AnnotationRow]:
+        """Get annotations with id greater than *watermark*, ordered by id."""
         ...
 
 
@@ -642,6 +1043,20 @@ class TagAnnotationRepository(ABC):
         """
         ...
 
+    @abstractmethod
+    def batch_get_rows(self, target_hashes: list[str]) -> dict[str, list[TagAnnotationRow]]:
+        """Get the tag annotation rows of many commits at once.
+
+        Like :meth:`batch_get_tags` but returns full rows (ordered by
+        created_at) so they can be exported and re-imported verbatim.
+        """
+        ...
+
+    @abstractmethod
+    def save_many(self, rows: Sequence[TagAnnotationRow]) -> None:
+        """Insert many tag annotations with a single bulk statement."""
+        ...
+
 
 class TagRegistryRepository(ABC):
     """Abstract interface for tag registry storage.
@@ -70,6 +70,17 @@ class CommitRow(Base):
     )
     message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     token_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Sum of token_count along the first-parent chain, this commit included.
+    # Materialized at commit time so budget checks are a single column read.
+    chain_token_total: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    # Commit-graph generation number: 1 for roots, otherwise one more than
+    # the highest generation among all parents (0 means not yet computed).
+    # Lets ancestry queries prune any commit whose generation is too low.
+    generation: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
     metadata_json: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
     generation_config_json: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
     tags_json: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
@@ -109,7 +120,8 @@ class AnnotationRow(Base):
     """Lightweight priority annotation (like git tags).
 
     Append-only: each change creates a new row for provenance.
-    The latest row for a given target_hash is the current annotation.
+    The latest row for a given target_hash is the current annotation;
+    :class:`CurrentAnnotationRow` points at it.
     """
 
     __tablename__ = "annotations"
@@ -131,6 +143,28 @@ class AnnotationRow(Base):
     )
 
 
+class CurrentAnnotationRow(Base):
+    """Pointer to the current annotation of each annotated commit.
+
+    Materialized view over the append-only ``annotations`` table so that
+    priority lookups are a primary-key join instead of a newest-per-target
+    scan.  The current annotation is the one with the latest
+    ``created_at`` (highest id on ties); ``created_at`` is copied here so
+    writes can keep the pointer up to date without reading history.
+    """
+
+    __tablename__ = "current_annotations"
+
+    target_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    tract_id: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
+    annotation_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("annotations.id"),
+        nullable=False,
+    )
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+
 class CommitParentRow(Base):
     """Association table for multi-parent commits (merge commits).
 
@@ -223,6 +257,14 @@ class CompileRecordRow(Base):
 
     Captures the state of a compile: which head it was built from,
     how many tokens/commits were included, and what parameters were used.
+
+    The effective commit list is delta-encoded: a record with a
+    ``base_record_id`` keeps the first ``keep_prefix`` and last
+    ``keep_suffix`` entries of its base's list and stores only the
+    positions in between as :class:`CompileEffectiveRow` rows.  A record
+    without a base is a full checkpoint.  ``effective_count`` is the full
+    list length (None on records written before delta encoding) and
+    ``delta_depth`` the number of deltas since the last checkpoint.
     """
 
     __tablename__ = "compile_records"
@@ -235,6 +277,11 @@ class CompileRecordRow(Base):
     token_source: Mapped[str] = mapped_column(String(50), nullable=False)
     params_json: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    base_record_id: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    keep_prefix: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    keep_suffix: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    effective_count: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    delta_depth: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
 
     __table_args__ = (
         Index("ix_compile_records_tract_time", "tract_id", "created_at"),
@@ -244,7 +291,8 @@ class CompileRecordRow(Base):
 class CompileEffectiveRow(Base):
     """Association between a compile record and the commits that were effective.
 
-    Position preserves the order of commits as they appeared in the compiled context.
+    Position preserves the order of commits as they appeared in the compiled
+    context.  Delta records store rows only for the positions they changed.
     """
 
     __tablename__ = "compile_effectives"
@@ -262,6 +310,46 @@ class CompileEffectiveRow(Base):
     position: Mapped[int] = mapped_column(Integer, nullable=False)
 
 
+class CompileSnapshotRow(Base):
+    """A persisted compile-cache snapshot.
+
+    Lets a new process resume incremental compilation from a known head
+    instead of recompiling the whole chain.  ``params_key`` identifies the
+    compile parameters and token counter the snapshot was built with;
+    ``annotation_watermark`` is the highest annotation id seen at build
+    time, used to detect priority changes made since.
+    """
+
+    __tablename__ = "compile_snapshots"
+
+    tract_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    head_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    params_key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    snapshot_json: Mapped[dict] = mapped_column(JSON, nullable=False)
+    annotation_watermark: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    api_token_count: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    api_token_source: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_compile_snapshots_tract_time", "tract_id", "created_at"),
+    )
+
+
+class SearchDocumentRow(Base):
+    """Links a blob to its row in the ``blob_fts`` full-text index.
+
+    ``blob_fts`` is an SQLite FTS5 virtual table (created with raw SQL by
+    ``init_db``, since the ORM cannot declare virtual tables) holding the
+    text extracted from each blob.  Its rowid is ``doc_id``.
+    """
+
+    __tablename__ = "search_documents"
+
+    doc_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False, unique=True)
+
+
 class SpawnPointerRow(Base):
     """Cross-tract linkage for multi-agent spawn relationships.
 
@@ -283,7 +371,7 @@ class SpawnPointerRow(Base):
     purpose: Mapped[str] = mapped_column(Text, nullable=False)
     inheritance_mode: Mapped[str] = mapped_column(
         String(20), nullable=False
-    )  # "full_clone", "head_snapshot", "selective"
+    )  # "full_clone", "head_snapshot", "selective", "shared_prefix", "branch"
     display_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
 
@@ -356,6 +444,32 @@ class TagAnnotationRow(Base):
     )
 
 
+class CommitTagRow(Base):
+    """Tag membership index over both kinds of commit tags.
+
+    One row per (commit, tag, source): ``source`` is ``"commit"`` for
+    immutable tags recorded in ``CommitRow.tags_json`` and
+    ``"annotation"`` for mutable :class:`TagAnnotationRow` tags.  Kept in
+    step by the commit and tag-annotation repositories so that tag queries
+    are indexed lookups instead of scans over ancestor rows.
+    """
+
+    __tablename__ = "commit_tags"
+
+    commit_hash: Mapped[str] = mapped_column(
+        String(64),
+        ForeignKey("commits.commit_hash"),
+        primary_key=True,
+    )
+    tag: Mapped[str] = mapped_column(String(100), primary_key=True)
+    source: Mapped[str] = mapped_column(String(16), primary_key=True)
+    tract_id: Mapped[str] = mapped_column(String(64), nullable=False)
+
+    __table_args__ = (
+        Index("ix_commit_tags_tag_tract", "tag", "tract_id"),
+    )
+
+
 class TagRegistryRow(Base):
     """Registry of known tag names for a tract.
 
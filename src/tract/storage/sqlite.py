@@ -6,12 +6,29 @@ Each repository takes a Session in its constructor.
 
 from __future__ import annotations
 
+import json
 from datetime import datetime
-from collections.abc import Sequence
-
-from sqlalchemy import delete, func, select, update, and_, or_
+from collections.abc import Iterator, Sequence
+from typing import TYPE_CHECKING, Any, cast
+
+from sqlalchemy import (
+    Integer,
+    String,
+    Text,
+    and_,
+    column,
+    delete,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    table,
+    update,
+)
 from sqlalchemy.dialects.sqlite import insert as sqlite_insert
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, aliased
 
 from tract.storage.repositories import (
     AnnotationRepository,
@@ -20,12 +37,15 @@ from tract.storage.repositories import (
     CommitParentRepository,
     CommitRepository,
     CompileRecordRepository,
+    CompileSnapshotRepository,
     OperationEventRepository,
     PersistenceRepository,
     TagAnnotationRepository,
     TagRegistryRepository,
     RefRepository,
+    SearchIndexRepository,
     SpawnPointerRepository,
+    TagIndexRepository,
     ToolSchemaRepository,
 )
 from tract.storage.schema import (
@@ -34,29 +54,165 @@ from tract.storage.schema import (
     BlobRow,
     CommitParentRow,
     CommitRow,
+    CommitTagRow,
     CommitToolRow,
     CompileEffectiveRow,
     CompileRecordRow,
+    CompileSnapshotRow,
     ConfigChangeRow,
+    CurrentAnnotationRow,
     OperationCommitRow,
     OperationConfigRow,
     OperationEventRow,
     TagAnnotationRow,
     TagRegistryRow,
     RefRow,
+    SearchDocumentRow,
     SpawnPointerRow,
     ToolSchemaRow,
 )
 
+if TYPE_CHECKING:
+    from sqlalchemy.engine import CursorResult
+
+# Upper bound on bound parameters per IN (...) clause.  SQLite builds older
+# than 3.32 cap host parameters at 999, so batch lookups are chunked.
+_IN_CHUNK_SIZE = 500
+
+# FTS5 virtual table holding extracted blob text (created by init_db).
+_BLOB_FTS = table("blob_fts", column("rowid", Integer), column("body", Text))
+_FTS_READY_KEY = "tract_blob_fts"
+# The trigram tokenizer cannot answer MATCH queries shorter than this.
+_TRIGRAM_MIN = 3
+# Discriminator fields that would otherwise match every message of a kind.
+_SEARCH_SKIP_KEYS = frozenset({"content_type", "role"})
+
+
+def _chunked(items: Sequence[str], size: int = _IN_CHUNK_SIZE) -> list[Sequence[str]]:
+    """Split *items* into consecutive slices of at most *size* elements."""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _column_values(row: object) -> dict:
+    """Return the column values of an ORM row as a dict for bulk inserts.
+
+    Unset autoincrement keys (None) are omitted so the database assigns them.
+    """
+    values = {}
+    for col in row.__table__.columns:  # type: ignore[attr-defined]
+        value = getattr(row, col.key)
+        if value is None and col.autoincrement is True:
+            continue
+        values[col.key] = value
+    return values
+
+
+def extract_search_text(payload_json: str) -> str:
+    """Extract the searchable text of a blob payload.
+
+    Collects the string and numeric values of the content dict (nested
+    payloads included), one per line, so JSON keys and syntax are not
+    indexed.  Non-JSON payloads are indexed verbatim.
+    """
+    try:
+        data = json.loads(payload_json)
+    except (json.JSONDecodeError, TypeError):
+        return payload_json or ""
+
+    parts: list[str] = []
+    stack: list[tuple[str | None, object]] = [(None, data)]
+    while stack:
+        key, value = stack.pop()
+        if isinstance(value, str):
+            if key not in _SEARCH_SKIP_KEYS:
+                parts.append(value)
+        elif isinstance(value, dict):
+            stack.extend(reversed(list(value.items())))
+        elif isinstance(value, list):
+            stack.extend((key, v) for v in reversed(value))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            parts.append(str(value))
+    return "\n".join(parts)
+
+
+def _merge_ancestry_cte(start_hash: str, name: str = "ancestors"):
+    """Recursive CTE of *start_hash* and every primary or merge ancestor.
+
+    ``UNION`` deduplicates shared history, so each hash appears once.
+    """
+    ancestors = select(
+        literal(start_hash, String).label("commit_hash")
+    ).cte(name, recursive=True)
+    child = aliased(CommitRow)
+    link = aliased(CommitParentRow)
+    return ancestors.union(
+        select(child.parent_hash)
+        .join(ancestors, child.commit_hash == ancestors.c.commit_hash)
+        .where(child.parent_hash.is_not(None)),
+        select(link.parent_hash)
+        .join(ancestors, link.commit_hash == ancestors.c.commit_hash),
+    )
+
+
+def _tract_scope(session: Session, tract_id: str, hash_col, tract_col):
+    """Condition selecting the commits visible to *tract_id*.
+
+    Besides the tract's own commits, a ``shared_prefix`` spawn child sees
+    the parent history it was forked from: those commits keep the
+    parent's ``tract_id``, so they are matched through the merge-aware
+    ancestry of the recorded fork point instead.
+    """
+    own = tract_col == tract_id
+    fork = session.execute(
+        select(SpawnPointerRow.parent_commit_hash).where(
+            SpawnPointerRow.child_tract_id == tract_id,
+            SpawnPointerRow.inheritance_mode == "shared_prefix",
+        )
+    ).scalar_one_or_none()
+    if fork is None:
+        return own
+    inherited = _merge_ancestry_cte(fork, "inherited")
+    return or_(own, hash_col.in_(select(inherited.c.commit_hash)))
+
+
+def _commit_graph_cte(start_hashes: Sequence[str], min_generation: int):
+    """Recursive CTE of commits reachable from *start_hashes*.
+
+    Carries each commit's first parent and generation so the recursion can
+    stop expanding below *min_generation*; ``UNION`` deduplicates shared
+    history.
+    """
+    reach = (
+        select(CommitRow.commit_hash, CommitRow.parent_hash, CommitRow.generation)
+        .where(CommitRow.commit_hash.in_(list(start_hashes)))
+        .cte("reach", recursive=True)
+    )
+    expand = (reach.c.generation >= min_generation) | (reach.c.generation == 0)
+    parent = aliased(CommitRow)
+    merge_parent = aliased(CommitRow)
+    link = aliased(CommitParentRow)
+    return reach.union(
+        select(parent.commit_hash, parent.parent_hash, parent.generation)
+        .join(reach, parent.commit_hash == reach.c.parent_hash)
+        .where(expand),
+        select(merge_parent.commit_hash, merge_parent.parent_hash, merge_parent.generation)
+        .join(link, merge_parent.commit_hash == link.parent_hash)
+        .join(reach, link.commit_hash == reach.c.commit_hash)
+        .where(expand),
+    )
+
 
 class SqliteBlobRepository(BlobRepository):
     """SQLite implementation of blob repository.
 
     Content-addressable: save_if_absent checks existence before insert.
+    Newly stored blobs are added to the full-text search index, and
+    deleted blobs are removed from it.
     """
 
     def __init__(self, session: Session) -> None:
         self._session = session
+        self._search_index = SqliteSearchIndexRepository(session)
 
     def get(self, content_hash: str) -> BlobRow | None:
         stmt = select(BlobRow).where(BlobRow.content_hash == content_hash)
@@ -76,16 +232,29 @@ class SqliteBlobRepository(BlobRepository):
             token_count=blob.token_count,
             created_at=blob.created_at,
         ).on_conflict_do_nothing(index_elements=["content_hash"])
-        self._session.execute(stmt)
+        result = cast("CursorResult[Any]", self._session.execute(stmt))
         self._session.flush()
+        if result.rowcount:
+            self._search_index.index_blobs([blob])
+
+    def save_many_if_absent(self, blobs: Sequence[BlobRow]) -> None:
+        if not blobs:
+            return
+        stmt = sqlite_insert(BlobRow).on_conflict_do_nothing(
+            index_elements=["content_hash"]
+        )
+        self._session.execute(stmt, [_column_values(b) for b in blobs])
+        self._session.flush()
+        self._search_index.index_blobs(blobs)
 
     def batch_get(self, content_hashes: list[str]) -> dict[str, BlobRow]:
         """Get multiple blobs by content hash in a single query."""
-        if not content_hashes:
-            return {}
-        stmt = select(BlobRow).where(BlobRow.content_hash.in_(content_hashes))
-        rows = self._session.execute(stmt).scalars().all()
-        return {row.content_hash: row for row in rows}
+        result: dict[str, BlobRow] = {}
+        for chunk in _chunked(content_hashes):
+            stmt = select(BlobRow).where(BlobRow.content_hash.in_(chunk))
+            for row in self._session.execute(stmt).scalars().all():
+                result[row.content_hash] = row
+        return result
 
     def delete_if_orphaned(self, content_hash: str) -> bool:
         """Delete a blob if no commit still references it.
@@ -101,17 +270,356 @@ class SqliteBlobRepository(BlobRepository):
 
         blob = self.get(content_hash)
         if blob is not None:
+            self._search_index.remove([content_hash])
             self._session.delete(blob)
             self._session.flush()
             return True
         return False
 
+    def delete_orphaned(self, content_hashes: Sequence[str]) -> int:
+        """Delete unreferenced blobs with chunked set-based statements."""
+        candidates = list(dict.fromkeys(content_hashes))
+        orphaned: list[str] = []
+        for chunk in _chunked(candidates):
+            referenced = set(self._session.execute(
+                select(CommitRow.content_hash)
+                .where(CommitRow.content_hash.in_(chunk))
+                .distinct()
+            ).scalars())
+            orphaned.extend(self._session.execute(
+                select(BlobRow.content_hash).where(
+                    BlobRow.content_hash.in_([h for h in chunk if h not in referenced])
+                )
+            ).scalars())
+        if not orphaned:
+            return 0
+        self._search_index.remove(orphaned)
+        for chunk in _chunked(orphaned):
+            self._session.execute(delete(BlobRow).where(BlobRow.content_hash.in_(chunk)))
+        self._session.expire_all()
+        self._session.flush()
+        return len(orphaned)
+
+
+class SqliteSearchIndexRepository(SearchIndexRepository):
+    """SQLite FTS5 implementation of the blob full-text index.
+
+    Text is stored in the ``blob_fts`` virtual table using the trigram
+    tokenizer, so any substring of three or more characters is answered
+    from the index and results can be ranked with ``bm25()``.  Shorter
+    terms fall back to a scan of the indexed text.  ``search_documents``
+    maps each content hash to its ``blob_fts`` rowid.
+
+    When the table is missing (SQLite built without FTS5, or a non-SQLite
+    backend) :attr:`available` is False and writes are no-ops.
+    """
+
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    @property
+    def available(self) -> bool:
+        if self._session.get_bind().dialect.name != "sqlite":
+            return False
+        # Cache positive checks on the pooled DBAPI connection so the
+        # commit path does not query sqlite_master every time.
+        conn = self._session.connection()
+        if conn.info.get(_FTS_READY_KEY):
+            return True
+        ready = conn.execute(
+            select(literal(1)).select_from(table("sqlite_master", column("name")))
+            .where(column("name") == _BLOB_FTS.name)
+        ).first() is not None
+        if ready:
+            conn.info[_FTS_READY_KEY] = True
+        return ready
+
+    def index_blobs(self, blobs: Sequence[BlobRow]) -> None:
+        if not blobs or not self.available:
+            return
+        texts = {b.content_hash: b.payload_json for b in blobs}
+        hashes = list(texts)
+        for chunk in _chunked(hashes):
+            known = set(self._session.execute(
+                select(SearchDocumentRow.content_hash)
+                .where(SearchDocumentRow.content_hash.in_(chunk))
+            ).scalars())
+            for content_hash in known:
+                del texts[content_hash]
+        if not texts:
+            return
+
+        self._session.execute(
+            insert(SearchDocumentRow),
+            [{"content_hash": h} for h in texts],
+        )
+        doc_ids: dict[str, int] = {}
+        for chunk in _chunked(list(texts)):
+            doc_ids.update(self._session.execute(
+                select(SearchDocumentRow.content_hash, SearchDocumentRow.doc_id)
+                .where(SearchDocumentRow.content_hash.in_(chunk))
+            ).all())
+        self._session.execute(
+            insert(_BLOB_FTS),
+            [
+                {"rowid": doc_ids[h], "body": extract_search_text(payload)}
+                for h, payload in texts.items()
+            ],
+        )
+
+    def remove(self, content_hashes: Sequence[str]) -> None:
+        if not content_hashes or not self.available:
+            return
+        for chunk in _chunked(list(content_hashes)):
+            doc_ids = list(self._session.execute(
+                select(SearchDocumentRow.doc_id)
+                .where(SearchDocumentRow.content_hash.in_(chunk))
+            ).scalars())
+            if not doc_ids:
+                continue
+            self._session.execute(
+                delete(_BLOB_FTS).where(_BLOB_FTS.c.rowid.in_(doc_ids))
+            )
+            self._session.execute(
+                delete(SearchDocumentRow)
+                .where(SearchDocumentRow.doc_id.in_(doc_ids))
+            )
+
+    def reindex(self) -> int:
+        if not self.available:
+            return 0
+        missing = list(self._session.execute(
+            select(BlobRow.content_hash)
+            .outerjoin(
+                SearchDocumentRow,
+                SearchDocumentRow.content_hash == BlobRow.content_hash,
+            )
+            .where(SearchDocumentRow.doc_id.is_(None))
+        ).scalars())
+        for chunk in _chunked(missing):
+            # Column rows expose content_hash/payload_json like BlobRow
+            # without loading every blob into the identity map.
+            rows = self._session.execute(
+                select(BlobRow.content_hash, BlobRow.payload_json)
+                .where(BlobRow.content_hash.in_(chunk))
+            ).all()
+            self.index_blobs(rows)  # type: ignore[arg-type]
+        self._session.flush()
+        return len(missing)
+
+    def search(
+        self,
+        text: str | None = None,
+        *,
+        pattern: str | None = None,
+        case_sensitive: bool = False,
+        tract_id: str | None = None,
+        ancestor_of: str | None = None,
+        content_type: str | None = None,
+        ranked: bool = True,
+        limit: int | None = None,
+    ) -> Sequence[CommitRow]:
+        body = _BLOB_FTS.c.body
+        stmt = (
+            select(CommitRow)
+            .join(
+                SearchDocumentRow,
+                SearchDocumentRow.content_hash == CommitRow.content_hash,
+            )
+            .join(_BLOB_FTS, _BLOB_FTS.c.rowid == SearchDocumentRow.doc_id)
+        )
+
+        use_match = text is not None and len(text) >= _TRIGRAM_MIN
+        if text is not None:
+            if use_match:
+                stmt = stmt.where(body.match('"' + text.replace('"', '""') + '"'))
+            if case_sensitive:
+                stmt = stmt.where(func.instr(body, text) > 0)
+            elif not use_match:
+                escaped = (
+                    text.replace("\\", "\\\\")
+                    .replace("%", "\\%")
+                    .replace("_", "\\_")
+                )
+                stmt = stmt.where(body.like(f"%{escaped}%", escape="\\"))
+        if pattern is not None:
+            stmt = stmt.where(body.regexp_match(pattern))
+
+        if tract_id is not None:
+            stmt = stmt.where(
+                _tract_scope(self._session, tract_id, CommitRow.commit_hash, CommitRow.tract_id)
+            )
+        if content_type is not None:
+            stmt = stmt.where(CommitRow.content_type == content_type)
+        if ancestor_of is not None:
+            ancestors = _merge_ancestry_cte(ancestor_of)
+            stmt = stmt.join(
+                ancestors, CommitRow.commit_hash == ancestors.c.commit_hash
+            )
+
+        if ranked and use_match:
+            stmt = stmt.order_by(func.bm25(literal_column(_BLOB_FTS.name)))
+        stmt = stmt.order_by(CommitRow.created_at.desc())
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return list(self._session.execute(stmt).scalars().all())
+
+
+_TAG_SOURCE_COMMIT = "commit"
+_TAG_SOURCE_ANNOTATION = "annotation"
+
+
+class SqliteTagIndexRepository(TagIndexRepository):
+    """SQLite implementation of the unified commit tag index (``commit_tags``)."""
+
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    def _insert(self, memberships: list[dict]) -> None:
+        if memberships:
+            self._session.execute(
+                sqlite_insert(CommitTagRow).on_conflict_do_nothing(), memberships
+            )
+
+    def index_commits(self, commits: Sequence[CommitRow]) -> None:
+        self._insert([
+            {
+                "commit_hash": c.commit_hash,
+                "tag": tag,
+                "source": _TAG_SOURCE_COMMIT,
+                "tract_id": c.tract_id,
+            }
+            for c in commits if c.tags_json
+            for tag in dict.fromkeys(c.tags_json)
+        ])
+
+    def index_annotations(self, rows: Sequence[TagAnnotationRow]) -> None:
+        self._insert([
+            {
+                "commit_hash": r.target_hash,
+                "tag": r.tag,
+                "source": _TAG_SOURCE_ANNOTATION,
+                "tract_id": r.tract_id,
+            }
+            for r in rows
+        ])
+
+    def unindex_annotation(self, commit_hash: str, tag: str) -> None:
+        self._session.execute(
+            delete(CommitTagRow).where(
+                CommitTagRow.commit_hash == commit_hash,
+                CommitTagRow.tag == tag,
+                CommitTagRow.source == _TAG_SOURCE_ANNOTATION,
+            )
+        )
+
+    def reindex(self) -> int:
+        from sqlalchemy import text
+
+        before = self._session.execute(
+            select(func.count()).select_from(CommitTagRow)
+        ).scalar_one()
+        self._session.execute(text("""
+            INSERT OR IGNORE INTO commit_tags (commit_hash, tag, source, tract_id)
+            SELECT c.commit_hash, j.value, :source, c.tract_id
+            FROM commits c, json_each(c.tags_json) j
+            WHERE c.tags_json IS NOT NULL AND json_type(c.tags_json) = 'array'
+        """), {"source": _TAG_SOURCE_COMMIT})
+        self._session.execute(text("""
+            INSERT OR IGNORE INTO commit_tags (commit_hash, tag, source, tract_id)
+            SELECT target_hash, tag, :source, tract_id FROM tag_annotations
+        """), {"source": _TAG_SOURCE_ANNOTATION})
+        after = self._session.execute(
+            select(func.count()).select_from(CommitTagRow)
+        ).scalar_one()
+        return after - before
+
+    def get_tags(self, commit_hash: str) -> list[str]:
+        stmt = (
+            select(CommitTagRow.tag)
+            .where(CommitTagRow.commit_hash == commit_hash)
+            .distinct()
+            .order_by(CommitTagRow.tag)
+        )
+        return list(self._session.execute(stmt).scalars().all())
+
+    def get_commits(
+        self,
+        tags: Sequence[str],
+        *,
+        match: str = "any",
+        tract_id: str | None = None,
+        ancestor_of: str | None = None,
+        op_filter: object | None = None,
+        limit: int | None = None,
+    ) -> Sequence[CommitRow]:
+        if match not in ("any", "all"):
+            raise ValueError(f"match must be 'any' or 'all', got {match!r}")
+        wanted = list(dict.fromkeys(tags))
+        if not wanted:
+            return []
+
+        tagged = select(CommitTagRow.commit_hash).where(CommitTagRow.tag.in_(wanted))
+        if tract_id is not None:
+            tagged = tagged.where(_tract_scope(
+                self._session, tract_id, CommitTagRow.commit_hash, CommitTagRow.tract_id
+            ))
+        if match == "all":
+            tagged = tagged.group_by(CommitTagRow.commit_hash).having(
+                func.count(func.distinct(CommitTagRow.tag)) == len(wanted)
+            )
+
+        stmt = select(CommitRow).where(CommitRow.commit_hash.in_(tagged))
+        if ancestor_of is not None:
+            ancestors = _merge_ancestry_cte(ancestor_of)
+            stmt = stmt.join(
+                ancestors, CommitRow.commit_hash == ancestors.c.commit_hash
+            )
+        if op_filter is not None:
+            stmt = stmt.where(CommitRow.operation == op_filter)
+        stmt = stmt.order_by(CommitRow.created_at.desc())
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return list(self._session.execute(stmt).scalars().all())
+
+    def count_commits(
+        self,
+        tags: Sequence[str],
+        *,
+        tract_id: str | None = None,
+        ancestor_of: str | None = None,
+    ) -> dict[str, int]:
+        counts = {tag: 0 for tag in tags}
+        if not counts:
+            return counts
+        stmt = (
+            select(CommitTagRow.tag, func.count(func.distinct(CommitTagRow.commit_hash)))
+            .where(CommitTagRow.tag.in_(list(counts)))
+            .group_by(CommitTagRow.tag)
+        )
+        if tract_id is not None:
+            stmt = stmt.where(_tract_scope(
+                self._session, tract_id, CommitTagRow.commit_hash, CommitTagRow.tract_id
+            ))
+        if ancestor_of is not None:
+            ancestors = _merge_ancestry_cte(ancestor_of)
+            stmt = stmt.join(
+                ancestors, CommitTagRow.commit_hash == ancestors.c.commit_hash
+            )
+        for tag, count in self._session.execute(stmt).all():
+            counts[tag] = count
+        return counts
+
 
 class SqliteCommitRepository(CommitRepository):
-    """SQLite implementation of commit repository."""
+    """SQLite implementation of commit repository.
+
+    Immutable commit tags are added to the tag index as commits are saved.
+    """
 
     def __init__(self, session: Session) -> None:
         self._session = session
+        self._tag_index = SqliteTagIndexRepository(session)
 
     def get(self, commit_hash: str) -> CommitRow | None:
         stmt = select(CommitRow).where(CommitRow.commit_hash == commit_hash)
@@ -120,6 +628,26 @@ class SqliteCommitRepository(CommitRepository):
     def save(self, commit: CommitRow) -> None:
         self._session.add(commit)
         self._session.flush()
+        if commit.tags_json:
+            self._tag_index.index_commits([commit])
+
+    def save_many(self, commits: Sequence[CommitRow]) -> None:
+        if not commits:
+            return
+        self._session.execute(insert(CommitRow), [_column_values(c) for c in commits])
+        self._tag_index.index_commits(commits)
+        self._session.flush()
+
+    def save_many_if_absent(self, commits: Sequence[CommitRow]) -> set[str]:
+        if not commits:
+            return set()
+        existing: set[str] = set()
+        for chunk in _chunked([c.commit_hash for c in commits]):
+            stmt = select(CommitRow.commit_hash).where(CommitRow.commit_hash.in_(chunk))
+            existing.update(self._session.execute(stmt).scalars().all())
+        fresh = [c for c in commits if c.commit_hash not in existing]
+        self.save_many(fresh)
+        return {c.commit_hash for c in fresh}
 
     def get_ancestors(
         self,
@@ -139,79 +667,123 @@ class SqliteCommitRepository(CommitRepository):
 
         Returns commits in reverse chronological order (newest first).
 
-        Implementation: walks the parent chain one commit at a time via
-        primary-key lookups (O(1) each). Only fetches chain-length rows
-        instead of all commits in the tract.
+        Implementation: a single recursive CTE follows ``parent_hash`` and
+        records each commit's depth from the start, so the whole chain is
+        fetched in one round-trip and returned in chain order.  When only
+        *limit* is given, the recursion stops at that depth.
         """
-        ancestors: list[CommitRow] = []
-        current_hash: str | None = commit_hash
-
-        while current_hash is not None:
-            if limit is not None and len(ancestors) >= limit:
-                break
-            commit = self.get(current_hash)
-            if commit is None:
-                break
-            if op_filter is None or commit.operation == op_filter:
-                ancestors.append(commit)
-            current_hash = commit.parent_hash
+        chain = (
+            select(
+                CommitRow.commit_hash,
+                CommitRow.parent_hash,
+                literal(0).label("depth"),
+            )
+            .where(CommitRow.commit_hash == commit_hash)
+            .cte("chain", recursive=True)
+        )
+        parent = aliased(CommitRow)
+        step = select(
+            parent.commit_hash,
+            parent.parent_hash,
+            (chain.c.depth + 1).label("depth"),
+        ).join(chain, parent.commit_hash == chain.c.parent_hash)
+        if limit is not None and op_filter is None:
+            step = step.where(chain.c.depth + 1 < limit)
+        chain = chain.union_all(step)
 
-        return ancestors
+        stmt = (
+            select(CommitRow)
+            .join(chain, CommitRow.commit_hash == chain.c.commit_hash)
+            .order_by(chain.c.depth)
+        )
+        if op_filter is not None:
+            stmt = stmt.where(CommitRow.operation == op_filter)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return list(self._session.execute(stmt).scalars().all())
 
     def sum_ancestor_tokens(self, commit_hash: str) -> int:
-        """Sum token_count for the ancestor chain using a recursive CTE."""
-        from sqlalchemy import text
+        """Read the materialized chain_token_total of a commit."""
+        result = self._session.execute(
+            select(CommitRow.chain_token_total).where(
+                CommitRow.commit_hash == commit_hash
+            )
+        ).scalar_one_or_none()
+        return int(result) if result is not None else 0
 
+    def get_generation(self, commit_hash: str) -> int:
+        """Read the materialized generation number of a commit."""
         result = self._session.execute(
-            text(
-                "WITH RECURSIVE ancestors(commit_hash, parent_hash, token_count) AS ("
-                "  SELECT commit_hash, parent_hash, token_count"
-                "  FROM commits WHERE commit_hash = :start_hash"
-                "  UNION ALL"
-                "  SELECT c.commit_hash, c.parent_hash, c.token_count"
-                "  FROM commits c"
-                "  JOIN ancestors a ON c.commit_hash = a.parent_hash"
-                ") SELECT COALESCE(SUM(token_count), 0) FROM ancestors"
-            ),
-            {"start_hash": commit_hash},
-        ).scalar()
-        return int(result)  # type: ignore[arg-type]
+            select(CommitRow.generation).where(CommitRow.commit_hash == commit_hash)
+        ).scalar_one_or_none()
+        return int(result) if result is not None else 0
+
+    def get_commit_graph(
+        self,
+        start_hashes: Sequence[str],
+        *,
+        min_generation: int = 0,
+    ) -> dict[str, tuple[int, tuple[str, ...]]]:
+        """Load an ancestry's adjacency in two statements.
+
+        The recursive CTE yields each reachable commit with its first
+        parent and generation; a second statement fetches the ordered
+        merge parents of those commits.
+        """
+        if not start_hashes:
+            return {}
+        reach = _commit_graph_cte(start_hashes, min_generation)
+        rows = self._session.execute(
+            select(reach.c.commit_hash, reach.c.parent_hash, reach.c.generation)
+        ).all()
+        parents: dict[str, list[str]] = {
+            r.commit_hash: [r.parent_hash] if r.parent_hash else [] for r in rows
+        }
+        merge_rows = self._session.execute(
+            select(CommitParentRow.commit_hash, CommitParentRow.parent_hash)
+            .join(reach, CommitParentRow.commit_hash == reach.c.commit_hash)
+            .order_by(CommitParentRow.commit_hash, CommitParentRow.position)
+        ).all()
+        for r in merge_rows:
+            if r.parent_hash not in parents[r.commit_hash]:
+                parents[r.commit_hash].append(r.parent_hash)
+        return {
+            r.commit_hash: (r.generation or 0, tuple(parents[r.commit_hash]))
+            for r in rows
+        }
 
     def get_ancestors_with_merges(
-        self, start_hash: str, limit: int | None = None
+        self,
+        start_hash: str,
+        limit: int | None = None,
+        *,
+        op_filter: object | None = None,
     ) -> Sequence[CommitRow]:
-        """Walk ancestry following primary parents AND merge parents via recursive CTE."""
-        from sqlalchemy import text
+        """Walk ancestry following primary parents AND merge parents via recursive CTE.
 
-        limit_clause = f" LIMIT {int(limit)}" if limit is not None else ""
-        sql = (
-            "WITH RECURSIVE ancestors(commit_hash) AS ("
-            "  SELECT :start_hash"
-            "  UNION"
-            "  SELECT c.parent_hash FROM commits c"
-            "    JOIN ancestors a ON c.commit_hash = a.commit_hash"
-            "    WHERE c.parent_hash IS NOT NULL"
-            "  UNION"
-            "  SELECT cp.parent_hash FROM commit_parents cp"
-            "    JOIN ancestors a ON cp.commit_hash = a.commit_hash"
-            ") "
-            "SELECT c.* FROM commits c"
-            "  JOIN ancestors a ON c.commit_hash = a.commit_hash"
-            f"  ORDER BY c.created_at DESC{limit_clause}"
-        )
-        rows = self._session.execute(text(sql), {"start_hash": start_hash}).fetchall()
-        # Map raw rows back to CommitRow ORM objects
-        result = []
-        for raw in rows:
-            obj = self._session.get(CommitRow, raw.commit_hash)
-            if obj is not None:
-                result.append(obj)
-        return result
+        The CTE collects every reachable hash (``UNION`` deduplicates shared
+        history) and the outer query loads the matching ORM rows in the same
+        round-trip.
+        """
+        ancestors = _merge_ancestry_cte(start_hash)
+        stmt = (
+            select(CommitRow)
+            .join(ancestors, CommitRow.commit_hash == ancestors.c.commit_hash)
+            .order_by(CommitRow.created_at.desc())
+        )
+        if op_filter is not None:
+            stmt = stmt.where(CommitRow.operation == op_filter)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return list(self._session.execute(stmt).scalars().all())
 
     def get_by_type(self, content_type: str, tract_id: str) -> Sequence[CommitRow]:
         stmt = (
             select(CommitRow)
-            .where(CommitRow.tract_id == tract_id, CommitRow.content_type == content_type)
+            .where(
+                _tract_scope(self._session, tract_id, CommitRow.commit_hash, CommitRow.tract_id),
+                CommitRow.content_type == content_type,
+            )
             .order_by(CommitRow.created_at)
         )
         return list(self._session.execute(stmt).scalars().all())
@@ -233,7 +805,9 @@ class SqliteCommitRepository(CommitRepository):
 
         conditions = [CommitRow.commit_hash.startswith(prefix)]
         if tract_id is not None:
-            conditions.append(CommitRow.tract_id == tract_id)
+            conditions.append(
+                _tract_scope(self._session, tract_id, CommitRow.commit_hash, CommitRow.tract_id)
+            )
 
         stmt = select(CommitRow).where(and_(*conditions))
         results = list(self._session.execute(stmt).scalars().all())
@@ -252,7 +826,9 @@ class SqliteCommitRepository(CommitRepository):
     def get_by_config_multi(
         self, tract_id: str, conditions: list[tuple[str, str, object]]
     ) -> Sequence[CommitRow]:
-        where_clauses = [CommitRow.tract_id == tract_id]
+        where_clauses = [
+            _tract_scope(self._session, tract_id, CommitRow.commit_hash, CommitRow.tract_id)
+        ]
         ops = {
             "=": lambda e, v: e == v,
             "!=": lambda e, v: e != v,
@@ -303,12 +879,71 @@ class SqliteCommitRepository(CommitRepository):
         )
         return list(self._session.execute(stmt).scalars().all())
 
+    def iter_history(
+        self, tract_id: str, *, page_size: int = _IN_CHUNK_SIZE
+    ) -> Iterator[Sequence[CommitRow]]:
+        """Stream the tract's commits plus foreign ancestors, parents first.
+
+        Generation strictly increases from parent to child, so ordering by
+        it is topological.  Rows are fetched with ``yield_per`` from a
+        single cursor instead of re-sorting the table for every page.
+        """
+        owned = aliased(CommitRow)
+        child = aliased(CommitRow)
+        by_commits = (
+            select(owned.commit_hash)
+            .join(child, child.parent_hash == owned.commit_hash)
+            .where(child.tract_id == tract_id, owned.tract_id != tract_id)
+        )
+        by_merges = (
+            select(owned.commit_hash)
+            .join(CommitParentRow, CommitParentRow.parent_hash == owned.commit_hash)
+            .join(child, child.commit_hash == CommitParentRow.commit_hash)
+            .where(child.tract_id == tract_id, owned.tract_id != tract_id)
+        )
+        foreign = sorted(self._session.execute(by_commits.union(by_merges)).scalars().all())
+
+        selected = CommitRow.tract_id == tract_id
+        if foreign:
+            reach = _commit_graph_cte(foreign, 0)
+            selected = or_(selected, CommitRow.commit_hash.in_(select(reach.c.commit_hash)))
+        stmt = (
+            select(CommitRow)
+            .where(selected)
+            .order_by(CommitRow.generation, CommitRow.commit_hash)
+            .execution_options(yield_per=page_size)
+        )
+        yield from self._session.execute(stmt).scalars().partitions()
+
+    def get_shared_roots(self, tract_id: str) -> set[str]:
+        """Get this tract's commits referenced by other tracts' commits or refs."""
+        owned = aliased(CommitRow)
+        child = aliased(CommitRow)
+        by_commits = (
+            select(child.parent_hash)
+            .join(owned, owned.commit_hash == child.parent_hash)
+            .where(owned.tract_id == tract_id, child.tract_id != tract_id)
+        )
+        by_merges = (
+            select(CommitParentRow.parent_hash)
+            .join(owned, owned.commit_hash == CommitParentRow.parent_hash)
+            .join(child, child.commit_hash == CommitParentRow.commit_hash)
+            .where(owned.tract_id == tract_id, child.tract_id != tract_id)
+        )
+        by_refs = (
+            select(RefRow.commit_hash)
+            .join(owned, owned.commit_hash == RefRow.commit_hash)
+            .where(owned.tract_id == tract_id, RefRow.tract_id != tract_id)
+        )
+        stmt = by_commits.union(by_merges, by_refs)
+        return {h for h in self._session.execute(stmt).scalars() if h is not None}
+
     def get_edits_for(self, commit_hash: str, tract_id: str) -> Sequence[CommitRow]:
         """Get original commit and all its edits, ordered by created_at."""
         stmt = (
             select(CommitRow)
             .where(
-                CommitRow.tract_id == tract_id,
+                _tract_scope(self._session, tract_id, CommitRow.commit_hash, CommitRow.tract_id),
                 or_(
                     CommitRow.commit_hash == commit_hash,
                     CommitRow.edit_target == commit_hash,
@@ -325,76 +960,162 @@ class SqliteCommitRepository(CommitRepository):
         row.metadata_json = metadata
         self._session.flush()
 
-    def delete(self, commit_hash: str) -> None:
-        """Delete a commit by hash. Also cleans up related rows.
+    def _subtract_chain_total_below(self, commit_hash: str) -> None:
+        """Subtract *commit_hash*'s chain_token_total from its descendants.
 
-        Removes all rows that reference this commit via FK, and nullifies
-        parent_hash/edit_target references from other commits, before
-        deleting the commit itself.
+        Keeps the materialized totals consistent when the commit is removed
+        and its children are re-rooted.  No-op when it has no children.
         """
-        # Bulk delete CommitParentRow entries where this commit is child or parent
-        self._session.execute(
-            delete(CommitParentRow).where(
-                (CommitParentRow.commit_hash == commit_hash)
-                | (CommitParentRow.parent_hash == commit_hash)
+        total = self._session.execute(
+            select(CommitRow.chain_token_total).where(
+                CommitRow.commit_hash == commit_hash
             )
-        )
+        ).scalar_one_or_none()
+        if not total:
+            return
 
-        # Bulk delete AnnotationRow entries referencing this commit
-        self._session.execute(
-            delete(AnnotationRow).where(AnnotationRow.target_hash == commit_hash)
-        )
-
-        # Bulk delete RefRow entries pointing to this commit (e.g., ORIG_HEAD)
-        self._session.execute(
-            delete(RefRow).where(RefRow.commit_hash == commit_hash)
+        descendants = (
+            select(CommitRow.commit_hash)
+            .where(CommitRow.parent_hash == commit_hash)
+            .cte("descendants", recursive=True)
         )
-
-        # Bulk delete CompileEffectiveRow entries referencing this commit
-        self._session.execute(
-            delete(CompileEffectiveRow).where(
-                CompileEffectiveRow.commit_hash == commit_hash
+        child = aliased(CommitRow)
+        descendants = descendants.union_all(
+            select(child.commit_hash).join(
+                descendants, child.parent_hash == descendants.c.commit_hash
             )
         )
-
-        # Bulk delete CommitToolRow entries referencing this commit
         self._session.execute(
-            delete(CommitToolRow).where(CommitToolRow.commit_hash == commit_hash)
+            update(CommitRow)
+            .where(CommitRow.commit_hash.in_(select(descendants.c.commit_hash)))
+            .values(chain_token_total=CommitRow.chain_token_total - total)
+            .execution_options(synchronize_session=False)
         )
 
-        # Bulk delete TagAnnotationRow entries referencing this commit
-        self._session.execute(
-            delete(TagAnnotationRow).where(TagAnnotationRow.target_hash == commit_hash)
-        )
+    def _rebase_chain_totals(self, doomed: set[str]) -> None:
+        """Re-root chain totals below commits about to be deleted.
 
-        # Bulk delete OperationCommitRow entries referencing this commit
-        self._session.execute(
-            delete(OperationCommitRow).where(OperationCommitRow.commit_hash == commit_hash)
-        )
+        Only deleted commits with a surviving child need work.  They are
+        processed ancestors first, each subtracting its *current* total
+        from its descendants, so a survivor ends up counting from its
+        nearest deleted ancestor -- the same result as deleting one by one.
+        """
+        boundary: set[str] = set()
+        for chunk in _chunked(list(doomed)):
+            rows = self._session.execute(
+                select(CommitRow.parent_hash, CommitRow.commit_hash)
+                .where(CommitRow.parent_hash.in_(chunk))
+            ).all()
+            boundary.update(r.parent_hash for r in rows if r.commit_hash not in doomed)
+        if not boundary:
+            return
+        order: list[tuple[int, datetime, str]] = []
+        for chunk in _chunked(list(boundary)):
+            order.extend(
+                (r.generation, r.created_at, r.commit_hash)
+                for r in self._session.execute(
+                    select(CommitRow.generation, CommitRow.created_at, CommitRow.commit_hash)
+                    .where(CommitRow.commit_hash.in_(chunk))
+                ).all()
+            )
+        for _, _, commit_hash in sorted(order):
+            self._subtract_chain_total_below(commit_hash)
 
-        # Bulk nullify parent_hash on children (SET NULL semantics)
-        self._session.execute(
-            update(CommitRow)
-            .where(CommitRow.parent_hash == commit_hash)
-            .values(parent_hash=None)
-        )
+    def delete(self, commit_hash: str) -> None:
+        """Delete a commit by hash. Also cleans up related rows.
 
-        # Bulk nullify edit_target references (SET NULL semantics)
-        self._session.execute(
-            update(CommitRow)
-            .where(CommitRow.edit_target == commit_hash)
-            .values(edit_target=None)
-        )
+        Removes all rows that reference this commit via FK, and nullifies
+        parent_hash/edit_target references from other commits, before
+        deleting the commit itself.
+        """
+        self.delete_many([commit_hash])
 
-        # Now delete the commit itself
-        self._session.execute(
-            delete(CommitRow).where(CommitRow.commit_hash == commit_hash)
-        )
+    def delete_many(self, commit_hashes: Sequence[str]) -> None:
+        """Delete commits and their dependent rows with set-based statements.
+
+        Children of deleted commits become roots: their chain totals are
+        re-based first, then each table is cleaned with one statement per
+        chunk of hashes.
+        """
+        doomed = set(commit_hashes)
+        if not doomed:
+            return
+        self._rebase_chain_totals(doomed)
+
+        for chunk in _chunked(list(doomed)):
+            # CommitParentRow entries where these commits are child or parent
+            self._session.execute(
+                delete(CommitParentRow).where(
+                    CommitParentRow.commit_hash.in_(chunk)
+                    | CommitParentRow.parent_hash.in_(chunk)
+                )
+            )
+            # Rows that reference these commits by hash
+            for row_type, target_col in (
+                (CurrentAnnotationRow, CurrentAnnotationRow.target_hash),
+                (CommitTagRow, CommitTagRow.commit_hash),
+                (AnnotationRow, AnnotationRow.target_hash),
+                (RefRow, RefRow.commit_hash),  # e.g. ORIG_HEAD
+                (CompileEffectiveRow, CompileEffectiveRow.commit_hash),
+                (CompileSnapshotRow, CompileSnapshotRow.head_hash),
+                (CommitToolRow, CommitToolRow.commit_hash),
+                (TagAnnotationRow, TagAnnotationRow.target_hash),
+                (OperationCommitRow, OperationCommitRow.commit_hash),
+            ):
+                self._session.execute(delete(row_type).where(target_col.in_(chunk)))
+
+            # Nullify parent_hash / edit_target on survivors (SET NULL semantics)
+            self._session.execute(
+                update(CommitRow)
+                .where(CommitRow.parent_hash.in_(chunk))
+                .values(parent_hash=None)
+            )
+            self._session.execute(
+                update(CommitRow)
+                .where(CommitRow.edit_target.in_(chunk))
+                .values(edit_target=None)
+            )
+
+            # Now delete the commits themselves
+            self._session.execute(
+                delete(CommitRow).where(CommitRow.commit_hash.in_(chunk))
+            )
 
         # Expire all to sync identity map with bulk changes above
         self._session.expire_all()
         self._session.flush()
 
+    def get_gc_candidates(
+        self,
+        tract_id: str,
+        roots: Sequence[str],
+        *,
+        orphan_cutoff: datetime,
+        archive_cutoff: datetime | None = None,
+        limit: int | None = None,
+    ) -> Sequence[CommitRow]:
+        """Unreachable, expired commits via one recursive reachability CTE."""
+        is_archive = (
+            select(OperationCommitRow.commit_hash)
+            .where(
+                OperationCommitRow.commit_hash == CommitRow.commit_hash,
+                OperationCommitRow.role == "source",
+            )
+            .exists()
+        )
+        expired = ~is_archive & (CommitRow.created_at <= orphan_cutoff)
+        if archive_cutoff is not None:
+            expired = expired | (is_archive & (CommitRow.created_at <= archive_cutoff))
+
+        stmt = select(CommitRow).where(CommitRow.tract_id == tract_id, expired)
+        if roots:
+            reach = _commit_graph_cte(roots, 0)
+            stmt = stmt.where(CommitRow.commit_hash.not_in(select(reach.c.commit_hash)))
+        stmt = stmt.order_by(CommitRow.created_at)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return list(self._session.execute(stmt).scalars().all())
+
 
 class SqliteRefRepository(RefRepository):
     """SQLite implementation of ref repository.
@@ -637,12 +1358,27 @@ class SqliteCommitParentRepository(CommitParentRepository):
             )
         self._session.flush()
 
+    def batch_get_parents(self, commit_hashes: Sequence[str]) -> dict[str, list[str]]:
+        """Get ordered parents for many commits in chunked IN queries."""
+        result: dict[str, list[str]] = {}
+        for chunk in _chunked(list(commit_hashes)):
+            stmt = (
+                select(CommitParentRow.commit_hash, CommitParentRow.parent_hash)
+                .where(CommitParentRow.commit_hash.in_(chunk))
+                .order_by(CommitParentRow.commit_hash, CommitParentRow.position)
+            )
+            for row in self._session.execute(stmt).all():
+                result.setdefault(row.commit_hash, []).append(row.parent_hash)
+        return result
+
 
 class SqliteAnnotationRepository(AnnotationRepository):
     """SQLite implementation of annotation repository.
 
     Annotations are append-only. The latest annotation for a given
-    target_hash (by created_at) is the current priority.
+    target_hash (by created_at, then id) is the current priority; every
+    write keeps the ``current_annotations`` pointer table in step so that
+    current-priority reads are a primary-key join.
     """
 
     def __init__(self, session: Session) -> None:
@@ -651,15 +1387,75 @@ class SqliteAnnotationRepository(AnnotationRepository):
     def get_latest(self, target_hash: str) -> AnnotationRow | None:
         stmt = (
             select(AnnotationRow)
-            .where(AnnotationRow.target_hash == target_hash)
-            .order_by(AnnotationRow.created_at.desc())
-            .limit(1)
+            .join(CurrentAnnotationRow, AnnotationRow.id == CurrentAnnotationRow.annotation_id)
+            .where(CurrentAnnotationRow.target_hash == target_hash)
         )
         return self._session.execute(stmt).scalar_one_or_none()
 
     def save(self, annotation: AnnotationRow) -> None:
         self._session.add(annotation)
         self._session.flush()
+        current = CurrentAnnotationRow.__table__
+        stmt = sqlite_insert(CurrentAnnotationRow).values(
+            target_hash=annotation.target_hash,
+            tract_id=annotation.tract_id,
+            annotation_id=annotation.id,
+            created_at=annotation.created_at,
+        )
+        self._session.execute(stmt.on_conflict_do_update(
+            index_elements=[CurrentAnnotationRow.target_hash],
+            set_={
+                "tract_id": stmt.excluded.tract_id,
+                "annotation_id": stmt.excluded.annotation_id,
+                "created_at": stmt.excluded.created_at,
+            },
+            where=(stmt.excluded.created_at > current.c.created_at)
+            | (
+                (stmt.excluded.created_at == current.c.created_at)
+                & (stmt.excluded.annotation_id > current.c.annotation_id)
+            ),
+        ))
+
+    def save_many(self, annotations: Sequence[AnnotationRow]) -> None:
+        if not annotations:
+            return
+        self._session.execute(
+            insert(AnnotationRow), [_column_values(a) for a in annotations]
+        )
+        self._refresh_current(list({a.target_hash for a in annotations}))
+        self._session.flush()
+
+    def _refresh_current(self, target_hashes: list[str]) -> None:
+        """Repoint ``current_annotations`` at the newest row of each target."""
+        newer = aliased(AnnotationRow)
+        for chunk in _chunked(target_hashes):
+            latest = select(
+                AnnotationRow.target_hash,
+                AnnotationRow.tract_id,
+                AnnotationRow.id,
+                AnnotationRow.created_at,
+            ).where(
+                AnnotationRow.target_hash.in_(chunk),
+                ~select(newer.id).where(
+                    newer.target_hash == AnnotationRow.target_hash,
+                    (newer.created_at > AnnotationRow.created_at)
+                    | (
+                        (newer.created_at == AnnotationRow.created_at)
+                        & (newer.id > AnnotationRow.id)
+                    ),
+                ).exists(),
+            )
+            stmt = sqlite_insert(CurrentAnnotationRow).from_select(
+                ["target_hash", "tract_id", "annotation_id", "created_at"], latest
+            )
+            self._session.execute(stmt.on_conflict_do_update(
+                index_elements=[CurrentAnnotationRow.target_hash],
+                set_={
+                    "tract_id": stmt.excluded.tract_id,
+                    "annotation_id": stmt.excluded.annotation_id,
+                    "created_at": stmt.excluded.created_at,
+                },
+            ))
 
     def get_history(self, target_hash: str) -> Sequence[AnnotationRow]:
         stmt = (
@@ -669,38 +1465,30 @@ class SqliteAnnotationRepository(AnnotationRepository):
         )
         return list(self._session.execute(stmt).scalars().all())
 
-    def batch_get_latest(self, target_hashes: list[str]) -> dict[str, AnnotationRow]:
-        """Get latest annotation per target using a single query with subquery."""
-        if not target_hashes:
-            return {}
-
-        # Subquery: max created_at per target_hash
-        max_time_subq = (
-            select(
-                AnnotationRow.target_hash,
-                func.max(AnnotationRow.created_at).label("max_created_at"),
+    def batch_get_history(self, target_hashes: list[str]) -> dict[str, list[AnnotationRow]]:
+        result: dict[str, list[AnnotationRow]] = {}
+        for chunk in _chunked(target_hashes):
+            stmt = (
+                select(AnnotationRow)
+                .where(AnnotationRow.target_hash.in_(chunk))
+                .order_by(AnnotationRow.created_at, AnnotationRow.id)
             )
-            .where(AnnotationRow.target_hash.in_(target_hashes))
-            .group_by(AnnotationRow.target_hash)
-            .subquery()
-        )
+            for row in self._session.execute(stmt).scalars().all():
+                result.setdefault(row.target_hash, []).append(row)
+        return result
 
-        # Join to get full rows, order by id desc for deterministic tie-breaking
-        stmt = (
-            select(AnnotationRow)
-            .join(
-                max_time_subq,
-                (AnnotationRow.target_hash == max_time_subq.c.target_hash)
-                & (AnnotationRow.created_at == max_time_subq.c.max_created_at),
+    def batch_get_latest(self, target_hashes: list[str]) -> dict[str, AnnotationRow]:
+        """Get the current annotation per target via the ``current_annotations`` pointers."""
+        result: dict[str, AnnotationRow] = {}
+        for chunk in _chunked(target_hashes):
+            stmt = (
+                select(AnnotationRow)
+                .join(CurrentAnnotationRow, AnnotationRow.id == CurrentAnnotationRow.annotation_id)
+                .where(CurrentAnnotationRow.target_hash.in_(chunk))
             )
-            .order_by(AnnotationRow.id.desc())
-        )
-
-        rows = self._session.execute(stmt).scalars().all()
-        # dict comprehension iterates in order; last write wins, so the
-        # lowest id (oldest) would overwrite — but we want highest id.
-        # Build dict from reversed list so highest-id row is final value.
-        return {row.target_hash: row for row in reversed(list(rows))}
+            for row in self._session.execute(stmt).scalars().all():
+                result[row.target_hash] = row
+        return result
 
 
 class SqliteOperationEventRepository(OperationEventRepository):
@@ -789,6 +1577,17 @@ class SqliteOperationEventRepository(OperationEventRepository):
         )
         return set(self._session.execute(stmt).scalars().all())
 
+    def filter_sources(self, commit_hashes: Sequence[str]) -> set[str]:
+        sources: set[str] = set()
+        for chunk in _chunked(list(commit_hashes)):
+            sources.update(self._session.execute(
+                select(OperationCommitRow.commit_hash).where(
+                    OperationCommitRow.commit_hash.in_(chunk),
+                    OperationCommitRow.role == "source",
+                )
+            ).scalars())
+        return sources
+
     def get_all_ids(self, tract_id: str) -> list[str]:
         stmt = select(OperationEventRow.event_id).where(
             OperationEventRow.tract_id == tract_id
@@ -822,15 +1621,42 @@ class SqliteOperationEventRepository(OperationEventRepository):
         self._session.expire_all()
         self._session.flush()
 
+    def delete_empty_events(self, tract_id: str) -> int:
+        """Delete events with no source/result members in bulk."""
+        members = select(OperationCommitRow.event_id).where(
+            OperationCommitRow.role.in_(("source", "result"))
+        )
+        event_ids = list(self._session.execute(
+            select(OperationEventRow.event_id).where(
+                OperationEventRow.tract_id == tract_id,
+                OperationEventRow.event_id.not_in(members),
+            )
+        ).scalars())
+        for chunk in _chunked(event_ids):
+            self._session.execute(
+                delete(OperationCommitRow).where(OperationCommitRow.event_id.in_(chunk))
+            )
+            self._session.execute(
+                delete(OperationEventRow).where(OperationEventRow.event_id.in_(chunk))
+            )
+        if event_ids:
+            self._session.expire_all()
+            self._session.flush()
+        return len(event_ids)
+
 
 class SqliteCompileRecordRepository(CompileRecordRepository):
     """SQLite implementation of compile record storage.
 
-    Tracks compile operations and their effective commits.
+    Tracks compile operations and their effective commits.  Effective
+    commit lists are delta-encoded against a base record, with a full
+    checkpoint every *checkpoint_every* records of a delta chain so that
+    reconstruction reads a bounded number of records.
     """
 
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: Session, checkpoint_every: int = 32) -> None:
         self._session = session
+        self._checkpoint_every = checkpoint_every
 
     def save_record(
         self,
@@ -889,6 +1715,204 @@ class SqliteCompileRecordRepository(CompileRecordRepository):
         )
         return list(self._session.execute(stmt).scalars().all())
 
+    def save_effectives(
+        self,
+        record_id: str,
+        commit_hashes: Sequence[str],
+        base: tuple[str, Sequence[str]] | None = None,
+    ) -> None:
+        record = self._session.get(CompileRecordRow, record_id)
+        if record is None:
+            raise ValueError(f"Compile record {record_id!r} not found")
+        count = len(commit_hashes)
+        prefix = suffix = depth = 0
+        base_row = None
+        if base is not None:
+            base_row = self._session.get(CompileRecordRow, base[0])
+        if base_row is not None and base_row.effective_count is not None:
+            depth = base_row.delta_depth + 1
+        if base is not None and depth and depth < self._checkpoint_every:
+            base_hashes = base[1]
+            limit = min(count, len(base_hashes))
+            while prefix < limit and commit_hashes[prefix] == base_hashes[prefix]:
+                prefix += 1
+            limit -= prefix
+            while (
+                suffix < limit
+                and commit_hashes[count - 1 - suffix] == base_hashes[-1 - suffix]
+            ):
+                suffix += 1
+        if prefix + suffix == 0:
+            # Nothing shared (or a checkpoint is due): store the full list
+            base_row, depth = None, 0
+
+        record.base_record_id = base_row.record_id if base_row is not None else None
+        record.keep_prefix = prefix
+        record.keep_suffix = suffix
+        record.effective_count = count
+        record.delta_depth = depth
+        changed = range(prefix, count - suffix)
+        if changed:
+            self._session.execute(
+                insert(CompileEffectiveRow),
+                [
+                    {"record_id": record_id, "commit_hash": commit_hashes[pos], "position": pos}
+                    for pos in changed
+                ],
+            )
+        self._session.flush()
+
+    def get_commit_hashes(self, record_id: str) -> list[str]:
+        # Walk base_record_id links back to the checkpoint in one query
+        chain = (
+            select(
+                CompileRecordRow.record_id,
+                CompileRecordRow.base_record_id,
+                literal(0).label("depth"),
+            )
+            .where(CompileRecordRow.record_id == record_id)
+            .cte("record_chain", recursive=True)
+        )
+        base = aliased(CompileRecordRow)
+        chain = chain.union_all(
+            select(
+                base.record_id,
+                base.base_record_id,
+                (chain.c.depth + 1).label("depth"),
+            ).join(chain, base.record_id == chain.c.base_record_id)
+        )
+        records = list(self._session.execute(
+            select(CompileRecordRow)
+            .join(chain, CompileRecordRow.record_id == chain.c.record_id)
+            .order_by(chain.c.depth.desc())
+        ).scalars().all())
+        if not records:
+            return []
+
+        rows_by_record: dict[str, list[CompileEffectiveRow]] = {}
+        for row in self._session.execute(
+            select(CompileEffectiveRow)
+            .where(CompileEffectiveRow.record_id.in_([r.record_id for r in records]))
+            .order_by(CompileEffectiveRow.position)
+        ).scalars():
+            rows_by_record.setdefault(row.record_id, []).append(row)
+
+        # Replay from the checkpoint forward.  Slots of commits deleted since
+        # (e.g. by gc) stay None so later positions keep lining up.
+        hashes: list[str | None] = []
+        for record in records:
+            rows = rows_by_record.get(record.record_id, [])
+            if record.effective_count is None:
+                # Pre-delta record: rows are the full list
+                hashes = [row.commit_hash for row in rows]
+                continue
+            count = record.effective_count
+            current: list[str | None] = [None] * count
+            if record.base_record_id is not None:
+                current[:record.keep_prefix] = hashes[:record.keep_prefix]
+                if record.keep_suffix:
+                    current[count - record.keep_suffix:] = hashes[len(hashes) - record.keep_suffix:]
+            for row in rows:
+                current[row.position] = row.commit_hash
+            hashes = current
+        return [h for h in hashes if h is not None]
+
+
+class SqliteCompileSnapshotRepository(CompileSnapshotRepository):
+    """SQLite implementation of persisted compile-snapshot storage."""
+
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    def get(
+        self, tract_id: str, head_hash: str, params_key: str
+    ) -> CompileSnapshotRow | None:
+        return self._session.get(CompileSnapshotRow, (tract_id, head_hash, params_key))
+
+    def save(self, row: CompileSnapshotRow) -> None:
+        self._session.merge(row)
+        self._session.flush()
+
+    def find_nearest_ancestor(
+        self, tract_id: str, head_hash: str, params_key: str
+    ) -> tuple[CompileSnapshotRow, int] | None:
+        chain = (
+            select(
+                CommitRow.commit_hash,
+                CommitRow.parent_hash,
+                literal(0).label("depth"),
+            )
+            .where(CommitRow.commit_hash == head_hash)
+            .cte("chain", recursive=True)
+        )
+        parent = aliased(CommitRow)
+        chain = chain.union_all(
+            select(
+                parent.commit_hash,
+                parent.parent_hash,
+                (chain.c.depth + 1).label("depth"),
+            ).join(chain, parent.commit_hash == chain.c.parent_hash)
+        )
+        stmt = (
+            select(CompileSnapshotRow, chain.c.depth)
+            .join(chain, CompileSnapshotRow.head_hash == chain.c.commit_hash)
+            .where(
+                CompileSnapshotRow.tract_id == tract_id,
+                CompileSnapshotRow.params_key == params_key,
+            )
+            .order_by(chain.c.depth)
+            .limit(1)
+        )
+        result = self._session.execute(stmt).first()
+        if result is None:
+            return None
+        return result[0], int(result[1])
+
+    def prune(
+        self,
+        tract_id: str,
+        keep: int,
+        *,
+        params_key: str | None = None,
+        exclude: Sequence[str] = (),
+    ) -> int:
+        stale = (
+            select(CompileSnapshotRow.head_hash, CompileSnapshotRow.params_key)
+            .where(CompileSnapshotRow.tract_id == tract_id)
+            .order_by(CompileSnapshotRow.created_at.desc())
+            .offset(keep)
+        )
+        if params_key is not None:
+            stale = stale.where(CompileSnapshotRow.params_key == params_key)
+        if exclude:
+            stale = stale.where(CompileSnapshotRow.params_key.not_in(list(exclude)))
+        rows = self._session.execute(stale).all()
+        for head_hash, row_key in rows:
+            self._session.execute(
+                delete(CompileSnapshotRow).where(
+                    CompileSnapshotRow.tract_id == tract_id,
+                    CompileSnapshotRow.head_hash == head_hash,
+                    CompileSnapshotRow.params_key == row_key,
+                )
+            )
+        if rows:
+            self._session.flush()
+        return len(rows)
+
+    def annotation_watermark(self, tract_id: str) -> int:
+        result = self._session.execute(
+            select(func.max(AnnotationRow.id)).where(AnnotationRow.tract_id == tract_id)
+        ).scalar()
+        return int(result) if result is not None else 0
+
+    def annotations_since(self, tract_id: str, watermark: int) -> list[AnnotationRow]:
+        stmt = (
+            select(AnnotationRow)
+            .where(AnnotationRow.tract_id == tract_id, AnnotationRow.id > watermark)
+            .order_by(AnnotationRow.id)
+        )
+        return list(self._session.execute(stmt).scalars().all())
+
 
 class SqliteSpawnPointerRepository(SpawnPointerRepository):
     """SQLite implementation of spawn pointer storage.
@@ -1048,24 +2072,27 @@ class SqliteToolSchemaRepository(ToolSchemaRepository):
         return list(self._session.execute(stmt).scalars().all())
 
     def batch_get_commit_tool_hashes(self, commit_hashes: list[str]) -> dict[str, list[str]]:
-        if not commit_hashes:
-            return {}
-        stmt = (
-            select(CommitToolRow.commit_hash, CommitToolRow.tool_hash)
-            .where(CommitToolRow.commit_hash.in_(commit_hashes))
-            .order_by(CommitToolRow.commit_hash, CommitToolRow.position)
-        )
         result: dict[str, list[str]] = {}
-        for row in self._session.execute(stmt).all():
-            result.setdefault(row.commit_hash, []).append(row.tool_hash)
+        for chunk in _chunked(commit_hashes):
+            stmt = (
+                select(CommitToolRow.commit_hash, CommitToolRow.tool_hash)
+                .where(CommitToolRow.commit_hash.in_(chunk))
+                .order_by(CommitToolRow.commit_hash, CommitToolRow.position)
+            )
+            for row in self._session.execute(stmt).all():
+                result.setdefault(row.commit_hash, []).append(row.tool_hash)
         return result
 
 
 class SqliteTagAnnotationRepository(TagAnnotationRepository):
-    """SQLite implementation of mutable tag annotation storage."""
+    """SQLite implementation of mutable tag annotation storage.
+
+    Added and removed tags are mirrored into the tag index.
+    """
 
     def __init__(self, session: Session) -> None:
         self._session = session
+        self._tag_index = SqliteTagIndexRepository(session)
 
     def add_tag(
         self, tract_id: str, target_hash: str, tag: str, created_at: datetime
@@ -1078,6 +2105,7 @@ class SqliteTagAnnotationRepository(TagAnnotationRepository):
         )
         self._session.add(row)
         self._session.flush()
+        self._tag_index.index_annotations([row])
         return row
 
     def remove_tag(self, tract_id: str, target_hash: str, tag: str) -> bool:
@@ -1094,6 +2122,7 @@ class SqliteTagAnnotationRepository(TagAnnotationRepository):
         for row in rows:
             self._session.delete(row)
         self._session.flush()
+        self._tag_index.unindex_annotation(target_hash, tag)
         return True
 
     def get_tags(self, target_hash: str) -> list[str]:
@@ -1166,6 +2195,27 @@ class SqliteTagAnnotationRepository(TagAnnotationRepository):
             result.setdefault(row.target_hash, []).append(row.tag)
         return result
 
+    def batch_get_rows(self, target_hashes: list[str]) -> dict[str, list[TagAnnotationRow]]:
+        result: dict[str, list[TagAnnotationRow]] = {}
+        for chunk in _chunked(target_hashes):
+            stmt = (
+                select(TagAnnotationRow)
+                .where(TagAnnotationRow.target_hash.in_(chunk))
+                .order_by(TagAnnotationRow.created_at, TagAnnotationRow.id)
+            )
+            for row in self._session.execute(stmt).scalars().all():
+                result.setdefault(row.target_hash, []).append(row)
+        return result
+
+    def save_many(self, rows: Sequence[TagAnnotationRow]) -> None:
+        if not rows:
+            return
+        self._session.execute(
+            insert(TagAnnotationRow), [_column_values(r) for r in rows]
+        )
+        self._tag_index.index_annotations(rows)
+        self._session.flush()
+
 
 class SqliteTagRegistryRepository(TagRegistryRepository):
     """SQLite implementation of tag registry storage."""
@@ -0,0 +1,350 @@
+"""Operation-level tracing for Tract.
+
+Every Tract owns a :class:`Tracer` (``t.tracer``).  Until a sink is
+attached it is disabled and each instrumentation point costs a single
+attribute check.  Attach a :class:`TraceSink` -- for example the
+in-memory :class:`TraceCollector` -- to receive timed spans for facade
+operations (``commit``, ``compile``, ``compress``, ``merge``, ...),
+compile phases, middleware and policy dispatch, LLM calls and SQL
+statements, plus counters such as compile-cache hits and misses::
+
+    collector = TraceCollector()
+    t.tracer.add_sink(collector)
+    t.compile()
+    print(collector.summary()["compile.walk"])
+
+Span names are dotted: ``compile`` is the facade call, ``compile.walk``
+one of its phases, ``storage.query`` a SQL statement and ``llm.chat`` a
+client call.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import logging
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, ParamSpec, Protocol, TypeVar, runtime_checkable
+
+if TYPE_CHECKING:
+    from contextlib import AbstractContextManager
+
+    from sqlalchemy.engine import Connection, Engine
+
+__all__: list[str] = [
+    "SpanRecord",
+    "TraceCollector",
+    "TraceSink",
+    "Tracer",
+    "traced",
+]
+
+logger = logging.getLogger(__name__)
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+_NULL_SPAN: AbstractContextManager[None] = nullcontext()
+_QUERY_STARTS = "tract_trace_query_starts"
+
+# Open spans of the current thread / asyncio task as (tracer id, name)
+# frames.  Each tracer only sees its own frames.
+_OPEN_SPANS: ContextVar[tuple[tuple[int, str], ...]] = ContextVar(
+    "tract_open_spans", default=()
+)
+
+
+@dataclass(frozen=True)
+class SpanRecord:
+    """A finished, timed span delivered to trace sinks."""
+
+    name: str
+    duration_ms: float
+    parent: str | None = None  # name of the enclosing span, if any
+    depth: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None  # exception type name when the span raised
+
+
+@runtime_checkable
+class TraceSink(Protocol):
+    """Receiver for spans and counters emitted by a :class:`Tracer`."""
+
+    def record_span(self, span: SpanRecord) -> None:
+        """Called once for every finished span."""
+        ...
+
+    def record_count(self, name: str, value: int) -> None:
+        """Called for every counter increment."""
+        ...
+
+
+class Tracer:
+    """Dispatches spans and counters to registered sinks.
+
+    Disabled (``enabled`` is False) while no sink is registered: ``span()``
+    then returns a shared no-op context manager and ``count()`` returns
+    immediately.  SQL statement tracing hooks into the SQLAlchemy engine
+    only while enabled.  Note that an engine shared by several tracts
+    reports every tract's statements to each enabled tracer.
+
+    Open spans are tracked per thread and per asyncio task, so spans from
+    concurrent workers nest under their own parents.
+    """
+
+    def __init__(self) -> None:
+        self._sinks: list[TraceSink] = []
+        self._engine: Engine | Connection | None = None
+        self._listening = False
+        # Bound once so SQLAlchemy can match them on removal.
+        self._before_query = self._on_before_cursor_execute
+        self._after_query = self._on_after_cursor_execute
+        self._query_error = self._on_handle_error
+
+    @property
+    def enabled(self) -> bool:
+        """True when at least one sink is registered."""
+        return bool(self._sinks)
+
+    @property
+    def sinks(self) -> tuple[TraceSink, ...]:
+        """Registered sinks, in registration order."""
+        return tuple(self._sinks)
+
+    def add_sink(self, sink: TraceSink) -> TraceSink:
+        """Register *sink* and enable tracing.  Returns the sink."""
+        if not isinstance(sink, TraceSink):
+            raise TypeError(
+                f"Trace sink must implement record_span() and record_count(), "
+                f"got {type(sink).__name__}"
+            )
+        self._sinks.append(sink)
+        self._sync_engine_listeners()
+        return sink
+
+    def remove_sink(self, sink: TraceSink) -> None:
+        """Unregister *sink*; tracing is disabled when none remain."""
+        try:
+            self._sinks.remove(sink)
+        except ValueError:
+            raise ValueError("Trace sink is not registered") from None
+        self._sync_engine_listeners()
+
+    def span(self, name: str, **attributes: Any) -> AbstractContextManager[None]:
+        """Time the enclosed block as span *name*."""
+        if not self._sinks:
+            return _NULL_SPAN
+        return self._span(name, attributes)
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Increment counter *name* by *value*."""
+        if not self._sinks:
+            return
+        for sink in self._sinks:
+            try:
+                sink.record_count(name, value)
+            except Exception:
+                logger.exception("Trace sink %r failed to record counter %s", sink, name)
+
+    def _open_spans(self) -> list[str]:
+        """Names of this tracer's open spans in the current context, outermost first."""
+        me = id(self)
+        return [name for owner, name in _OPEN_SPANS.get() if owner == me]
+
+    @contextmanager
+    def _span(self, name: str, attributes: dict[str, Any]) -> Iterator[None]:
+        stack = self._open_spans()
+        parent = stack[-1] if stack else None
+        depth = len(stack)
+        token = _OPEN_SPANS.set((*_OPEN_SPANS.get(), (id(self), name)))
+        error: str | None = None
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException as exc:
+            error = type(exc).__name__
+            raise
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            _OPEN_SPANS.reset(token)
+            self._emit(SpanRecord(name, duration_ms, parent, depth, attributes, error))
+
+    def _emit(self, record: SpanRecord) -> None:
+        for sink in self._sinks:
+            try:
+                sink.record_span(record)
+            except Exception:
+                logger.exception("Trace sink %r failed to record span %s", sink, record.name)
+
+    # ------------------------------------------------------------------
+    # SQL statement tracing
+    # ------------------------------------------------------------------
+
+    def bind_engine(self, engine: Engine | Connection | None) -> None:
+        """Trace statements executed on *engine* (or a connection) while tracing is enabled."""
+        if engine is self._engine:
+            return
+        self._remove_engine_listeners()
+        self._engine = engine
+        self._sync_engine_listeners()
+
+    def close(self) -> None:
+        """Detach from the engine; registered sinks are kept."""
+        self._remove_engine_listeners()
+        self._engine = None
+
+    def _sync_engine_listeners(self) -> None:
+        if self._sinks and not self._listening and self._engine is not None:
+            from sqlalchemy import event
+
+            event.listen(self._engine, "before_cursor_execute", self._before_query)
+            event.listen(self._engine, "after_cursor_execute", self._after_query)
+            event.listen(self._engine, "handle_error", self._query_error)
+            self._listening = True
+        elif not self._sinks:
+            self._remove_engine_listeners()
+
+    def _remove_engine_listeners(self) -> None:
+        if not self._listening or self._engine is None:
+            return
+        from sqlalchemy import event
+
+        event.remove(self._engine, "before_cursor_execute", self._before_query)
+        event.remove(self._engine, "after_cursor_execute", self._after_query)
+        event.remove(self._engine, "handle_error", self._query_error)
+        self._listening = False
+
+    def _on_before_cursor_execute(
+        self, conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+    ) -> None:
+        conn.info.setdefault(_QUERY_STARTS, []).append(time.perf_counter())
+
+    def _on_after_cursor_execute(
+        self, conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+    ) -> None:
+        starts = conn.info.get(_QUERY_STARTS)
+        if not starts:
+            return
+        duration_ms = (time.perf_counter() - starts.pop()) * 1000
+        verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+        stack = self._open_spans()
+        self._emit(SpanRecord(
+            "storage.query",
+            duration_ms,
+            stack[-1] if stack else None,
+            len(stack),
+            {"statement": verb, "executemany": executemany},
+        ))
+
+    def _on_handle_error(self, exception_context: Any) -> None:
+        conn = exception_context.connection
+        if conn is not None:
+            starts = conn.info.get(_QUERY_STARTS)
+            if starts:
+                starts.pop()
+
+
+def traced(name: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Method decorator timing each call as span *name*.
+
+    Works on both regular and ``async`` methods.  The instance must expose
+    its :class:`Tracer` as ``_tracer``.
+    """
+
+    def decorate(fn: Callable[P, R]) -> Callable[P, R]:
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def awrapper(*args: P.args, **kwargs: P.kwargs) -> Any:
+                tracer: Tracer = args[0]._tracer  # type: ignore[attr-defined]
+                if not tracer._sinks:
+                    return await fn(*args, **kwargs)
+                with tracer._span(name, {}):
+                    return await fn(*args, **kwargs)
+
+            return awrapper  # type: ignore[return-value]
+
+        @functools.wraps(fn)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            tracer: Tracer = args[0]._tracer  # type: ignore[attr-defined]
+            if not tracer._sinks:
+                return fn(*args, **kwargs)
+            with tracer._span(name, {}):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+class _TracedLLMClient:
+    """Proxy timing ``chat``/``achat`` of an LLM client as ``llm.chat`` spans."""
+
+    def __init__(self, client: Any, tracer: Tracer, operation: str) -> None:
+        self._client = client
+        self._tracer = tracer
+        self._operation = operation
+
+    def chat(self, messages: list[dict], **kwargs: Any) -> Any:
+        with self._tracer.span("llm.chat", operation=self._operation):
+            return self._client.chat(messages, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if name != "achat":
+            return attr
+
+        # Only present when the wrapped client is async-capable, so
+        # hasattr(client, "achat") probes keep working.
+        async def achat(messages: list[dict], **kwargs: Any) -> Any:
+            with self._tracer.span("llm.chat", operation=self._operation):
+                return await attr(messages, **kwargs)
+
+        return achat
+
+
+def trace_llm_client(client: Any, tracer: Tracer, operation: str) -> Any:
+    """Wrap *client* so its calls are traced; returns it unchanged when disabled."""
+    if not tracer._sinks:
+        return client
+    return _TracedLLMClient(client, tracer, operation)
+
+
+class TraceCollector:
+    """In-memory :class:`TraceSink` that keeps recent spans and totals counters.
+
+    Args:
+        max_spans: Number of most recent spans to keep (None keeps all).
+    """
+
+    def __init__(self, max_spans: int | None = 10_000) -> None:
+        self.spans: deque[SpanRecord] = deque(maxlen=max_spans)
+        self.counters: dict[str, int] = {}
+
+    def record_span(self, span: SpanRecord) -> None:
+        self.spans.append(span)
+
+    def record_count(self, name: str, value: int) -> None:
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Aggregate kept spans by name: ``count``, ``total_ms``, ``mean_ms``, ``max_ms``."""
+        out: dict[str, dict[str, float]] = {}
+        for span in self.spans:
+            entry = out.setdefault(span.name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            entry["count"] += 1
+            entry["total_ms"] += span.duration_ms
+            entry["max_ms"] = max(entry["max_ms"], span.duration_ms)
+        for entry in out.values():
+            entry["mean_ms"] = entry["total_ms"] / entry["count"]
+        return out
+
+    def clear(self) -> None:
+        """Drop all kept spans and counters."""
+        self.spans.clear()
+        self.counters.clear()
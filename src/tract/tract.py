@@ -20,7 +20,7 @@ from typing import TYPE_CHECKING, Literal, overload
 
 from pydantic import BaseModel
 
-from tract.engine.cache import CacheManager
+from tract.engine.cache import CacheManager, CompileVariant
 from tract.engine.commit import CommitEngine
 from tract.engine.compiler import DefaultContextCompiler
 from tract.engine.tokens import TiktokenCounter
@@ -47,19 +47,23 @@ from tract.storage.sqlite import (
     SqliteCommitParentRepository,
     SqliteCommitRepository,
     SqliteCompileRecordRepository,
+    SqliteCompileSnapshotRepository,
     SqliteOperationEventRepository,
     SqlitePersistenceRepository,
     SqliteRefRepository,
+    SqliteSearchIndexRepository,
     SqliteSpawnPointerRepository,
     SqliteTagAnnotationRepository,
+    SqliteTagIndexRepository,
     SqliteTagRegistryRepository,
     SqliteToolSchemaRepository,
 )
+from tract.tracing import Tracer, traced
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Iterator
+    from collections.abc import Callable, Iterable, Iterator
     from pathlib import Path
-    from typing import Any
+    from typing import Any, BinaryIO
 
     from sqlalchemy import Engine
     from sqlalchemy.orm import Session
@@ -421,6 +425,7 @@ class Tract:
         event_repo: SqliteOperationEventRepository | None = None,
         compile_record_repo: SqliteCompileRecordRepository | None = None,
         tool_schema_repo: SqliteToolSchemaRepository | None = None,
+        compile_snapshot_repo: SqliteCompileSnapshotRepository | None = None,
         verify_cache: bool = False,
     ) -> None:
         self._engine = engine
@@ -437,18 +442,33 @@ class Tract:
         self._parent_repo = parent_repo
         self._event_repo = event_repo
         self._compile_record_repo = compile_record_repo
+        # Last compile record per branch: (record_id, commit_hashes), the
+        # base that the next record's effective commits are delta-encoded against
+        self._compile_record_bases: dict[str | None, tuple[str, tuple[str, ...]]] = {}
         self._tool_schema_repo = tool_schema_repo
+        self._compile_snapshot_repo = compile_snapshot_repo
         self._spawn_repo: SqliteSpawnPointerRepository | None = None
+        self._search_index_repo = SqliteSearchIndexRepository(session)
+        self._tag_index_repo = SqliteTagIndexRepository(session)
         self._session_owner: object | None = None  # Session back-reference (set by Session)
         self._tag_annotation_repo: SqliteTagAnnotationRepository | None = None
         self._tag_registry_repo: SqliteTagRegistryRepository | None = None
         self._strict_tags: bool = True
         self._custom_type_registry: dict[str, type[BaseModel]] = {}
+        # Operation tracing; inert until a sink is added via t.tracer
+        self._tracer = Tracer()
+        self._tracer.bind_engine(engine if engine is not None else session.bind)
+        if isinstance(compiler, DefaultContextCompiler):
+            compiler.tracer = self._tracer
         self._cache = CacheManager(
             maxsize=config.compile_cache_maxsize,
             compiler=compiler,
             token_counter=token_counter,
             commit_repo=commit_repo,
+            parent_repo=parent_repo,
+            snapshot_repo=compile_snapshot_repo,
+            tract_id=tract_id,
+            tracer=self._tracer,
         )
         self._verify_cache: bool = verify_cache
         self._in_batch: bool = False
@@ -553,6 +573,7 @@ class Tract:
             get_ancestors=self._get_merge_aware_ancestors,
             row_to_info=self._commit_engine._row_to_info,
             get_head=lambda: self.head,
+            tag_index_repo=self._tag_index_repo,
         )
 
         self._branches_mgr = BranchManager(
@@ -563,7 +584,7 @@ class Tract:
             cache=self._cache,
             check_open=self._check_open,
             commit_session=self._commit_session,
-            get_config_index=lambda: getattr(self._config_mgr, '_config_index', None),
+            invalidate_config=lambda: self._config_mgr.invalidate_cache(),
         )
 
         self._annotations_mgr = AnnotationManager(
@@ -586,6 +607,7 @@ class Tract:
             get_head=lambda: self.head,
             tract_ref=lambda: self,
             policy_engine=self._policy_engine,
+            tracer=self._tracer,
         )
 
         self._tools_mgr = ToolManager(
@@ -620,6 +642,8 @@ class Tract:
             commit_session=self._commit_session,
             commit_fn=lambda *a, **kw: self.commit(*a, **kw),
             get_head=lambda: self.head,
+            snapshot_repo=self._compile_snapshot_repo,
+            tracer=self._tracer,
         )
 
         # Search manager (read-only + callbacks)
@@ -648,6 +672,8 @@ class Tract:
             commit_fn=lambda *a, **kw: self.commit(*a, **kw),
             tag_annotation_repo=self._tag_annotation_repo,
             tract_ref=self,
+            search_index_repo=self._search_index_repo,
+            tag_index_repo=self._tag_index_repo,
         )
 
         # Template manager (shares Tract's registries)
@@ -802,6 +828,9 @@ class Tract:
             commit_session=self._commit_session,
             get_head=lambda: self.head,
             row_to_info=self._commit_engine._row_to_info,
+            tool_schema_repo=self._tool_schema_repo,
+            get_tag_annotation_repo=lambda: self._tag_annotation_repo,
+            get_tag_registry_repo=lambda: self._tag_registry_repo,
         )
 
         # Runtime sub-object (wraps LLM + toolkit)
@@ -846,6 +875,11 @@ class Tract:
         """Template and profile sub-object."""
         return self._templates_mgr
 
+    @property
+    def tracer(self) -> Tracer:
+        """Operation tracer -- add a :class:`~tract.tracing.TraceSink` to enable."""
+        return self._tracer
+
     # ------------------------------------------------------------------
     # Branch operations
     # ------------------------------------------------------------------
@@ -1232,6 +1266,7 @@ class Tract:
     # Compression operations
     # ------------------------------------------------------------------
 
+    @traced("compress")
     def compress(self, **kwargs):
         """Compress commit chains into summaries.
 
@@ -1243,18 +1278,31 @@ class Tract:
         self._check_open()
         return self._compression_mgr.compress(**kwargs)
 
+    @traced("compress")
     async def acompress(self, **kwargs):
         """Async version of :meth:`compress`."""
         self._check_open()
         return await self._compression_mgr.acompress(**kwargs)
 
-    def gc(self, *, orphan_retention_days: int = 7, archive_retention_days: int | None = None, branch: str | None = None):
+    @traced("gc")
+    def gc(
+        self,
+        *,
+        orphan_retention_days: int = 7,
+        archive_retention_days: int | None = None,
+        branch: str | None = None,
+        batch_size: int | None = None,
+        max_seconds: float | None = None,
+    ):
         """Garbage-collect unreachable commits.
 
         Args:
             orphan_retention_days: Retention for orphaned commits (default 7).
             archive_retention_days: Retention for archived commits.
             branch: Limit GC to a specific branch.
+            batch_size: Remove commits in batches of this size, committing
+                after each batch (default: one transaction).
+            max_seconds: Stop a batched run after this many seconds.
 
         Returns:
             :class:`GCResult` describing what was collected.
@@ -1264,6 +1312,8 @@ class Tract:
             orphan_retention_days=orphan_retention_days,
             archive_retention_days=archive_retention_days,
             branch=branch,
+            batch_size=batch_size,
+            max_seconds=max_seconds,
         )
 
     def record_usage(self, usage, *, head_hash: str | None = None):
@@ -1364,6 +1414,49 @@ class Tract:
         self._check_open()
         return self._persistence_mgr.load_state(state)
 
+    def export_archive(
+        self,
+        target: str | Path | BinaryIO,
+        *,
+        compression: str | None = None,
+    ) -> int:
+        """Stream the tract to a DAG-preserving archive file.
+
+        Keeps commit hashes, merge parents, annotations, tags and branches,
+        and never holds the whole history in memory.
+
+        Args:
+            target: Path or binary file object.
+            compression: ``"gzip"``, ``"zstd"`` or None (inferred from a
+                ``.gz``/``.zst`` suffix).
+
+        Returns:
+            Number of commits exported.
+        """
+        self._check_open()
+        return self._require_persistence().export_archive(target, compression=compression)
+
+    def import_archive(self, source: str | Path | BinaryIO) -> int:
+        """Load an archive from :meth:`export_archive` into this tract.
+
+        Runs as one atomic batch: an invalid or truncated archive leaves the
+        tract unchanged.
+
+        Args:
+            source: Path or binary file object (compression auto-detected).
+
+        Returns:
+            Number of commits imported.
+        """
+        self._check_open()
+        persistence = self._require_persistence()
+        with self.batch():
+            inserted = persistence.import_archive(source)
+        self._cache.clear()
+        if hasattr(self, '_config_mgr') and self._config_mgr is not None:
+            self._config_mgr.invalidate_cache()
+        return inserted
+
     def compile_records(self, limit: int = 100) -> list:
         """Get compile records for this tract, newest first.
 
@@ -1445,6 +1538,12 @@ class Tract:
     # Internal check
     # ------------------------------------------------------------------
 
+    def _require_persistence(self) -> PersistenceManager:
+        """Return the persistence manager, which open()/from_components() create."""
+        if self._persistence_mgr is None:
+            raise TraceError("Tract has no persistence manager; use Tract.open()")
+        return self._persistence_mgr
+
     def _check_open(self) -> None:
         """Raise :class:`ClosedError` if closed, or :class:`ThreadSafetyError` if wrong thread."""
         if self._closed:
@@ -1618,6 +1717,11 @@ class Tract:
         event_repo = SqliteOperationEventRepository(session)
         compile_record_repo = SqliteCompileRecordRepository(session)
         tool_schema_repo = SqliteToolSchemaRepository(session)
+        compile_snapshot_repo = (
+            SqliteCompileSnapshotRepository(session)
+            if config.compile_cache_persist
+            else None
+        )
 
         # Token counter (tokenizer_encoding= overrides config when both provided)
         encoding = tokenizer_encoding or config.tokenizer_encoding
@@ -1675,6 +1779,7 @@ class Tract:
             event_repo=event_repo,
             compile_record_repo=compile_record_repo,
             tool_schema_repo=tool_schema_repo,
+            compile_snapshot_repo=compile_snapshot_repo,
             verify_cache=verify_cache,
         )
         tract._spawn_repo = spawn_repo
@@ -2135,6 +2240,7 @@ class Tract:
     # Public methods
     # ------------------------------------------------------------------
 
+    @traced("commit")
     def commit(
         self,
         content: BaseModel | dict,
@@ -2240,6 +2346,9 @@ class Tract:
         # Persist to database
         self._commit_session()
 
+        # Carry the config index forward to the new HEAD
+        self._config_mgr.advance(prev_head, info.commit_hash, content)
+
         # Update compile cache: incremental extend for APPEND,
         # in-memory patching for EDIT, otherwise next compile() rebuilds.
         # Skip cache updates during batch() -- cache was cleared on entry
@@ -2261,12 +2370,105 @@ class Tract:
                         if patched is not None:
                             self._cache.put(info.commit_hash, patched)
                 # Do NOT clear cache -- other entries at different HEADs remain valid
+            if prev_head and self._cache.uses_default_compiler:
+                self._cache.advance_variants(prev_head, info.commit_hash)
 
         # Fire post-commit middleware
         self._middleware_mgr._run("post_commit", commit=info)
 
         return info
 
+    def commit_many(
+        self,
+        contents: Iterable[BaseModel | dict],
+        *,
+        metadata: dict | None = None,
+        generation_config: dict | None = None,
+        tools: list[dict] | None = None,
+        tags: list[str] | None = None,
+    ) -> list[CommitInfo]:
+        """Append many commits in one bulk write.
+
+        Intended for ingesting long transcripts.  Each content goes through
+        the same validation, auto-message, tag classification and
+        middleware as :meth:`commit`, but the rows are written with bulk
+        inserts, HEAD moves once, and the session commits once (or defers
+        to an enclosing :meth:`batch`).  The compile cache is not extended;
+        the next :meth:`compile` rebuilds it.
+
+        Args:
+            contents: Content models or dicts, oldest first.
+            metadata: Optional metadata applied to every commit.
+            generation_config: Optional generation config applied to every commit.
+            tools: Optional tool definitions linked to every commit
+                (defaults to the tools set via ``set_tools()``).
+            tags: Optional immutable tags added to every commit.
+
+        Returns:
+            :class:`CommitInfo` for each new commit, in input order.
+        """
+        self._check_open()
+        if self._ref_repo.is_detached(self._tract_id):
+            raise DetachedHeadError()
+
+        from tract.engine.commit import extract_text_from_content as _extract_text
+
+        max_commit_tokens = self._config_mgr.get("max_commit_tokens")
+        explicit_tags = list(tags) if tags else []
+        models: list[BaseModel] = []
+        messages: list[str | None] = []
+        all_tags: list[list[str] | None] = []
+        for content in contents:
+            if isinstance(content, dict):
+                content = validate_content(content, custom_registry=self._custom_type_registry)
+            _ctype = getattr(content, "content_type", "unknown")
+            _role = getattr(content, "role", None)
+            _text = _extract_text(content)
+
+            message, auto_tags = self._auto_classify(
+                _ctype, _text, role=_role,
+                operation=CommitOperation.APPEND, metadata=metadata,
+            )
+            item_tags = list(dict.fromkeys(explicit_tags + auto_tags))
+            if item_tags:
+                self._tags_mgr._validate(item_tags)
+
+            self._middleware_mgr._run("pre_commit", pending=content)
+
+            if (
+                max_commit_tokens is not None
+                and _text
+                and self._token_counter.count_text(_text) > int(max_commit_tokens)
+            ):
+                raise BlockedError(
+                    "pre_commit",
+                    f"Exceeds max_commit_tokens ({max_commit_tokens})",
+                )
+
+            models.append(content)
+            messages.append(message)
+            all_tags.append(item_tags or None)
+
+        infos = self._commit_engine.create_commits(
+            models,
+            messages=messages,
+            tags=all_tags,
+            metadata=metadata,
+            generation_config=generation_config,
+        )
+
+        effective_tools = tools if tools is not None else self._tools_mgr.get()
+        if effective_tools is not None and self._tool_schema_repo is not None:
+            for info in infos:
+                self._tools_mgr._store_and_link(info.commit_hash, effective_tools)
+
+        self._commit_session()
+
+        for info in infos:
+            self._middleware_mgr._run("post_commit", commit=info)
+
+        return infos
+
     def metadata(
         self,
         kind: str,
@@ -2666,6 +2868,7 @@ class Tract:
         recent_ratio: float | None = ...,
     ) -> tuple[CompiledContext, list[ReorderWarning]]: ...
 
+    @traced("compile")
     def compile(
         self,
         *,
@@ -2748,14 +2951,17 @@ class Tract:
             or recent_ratio is not None
         )
         if _bypass_cache:
-            result = self._compiler.compile(
-                self._tract_id,
+            result = self._compile_variant(
                 current_head,
-                at_time=at_time,
-                at_commit=at_commit,
-                include_edit_annotations=include_edit_annotations,
-                include_reasoning=include_reasoning,
-                **_strategy_kw,
+                CompileVariant.of(
+                    at_time=at_time,
+                    at_commit=at_commit,
+                    include_edit_annotations=include_edit_annotations,
+                    include_reasoning=include_reasoning,
+                    strategy=strategy,
+                    strategy_k=strategy_k,
+                    recent_ratio=recent_ratio,
+                ),
             )
             # Apply API-reported token override if available for the
             # resolved head commit (tiktoken is temporary; API is truth).
@@ -2808,7 +3014,13 @@ class Tract:
                     )
             return self._inject_tools(result)
 
-        # Cache miss: full compile and build snapshot
+        # Cache miss: resume from the persistent tier when enabled
+        resumed = self._cache.load_persisted(current_head)
+        if resumed is not None:
+            self._persist_compile_snapshot(current_head)
+            return self._inject_tools(self._cache.to_compiled(resumed))
+
+        # Full compile and build snapshot
         result = self._compiler.compile(self._tract_id, current_head)
         snapshot = self._cache.build_snapshot(current_head, result)
         if snapshot is not None:
@@ -2817,9 +3029,48 @@ class Tract:
             if api_override is not None:
                 snapshot = replace(snapshot, token_count=api_override[0], token_source=api_override[1])
             self._cache.put(current_head, snapshot)
+            self._persist_compile_snapshot(current_head)
             result = self._cache.to_compiled(snapshot)
         return self._inject_tools(result)
 
+    def _compile_variant(self, head_hash: str, variant: CompileVariant) -> CompiledContext:
+        """Compile with non-default parameters, served from the variant cache.
+
+        Misses run a full compile and cache its snapshot under
+        ``(head_hash, variant)``; custom compilers are never cached.
+        """
+        snapshot = self._cache.get_variant(head_hash, variant)
+        if snapshot is None:
+            # Strategy options are DefaultContextCompiler extensions, not part
+            # of the ContextCompiler protocol
+            strategy_kw: dict[str, Any] = {
+                "strategy": variant.strategy,
+                "strategy_k": variant.strategy_k,
+                "recent_ratio": variant.recent_ratio,
+            }
+            result = self._compiler.compile(
+                self._tract_id,
+                head_hash,
+                at_time=variant.at_time,
+                at_commit=variant.at_commit,
+                include_edit_annotations=variant.include_edit_annotations,
+                include_reasoning=variant.include_reasoning,
+                **strategy_kw,
+            )
+            snapshot = self._cache.build_snapshot(head_hash, result)
+            if snapshot is None:
+                return result
+            self._cache.put_variant(head_hash, variant, snapshot)
+        return self._cache.to_compiled(snapshot)
+
+    def _persist_compile_snapshot(self, head_hash: str) -> None:
+        """Write the cached snapshot for *head_hash* to the persistent tier.
+
+        No-op unless ``TractConfig.compile_cache_persist`` is enabled.
+        """
+        if self._cache.persist(head_hash):
+            self._commit_session()
+
     def _reorder_compiled(
         self, result: CompiledContext, order: list[str]
     ) -> CompiledContext:
@@ -2965,20 +3216,12 @@ class Tract:
                 )
             )
 
-        # Fetch a larger window when op_filter will discard rows
-        fetch_limit = None if op_filter is not None else limit
-        all_rows = list(
-            self._commit_repo.get_ancestors_with_merges(start_hash, limit=fetch_limit)
+        return list(
+            self._commit_repo.get_ancestors_with_merges(
+                start_hash, limit=limit, op_filter=op_filter,
+            )
         )
 
-        # Apply op_filter in Python (content_type filtering etc.)
-        if op_filter is not None:
-            all_rows = [r for r in all_rows if r.operation == op_filter]
-            if limit is not None:
-                all_rows = all_rows[:limit]
-
-        return all_rows
-
 
     def _compile_at(self, commit_hash: str) -> CompiledContext:
         """Compile at a specific commit, using LRU cache if available.
@@ -3047,6 +3290,7 @@ class Tract:
         return self._llm_state.operation_prompts
 
 
+    @traced("merge")
     def merge(
         self,
         source_branch: str,
@@ -3291,6 +3535,7 @@ class Tract:
 
         return result
 
+    @traced("rebase")
     def rebase(
         self,
         target_branch: str,
@@ -3368,7 +3613,12 @@ class Tract:
         token_source: str,
         commit_hashes: tuple[str, ...] | list[str] = (),
     ) -> None:
-        """Persist a compile record to storage."""
+        """Persist a compile record to storage.
+
+        The effective commits are stored as a delta from the previous record
+        written on the same branch by this instance (see
+        :meth:`~tract.storage.repositories.CompileRecordRepository.save_effectives`).
+        """
         if self._compile_record_repo is None:
             return  # compile records not enabled; silently skip
         record_id = uuid.uuid4().hex
@@ -3382,8 +3632,13 @@ class Tract:
             params_json=None,
             created_at=datetime.now(timezone.utc),
         )
-        for pos, ch in enumerate(commit_hashes):
-            self._compile_record_repo.add_effective(record_id, ch, pos)
+        branch = self._ref_repo.get_current_branch(self._tract_id)
+        commit_hashes = tuple(commit_hashes)
+        self._compile_record_repo.save_effectives(
+            record_id, commit_hashes, self._compile_record_bases.get(branch)
+        )
+        if commit_hashes:
+            self._compile_record_bases[branch] = (record_id, commit_hashes)
         self._commit_session()
 
     def _normalize_usage_dict(self, usage_dict: dict) -> TokenUsage:
@@ -3482,7 +3737,15 @@ class Tract:
         """Close the session and dispose the engine."""
         if self._closed:
             return
+        # Flush the current HEAD's snapshot so the next open() resumes from it
+        try:
+            head = self.head
+            if head is not None:
+                self._persist_compile_snapshot(head)
+        except Exception:
+            logger.debug("Failed to persist compile snapshot", exc_info=True)
         self._closed = True
+        self._tracer.close()
         # Close internally-created LLM client (not externally-provided ones)
         owns = self._llm_state.owns_llm_client
         client = self._llm_state.llm_client
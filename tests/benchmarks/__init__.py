@@ -0,0 +1,15 @@
+"""Offline performance benchmarks for Tract.
+
+Run from the repository root::
+
+    python -m tests.benchmarks --scale 1k,10k --output bench.json
+    python -m tests.benchmarks --scale 1k --baseline bench.json --threshold 0.25
+
+Every case runs against in-memory SQLite with ``MockLLMClient`` standing in
+for the LLM, so results only reflect Tract's own storage and compile work.
+Results are written as JSON keyed by ``"<case>@<scale>"``; comparing
+against a baseline exits non-zero when any case is slower by more than the
+threshold.  The smoke tests in ``test_benchmarks.py`` that run cases end to
+end carry the ``benchmark`` marker and are deselected by default; run them
+with ``pytest -m benchmark tests/benchmarks``.
+"""
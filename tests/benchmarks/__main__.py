@@ -0,0 +1,61 @@
+"""Command-line entry point: ``python -m tests.benchmarks``."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+
+from tests.benchmarks.cases import CASES
+from tests.benchmarks.runner import compare, load, parse_scale, run_suite, save
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m tests.benchmarks",
+        description="Run Tract's offline performance benchmarks.",
+    )
+    parser.add_argument(
+        "--scale", default="1k",
+        help="Comma-separated history sizes: 1k, 10k, 100k or integers (default: 1k).",
+    )
+    parser.add_argument(
+        "--only", default=None,
+        help=f"Comma-separated cases to run (default: all). Available: {', '.join(CASES)}.",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per case (default: 3).")
+    parser.add_argument("--output", "-o", default=None, help="Write results JSON to this file.")
+    parser.add_argument("--baseline", "-b", default=None, help="Compare against a previous results file.")
+    parser.add_argument(
+        "--threshold", type=float, default=0.25,
+        help="Allowed slowdown as a fraction before failing (default: 0.25).",
+    )
+    args = parser.parse_args(argv)
+
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    try:
+        scales = [parse_scale(s) for s in args.scale.split(",") if s]
+    except ValueError:
+        parser.error(f"invalid --scale: {args.scale!r}")
+    names = [n for n in args.only.split(",") if n] if args.only else None
+
+    try:
+        document = run_suite(scales, names, repeat=args.repeat, progress=True)
+    except ValueError as exc:
+        parser.error(str(exc))
+    if args.output:
+        save(document, args.output)
+
+    if args.baseline:
+        regressions = compare(document, load(args.baseline), threshold=args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.threshold:.0%}:", file=sys.stderr)
+            for regression in regressions:
+                print(f"  {regression}", file=sys.stderr)
+            return 1
+        print("No regressions.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
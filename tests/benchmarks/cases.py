@@ -0,0 +1,215 @@
+"""Benchmark cases.
+
+Each case is a generator function taking the scale ``n`` (number of
+commits in the fixture history): it builds its fixture, yields the
+zero-argument callable to time, and cleans up after the ``yield``, in the
+style of a pytest yield fixture.  A fresh fixture is built for every
+repetition, so destructive operations (compress, merge, gc) are measured
+from the same starting state each time.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+
+from tract import DialogueContent, InstructionContent, Session, Tract
+from tract.llm.testing import MockLLMClient
+
+CaseFunc = Callable[[int], Iterator[Callable[[], object]]]
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    """A registered benchmark: fixture generator plus operations per run."""
+
+    name: str
+    func: CaseFunc
+    ops: Callable[[int], int]
+
+
+CASES: dict[str, BenchmarkCase] = {}
+
+
+def benchmark(name: str, *, ops: Callable[[int], int] | None = None) -> Callable[[CaseFunc], CaseFunc]:
+    """Register a case; *ops* gives the operations per run for throughput."""
+
+    def register(func: CaseFunc) -> CaseFunc:
+        CASES[name] = BenchmarkCase(name, func, ops or (lambda n: 1))
+        return func
+
+    return register
+
+
+def _history(t: Tract, n: int, *, prefix: str = "Message") -> None:
+    """Append *n* alternating user/assistant commits in one batch."""
+    with t.batch():
+        t.commit(InstructionContent(text="You are a benchmark assistant."))
+        for i in range(n - 1):
+            role = "user" if i % 2 == 0 else "assistant"
+            t.commit(DialogueContent(role=role, text=f"{prefix} {i}: " + "lorem ipsum " * 8))
+
+
+def _tract(n: int) -> Tract:
+    t = Tract.open()
+    _history(t, n)
+    return t
+
+
+def _diverged(n: int, tail: int = 10) -> Tract:
+    """*n* shared commits, then *tail* commits on ``feature`` and on ``main``."""
+    t = _tract(n)
+    t.branch("feature")
+    _history(t, tail, prefix="Feature")
+    t.switch("main")
+    _history(t, tail, prefix="Main")
+    return t
+
+
+# ---------------------------------------------------------------------------
+# Commit and compile
+# ---------------------------------------------------------------------------
+
+
+@benchmark("commit", ops=lambda n: n)
+def commit(n: int) -> Iterator[Callable[[], object]]:
+    t = Tract.open()
+
+    def run() -> None:
+        for i in range(n):
+            t.user(f"Message {i}")
+
+    yield run
+    t.close()
+
+
+@benchmark("compile_cold")
+def compile_cold(n: int) -> Iterator[Callable[[], object]]:
+    t = _tract(n)
+    t._cache.clear()
+    yield t.compile
+    t.close()
+
+
+@benchmark("compile_warm", ops=lambda n: 100)
+def compile_warm(n: int) -> Iterator[Callable[[], object]]:
+    t = _tract(n)
+    t.compile()
+
+    def run() -> None:
+        for _ in range(100):
+            t.compile()
+
+    yield run
+    t.close()
+
+
+# ---------------------------------------------------------------------------
+# History queries
+# ---------------------------------------------------------------------------
+
+
+@benchmark("log")
+def log(n: int) -> Iterator[Callable[[], object]]:
+    t = _tract(n)
+    yield lambda: t.log(limit=n)
+    t.close()
+
+
+@benchmark("find")
+def find(n: int) -> Iterator[Callable[[], object]]:
+    t = Tract.open()
+    _history(t, n // 2)
+    t.user("the needle in the haystack")
+    _history(t, n - n // 2 - 1)
+    yield lambda: t.find(content="needle")
+    t.close()
+
+
+# ---------------------------------------------------------------------------
+# Compression
+# ---------------------------------------------------------------------------
+
+
+@benchmark("compress")
+def compress(n: int) -> Iterator[Callable[[], object]]:
+    t = _tract(n)
+    t.config.configure_llm(MockLLMClient(["Summary of the conversation so far."]))
+    yield t.compress
+    t.close()
+
+
+@benchmark("sliding_window")
+def sliding_window(n: int) -> Iterator[Callable[[], object]]:
+    t = _tract(n)
+    t.config.configure_llm(MockLLMClient(["Summary of older messages."]))
+    yield lambda: t.compress(strategy="sliding_window", window_size=min(50, n // 2))
+    t.close()
+
+
+# ---------------------------------------------------------------------------
+# Branching
+# ---------------------------------------------------------------------------
+
+
+@benchmark("merge")
+def merge(n: int) -> Iterator[Callable[[], object]]:
+    t = _diverged(n)
+    yield lambda: t.merge("feature", no_ff=True)
+    t.close()
+
+
+@benchmark("rebase")
+def rebase(n: int) -> Iterator[Callable[[], object]]:
+    t = _diverged(n)
+    t.switch("feature")
+    yield lambda: t.rebase("main")
+    t.close()
+
+
+# ---------------------------------------------------------------------------
+# Multi-agent
+# ---------------------------------------------------------------------------
+
+
+@benchmark("spawn")
+def spawn(n: int) -> Iterator[Callable[[], object]]:
+    session = Session.open()
+    parent = session.create_tract()
+    _history(parent, n)
+    yield lambda: session.spawn(parent, purpose="benchmark")
+    session.close()
+
+
+@benchmark("collapse")
+def collapse(n: int) -> Iterator[Callable[[], object]]:
+    session = Session.open()
+    parent = session.create_tract()
+    _history(parent, n)
+    child = session.spawn(parent, purpose="benchmark")
+    _history(child, 10, prefix="Child")
+    yield lambda: session.collapse(child, into=parent, content="Child summary", auto_commit=True)
+    session.close()
+
+
+# ---------------------------------------------------------------------------
+# Maintenance and export
+# ---------------------------------------------------------------------------
+
+
+@benchmark("gc")
+def gc(n: int) -> Iterator[Callable[[], object]]:
+    t = _tract(10)
+    t.branch("scratch")
+    _history(t, n, prefix="Scratch")
+    t.switch("main")
+    t.delete_branch("scratch", force=True)
+    yield lambda: t.gc(orphan_retention_days=0)
+    t.close()
+
+
+@benchmark("export_state")
+def export_state(n: int) -> Iterator[Callable[[], object]]:
+    t = _tract(n)
+    yield t.export_state
+    t.close()
@@ -0,0 +1,129 @@
+"""Run benchmark cases, store results as JSON and compare against a baseline."""
+
+from __future__ import annotations
+
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+from tests.benchmarks.cases import CASES
+
+SCALES: dict[str, int] = {"1k": 1_000, "10k": 10_000, "100k": 100_000}
+
+# Differences below this many seconds are treated as timer noise.
+NOISE_FLOOR = 0.002
+
+
+@dataclass(frozen=True)
+class Regression:
+    """A case that got slower than ``baseline * (1 + threshold)``."""
+
+    key: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float("inf")
+
+    def __str__(self) -> str:
+        return (
+            f"{self.key}: {self.baseline * 1000:.1f}ms -> "
+            f"{self.current * 1000:.1f}ms ({self.ratio:.2f}x)"
+        )
+
+
+def parse_scale(value: str) -> int:
+    """Parse ``"1k"``-style names or plain integers."""
+    return SCALES.get(value.lower()) or int(value)
+
+
+def run_case(name: str, n: int, *, repeat: int = 3) -> dict:
+    """Time one case at scale *n*; the fixture is rebuilt for every repetition."""
+    bench = CASES[name]
+    timings: list[float] = []
+    for _ in range(repeat):
+        fixture = bench.func(n)
+        run = next(fixture)
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+        next(fixture, None)
+    best = min(timings)
+    ops = bench.ops(n)
+    return {
+        "case": name,
+        "scale": n,
+        "repeat": repeat,
+        "min_s": best,
+        "median_s": statistics.median(timings),
+        "ops": ops,
+        "ops_per_s": ops / best if best else None,
+    }
+
+
+def run_suite(
+    scales: Iterable[int],
+    names: Iterable[str] | None = None,
+    *,
+    repeat: int = 3,
+    progress: bool = False,
+) -> dict:
+    """Run every selected case at every scale and return the results document."""
+    selected = list(names) if names else list(CASES)
+    unknown = [n for n in selected if n not in CASES]
+    if unknown:
+        raise ValueError(f"Unknown benchmark case(s): {', '.join(unknown)}")
+
+    from tract import __version__
+
+    results: dict[str, dict] = {}
+    for n in scales:
+        for name in selected:
+            result = run_case(name, n, repeat=repeat)
+            results[f"{name}@{n}"] = result
+            if progress:
+                print(f"{name}@{n}: {result['min_s'] * 1000:.1f}ms", file=sys.stderr)
+    return {
+        "meta": {
+            "tract_version": __version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, *, threshold: float = 0.25) -> list[Regression]:
+    """List cases present in both documents whose best time regressed.
+
+    A case regresses when it is more than ``threshold`` (a fraction) slower
+    than the baseline and the absolute slowdown exceeds :data:`NOISE_FLOOR`.
+    """
+    regressions: list[Regression] = []
+    base_results = baseline.get("results", {})
+    for key, result in current.get("results", {}).items():
+        base = base_results.get(key)
+        if base is None:
+            continue
+        before, after = base["min_s"], result["min_s"]
+        if after > before * (1 + threshold) and after - before > NOISE_FLOOR:
+            regressions.append(Regression(key, before, after))
+    return regressions
+
+
+def save(document: dict, path: str | Path) -> None:
+    Path(path).write_text(json.dumps(document, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def load(path: str | Path) -> dict:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
@@ -0,0 +1,62 @@
+"""Smoke tests keeping the benchmark suite runnable."""
+
+from __future__ import annotations
+
+import pytest
+
+from tests.benchmarks import runner
+from tests.benchmarks.__main__ import main
+from tests.benchmarks.cases import CASES
+from tests.benchmarks.runner import compare, load, parse_scale, run_case, save
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_case_runs_at_small_scale(name: str) -> None:
+    """Every case builds its fixture and runs without error."""
+    result = run_case(name, 40, repeat=1)
+    assert result["case"] == name and result["scale"] == 40
+    assert result["min_s"] >= 0
+
+
+def test_compare_flags_only_real_slowdowns() -> None:
+    """Slowdowns beyond the threshold and the noise floor are regressions."""
+    baseline = {"results": {
+        "a@1000": {"min_s": 0.100},
+        "b@1000": {"min_s": 0.100},
+        "c@1000": {"min_s": 0.0001},
+        "gone@1000": {"min_s": 0.100},
+    }}
+    current = {"results": {
+        "a@1000": {"min_s": 0.200},
+        "b@1000": {"min_s": 0.110},
+        "c@1000": {"min_s": 0.0010},
+        "new@1000": {"min_s": 1.0},
+    }}
+    regressions = compare(current, baseline, threshold=0.25)
+    assert [r.key for r in regressions] == ["a@1000"]
+    assert regressions[0].ratio == pytest.approx(2.0)
+
+
+def test_parse_scale() -> None:
+    assert parse_scale("10k") == 10_000
+    assert parse_scale("250") == 250
+
+
+@pytest.mark.benchmark
+def test_cli_writes_results_and_fails_on_regression(tmp_path, monkeypatch) -> None:
+    """The CLI writes JSON and returns 1 when a baseline is much faster."""
+    out = tmp_path / "bench.json"
+    assert main(["--scale", "30", "--only", "log", "--repeat", "1", "-o", str(out)]) == 0
+    document = load(out)
+    assert set(document["results"]) == {"log@30"}
+
+    document["results"]["log@30"]["min_s"] = 1e-9
+    baseline = tmp_path / "baseline.json"
+    save(document, baseline)
+    monkeypatch.setattr(runner, "NOISE_FLOOR", 0.0)
+    status = main([
+        "--scale", "30", "--only", "log", "--repeat", "1",
+        "--baseline", str(baseline), "--threshold", "0",
+    ])
+    assert status == 1
@@ -11,7 +11,7 @@ from tract import (
     InstructionContent,
     Tract,
 )
-from tract.operations.ancestry import walk_ancestry
+from tract.operations.ancestry import load_ancestry, walk_ancestry
 from tests.conftest import make_tract, populate_tract
 
 
@@ -286,3 +286,67 @@ class TestWalkAncestryMergeParents:
         assert [r.commit_hash for r in result_default] == [
             r.commit_hash for r in result_none
         ]
+
+
+# ==================================================================
+# load_ancestry / AncestryGraph
+# ==================================================================
+
+class TestLoadAncestry:
+    """Tests for the batched ancestry loader."""
+
+    def test_first_parent_chain_matches_get_ancestors(self):
+        """Graph chain order equals the repository's newest-first chain."""
+        t = make_tract()
+        populate_tract(t, 6)
+
+        graph = load_ancestry(t._commit_repo, t.head)
+        chain = [r.commit_hash for r in graph.first_parent_chain(t.head)]
+        expected = [r.commit_hash for r in t._commit_repo.get_ancestors(t.head)]
+        assert chain == expected
+        assert len(graph) == 6
+
+    def test_merge_parents_loaded_in_batch(self):
+        """With parent_repo, merged-branch commits and parent lists are loaded."""
+        t = make_tract()
+        t.commit(InstructionContent(text="System prompt"))
+        t.branch("feature")
+        feat = t.commit(DialogueContent(role="user", text="Feature")).commit_hash
+        t.checkout("main")
+        main = t.commit(DialogueContent(role="user", text="Main")).commit_hash
+        result = t.merge("feature")
+
+        graph = load_ancestry(t._commit_repo, t.head, parent_repo=t._parent_repo)
+        assert feat in graph
+        assert graph.parents(result.merge_commit_hash) == [main, feat]
+        assert graph.parents(main) == []
+
+    def test_stop_at_excludes_seen(self):
+        """first_parent_chain stops before the first hash in stop_at."""
+        t = make_tract()
+        hashes = populate_tract(t, 5)
+
+        graph = load_ancestry(t._commit_repo, t.head)
+        chain = graph.first_parent_chain(hashes[-1], stop_at={hashes[1]})
+        assert [r.commit_hash for r in chain] == list(reversed(hashes[2:]))
+
+    def test_compile_issues_constant_queries(self):
+        """Cold compile does not issue one query per ancestor."""
+        from sqlalchemy import event
+
+        t = make_tract()
+        populate_tract(t, 40)
+        t._cache.clear()
+
+        statements: list[str] = []
+
+        def _count(conn, cursor, statement, params, context, executemany):
+            statements.append(statement)
+
+        event.listen(t._engine, "before_cursor_execute", _count)
+        try:
+            t.compile()
+        finally:
+            event.remove(t._engine, "before_cursor_execute", _count)
+
+        assert len(statements) < 20
@@ -574,6 +574,47 @@ class TestArunLoop:
         assert result.status == "max_steps"
         assert result.steps == 3
 
+    @pytest.mark.asyncio
+    async def test_arun_loop_parallel_tools(self):
+        """parallel_tools runs handlers as tasks and commits in call order."""
+        from tract.loop import LoopConfig, arun_loop
+
+        names = ["a", "b", "c", "d"]
+        tool_response = _make_response("", tool_calls=[{
+            "id": f"call_{n}",
+            "type": "function",
+            "function": {"name": n, "arguments": "{}"},
+        } for n in names])
+        client = MockLLMClient([tool_response, _make_response("Done.")])
+        t = Tract.open()
+        t.system("You fan out.")
+
+        running = 0
+        peak = 0
+
+        def make_handler(name):
+            async def handler():
+                nonlocal running, peak
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01 * (len(names) - names.index(name)))
+                running -= 1
+                return f"out-{name}"
+            return handler
+
+        seen: list[str] = []
+        result = await arun_loop(
+            t, llm_client=client,
+            config=LoopConfig(max_steps=3, parallel_tools=True, max_tool_concurrency=2),
+            tools=[],
+            tool_handlers={n: make_handler(n) for n in names},
+            on_tool_result=lambda name, output, status: seen.append(output),
+        )
+        assert result.status == "completed"
+        assert result.tool_calls == 4
+        assert peak == 2
+        assert seen == ["out-a", "out-b", "out-c", "out-d"]
+
 
 # ---------------------------------------------------------------------------
 # OpenAI client async tests (with mocked httpx)
@@ -591,6 +591,45 @@ class TestAcompressExtended:
         # The pinned commit should survive
         assert h2.commit_hash in result.preserved_commits
 
+    @pytest.mark.asyncio
+    async def test_acompress_groups_concurrently(self):
+        """acompress(max_concurrency=N) overlaps group summaries, keeps order."""
+        in_flight = 0
+        peak = 0
+
+        class SlowEchoClient:
+            async def achat(self, messages, **kwargs):
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+                name = "first" if "Alpha" in messages[-1]["content"] else "second"
+                return _make_response(f"Summary of {name} group")
+
+            def chat(self, messages, **kwargs):
+                raise AssertionError("sync path should not be used")
+
+            def close(self):
+                pass
+
+        t = Tract.open()
+        t.config.configure_llm(SlowEchoClient())
+        t.user("Alpha question")
+        t.assistant("Alpha answer")
+        pin = t.user("Pinned middle")
+        t.annotate(pin.commit_hash, Priority.PINNED, reason="keep")
+        t.user("Beta question")
+        t.assistant("Beta answer")
+
+        await t.acompress(max_concurrency=2)
+
+        assert peak == 2
+        texts = [m["content"] for m in t.compile().to_dicts()]
+        assert "Summary of first group" in texts[0]
+        assert texts[1] == "Pinned middle"
+        assert "Summary of second group" in texts[2]
+
     @pytest.mark.asyncio
     async def test_acompress_manual_content(self):
         """acompress with manual content= should not need LLM."""
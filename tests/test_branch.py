@@ -27,6 +27,7 @@ from tract import (
 )
 from tract.operations.branch import validate_branch_name
 from tract.operations.dag import (
+    CommitGraph,
     find_merge_base,
     get_all_ancestors,
     get_branch_commits,
@@ -455,6 +456,75 @@ class TestGetAllAncestors:
         assert ancestors == {first, second, third}
 
 
+class _CountingCommitRepo:
+    """Commit repository proxy that counts commit-graph loads."""
+
+    def __init__(self, repo):
+        self._repo = repo
+        self.loads = 0
+
+    def get_commit_graph(self, start_hashes, *, min_generation=0):
+        self.loads += 1
+        return self._repo.get_commit_graph(start_hashes, min_generation=min_generation)
+
+
+class TestCommitGraph:
+    def test_generations_materialized(self, tract):
+        """Roots are generation 1; merges sit one above their highest parent."""
+        fork = tract.head
+        tract.user("main 1")
+        tract.user("main 2")
+        tract.branch("feature", source=fork)
+        tract.user("feature 1")
+        tract.switch("main")
+        result = tract.merge("feature", no_ff=True)
+
+        repo = tract._commit_repo
+        assert repo.get_generation(fork) == 1
+        assert repo.get_generation(result.source_tip_hash) == 2
+        assert repo.get_generation(result.target_tip_hash) == 3
+        assert repo.get_generation(result.merge_commit_hash) == 4
+
+    def test_queries_answered_from_one_load(self, tract):
+        """Merge base and ancestry over deep branches need a single load."""
+        fork = tract.head
+        for i in range(40):
+            tract.user(f"main {i}")
+        main_head = tract.head
+        tract.branch("feature", source=fork)
+        for i in range(40):
+            tract.user(f"feature {i}")
+        feature_head = tract.head
+
+        counting = _CountingCommitRepo(tract._commit_repo)
+        graph = CommitGraph(counting)
+        assert graph.merge_base(main_head, feature_head) == fork
+        assert graph.is_ancestor(fork, main_head)
+        assert not graph.is_ancestor(main_head, feature_head)
+        assert len(graph.ancestors(main_head) | graph.ancestors(feature_head)) == 81
+        assert counting.loads == 1
+
+    def test_merge_base_through_merge_commit(self, tract):
+        """The merged-in tip becomes the merge base with its own branch."""
+        fork = tract.head
+        tract.branch("feature", source=fork)
+        tract.user("feature 1")
+        merged_tip = tract.head
+        tract.switch("main")
+        tract.user("main 1")
+        tract.merge("feature", no_ff=True)
+        main_head = tract.head
+        tract.switch("feature")
+        tract.user("feature 2")
+
+        assert find_merge_base(
+            tract._commit_repo, tract._parent_repo, main_head, tract.head
+        ) == merged_tip
+        assert is_ancestor(
+            tract._commit_repo, tract._parent_repo, merged_tip, main_head
+        )
+
+
 class TestGetBranchCommits:
     def test_single_branch_commit(self, tract):
         """Get single commit between merge base and branch tip."""
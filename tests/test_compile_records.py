@@ -381,3 +381,51 @@ class TestAPITokenPersistence:
         # token_checkpoints also graceful
         assert t.token_checkpoints() == []
         t.close()
+
+
+class TestDeltaEncodedRecords:
+    """Compile records store effective commits as deltas between records."""
+
+    def test_rows_grow_linearly_with_steps(self):
+        """Repeated generate() stores each new commit once, not per record."""
+        from sqlalchemy import func, select
+
+        from tract.storage.schema import CompileEffectiveRow
+
+        t = Tract.open()
+        t.config.configure_llm(MockLLMClient(responses=["ok"]))
+        t.system("System")
+        expected = []
+        for i in range(10):
+            t.user(f"Question {i}")
+            expected.append(list(t.compile().commit_hashes))
+            t.runtime.generate()
+
+        rows = t._session.execute(
+            select(func.count()).select_from(CompileEffectiveRow)
+        ).scalar_one()
+        assert rows <= len(t.compile().commit_hashes) + 1
+        # Each generate() writes a pre-call record, then the API usage record
+        pre_call = list(reversed(t.compile_records(limit=1000)))[::2]
+        assert [t.compile_record_commits(r.record_id) for r in pre_call] == expected
+        t.close()
+
+    def test_branches_delta_against_their_own_records(self):
+        """Records on another branch reconstruct to that branch's context."""
+        t = Tract.open()
+        t.system("System")
+        t.user("Shared")
+        t.record_usage({"prompt_tokens": 10, "completion_tokens": 1})
+        t.branch("side")
+        t.user("Side only")
+        t.record_usage({"prompt_tokens": 10, "completion_tokens": 1})
+        side_hashes = list(t.compile().commit_hashes)
+        t.switch("main")
+        t.user("Main only")
+        t.record_usage({"prompt_tokens": 10, "completion_tokens": 1})
+        main_hashes = list(t.compile().commit_hashes)
+
+        newest, side, _ = t.token_checkpoints()
+        assert t.compile_record_commits(side.record_id) == side_hashes
+        assert t.compile_record_commits(newest.record_id) == main_hashes
+        t.close()
@@ -204,3 +204,54 @@ class TestStrategyWithNonCompilable:
         t.assistant("World")
         compiled = t.compile(strategy="adaptive")
         assert len(compiled.messages) == 2
+
+
+# ---------------------------------------------------------------------------
+# Strategy compile caching
+# ---------------------------------------------------------------------------
+
+
+def _fresh(t: Tract, **kwargs):
+    """Compile with every cached variant dropped."""
+    t._cache.clear()
+    return t.compile(**kwargs)
+
+
+class TestStrategyCaching:
+    def test_repeat_strategy_compile_is_cached(self):
+        """The same non-default compile twice is served from the memo."""
+        t = _make_tract_with_commits(3)
+        first = t.compile(strategy="adaptive", strategy_k=2)
+        again = t.compile(strategy="adaptive", strategy_k=2)
+        assert again.messages is not first.messages
+        assert again.messages[0] is first.messages[0]
+        other = t.compile(strategy="adaptive", strategy_k=3)
+        assert other.messages[0] is not first.messages[0]
+
+    @pytest.mark.parametrize("kwargs", [
+        {"strategy": "messages"},
+        {"strategy": "adaptive", "strategy_k": 1},
+        {"strategy": "adaptive", "strategy_k": 3},
+    ])
+    def test_extended_variant_matches_fresh_compile(self, kwargs):
+        """Appends extend cached variants to exactly what a recompile yields."""
+        t = _make_tract_with_commits(2)
+        t.compile(**kwargs)
+        t.user("A" * 600)
+        t.config.set(temperature=0.3)
+        t.assistant("Final answer")
+        extended = t.compile(**kwargs)
+        fresh = _fresh(t, **kwargs)
+        assert extended.to_dicts() == fresh.to_dicts()
+        assert extended.commit_hashes == fresh.commit_hashes
+        assert extended.token_count == fresh.token_count
+
+    def test_historical_compile_survives_append(self):
+        """An at_commit compile is carried forward when HEAD moves past it."""
+        t = _make_tract_with_commits(2)
+        anchor = t.assistant("anchor")
+        before = t.compile(at_commit=anchor.commit_hash)
+        t.user("after the anchor")
+        after = t.compile(at_commit=anchor.commit_hash)
+        assert after.messages[-1] is before.messages[-1]
+        assert before.commit_hashes[-1] == anchor.commit_hash
@@ -442,6 +442,74 @@ class TestMultiPinnedInterleaving:
         assert "Message 5" in texts[2]
 
 
+class _EchoLLM:
+    """Thread-safe mock that summarizes a group by echoing its message names.
+
+    With ``barrier_parties`` set, every call waits until that many calls are
+    in flight, so the test deadlocks (and times out) unless they run
+    concurrently.
+    """
+
+    def __init__(self, barrier_parties=None, fail_on=None):
+        import threading
+
+        self._barrier = (
+            threading.Barrier(barrier_parties, timeout=5) if barrier_parties else None
+        )
+        self._fail_on = fail_on
+
+    def chat(self, messages, **kwargs):
+        import re
+
+        names = re.findall(r"Message \d+", messages[-1]["content"])
+        if self._barrier is not None:
+            self._barrier.wait()
+        text = "" if self._fail_on in names else "Summary of " + ", ".join(names)
+        return {"choices": [{"message": {"content": text}}]}
+
+    def close(self):
+        pass
+
+
+class TestConcurrentGroupSummaries:
+    """compress(max_concurrency=N) summarizes pinned-separated groups in parallel."""
+
+    def _tract(self):
+        t, hashes = make_tract_with_commits(5)
+        t.annotate(hashes[1], Priority.PINNED, reason="pin2")
+        t.annotate(hashes[3], Priority.PINNED, reason="pin4")
+        return t, hashes
+
+    def test_groups_run_concurrently_in_order(self):
+        t, hashes = self._tract()
+        t.config.configure_llm(_EchoLLM(barrier_parties=3))
+
+        t.compress(max_concurrency=3)
+
+        texts = [m.content for m in t.compile().messages]
+        assert texts[0].endswith("Summary of Message 1")
+        assert "Message 2" in texts[1]
+        assert texts[2].endswith("Summary of Message 3")
+        assert "Message 4" in texts[3]
+        assert texts[4].endswith("Summary of Message 5")
+
+    def test_failed_group_raises_and_commits_nothing(self):
+        t, hashes = self._tract()
+        t.config.configure_llm(_EchoLLM(fail_on="Message 3"))
+        head = t.head
+
+        with pytest.raises(CompressionError, match="empty summary"):
+            t.compress(max_concurrency=3)
+        assert t.head == head
+
+    def test_invalid_max_concurrency(self):
+        t, hashes = self._tract()
+        t.config.configure_llm(_EchoLLM())
+
+        with pytest.raises(ValueError, match="max_concurrency"):
+            t.compress(max_concurrency=0)
+
+
 # ===========================================================================
 # 7. LLM error path tests
 # ===========================================================================
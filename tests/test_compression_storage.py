@@ -4,7 +4,7 @@ Covers:
 - OperationEventRow, OperationCommitRow table creation and CRUD
 - CompileRecordRow, CompileEffectiveRow table creation and CRUD
 - SqliteOperationEventRepository all 9 methods
-- SqliteCompileRecordRepository all 5 methods
+- SqliteCompileRecordRepository all methods, including delta-encoded effectives
 - Schema migration v2->v6 and v5->v6
 - CompressResult, GCResult, ReorderWarning models
 - Default summarization prompt and builder
@@ -776,6 +776,118 @@ class TestCompileRecordRepository:
         assert repo.get_effectives("nonexistent-id") == []
 
 
+class TestCompileRecordDeltas:
+    """Delta-encoded effective commits in SqliteCompileRecordRepository."""
+
+    @pytest.fixture
+    def hashes(self, session: Session) -> list[str]:
+        hashes = [f"c{i}" for i in range(8)]
+        for h in hashes:
+            _make_commit(session, h)
+        return hashes
+
+    @staticmethod
+    def _save(repo: SqliteCompileRecordRepository, record_id, commit_hashes, base=None):
+        repo.save_record(
+            record_id=record_id,
+            tract_id="test-tract",
+            head_hash=commit_hashes[-1] if commit_hashes else "",
+            token_count=0,
+            commit_count=len(commit_hashes),
+            token_source="tiktoken:cl100k_base",
+            params_json=None,
+            created_at=datetime.now(timezone.utc).replace(tzinfo=None),
+        )
+        repo.save_effectives(record_id, commit_hashes, base)
+        return (record_id, tuple(commit_hashes))
+
+    def test_append_stores_only_new_hashes(self, session: Session, hashes: list[str]):
+        repo = SqliteCompileRecordRepository(session)
+        base = self._save(repo, "r0", hashes[:3])
+        self._save(repo, "r1", hashes[:5], base)
+
+        record = repo.get_record("r1")
+        assert (record.base_record_id, record.keep_prefix, record.keep_suffix) == ("r0", 3, 0)
+        assert [e.commit_hash for e in repo.get_effectives("r1")] == hashes[3:5]
+        assert repo.get_commit_hashes("r1") == hashes[:5]
+
+    def test_replace_and_remove_in_the_middle(self, session: Session, hashes: list[str]):
+        repo = SqliteCompileRecordRepository(session)
+        r0 = self._save(repo, "r0", hashes[:6])
+        replaced = [hashes[0], hashes[7], hashes[2], hashes[3], hashes[4], hashes[5]]
+        r1 = self._save(repo, "r1", replaced, r0)
+        removed = replaced[:2] + replaced[4:]
+        self._save(repo, "r2", removed, r1)
+
+        assert [e.commit_hash for e in repo.get_effectives("r1")] == [hashes[7]]
+        assert repo.get_effectives("r2") == []
+        assert repo.get_commit_hashes("r1") == replaced
+        assert repo.get_commit_hashes("r2") == removed
+        assert repo.get_commit_hashes("r0") == hashes[:6]
+
+    def test_checkpoint_every_bounds_chain(self, session: Session, hashes: list[str]):
+        repo = SqliteCompileRecordRepository(session, checkpoint_every=3)
+        base = None
+        for i in range(1, 8):
+            base = self._save(repo, f"r{i}", hashes[:i + 1], base)
+
+        depths = [repo.get_record(f"r{i}").delta_depth for i in range(1, 8)]
+        assert depths == [0, 1, 2, 0, 1, 2, 0]
+        assert repo.get_record("r4").base_record_id is None
+        for i in range(1, 8):
+            assert repo.get_commit_hashes(f"r{i}") == hashes[:i + 1]
+
+    def test_unrelated_list_is_stored_in_full(self, session: Session, hashes: list[str]):
+        repo = SqliteCompileRecordRepository(session)
+        base = self._save(repo, "r0", hashes[:3])
+        self._save(repo, "r1", hashes[4:], base)
+        assert repo.get_record("r1").base_record_id is None
+        assert repo.get_commit_hashes("r1") == hashes[4:]
+
+    def test_deleted_commit_does_not_shift_later_deltas(
+        self, session: Session, hashes: list[str]
+    ):
+        """Rows removed by gc leave gaps that later deltas skip over."""
+        repo = SqliteCompileRecordRepository(session)
+        r0 = self._save(repo, "r0", hashes[:4])
+        self._save(repo, "r1", hashes[:4] + [hashes[5]], r0)
+        session.execute(
+            CompileEffectiveRow.__table__.delete().where(
+                CompileEffectiveRow.commit_hash == hashes[1]
+            )
+        )
+        expected = [hashes[0], hashes[2], hashes[3], hashes[5]]
+        assert repo.get_commit_hashes("r1") == expected
+
+    def test_pre_delta_record_reads_back_in_full(
+        self, session: Session, hashes: list[str]
+    ):
+        repo = SqliteCompileRecordRepository(session)
+        self._save(repo, "old", [])
+        record = repo.get_record("old")
+        record.effective_count = None
+        for pos, h in enumerate(hashes[:3]):
+            repo.add_effective("old", h, pos)
+
+        assert repo.get_commit_hashes("old") == hashes[:3]
+        # Not usable as a delta base
+        self._save(repo, "new", hashes[:4], ("old", tuple(hashes[:3])))
+        assert repo.get_record("new").base_record_id is None
+        assert repo.get_commit_hashes("new") == hashes[:4]
+
+    def test_missing_base_is_stored_in_full(self, session: Session, hashes: list[str]):
+        repo = SqliteCompileRecordRepository(session)
+        self._save(repo, "r1", hashes[:3], ("gone", tuple(hashes[:2])))
+        assert repo.get_record("r1").base_record_id is None
+        assert repo.get_commit_hashes("r1") == hashes[:3]
+
+    def test_unknown_record(self, session: Session):
+        repo = SqliteCompileRecordRepository(session)
+        assert repo.get_commit_hashes("missing") == []
+        with pytest.raises(ValueError):
+            repo.save_effectives("missing", ["c0"])
+
+
 # ===========================================================================
 # Model Tests
 # ===========================================================================
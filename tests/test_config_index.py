@@ -457,3 +457,107 @@ class TestConfigIndexBuildAtPoint:
                 parent_repo=t._parent_repo,
             )
             assert idx.get("model") == "gpt-3.5"
+
+
+# ---------------------------------------------------------------------------
+# Incremental maintenance and persistence
+# ---------------------------------------------------------------------------
+
+
+class TestIncrementalConfigIndex:
+    """Per-commit indexes are derived incrementally instead of rebuilt."""
+
+    @staticmethod
+    def _count_builds(monkeypatch) -> list[str]:
+        calls: list[str] = []
+        original = ConfigIndex.build.__func__
+
+        def _build(cls, commit_repo, blob_repo, head_hash, **kwargs):
+            calls.append(head_hash)
+            return original(cls, commit_repo, blob_repo, head_hash, **kwargs)
+
+        monkeypatch.setattr(ConfigIndex, "build", classmethod(_build))
+        return calls
+
+    def test_commits_and_reset_never_rebuild(self, monkeypatch):
+        """New commits extend the parent index; reset reuses the cached one."""
+        builds = self._count_builds(monkeypatch)
+        with Tract.open() as t:
+            first = t.config.set(model="gpt-3.5", temperature=0.2)
+            t.user("Hello")
+            assert t.config.get("model") == "gpt-3.5"
+            t.config.set(model="gpt-4o")
+            t.assistant("Hi")
+            assert t.config.get_all() == {"model": "gpt-4o", "temperature": 0.2}
+
+            t.reset(first.commit_hash)
+            assert t.config.get("model") == "gpt-3.5"
+        assert builds == []
+
+    def test_invalidation_leaves_cached_indexes_untouched(self):
+        """Invalidation is tracked by the manager, not on shared indexes."""
+        with Tract.open() as t:
+            t.config.set(model="gpt-3.5")
+            t.user("seed")
+            mgr = t._config_mgr
+            held = mgr.config_index
+            t.branch("feature")
+            mgr.invalidate_cache()
+            assert not held.is_stale
+            assert mgr.config_index is held
+            assert mgr.config_index.get("model") == "gpt-3.5"
+
+    def test_apply_leaves_source_unchanged(self):
+        """apply() returns a new index; the parent's view is unaffected."""
+        base = ConfigIndex({"model": "a", "temperature": 0.1})
+        child = base.apply({"model": "b"})
+        assert child.get("model") == "b" and child.get("temperature") == 0.1
+        assert base.get("model") == "a"
+        assert base.apply({}) is base
+
+    def test_reopen_resumes_from_persisted_index(self, tmp_path, monkeypatch):
+        """A new process resumes from the index stored with compile snapshots."""
+        from tract.models.config import TractConfig
+
+        db = str(tmp_path / "cfg.db")
+
+        def _open() -> Tract:
+            config = TractConfig(db_path=db, compile_cache_persist=True)
+            return Tract.open(db, tract_id="cfg", config=config)
+
+        with _open() as t:
+            t.config.set(model="gpt-4o")
+            t.config.set(temperature=0.5)
+
+        with _open() as t:
+            t.user("after reopen")
+            builds = self._count_builds(monkeypatch)
+            assert t.config.get_all() == {"model": "gpt-4o", "temperature": 0.5}
+            assert builds == []
+
+    def test_persisted_indexes_do_not_evict_compile_snapshots(self, tmp_path):
+        """Config indexes keep one row and stay out of the snapshot budget."""
+        from sqlalchemy import select
+
+        from tract.models.config import TractConfig
+        from tract.operations.config_index import PERSIST_KEY
+        from tract.storage.schema import CompileSnapshotRow
+
+        db = str(tmp_path / "cfg.db")
+        config = TractConfig(db_path=db, compile_cache_persist=True, compile_cache_maxsize=2)
+        with Tract.open(db, tract_id="cfg", config=config) as t:
+            t.user("Hello")
+            t.compile()
+            first_head = t.head
+            for i in range(5):
+                t.config.set(temperature=i / 10)
+
+        # Reopening misses the memory cache, so compile persists and prunes
+        with Tract.open(db, tract_id="cfg", config=config) as t:
+            t.compile()
+            rows = t._session.execute(
+                select(CompileSnapshotRow.head_hash, CompileSnapshotRow.params_key)
+            ).all()
+            snapshots = [head for head, key in rows if key != PERSIST_KEY]
+            assert sorted(snapshots) == sorted([first_head, t.head])
+            assert [head for head, key in rows if key == PERSIST_KEY] == [t.head]
@@ -192,6 +192,27 @@ class TestDeployBasic:
         assert pointer.display_name == "research-task"
         session.close()
 
+    def test_children_share_session_components(self):
+        """Deploy and spawn children reuse the session's token counter."""
+        from pydantic import BaseModel
+
+        class Note(BaseModel):
+            content_type: str = "note"
+            text: str
+
+        session, parent, hashes = _make_session_with_parent(3)
+        parent.register_content_type("note", Note)
+
+        child_a = session.deploy(parent, purpose="a", branch_name="a")
+        child_b = session.deploy(parent, purpose="b", branch_name="b")
+        spawned = session.spawn(parent, purpose="c")
+
+        assert child_a._token_counter is parent._token_counter
+        assert child_b._token_counter is parent._token_counter
+        assert spawned._token_counter is parent._token_counter
+        assert child_a._custom_type_registry["note"] is Note
+        session.close()
+
 
 # ===========================================================================
 # Curation: keep_tags
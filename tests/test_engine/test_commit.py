@@ -114,6 +114,21 @@ class TestCreateCommit:
         assert c1.parent_hash is None
         assert c2.parent_hash == c1.commit_hash
 
+    def test_chain_token_total_accumulates(self, commit_engine, repos) -> None:
+        """chain_token_total is the running sum of token_count along the chain."""
+        c1 = commit_engine.create_commit(InstructionContent(text="first"))
+        c2 = commit_engine.create_commit(DialogueContent(role="user", text="second"))
+        c3 = commit_engine.create_commit(
+            DialogueContent(role="user", text="second, edited"),
+            operation=CommitOperation.EDIT,
+            edit_target=c2.commit_hash,
+        )
+
+        row = repos["commit"].get(c3.commit_hash)
+        assert row.chain_token_total == c1.token_count + c2.token_count + c3.token_count
+        assert repos["commit"].sum_ancestor_tokens(c3.commit_hash) == row.chain_token_total
+        assert repos["commit"].sum_ancestor_tokens("nonexistent") == 0
+
     def test_blob_deduplication(self, commit_engine, repos) -> None:
         """Same content stored once but can be referenced by multiple commits."""
         content = InstructionContent(text="You are a helpful assistant.")
@@ -263,6 +278,89 @@ class TestTokenBudget:
         assert callback_calls[0][1] == 1  # max_tokens
         assert callback_calls[0][0] > 1  # current_tokens > max
 
+    def test_budget_check_reads_parent_total(self, session, sample_tract_id) -> None:
+        """Budget total includes the whole chain via the parent's materialized total."""
+        commit_repo = SqliteCommitRepository(session)
+        blob_repo = SqliteBlobRepository(session)
+        ref_repo = SqliteRefRepository(session)
+        annot_repo = SqliteAnnotationRepository(session)
+        counter = TiktokenCounter()
+
+        callback_calls: list[tuple[int, int]] = []
+        budget = TokenBudgetConfig(
+            max_tokens=1,
+            action=BudgetAction.CALLBACK,
+            callback=lambda current, max_t: callback_calls.append((current, max_t)),
+        )
+        engine = CommitEngine(
+            commit_repo, blob_repo, ref_repo, annot_repo, counter, sample_tract_id,
+            token_budget=budget,
+        )
+
+        c1 = engine.create_commit(InstructionContent(text="one two three"))
+        c2 = engine.create_commit(DialogueContent(role="user", text="four five"))
+
+        assert callback_calls[-1][0] == c1.token_count + c2.token_count
+
+
+class TestCreateCommits:
+    """Tests for CommitEngine.create_commits bulk ingestion."""
+
+    def test_chains_parents_and_moves_head(self, commit_engine, repos, sample_tract_id) -> None:
+        """Bulk commits chain onto HEAD and HEAD ends at the last one."""
+        first = commit_engine.create_commit(InstructionContent(text="system"))
+        infos = commit_engine.create_commits([
+            DialogueContent(role="user", text="one"),
+            DialogueContent(role="assistant", text="two"),
+            DialogueContent(role="user", text="three"),
+        ], messages=["a", "b", None])
+
+        assert [i.parent_hash for i in infos] == [
+            first.commit_hash, infos[0].commit_hash, infos[1].commit_hash,
+        ]
+        assert [i.message for i in infos] == ["a", "b", None]
+        assert repos["ref"].get_head(sample_tract_id) == infos[-1].commit_hash
+        assert infos[0].created_at < infos[1].created_at < infos[2].created_at
+
+        row = repos["commit"].get(infos[-1].commit_hash)
+        assert row.chain_token_total == first.token_count + sum(i.token_count for i in infos)
+
+    def test_dedups_blobs_and_adds_default_annotations(self, commit_engine, repos) -> None:
+        """Repeated content shares a blob; default-priority types get annotations."""
+        infos = commit_engine.create_commits([
+            InstructionContent(text="same"),
+            InstructionContent(text="same"),
+        ])
+        assert infos[0].content_hash == infos[1].content_hash
+        assert repos["blob"].get(infos[0].content_hash) is not None
+
+        for info in infos:
+            annotation = repos["annotation"].get_latest(info.commit_hash)
+            assert annotation is not None
+            assert annotation.priority == Priority.PINNED
+
+    def test_reject_budget_writes_nothing(self, session, sample_tract_id) -> None:
+        """REJECT mode raises before any row of the batch is written."""
+        commit_repo = SqliteCommitRepository(session)
+        ref_repo = SqliteRefRepository(session)
+        engine = CommitEngine(
+            commit_repo, SqliteBlobRepository(session), ref_repo,
+            SqliteAnnotationRepository(session), TiktokenCounter(), sample_tract_id,
+            token_budget=TokenBudgetConfig(max_tokens=5, action=BudgetAction.REJECT),
+        )
+
+        with pytest.raises(BudgetExceededError):
+            engine.create_commits([
+                DialogueContent(role="user", text="hi"),
+                DialogueContent(role="user", text="this one pushes the chain over budget"),
+            ])
+        assert ref_repo.get_head(sample_tract_id) is None
+        assert commit_repo.get_by_type("dialogue", sample_tract_id) == []
+
+    def test_empty_input(self, commit_engine) -> None:
+        """No contents means no commits."""
+        assert commit_engine.create_commits([]) == []
+
 
 class TestGetCommit:
     """Tests for CommitEngine.get_commit."""
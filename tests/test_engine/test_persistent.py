@@ -0,0 +1,66 @@
+"""Tests for the structure-sharing PersistentVector."""
+
+from __future__ import annotations
+
+import pytest
+
+from tract.engine.persistent import PersistentVector
+
+
+@pytest.mark.parametrize("n", [0, 1, 31, 32, 33, 1024, 1056, 1057, 33_000])
+def test_build_and_append_match_list(n: int) -> None:
+    """Bulk construction and repeated append agree with a plain list."""
+    expected = list(range(n))
+    built = PersistentVector(expected)
+    appended: PersistentVector[int] = PersistentVector()
+    for x in expected:
+        appended = appended.append(x)
+    assert list(built) == expected
+    assert list(appended) == expected
+    assert built == appended == tuple(expected)
+    assert len(built) == n
+
+
+def test_indexing_and_slicing() -> None:
+    """Positive, negative and slice access behave like a tuple."""
+    ref = tuple(range(100))
+    vec = PersistentVector(ref)
+    assert vec[0] == 0 and vec[63] == 63 and vec[-1] == 99
+    assert vec[10:20] == ref[10:20]
+    with pytest.raises(IndexError):
+        vec[100]
+    with pytest.raises(IndexError):
+        vec[-101]
+
+
+def test_set_and_delete_leave_source_unchanged() -> None:
+    """Updates return new vectors; the original keeps its contents."""
+    ref = list(range(2000))
+    vec = PersistentVector(ref)
+    patched = vec.set(5, "x").set(-1, "y")
+    assert patched[5] == "x" and patched[-1] == "y"
+    assert list(vec) == ref
+
+    removed = vec.delete(1000)
+    assert len(removed) == 1999 and removed[1000] == 1001
+    assert list(vec) == ref
+
+
+def test_append_shares_structure() -> None:
+    """A child vector reuses the parent's trie nodes instead of copying them."""
+    parent = PersistentVector(range(5000))
+    child = parent.append(-1)
+    assert child._root is parent._root
+    edited = parent.set(0, -1)
+    assert edited._tail is parent._tail
+    assert edited._root[-1] is parent._root[-1]
+
+
+def test_equality_and_hash() -> None:
+    """Vectors compare equal to same-content vectors and tuples."""
+    a = PersistentVector([1, 2, 3])
+    assert a == PersistentVector((1, 2, 3))
+    assert a == (1, 2, 3)
+    assert a != (1, 2)
+    assert hash(a) == hash((1, 2, 3))
+    assert PersistentVector(a) is a
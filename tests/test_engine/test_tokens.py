@@ -84,6 +84,59 @@ class TestTiktokenCounter:
         assert counter.encoding_name == "o200k_base"
         assert counter.count_text("hello") > 0
 
+    def test_encoding_loaded_on_first_count(self) -> None:
+        """Constructing a counter does not load the BPE ranks."""
+        counter = TiktokenCounter()
+        assert counter._loaded_enc is None
+        assert counter.count_text("") == 0
+        assert counter._loaded_enc is None
+        counter.count_text("hello")
+        assert counter._loaded_enc is not None
+
+    def test_unknown_encoding_name_rejected(self) -> None:
+        with pytest.raises(ValueError, match="Unknown encoding"):
+            TiktokenCounter(encoding_name="not-an-encoding")
+
+    def test_count_texts_matches_count_text(self) -> None:
+        """Batched counts equal one-at-a-time counts, in input order."""
+        counter = TiktokenCounter()
+        texts = [f"message number {i} " * (i + 1) for i in range(10)] + ["", "hi", "hi"]
+        expected = [len(counter._enc.encode(t)) for t in texts]
+        assert counter.count_texts(texts) == expected
+        assert [counter.count_text(t) for t in texts] == expected
+
+    def test_memo_skips_reencoding(self) -> None:
+        """Repeated texts are answered from the memo."""
+        counter = TiktokenCounter()
+        first = counter.count_text("memoized text")
+        counter._enc = None  # any further encode would fail
+        assert counter.count_text("memoized text") == first
+        assert counter.count_texts(["memoized text"]) == [first]
+
+    def test_memo_is_bounded(self) -> None:
+        """The memo evicts least recently used entries past memo_size."""
+        counter = TiktokenCounter(memo_size=2)
+        for text in ("a", "b", "c"):
+            counter.count_text(text)
+        assert len(counter._memo) == 2
+        assert counter._memo_key("a") not in counter._memo
+
+    def test_count_each_message_sums_to_count_messages(self) -> None:
+        """Per-message counts plus the primer equal count_messages."""
+        counter = TiktokenCounter()
+        messages = [
+            {"role": "user", "content": "Hello", "name": "Bob"},
+            {
+                "role": "assistant",
+                "content": "",
+                "tool_calls": [{"id": "c1", "function": {"name": "f", "arguments": "{}"}}],
+            },
+        ]
+        each = counter.count_each_message(messages)
+        assert len(each) == 2
+        assert sum(each) + 3 == counter.count_messages(messages)
+        assert each[0] == counter.count_messages(messages[:1]) - 3
+
 
 class TestNullTokenCounter:
     """Tests for the NullTokenCounter stub."""
@@ -299,3 +299,83 @@ class TestExportImportEdgeCases:
             types = {c["content_type"] for c in state["commits"]}
             assert "instruction" in types or "system" in types  # system prompt type
             assert "dialogue" in types  # user/assistant are dialogue
+
+
+class TestArchive:
+    """Tests for Tract.export_archive() and import_archive()."""
+
+    @staticmethod
+    def _populate(t: Tract) -> str:
+        t.system("System prompt")
+        first = t.user("Hello").commit_hash
+        t.branch("feature")
+        t.user("Feature work")
+        t.switch("main")
+        t.assistant("Main work")
+        t.merge("feature", no_ff=True)
+        t.annotate(first, Priority.PINNED, reason="keep")
+        t.register_tag("keepme")
+        t.tag(first, "keepme")
+        return first
+
+    def test_round_trip_preserves_dag(self, tmp_path):
+        """Hashes, merge parents, annotations, tags and branches survive."""
+        path = tmp_path / "tract.jsonl"
+        with Tract.open() as t1:
+            first = self._populate(t1)
+            exported = t1.export_archive(path)
+            head = t1.head
+            parents = t1._parent_repo.get_parents(head)
+            messages = t1.compile().to_dicts()
+
+        with Tract.open() as t2:
+            assert t2.import_archive(path) == exported == 5
+            assert t2.head == head
+            assert t2.current_branch == "main"
+            assert set(t2._ref_repo.list_branches(t2.tract_id)) >= {"main", "feature"}
+            assert len(parents) == 2
+            assert t2._parent_repo.get_parents(head) == parents
+            assert t2._annotation_repo.get_latest(first).priority == Priority.PINNED
+            assert "keepme" in t2.get_tags(first)
+            assert t2.compile().to_dicts() == messages
+
+    def test_gzip_round_trip_and_reimport(self):
+        """gzip archives are detected on read; re-importing is a no-op."""
+        import io
+
+        buf = io.BytesIO()
+        with Tract.open() as t1:
+            self._populate(t1)
+            t1.export_archive(buf, compression="gzip")
+            head = t1.head
+        assert buf.getvalue()[:2] == b"\x1f\x8b"
+
+        with Tract.open() as t2:
+            buf.seek(0)
+            assert t2.import_archive(buf) == 5
+            buf.seek(0)
+            assert t2.import_archive(buf) == 0
+            assert t2.head == head
+            assert len(t2.log(limit=100)) == 5
+
+    def test_truncated_archive_rolls_back(self, tmp_path):
+        """A missing end record raises and leaves the tract untouched."""
+        path = tmp_path / "tract.jsonl"
+        with Tract.open() as t1:
+            self._populate(t1)
+            t1.export_archive(path)
+        lines = path.read_text(encoding="utf-8").splitlines(keepends=True)
+        path.write_text("".join(lines[:-1]), encoding="utf-8")
+
+        with Tract.open() as t2:
+            with pytest.raises(ValueError, match="Truncated"):
+                t2.import_archive(path)
+            assert t2.head is None
+            assert t2.log() == []
+
+    def test_rejects_non_archive(self, tmp_path):
+        """Input without a header record is rejected."""
+        path = tmp_path / "state.json"
+        path.write_text(json.dumps({"version": 1}) + "\n", encoding="utf-8")
+        with Tract.open() as t, pytest.raises(ValueError, match="Not a tract archive"):
+            t.import_archive(path)
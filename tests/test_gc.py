@@ -282,6 +282,92 @@ class TestGCEdgeCases:
         assert second_result.commits_removed == 0
 
 
+    def test_gc_batched_removes_everything(self):
+        """gc(batch_size=N) commits per batch and still removes every orphan."""
+        t, hashes = make_tract_with_commits(8)
+        orphans = create_orphans(t, hashes)
+
+        result = t.gc(orphan_retention_days=0, batch_size=3)
+
+        assert result.complete is True
+        assert result.commits_removed == len(orphans)
+        assert all(t._commit_repo.get(h) is None for h in orphans)
+
+    def test_gc_batched_plans_reachability_once(self):
+        """Batches reuse one reachability pass instead of re-planning."""
+        t, hashes = make_tract_with_commits(8)
+        orphans = create_orphans(t, hashes)
+        repo = t._commit_repo
+        calls: list[int | None] = []
+        original = repo.get_gc_candidates
+
+        def counting(*args, **kwargs):
+            calls.append(kwargs.get("limit"))
+            return original(*args, **kwargs)
+
+        repo.get_gc_candidates = counting
+        result = t.gc(orphan_retention_days=0, batch_size=2)
+        assert result.commits_removed == len(orphans)
+        assert calls == [None]
+
+    def test_gc_time_sliced_resumes(self):
+        """A run that exhausts max_seconds reports incomplete; the next run continues."""
+        t, hashes = make_tract_with_commits(5)
+        orphans = create_orphans(t, hashes)
+
+        first = t.gc(orphan_retention_days=0, batch_size=1, max_seconds=0)
+        assert first.complete is False
+        assert first.commits_removed == 1
+        # Oldest orphan goes first
+        assert t._commit_repo.get(orphans[0]) is None
+
+        rest = t.gc(orphan_retention_days=0, batch_size=10)
+        assert rest.complete is True
+        assert first.commits_removed + rest.commits_removed == len(orphans)
+
+    def test_gc_time_sliced_exact_final_batch_is_complete(self):
+        """A full batch that removes the last orphan is not reported incomplete."""
+        t, hashes = make_tract_with_commits(5)
+        orphans = create_orphans(t, hashes)
+
+        result = t.gc(orphan_retention_days=0, batch_size=len(orphans), max_seconds=0)
+        assert result.commits_removed == len(orphans)
+        assert result.complete is True
+
+    def test_gc_batch_arguments_validated(self):
+        """batch_size must be positive and max_seconds needs batch_size."""
+        t, _ = make_tract_with_commits(2)
+        with pytest.raises(ValueError):
+            t.gc(batch_size=0)
+        with pytest.raises(ValueError):
+            t.gc(max_seconds=1.0)
+
+    def test_gc_keeps_young_descendant_chain_totals(self):
+        """A retained orphan whose old parent is removed is re-rooted."""
+        from datetime import datetime, timedelta, timezone
+
+        from sqlalchemy import update
+
+        from tract.storage.schema import CommitRow
+
+        t, hashes = make_tract_with_commits(4)
+        orphans = create_orphans(t, hashes)
+        old = datetime.now(timezone.utc) - timedelta(days=30)
+        t._session.execute(
+            update(CommitRow)
+            .where(CommitRow.commit_hash == orphans[0])
+            .values(created_at=old)
+        )
+        own_tokens = t._commit_repo.get(orphans[1]).token_count
+
+        result = t.gc(orphan_retention_days=7)
+
+        assert result.commits_removed == 1
+        survivor = t._commit_repo.get(orphans[1])
+        assert survivor.parent_hash is None
+        assert t._commit_repo.sum_ancestor_tokens(orphans[1]) == own_tokens
+
+
 # ===========================================================================
 # 5. Provenance cleanup tests
 # ===========================================================================
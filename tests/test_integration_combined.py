@@ -182,6 +182,26 @@ class TestFindAndCompare:
             results = t.find(content="quick brown")
             assert len(results) == 1
 
+    def test_find_reaches_past_recent_history(self):
+        """find(content=/pattern=) searches the whole history, not a recent window."""
+        with Tract.open() as t:
+            t.user("The needle in the haystack")
+            with t.batch():
+                for i in range(600):
+                    t.user(f"filler message {i}")
+            assert len(t.find(content="needle", limit=1)) == 1
+            assert len(t.find(pattern=r"need\w+ in")) == 1
+            assert t.find(content="Needle") == []
+
+    def test_find_matches_content_text_not_payload_json(self):
+        """find(content=) matches content values, not JSON keys or the role."""
+        with Tract.open() as t:
+            h = t.user("hello world").commit_hash
+            assert [c.commit_hash for c in t.find(content="hello")] == [h]
+            assert t.find(content="content_type") == []
+            assert t.find(content='"text"') == []
+            assert t.find(content="user") == []
+
     def test_compare_branches_with_configs(self):
         """compare() works on branches with different configs."""
         with Tract.open() as t:
@@ -0,0 +1,87 @@
+"""Import-footprint tests for the lazily-resolved ``tract`` package."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+import tract
+import tract.llm
+
+# Third-party packages `import tract` must not load.
+_HEAVY = ("sqlalchemy", "pydantic", "rich", "httpx", "anthropic", "tiktoken", "tenacity")
+
+
+def _fresh_import(statement: str) -> list[str]:
+    """Run *statement* in a new interpreter; return the modules it loaded."""
+    code = (
+        "import json, sys\n"
+        "before = set(sys.modules)\n"
+        f"{statement}\n"
+        "print(json.dumps(sorted(set(sys.modules) - before)))\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _top_level(modules: list[str]) -> set[str]:
+    return {m.split(".", 1)[0] for m in modules}
+
+
+def _needs_optional_deps(package, name: str) -> bool:
+    """True if *name* is exported from a module with optional dependencies."""
+    target = package._LAZY_ATTRS.get(name)
+    if target is None:
+        return False
+    module = target[0] if isinstance(target, tuple) else target
+    return module in tract._OPTIONAL_MODULES
+
+
+class TestImportFootprint:
+    def test_import_tract_loads_nothing_heavy(self) -> None:
+        modules = _fresh_import("import tract")
+        assert not _top_level(modules) & set(_HEAVY)
+        assert "tract.tract" not in modules
+
+    def test_cli_import_is_light(self) -> None:
+        modules = _fresh_import("import tract.cli")
+        assert not _top_level(modules) & set(_HEAVY)
+
+    def test_facade_defers_optional_clients_and_rich(self) -> None:
+        modules = _fresh_import("from tract import Tract; Tract.open().user('hi')")
+        assert not _top_level(modules) & {"rich", "httpx", "anthropic", "tenacity"}
+
+
+class TestLazyAttributes:
+    @pytest.mark.parametrize("package", [tract, tract.llm], ids=["tract", "tract.llm"])
+    def test_lazy_table_matches_all(self, package) -> None:
+        assert set(package._LAZY_ATTRS) == set(package.__all__) - {"__version__"}
+
+    @pytest.mark.parametrize("package", [tract, tract.llm], ids=["tract", "tract.llm"])
+    def test_every_public_name_resolves(self, package) -> None:
+        for name in package.__all__:
+            try:
+                getattr(package, name)
+            except (AttributeError, ImportError):
+                # Only names backed by optional extras may be missing
+                if not _needs_optional_deps(package, name):
+                    raise
+
+    def test_alias_resolves_to_original(self) -> None:
+        from tract.profiles import get_profile
+
+        assert tract.get_workflow_profile is get_profile
+
+    def test_unknown_attribute_raises(self) -> None:
+        with pytest.raises(AttributeError):
+            tract.does_not_exist  # noqa: B018
+        with pytest.raises(ImportError):
+            from tract import does_not_exist  # noqa: F401
+
+    def test_dir_lists_lazy_names(self) -> None:
+        assert {"Tract", "Session", "MockLLMClient"} <= set(dir(tract))
@@ -3,6 +3,9 @@
 from __future__ import annotations
 
 import asyncio
+import json
+import sqlite3
+import threading
 import time
 
 import pytest
@@ -204,3 +207,313 @@ class TestCacheAllFlag:
         client.chat(msg, temperature=0.9)
         client.chat(msg, temperature=0.9)
         assert inner.call_count == 1
+
+
+# ---------------------------------------------------------------------------
+# Memory tier, buffered stats and size cap
+# ---------------------------------------------------------------------------
+
+def _msg(text: str) -> list[dict[str, str]]:
+    return [{"role": "user", "content": text}]
+
+
+def _db_hits(client: CachingLLMClient) -> int:
+    return client._conn.execute("SELECT COALESCE(SUM(hit_count), 0) FROM llm_cache").fetchone()[0]
+
+
+def _cached_texts(client: CachingLLMClient) -> set[str]:
+    rows = client._conn.execute("SELECT response FROM llm_cache").fetchall()
+    return {client.extract_content(json.loads(r[0])) for r in rows}
+
+
+class TestTieredCache:
+    def test_memory_hits_touch_no_sqlite(self) -> None:
+        client, inner = _make_client()
+        client.chat(_msg("Hi"))
+        statements: list[str] = []
+        client._conn.set_trace_callback(statements.append)
+        for _ in range(10):
+            client.chat(_msg("Hi"))
+        assert statements == []
+        assert client.hits == 10 and inner.call_count == 1
+
+    def test_disk_hits_do_not_write(self) -> None:
+        client, _ = _make_client(memory_entries=0)
+        client.chat(_msg("Hi"))
+        changes = client._conn.total_changes
+        for _ in range(10):
+            client.chat(_msg("Hi"))
+        assert client._conn.total_changes == changes
+
+    def test_hit_counts_flushed_in_batches(self) -> None:
+        client, _ = _make_client(flush_every=3)
+        client.chat(_msg("Hi"))
+        client.chat(_msg("Hi"))
+        client.chat(_msg("Hi"))
+        assert _db_hits(client) == 0
+        client.chat(_msg("Hi"))
+        assert _db_hits(client) == 3
+        client.chat(_msg("Hi"))
+        client.flush()
+        assert _db_hits(client) == 4
+
+    def test_close_flushes_pending_hits(self, tmp_path) -> None:
+        path = tmp_path / "cache.db"
+        client = CachingLLMClient(MockLLMClient(["A"]), cache_path=path)
+        client.chat(_msg("Hi"))
+        client.chat(_msg("Hi"))
+        client.close()
+        reopened = CachingLLMClient(MockLLMClient(["B"]), cache_path=path)
+        assert _db_hits(reopened) == 1
+
+    def test_lru_eviction_keeps_recently_used(self) -> None:
+        client, _ = _make_client(["1", "2", "3", "4"], max_entries=3, memory_entries=0)
+        for text in ("1", "2", "3"):
+            client.chat(_msg(text))
+        client.chat(_msg("1"))  # refresh "1"
+        client.chat(_msg("4"))
+        assert _cached_texts(client) == {"1", "4"}
+        assert client.evictions == 2
+
+    def test_lfu_eviction_keeps_frequently_hit(self) -> None:
+        client, _ = _make_client(
+            ["a", "b", "c", "d"], max_entries=3, eviction="lfu", flush_every=1
+        )
+        for text in ("a", "b", "c"):
+            client.chat(_msg(text))
+        client.chat(_msg("a"))
+        client.chat(_msg("a"))
+        client.chat(_msg("c"))
+        client.chat(_msg("d"))
+        assert _cached_texts(client) == {"a", "d"}
+
+    def test_lfu_eviction_keeps_new_entry(self) -> None:
+        client, inner = _make_client(
+            ["a", "b", "c"], max_entries=2, eviction="lfu", flush_every=1
+        )
+        client.chat(_msg("a"))
+        client.chat(_msg("a"))
+        client.chat(_msg("b"))
+        client.chat(_msg("b"))
+        client.chat(_msg("c"))
+        assert "c" in _cached_texts(client)
+        client.chat(_msg("c"))
+        assert inner.call_count == 3
+
+    def test_max_bytes_caps_store(self) -> None:
+        client, _ = _make_client([f"response {i}" * 20 for i in range(20)], max_bytes=4000)
+        for i in range(20):
+            client.chat(_msg(str(i)))
+        assert client._store_totals()[1] <= 4000
+        assert client.evictions > 0
+
+    def test_evicted_entries_leave_memory_tier(self) -> None:
+        client, inner = _make_client(["1", "2", "3"], max_entries=1)
+        client.chat(_msg("1"))
+        client.chat(_msg("2"))
+        client.chat(_msg("1"))
+        assert inner.call_count == 3
+
+    def test_expired_row_is_overwritten_not_deleted_on_read(self) -> None:
+        client, _ = _make_client(["A", "B"], ttl_seconds=0.01)
+        client.chat(_msg("Hi"))
+        time.sleep(0.05)
+        changes = client._conn.total_changes
+        assert client._get(next(iter(client._memory))) is None
+        assert client._conn.total_changes == changes
+        client.chat(_msg("Hi"))
+        assert client.size == 1
+
+    def test_migrates_old_schema(self, tmp_path) -> None:
+        path = tmp_path / "old.db"
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "CREATE TABLE llm_cache (cache_key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+            "model TEXT, created_at REAL NOT NULL, hit_count INTEGER DEFAULT 0)"
+        )
+        conn.commit()
+        conn.close()
+        client = CachingLLMClient(MockLLMClient(["A"]), cache_path=path, max_entries=10)
+        client.chat(_msg("Hi"))
+        assert client.chat(_msg("Hi")) is not None
+        assert client.hits == 1
+        columns = {r[1] for r in client._conn.execute("PRAGMA table_info(llm_cache)")}
+        assert {"last_used", "size_bytes"} <= columns
+
+    def test_invalid_eviction_policy(self) -> None:
+        with pytest.raises(ValueError):
+            _make_client(eviction="fifo")
+
+
+# ---------------------------------------------------------------------------
+# Single-flight coalescing
+# ---------------------------------------------------------------------------
+
+class _SlowClient(MockLLMClient):
+    """MockLLMClient whose calls block until ``release`` is set."""
+
+    def __init__(self, responses: list[str], *, fail: bool = False) -> None:
+        super().__init__(responses)
+        self.release = threading.Event()
+        self.fail = fail
+
+    def chat(self, messages, **kwargs):
+        self.release.wait(timeout=5)
+        if self.fail:
+            raise RuntimeError("provider down")
+        return super().chat(messages, **kwargs)
+
+    async def achat(self, messages, **kwargs):
+        while not self.release.is_set():
+            await asyncio.sleep(0.001)
+        return self.chat(messages, **kwargs)
+
+
+def _wait_for_waiters(client: CachingLLMClient, count: int) -> None:
+    deadline = time.monotonic() + 5
+    while client.coalesced < count and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+async def _await_waiters(client: CachingLLMClient, count: int) -> None:
+    deadline = time.monotonic() + 5
+    while client.coalesced < count and time.monotonic() < deadline:
+        await asyncio.sleep(0.001)
+
+
+class TestSingleFlight:
+    def test_concurrent_threads_share_one_call(self) -> None:
+        inner = _SlowClient(["A", "B"])
+        client = CachingLLMClient(inner, cache_path=":memory:")
+        results: list[str] = []
+
+        def worker() -> None:
+            results.append(client.extract_content(client.chat(_msg("Hi"))))
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        _wait_for_waiters(client, 4)
+        inner.release.set()
+        for thread in threads:
+            thread.join()
+
+        assert results == ["A"] * 5
+        assert inner.call_count == 1
+        assert (client.misses, client.coalesced) == (1, 4)
+        assert not client._inflight
+
+    def test_concurrent_coroutines_share_one_call(self) -> None:
+        inner = _SlowClient(["A", "B"])
+        client = CachingLLMClient(inner, cache_path=":memory:")
+
+        async def run() -> list[dict]:
+            tasks = [asyncio.create_task(client.achat(_msg("Hi"))) for _ in range(4)]
+            await _await_waiters(client, 3)
+            inner.release.set()
+            return await asyncio.gather(*tasks)
+
+        responses = asyncio.run(run())
+        assert [client.extract_content(r) for r in responses] == ["A"] * 4
+        assert inner.call_count == 1
+        assert client.stats["coalesced"] == 3
+
+    def test_cancelled_leader_hands_off_to_waiter(self) -> None:
+        inner = _SlowClient(["A", "B"])
+        client = CachingLLMClient(inner, cache_path=":memory:")
+
+        async def run() -> tuple[asyncio.Task, list[dict]]:
+            leader = asyncio.create_task(client.achat(_msg("Hi")))
+            while not client._inflight:
+                await asyncio.sleep(0.001)
+            waiters = [asyncio.create_task(client.achat(_msg("Hi"))) for _ in range(2)]
+            await _await_waiters(client, 2)
+            leader.cancel()
+            await asyncio.gather(leader, return_exceptions=True)
+            inner.release.set()
+            return leader, await asyncio.gather(*waiters)
+
+        leader, responses = asyncio.run(run())
+        assert leader.cancelled()
+        assert [client.extract_content(r) for r in responses] == ["A", "A"]
+        assert inner.call_count == 1
+        assert not client._inflight
+
+    def test_cancelled_waiter_leaves_call_running(self) -> None:
+        inner = _SlowClient(["A", "B"])
+        client = CachingLLMClient(inner, cache_path=":memory:")
+
+        async def run() -> list[dict]:
+            tasks = [asyncio.create_task(client.achat(_msg("Hi")))]
+            while not client._inflight:
+                await asyncio.sleep(0.001)
+            tasks += [asyncio.create_task(client.achat(_msg("Hi"))) for _ in range(2)]
+            await _await_waiters(client, 2)
+            await asyncio.sleep(0.05)  # let the waiters park on the flight
+            tasks[-1].cancel()
+            await asyncio.sleep(0.01)  # the leader is still running
+            inner.release.set()
+            return await asyncio.gather(*tasks[:-1])
+
+        responses = asyncio.run(run())
+        assert [client.extract_content(r) for r in responses] == ["A", "A"]
+        assert inner.call_count == 1
+
+    def test_async_lookup_runs_off_event_loop(self) -> None:
+        client, _ = _make_client()
+        claim = client._claim
+        threads: list[int] = []
+
+        def tracking_claim(key: str):
+            threads.append(threading.get_ident())
+            return claim(key)
+
+        client._claim = tracking_claim
+        asyncio.run(client.achat(_msg("Hi")))
+        asyncio.run(client.achat(_msg("Hi")))
+        assert len(threads) == 2
+        assert threading.get_ident() not in threads
+
+    def test_leader_failure_reaches_waiters(self) -> None:
+        inner = _SlowClient(["A"], fail=True)
+        client = CachingLLMClient(inner, cache_path=":memory:")
+        errors: list[BaseException] = []
+
+        def worker() -> None:
+            try:
+                client.chat(_msg("Hi"))
+            except RuntimeError as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        _wait_for_waiters(client, 2)
+        inner.release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(errors) == 3
+        assert not client._inflight
+        assert client.size == 0
+
+        inner.fail = False
+        assert client.extract_content(client.chat(_msg("Hi"))) == "A"
+
+    def test_uncacheable_requests_are_not_coalesced(self) -> None:
+        inner = _SlowClient(["A", "B"])
+        inner.release.set()
+        client = CachingLLMClient(inner, cache_path=":memory:", cache_all=False)
+        client.chat(_msg("Hi"), temperature=0.7)
+        client.chat(_msg("Hi"), temperature=0.7)
+        assert inner.call_count == 2
+        assert client.coalesced == 0
+
+    def test_shared_across_threads(self) -> None:
+        client, inner = _make_client(["A"], memory_entries=0)
+        client.chat(_msg("Hi"))
+        worker = threading.Thread(target=lambda: client.chat(_msg("Hi")))
+        worker.start()
+        worker.join()
+        assert client.hits == 1
+        assert inner.call_count == 1
@@ -596,6 +596,105 @@ class TestLoopWithMiddleware:
         assert result.tool_calls == 0
 
 
+class TestParallelTools:
+    @staticmethod
+    def _fanout_client(names: list[str]) -> MockLLMClient:
+        return MockLLMClient([
+            _make_response("Fan out", tool_calls=[
+                {"name": n, "arguments": {"q": n}} for n in names
+            ]),
+            _make_response("Done."),
+        ])
+
+    @staticmethod
+    def _tool_results(t) -> list[tuple[str, str]]:
+        out = []
+        for e in reversed(t.log(limit=50)):
+            if e.message and e.message.startswith(("tool result", "tool error")):
+                payload = t.get_content(e.commit_hash)
+                out.append((e.message, str(payload)))
+        return out
+
+    def test_handlers_run_concurrently_results_in_order(self, tract_instance):
+        import threading
+
+        barrier = threading.Barrier(3, timeout=5)
+
+        def slow(q):
+            barrier.wait()  # only passes if all three run at once
+            return f"got {q}"
+
+        names = ["a", "b", "c"]
+        seen: list[str] = []
+        result = run_loop(
+            tract_instance,
+            task="Parallel",
+            llm_client=self._fanout_client(names),
+            config=LoopConfig(parallel_tools=True),
+            tool_handlers={n: slow for n in names},
+            on_tool_result=lambda name, output, status: seen.append(output),
+        )
+        assert result.status == "completed"
+        assert result.tool_calls == 3
+        assert seen == ["got a", "got b", "got c"]
+        results = self._tool_results(tract_instance)
+        assert [m for m, _ in results] == ["tool result: a", "tool result: b", "tool result: c"]
+
+    def test_middleware_validation_and_errors(self, tract_instance):
+        from tract.exceptions import BlockedError
+
+        pre: list[str] = []
+        post: list[tuple[str, bool]] = []
+
+        def pre_hook(ctx):
+            pre.append(ctx.pending["tool_name"])
+            if ctx.pending["tool_name"] == "blocked":
+                raise BlockedError("pre_tool_execute", "nope")
+
+        tract_instance.middleware.add("pre_tool_execute", pre_hook)
+        tract_instance.middleware.add(
+            "post_tool_execute",
+            lambda ctx: post.append((ctx.pending["tool_name"], ctx.pending["success"])),
+        )
+
+        def boom(q):
+            raise RuntimeError("kaboom")
+
+        handlers = {
+            "ok": lambda q: "fine",
+            "boom": boom,
+            "blocked": lambda q: "never",
+            "invalid": lambda q: "never",
+        }
+        result = run_loop(
+            tract_instance,
+            llm_client=self._fanout_client(["ok", "invalid", "boom", "blocked"]),
+            config=LoopConfig(
+                parallel_tools=True,
+                max_tool_concurrency=2,
+                tool_validator=lambda name, args: (name != "invalid", "bad"),
+            ),
+            tool_handlers=handlers,
+        )
+        assert result.status == "completed"
+        assert pre == ["ok", "boom", "blocked"]
+        assert post == [("ok", True), ("boom", False)]
+        results = self._tool_results(tract_instance)
+        assert [m for m, _ in results] == [
+            "tool result: ok", "tool error: invalid",
+            "tool error: boom", "tool error: blocked",
+        ]
+        assert "RuntimeError: kaboom" in results[2][1]
+
+    def test_invalid_concurrency(self, tract_instance):
+        with pytest.raises(ValueError, match="max_tool_concurrency"):
+            run_loop(
+                tract_instance,
+                llm_client=MockLLMClient([]),
+                config=LoopConfig(parallel_tools=True, max_tool_concurrency=0),
+            )
+
+
 # ---------------------------------------------------------------------------
 # Middleware blocking on operations (wired into tract.py)
 # ---------------------------------------------------------------------------
@@ -46,7 +46,7 @@ class TestSchemaMigration:
         t = _make_file_tract(tmp_path)
         stmt = select(TraceMetaRow).where(TraceMetaRow.key == "schema_version")
         row = t._session.execute(stmt).scalar_one()
-        assert row.value == "13"
+        assert row.value == "20"
         t.close()
 
     def test_persistence_tables_exist(self, tmp_path: Path) -> None:
@@ -98,7 +98,7 @@ class TestSchemaMigration:
                 ).fetchall()
             ]
 
-        assert version == "13"
+        assert version == "20"
         assert "operation_configs" in tables
         assert "config_change_log" in tables
         assert "behavioral_specs" in tables
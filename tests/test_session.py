@@ -189,6 +189,31 @@ class TestCrossRepoQueries:
 
         session.close()
 
+    def test_search_ranked_and_scoped(self, tmp_path):
+        """search() ranks by relevance and scopes by branch and content type."""
+        session = Session.open(str(tmp_path / "test.db"))
+        t = session.create_tract()
+        t.commit(DialogueContent(role="user", text="Deploy notes: deploy the deploy script"))
+        t.commit(DialogueContent(role="user", text="A long message that mentions deploy once among many other words"))
+        t.branch("side")
+        t.switch("side")
+        t.commit(InstructionContent(text="Never deploy on Fridays"))
+
+        results = session.search("DEPLOY")
+        assert len(results) == 3
+        assert "Deploy notes" in t.get_content(results[0].commit_hash)
+
+        on_main = session.search("deploy", tract_id=t.tract_id, branch="main")
+        assert len(on_main) == 2
+        instructions = session.search("deploy", content_type="instruction")
+        assert [r.content_type for r in instructions] == ["instruction"]
+        assert len(session.search("deploy", limit=1)) == 1
+
+        with pytest.raises(ValueError):
+            session.search("deploy", branch="main")
+
+        session.close()
+
     def test_compile_at_time(self, tmp_path):
         """compile_at(tract_id, at_time=T) compiles tract as of time T."""
         db_path = str(tmp_path / "test.db")
@@ -220,6 +245,28 @@ class TestCrossRepoQueries:
 
         session.close()
 
+    def test_compile_at_is_memoized(self, tmp_path):
+        """Repeated compile_at calls reuse the result until the tract moves."""
+        db_path = str(tmp_path / "test.db")
+        session = Session.open(db_path)
+        t = session.create_tract()
+
+        info1 = t.commit(InstructionContent(text="first"))
+        t.commit(DialogueContent(role="user", text="second"))
+
+        first = session.compile_at(t.tract_id, at_commit=info1.commit_hash)
+        again = session.compile_at(t.tract_id, at_commit=info1.commit_hash)
+        assert again.messages[0] is first.messages[0]
+        first.messages.append(first.messages[0])
+        assert len(session.compile_at(t.tract_id, at_commit=info1.commit_hash).messages) == 1
+
+        t.commit(DialogueContent(role="user", text="third"))
+        after = session.compile_at(t.tract_id, at_commit=info1.commit_hash)
+        assert after is not first
+        assert after.commit_count == 1
+
+        session.close()
+
     def test_session_content_queryable(self, tmp_path):
         """SessionContent commits are queryable by content_type 'session'."""
         db_path = str(tmp_path / "test.db")
@@ -1,6 +1,6 @@
 """Tests for spawn and collapse operations.
 
-Tests cover spawn creation, inheritance modes (head_snapshot, full_clone),
+Tests cover spawn creation, inheritance modes (head_snapshot, full_clone, shared_prefix),
 collapse with manual/auto modes, Tract.parent() and children() helpers,
 and edge cases.
 """
@@ -11,6 +11,7 @@ import pytest
 
 from tract import (
     CollapseResult,
+    CommitOperation,
     DialogueContent,
     InstructionContent,
     Session,
@@ -125,6 +126,105 @@ class TestSpawn:
 
         session.close()
 
+    def test_spawn_shared_prefix_reuses_parent_commits(self, tmp_path):
+        """shared_prefix points the child at the parent's history without copying."""
+        session, parent = _create_session_with_parent(tmp_path, n_commits=4)
+        parent_head = parent.head
+        before = parent.compile()
+
+        child = session.spawn(parent, purpose="cow task", inheritance="shared_prefix")
+
+        assert child.head == parent_head
+        assert child._commit_repo.get_all(child.tract_id) == []
+        assert child.compile().to_dicts() == before.to_dicts()
+
+        info = child.commit(DialogueContent(role="user", text="child only"))
+        assert info.parent_hash == parent_head
+        assert child.compile().commit_count == 5
+        # Parent is unaffected by child commits
+        assert "child only" not in [m.content for m in parent.compile().messages]
+
+        session.close()
+
+    def test_shared_prefix_child_queries_see_inherited_commits(self, tmp_path):
+        """Tract-scoped lookups on a shared_prefix child include inherited commits."""
+        session, parent = _create_session_with_parent(tmp_path, n_commits=2)
+        parent.register_tag("decision")
+        inherited = parent.commit(
+            DialogueContent(role="user", text="needle from parent"),
+            tags=["decision"],
+            generation_config={"model": "gpt-4o"},
+        )
+        child = session.spawn(parent, purpose="cow task", inheritance="shared_prefix")
+        child.commit(DialogueContent(role="user", text="child only"), tags=["decision"])
+
+        needle = inherited.commit_hash
+        assert [c.commit_hash for c in child.find(content="needle")] == [needle]
+        hits = session.search("needle", tract_id=child.tract_id)
+        assert [c.commit_hash for c in hits] == [needle]
+        assert child.resolve(needle[:8]) == needle
+        assert child.resolve(needle) == needle
+        assert [c.commit_hash for c in child.query_by_config("model", "=", "gpt-4o")] == [needle]
+
+        tag_index = child._tag_index_repo
+        assert len(child._tags_mgr.query(["decision"])) == 2
+        assert len(tag_index.get_commits(["decision"], tract_id=child.tract_id)) == 2
+        assert tag_index.count_commits(["decision"], tract_id=child.tract_id) == {"decision": 2}
+
+        # The parent does not see the child's commits
+        assert parent._tags_mgr.query(["decision"]) and all(
+            c.commit_hash != child.head for c in parent._tags_mgr.query(["decision"])
+        )
+        assert session.search("child only", tract_id=parent.tract_id) == []
+
+        session.close()
+
+    def test_shared_prefix_child_edits_inherited_commit(self, tmp_path):
+        """A shared_prefix child can edit, list and restore an inherited commit."""
+        session, parent = _create_session_with_parent(tmp_path, n_commits=2)
+        original = parent.commit(DialogueContent(role="user", text="draft"))
+        child = session.spawn(parent, purpose="cow task", inheritance="shared_prefix")
+        edit = child.commit(
+            DialogueContent(role="user", text="revised"),
+            operation=CommitOperation.EDIT,
+            edit_target=original.commit_hash,
+        )
+
+        history = child.edit_history(original.commit_hash)
+        assert [c.commit_hash for c in history] == [original.commit_hash, edit.commit_hash]
+        assert [c.commit_hash for c in child.edit_history(edit.commit_hash)] == [
+            original.commit_hash, edit.commit_hash,
+        ]
+
+        restored = child.restore(original.commit_hash, 0)
+        assert restored.edit_target == original.commit_hash
+        texts = [m["content"] for m in child.compile().to_dicts()]
+        assert "draft" in texts and "revised" not in texts
+        # The parent's history is untouched
+        assert len(parent.edit_history(original.commit_hash)) == 1
+        dialogue = child._commit_repo.get_by_type("dialogue", child.tract_id)
+        assert original.commit_hash in {r.commit_hash for r in dialogue}
+
+        session.close()
+
+    def test_parent_gc_keeps_shared_prefix(self, tmp_path):
+        """Parent GC does not collect commits a shared_prefix child builds on."""
+        session, parent = _create_session_with_parent(tmp_path, n_commits=3)
+        root = parent.log()[-1].commit_hash
+        child = session.spawn(parent, purpose="cow task", inheritance="shared_prefix")
+        child.commit(DialogueContent(role="user", text="child only"))
+        expected = child.compile().to_dicts()
+
+        parent.reset(root, mode="hard")
+        result = parent.gc(orphan_retention_days=0)
+        # Only the parent's own spawn commit is collectable
+        assert result.commits_removed == 1
+
+        child._cache.clear()
+        assert child.compile().to_dicts() == expected
+
+        session.close()
+
     def test_spawn_selective_requires_filter(self, tmp_path):
         """Spawn with selective but no filter criteria raises ValueError."""
         session, parent = _create_session_with_parent(tmp_path)
@@ -17,6 +17,7 @@ from tract.storage.schema import (
     AnnotationRow,
     BlobRow,
     CommitRow,
+    CurrentAnnotationRow,
 )
 
 
@@ -163,6 +164,101 @@ class TestSqliteCommitRepository:
         ancestors = commit_repo.get_ancestors(c3.commit_hash, limit=2)
         assert len(ancestors) == 2
 
+    def test_get_ancestors_op_filter_with_limit(self, commit_repo, blob_repo, sample_tract_id):
+        """op_filter keeps walking past non-matching commits until limit matches."""
+        blob = self._setup_blob(blob_repo)
+        now = datetime.now(timezone.utc)
+
+        c1 = _make_commit("opf1_" + "a" * 59, sample_tract_id, blob.content_hash, created_at=now)
+        c2 = _make_commit("opf2_" + "b" * 59, sample_tract_id, blob.content_hash,
+                          parent_hash=c1.commit_hash, operation=CommitOperation.EDIT,
+                          edit_target=c1.commit_hash, created_at=now + timedelta(seconds=1))
+        c3 = _make_commit("opf3_" + "c" * 59, sample_tract_id, blob.content_hash,
+                          parent_hash=c2.commit_hash, created_at=now + timedelta(seconds=2))
+
+        commit_repo.save(c1)
+        commit_repo.save(c2)
+        commit_repo.save(c3)
+
+        appends = commit_repo.get_ancestors(
+            c3.commit_hash, limit=2, op_filter=CommitOperation.APPEND,
+        )
+        assert [c.commit_hash for c in appends] == [c3.commit_hash, c1.commit_hash]
+
+    def test_delete_rebases_descendant_chain_totals(
+        self, commit_repo, blob_repo, sample_tract_id,
+    ):
+        """Deleting a commit subtracts its chain total from re-rooted descendants."""
+        blob = self._setup_blob(blob_repo)
+        c1 = _make_commit("ct1_" + "a" * 60, sample_tract_id, blob.content_hash)
+        c2 = _make_commit("ct2_" + "b" * 60, sample_tract_id, blob.content_hash,
+                          parent_hash=c1.commit_hash)
+        c3 = _make_commit("ct3_" + "c" * 60, sample_tract_id, blob.content_hash,
+                          parent_hash=c2.commit_hash)
+        for i, c in enumerate((c1, c2, c3), start=1):
+            c.chain_token_total = 4 * i
+            commit_repo.save(c)
+
+        commit_repo.delete(c1.commit_hash)
+
+        assert commit_repo.sum_ancestor_tokens(c2.commit_hash) == 4
+        assert commit_repo.sum_ancestor_tokens(c3.commit_hash) == 8
+
+    def test_delete_many_matches_sequential_deletes(
+        self, commit_repo, blob_repo, sample_tract_id,
+    ):
+        """Bulk deletion re-roots each survivor at its nearest deleted ancestor."""
+        blob = self._setup_blob(blob_repo)
+        chain = []
+        parent = None
+        for i in range(1, 6):
+            c = _make_commit(f"dm{i}_" + "e" * 60, sample_tract_id, blob.content_hash,
+                             parent_hash=parent)
+            c.chain_token_total = 4 * i
+            c.generation = i
+            commit_repo.save(c)
+            chain.append(c.commit_hash)
+            parent = c.commit_hash
+
+        # c1 -> c2 -> c3 -> c4 -> c5; delete c1 and c3
+        commit_repo.delete_many([chain[2], chain[0]])
+
+        assert commit_repo.get(chain[0]) is None and commit_repo.get(chain[2]) is None
+        assert commit_repo.get(chain[3]).parent_hash is None
+        assert commit_repo.sum_ancestor_tokens(chain[1]) == 4
+        assert commit_repo.sum_ancestor_tokens(chain[3]) == 4
+        assert commit_repo.sum_ancestor_tokens(chain[4]) == 8
+        assert blob_repo.delete_orphaned([blob.content_hash]) == 0
+
+    def test_get_ancestors_with_merges_single_query(
+        self, commit_repo, blob_repo, session, sample_tract_id,
+    ):
+        """Merge-aware walk follows commit_parents and returns newest first."""
+        from tract.storage.sqlite import SqliteCommitParentRepository
+
+        parent_repo = SqliteCommitParentRepository(session)
+        blob = self._setup_blob(blob_repo)
+        now = datetime.now(timezone.utc)
+
+        root = _make_commit("mroot_" + "a" * 58, sample_tract_id, blob.content_hash, created_at=now)
+        side = _make_commit("mside_" + "b" * 58, sample_tract_id, blob.content_hash,
+                            parent_hash=root.commit_hash, created_at=now + timedelta(seconds=1))
+        main = _make_commit("mmain_" + "c" * 58, sample_tract_id, blob.content_hash,
+                            parent_hash=root.commit_hash, created_at=now + timedelta(seconds=2))
+        merge = _make_commit("mmrg_" + "d" * 59, sample_tract_id, blob.content_hash,
+                             parent_hash=main.commit_hash, created_at=now + timedelta(seconds=3))
+        for c in (root, side, main, merge):
+            commit_repo.save(c)
+        parent_repo.add_parents(merge.commit_hash, [main.commit_hash, side.commit_hash])
+
+        rows = commit_repo.get_ancestors_with_merges(merge.commit_hash)
+        assert [r.commit_hash for r in rows] == [
+            merge.commit_hash, main.commit_hash, side.commit_hash, root.commit_hash,
+        ]
+        assert parent_repo.batch_get_parents([merge.commit_hash, main.commit_hash]) == {
+            merge.commit_hash: [main.commit_hash, side.commit_hash],
+        }
+
     def test_get_by_type(self, commit_repo, blob_repo, sample_tract_id):
         blob = self._setup_blob(blob_repo)
         now = datetime.now(timezone.utc)
@@ -381,6 +477,71 @@ class TestSqliteAnnotationRepository:
         result = annotation_repo.batch_get_latest(["nonexistent_" + "0" * 52])
         assert result == {}
 
+    def test_older_annotation_saved_later_is_not_current(
+        self, annotation_repo, blob_repo, commit_repo, sample_tract_id
+    ):
+        """The pointer follows created_at, not insertion order."""
+        commit = self._make_commit_with_blob(
+            blob_repo, commit_repo, "late_old_" + "a" * 55, sample_tract_id
+        )
+        now = datetime.now(timezone.utc)
+        for priority, offset in [(Priority.PINNED, 5), (Priority.SKIP, 0)]:
+            annotation_repo.save(AnnotationRow(
+                tract_id=sample_tract_id,
+                target_hash=commit.commit_hash,
+                priority=priority,
+                created_at=now + timedelta(seconds=offset),
+            ))
+        assert annotation_repo.get_latest(commit.commit_hash).priority == Priority.PINNED
+
+    def test_save_many_points_at_newest_revision(
+        self, annotation_repo, blob_repo, commit_repo, session, sample_tract_id
+    ):
+        """Bulk saves keep one pointer per target, at its newest row."""
+        c1 = self._make_commit_with_blob(
+            blob_repo, commit_repo, "many_c1_" + "a" * 56, sample_tract_id
+        )
+        c2 = self._make_commit_with_blob(
+            blob_repo, commit_repo, "many_c2_" + "b" * 56, sample_tract_id
+        )
+        now = datetime.now(timezone.utc)
+        annotation_repo.save_many([
+            AnnotationRow(tract_id=sample_tract_id, target_hash=c1.commit_hash,
+                          priority=Priority.NORMAL, created_at=now),
+            AnnotationRow(tract_id=sample_tract_id, target_hash=c1.commit_hash,
+                          priority=Priority.SKIP, created_at=now + timedelta(seconds=1)),
+            AnnotationRow(tract_id=sample_tract_id, target_hash=c2.commit_hash,
+                          priority=Priority.PINNED, created_at=now),
+            AnnotationRow(tract_id=sample_tract_id, target_hash=c2.commit_hash,
+                          priority=Priority.IMPORTANT, created_at=now),
+        ])
+        annotation_repo.save_many([
+            AnnotationRow(tract_id=sample_tract_id, target_hash=c1.commit_hash,
+                          priority=Priority.PINNED, created_at=now - timedelta(seconds=1)),
+        ])
+
+        result = annotation_repo.batch_get_latest([c1.commit_hash, c2.commit_hash])
+        assert result[c1.commit_hash].priority == Priority.SKIP
+        assert result[c2.commit_hash].priority == Priority.IMPORTANT  # same time, higher id
+        pointers = session.query(CurrentAnnotationRow).count()
+        assert pointers == 2
+
+    def test_deleting_commit_drops_pointer(
+        self, annotation_repo, blob_repo, commit_repo, session, sample_tract_id
+    ):
+        commit = self._make_commit_with_blob(
+            blob_repo, commit_repo, "gc_ann_" + "a" * 57, sample_tract_id
+        )
+        annotation_repo.save(AnnotationRow(
+            tract_id=sample_tract_id,
+            target_hash=commit.commit_hash,
+            priority=Priority.SKIP,
+            created_at=datetime.now(timezone.utc),
+        ))
+        commit_repo.delete_many([commit.commit_hash])
+        assert session.get(CurrentAnnotationRow, commit.commit_hash) is None
+        assert annotation_repo.get_latest(commit.commit_hash) is None
+
 
 # ---------------------------------------------------------------------------
 # Commit Repository: get_by_config
@@ -461,3 +622,240 @@ class TestSqliteCommitRepositoryGetByConfig:
         results = commit_repo.get_by_config(sample_tract_id, "temperature", "=", 0.7)
         assert len(results) == 1
         assert results[0].commit_hash == c2.commit_hash
+
+
+# ---------------------------------------------------------------------------
+# Compile Snapshot Repository
+# ---------------------------------------------------------------------------
+
+
+class TestSqliteCompileSnapshotRepository:
+    """Unit tests for persisted compile snapshots."""
+
+    @pytest.fixture
+    def snapshot_repo(self, session):
+        from tract.storage.sqlite import SqliteCompileSnapshotRepository
+
+        return SqliteCompileSnapshotRepository(session)
+
+    def _chain(self, blob_repo, commit_repo, tract_id, n):
+        blob = _make_blob("snap_blob_" + "0" * 54)
+        blob_repo.save_if_absent(blob)
+        now = datetime.now(timezone.utc)
+        hashes: list[str] = []
+        for i in range(n):
+            c = _make_commit(
+                f"snap{i}_" + "a" * 58, tract_id, blob.content_hash,
+                parent_hash=hashes[-1] if hashes else None,
+                created_at=now + timedelta(seconds=i),
+            )
+            commit_repo.save(c)
+            hashes.append(c.commit_hash)
+        return hashes
+
+    def _row(self, tract_id, head_hash, seconds=0):
+        from tract.storage.schema import CompileSnapshotRow
+
+        return CompileSnapshotRow(
+            tract_id=tract_id,
+            head_hash=head_hash,
+            params_key="k",
+            snapshot_json={"messages": []},
+            annotation_watermark=0,
+            created_at=datetime.now(timezone.utc) + timedelta(seconds=seconds),
+        )
+
+    def test_find_nearest_ancestor(
+        self, snapshot_repo, blob_repo, commit_repo, sample_tract_id,
+    ):
+        hashes = self._chain(blob_repo, commit_repo, sample_tract_id, 5)
+        snapshot_repo.save(self._row(sample_tract_id, hashes[0]))
+        snapshot_repo.save(self._row(sample_tract_id, hashes[2]))
+
+        row, distance = snapshot_repo.find_nearest_ancestor(
+            sample_tract_id, hashes[4], "k",
+        )
+        assert row.head_hash == hashes[2]
+        assert distance == 2
+        assert snapshot_repo.find_nearest_ancestor(sample_tract_id, hashes[4], "other") is None
+
+    def test_save_replaces_and_prune_keeps_newest(
+        self, snapshot_repo, blob_repo, commit_repo, sample_tract_id,
+    ):
+        hashes = self._chain(blob_repo, commit_repo, sample_tract_id, 3)
+        for i, h in enumerate(hashes):
+            snapshot_repo.save(self._row(sample_tract_id, h, seconds=i))
+        replaced = self._row(sample_tract_id, hashes[2], seconds=3)
+        replaced.snapshot_json = {"messages": [], "commit_count": 1}
+        snapshot_repo.save(replaced)
+
+        assert snapshot_repo.prune(sample_tract_id, keep=2) == 1
+        assert snapshot_repo.get(sample_tract_id, hashes[0], "k") is None
+        latest = snapshot_repo.get(sample_tract_id, hashes[2], "k")
+        assert latest.snapshot_json["commit_count"] == 1
+
+    def test_prune_scoped_by_params_key(
+        self, snapshot_repo, blob_repo, commit_repo, sample_tract_id,
+    ):
+        hashes = self._chain(blob_repo, commit_repo, sample_tract_id, 3)
+        for i, h in enumerate(hashes):
+            snapshot_repo.save(self._row(sample_tract_id, h, seconds=i))
+            other = self._row(sample_tract_id, h, seconds=i + 10)
+            other.params_key = "other"
+            snapshot_repo.save(other)
+
+        assert snapshot_repo.prune(sample_tract_id, keep=1, exclude=("other",)) == 2
+        assert snapshot_repo.prune(sample_tract_id, keep=2, params_key="other") == 1
+        assert snapshot_repo.get(sample_tract_id, hashes[2], "k") is not None
+        assert snapshot_repo.get(sample_tract_id, hashes[0], "other") is None
+        assert snapshot_repo.get(sample_tract_id, hashes[1], "other") is not None
+
+
+class TestSqliteSearchIndexRepository:
+    """Unit tests for the FTS5 blob text index."""
+
+    @pytest.fixture
+    def search_repo(self, session):
+        from tract.storage.sqlite import SqliteSearchIndexRepository
+
+        return SqliteSearchIndexRepository(session)
+
+    def _commit_text(self, blob_repo, commit_repo, tract_id, name, text, parent=None,
+                     content_type="dialogue", seconds=0):
+        payload = '{"content_type":"dialogue","role":"user","text":"%s"}' % text
+        blob = _make_blob(f"fts_{name}_".ljust(64, "0"), payload)
+        blob_repo.save_if_absent(blob)
+        c = _make_commit(
+            f"fts_c_{name}_".ljust(64, "a"), tract_id, blob.content_hash,
+            parent_hash=parent, content_type=content_type,
+            created_at=datetime.now(timezone.utc) + timedelta(seconds=seconds),
+        )
+        commit_repo.save(c)
+        return c.commit_hash
+
+    def test_saved_blobs_are_searchable(
+        self, search_repo, blob_repo, commit_repo, sample_tract_id,
+    ):
+        assert search_repo.available
+        a = self._commit_text(blob_repo, commit_repo, sample_tract_id, "a", "The quick brown fox")
+        self._commit_text(blob_repo, commit_repo, sample_tract_id, "b", "A lazy dog", parent=a)
+
+        hits = search_repo.search("QUICK brown")
+        assert [r.commit_hash for r in hits] == [a]
+        assert search_repo.search("QUICK", case_sensitive=True) == []
+        # JSON keys and the role discriminator are not indexed
+        assert search_repo.search("role") == []
+        assert search_repo.search("user") == []
+
+    def test_short_terms_and_patterns(
+        self, search_repo, blob_repo, commit_repo, sample_tract_id,
+    ):
+        a = self._commit_text(blob_repo, commit_repo, sample_tract_id, "a", "go to 42nd street")
+        self._commit_text(blob_repo, commit_repo, sample_tract_id, "b", "nothing here", parent=a)
+
+        assert [r.commit_hash for r in search_repo.search("go")] == [a]
+        assert [r.commit_hash for r in search_repo.search(pattern=r"\d+nd")] == [a]
+
+    def test_scoping(self, search_repo, blob_repo, commit_repo, sample_tract_id):
+        root = self._commit_text(blob_repo, commit_repo, sample_tract_id, "r", "shared apple")
+        left = self._commit_text(
+            blob_repo, commit_repo, sample_tract_id, "l", "left apple", parent=root, seconds=1,
+        )
+        self._commit_text(
+            blob_repo, commit_repo, sample_tract_id, "x", "right apple", parent=root,
+            content_type="instruction", seconds=2,
+        )
+        self._commit_text(blob_repo, commit_repo, "other-tract", "o", "apple elsewhere")
+
+        assert len(search_repo.search("apple")) == 4
+        assert len(search_repo.search("apple", tract_id=sample_tract_id)) == 3
+        scoped = search_repo.search("apple", ancestor_of=left, ranked=False)
+        assert [r.commit_hash for r in scoped] == [left, root]
+        assert len(search_repo.search("apple", content_type="instruction")) == 1
+        assert len(search_repo.search("apple", limit=2)) == 2
+
+    def test_delete_removes_from_index(self, search_repo, blob_repo, session):
+        blob = _make_blob("fts_orphan_".ljust(64, "0"), '{"text":"orphaned words"}')
+        blob_repo.save_if_absent(blob)
+        assert blob_repo.delete_if_orphaned(blob.content_hash)
+
+        from sqlalchemy import func, select
+
+        from tract.storage.schema import SearchDocumentRow
+
+        assert session.execute(select(func.count(SearchDocumentRow.doc_id))).scalar() == 0
+        # Re-saving the blob indexes it again
+        blob_repo.save_if_absent(_make_blob(blob.content_hash, blob.payload_json))
+        assert search_repo.reindex() == 0
+
+
+
+class TestSqliteTagIndexRepository:
+    """Unit tests for the unified commit_tags membership index."""
+
+    @pytest.fixture
+    def tag_index(self, session):
+        from tract.storage.sqlite import SqliteTagIndexRepository
+
+        return SqliteTagIndexRepository(session)
+
+    def _tagged(self, blob_repo, commit_repo, tract_id, name, tags, parent=None, seconds=0):
+        blob = _make_blob(f"tagidx_{name}_".ljust(64, "0"))
+        blob_repo.save_if_absent(blob)
+        c = _make_commit(
+            f"tagidx_c_{name}_".ljust(64, "a"), tract_id, blob.content_hash,
+            parent_hash=parent,
+            created_at=datetime.now(timezone.utc) + timedelta(seconds=seconds),
+        )
+        c.tags_json = tags
+        commit_repo.save(c)
+        return c.commit_hash
+
+    @staticmethod
+    def _hashes(rows):
+        return [r.commit_hash for r in rows]
+
+    def test_commit_tags_indexed_on_save(
+        self, tag_index, blob_repo, commit_repo, sample_tract_id,
+    ):
+        a = self._tagged(blob_repo, commit_repo, sample_tract_id, "a", ["x", "y", "x"])
+        b = self._tagged(blob_repo, commit_repo, sample_tract_id, "b", ["y"], parent=a, seconds=1)
+        self._tagged(blob_repo, commit_repo, "other-tract", "c", ["y"], seconds=2)
+
+        assert tag_index.get_tags(a) == ["x", "y"]
+        assert self._hashes(tag_index.get_commits(["y"], tract_id=sample_tract_id)) == [b, a]
+        assert self._hashes(tag_index.get_commits(["x", "y"], match="all")) == [a]
+        assert self._hashes(tag_index.get_commits(["y"], ancestor_of=b, limit=1)) == [b]
+        assert tag_index.count_commits(["x", "y"], tract_id=sample_tract_id) == {"x": 1, "y": 2}
+        assert tag_index.count_commits(["y"], ancestor_of=a) == {"y": 1}
+        with pytest.raises(ValueError):
+            tag_index.get_commits(["x"], match="some")
+
+    def test_annotation_source_is_independent(
+        self, tag_index, blob_repo, commit_repo, session, sample_tract_id,
+    ):
+        from tract.storage.schema import TagAnnotationRow
+
+        a = self._tagged(blob_repo, commit_repo, sample_tract_id, "ann", ["x"])
+        tag_index.index_annotations([TagAnnotationRow(
+            tract_id=sample_tract_id, target_hash=a, tag="x",
+            created_at=datetime.now(timezone.utc),
+        )])
+        tag_index.unindex_annotation(a, "x")
+        assert self._hashes(tag_index.get_commits(["x"])) == [a]
+        assert tag_index.count_commits(["x"], tract_id=sample_tract_id) == {"x": 1}
+
+        commit_repo.delete_many([a])
+        assert tag_index.get_tags(a) == []
+        assert tag_index.reindex() == 0
+
+
+def test_extract_search_text():
+    from tract.storage.sqlite import extract_search_text
+
+    payload = (
+        '{"content_type":"tool_io","tool_name":"grep","direction":"call",'
+        '"payload":{"args":["-n","needle"],"count":3,"flag":true}}'
+    )
+    assert extract_search_text(payload).split("\n") == ["grep", "call", "-n", "needle", "3"]
+    assert extract_search_text("not json") == "not json"
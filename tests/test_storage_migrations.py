@@ -13,7 +13,7 @@ Covers:
 from __future__ import annotations
 
 import json
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 import pytest
@@ -27,6 +27,7 @@ from tract.storage.engine import (
     init_db,
 )
 from tract.storage.schema import Base, TraceMetaRow
+from tract.storage.sqlite import SqliteAnnotationRepository, SqliteCompileRecordRepository
 
 
 # ---------------------------------------------------------------------------
@@ -367,7 +368,7 @@ class TestFullMigrationChain:
         """A brand-new database gets schema version 12."""
         engine = create_trace_engine(":memory:")
         init_db(engine)
-        assert _get_schema_version(engine) == "13"
+        assert _get_schema_version(engine) == "20"
         engine.dispose()
 
     def test_v1_migrates_to_v12(self):
@@ -394,7 +395,7 @@ class TestFullMigrationChain:
 
         init_db(engine)
 
-        assert _get_schema_version(engine) == "13"
+        assert _get_schema_version(engine) == "20"
         tables = _get_tables(engine)
         assert "commit_parents" in tables
         assert "spawn_pointers" in tables
@@ -420,7 +421,7 @@ class TestFullMigrationChain:
 
         init_db(engine)
 
-        assert _get_schema_version(engine) == "13"
+        assert _get_schema_version(engine) == "20"
         # v7: retention_json on annotations
         assert "retention_json" in _get_columns(engine, "annotations")
         # v8: tool tables
@@ -455,7 +456,7 @@ class TestFullMigrationChain:
 
         init_db(engine)
 
-        assert _get_schema_version(engine) == "13"
+        assert _get_schema_version(engine) == "20"
         assert "tags_json" in _get_columns(engine, "commits")
         assert "tag_annotations" in _get_tables(engine)
         assert "operation_configs" in _get_tables(engine)
@@ -474,10 +475,232 @@ class TestFullMigrationChain:
 
         init_db(engine)
 
-        assert _get_schema_version(engine) == "13"
+        assert _get_schema_version(engine) == "20"
         assert "config_change_log" in _get_tables(engine)
         engine.dispose()
 
+    def test_v13_backfills_chain_token_total(self):
+        """Starting from v13, init_db adds and backfills chain_token_total."""
+        engine = create_trace_engine(":memory:")
+        Base.metadata.create_all(engine)
+
+        now = datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+        with engine.connect() as conn:
+            conn.execute(text("ALTER TABLE commits DROP COLUMN chain_token_total"))
+            conn.execute(text(
+                "INSERT INTO blobs (content_hash, payload_json, byte_size, token_count, created_at) "
+                "VALUES ('blob-1', '{\"text\":\"test\"}', 16, 2, :now)"
+            ), {"now": now})
+            # root -> a -> b, plus a branch root -> c
+            for ch, parent, tokens in [
+                ("root", None, 5), ("a", "root", 7), ("b", "a", 11), ("c", "root", 3),
+            ]:
+                conn.execute(text(
+                    "INSERT INTO commits (commit_hash, tract_id, parent_hash, content_hash, "
+                    "content_type, operation, token_count, created_at) "
+                    "VALUES (:ch, 't1', :parent, 'blob-1', 'dialogue', 'APPEND', :tok, :now)"
+                ), {"ch": ch, "parent": parent, "tok": tokens, "now": now})
+            conn.commit()
+        self._set_version(engine, "13")
+
+        init_db(engine)
+
+        assert _get_schema_version(engine) == "20"
+        with engine.connect() as conn:
+            totals = dict(conn.execute(
+                text("SELECT commit_hash, chain_token_total FROM commits")
+            ).fetchall())
+        assert totals == {"root": 5, "a": 12, "b": 23, "c": 8}
+        engine.dispose()
+
+    def test_v16_backfills_commit_generations(self):
+        """Starting from v16, init_db adds and backfills commits.generation."""
+        engine = create_trace_engine(":memory:")
+        Base.metadata.create_all(engine)
+
+        now = datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+        with engine.connect() as conn:
+            conn.execute(text("ALTER TABLE commits DROP COLUMN generation"))
+            conn.execute(text(
+                "INSERT INTO blobs (content_hash, payload_json, byte_size, token_count, created_at) "
+                "VALUES ('blob-1', '{\"text\":\"test\"}', 16, 2, :now)"
+            ), {"now": now})
+            # root -> a -> b, root -> c, merge(b, c) -> m
+            for ch, parent in [
+                ("root", None), ("a", "root"), ("b", "a"), ("c", "root"), ("m", "b"),
+            ]:
+                conn.execute(text(
+                    "INSERT INTO commits (commit_hash, tract_id, parent_hash, content_hash, "
+                    "content_type, operation, token_count, created_at) "
+                    "VALUES (:ch, 't1', :parent, 'blob-1', 'dialogue', 'APPEND', 1, :now)"
+                ), {"ch": ch, "parent": parent, "now": now})
+            for pos, parent in enumerate(["b", "c"]):
+                conn.execute(text(
+                    "INSERT INTO commit_parents (commit_hash, parent_hash, position) "
+                    "VALUES ('m', :parent, :pos)"
+                ), {"parent": parent, "pos": pos})
+            conn.commit()
+        self._set_version(engine, "16")
+
+        init_db(engine)
+
+        assert _get_schema_version(engine) == "20"
+        with engine.connect() as conn:
+            generations = dict(conn.execute(
+                text("SELECT commit_hash, generation FROM commits")
+            ).fetchall())
+        assert generations == {"root": 1, "a": 2, "b": 3, "c": 2, "m": 4}
+        engine.dispose()
+
+    def test_v17_adds_compile_record_delta_columns(self):
+        """Starting from v17, existing compile records read back in full."""
+        engine = create_trace_engine(":memory:")
+        Base.metadata.create_all(engine)
+
+        now = datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+        with engine.connect() as conn:
+            for name in ("base_record_id", "keep_prefix", "keep_suffix",
+                         "effective_count", "delta_depth"):
+                conn.execute(text(f"ALTER TABLE compile_records DROP COLUMN {name}"))
+            conn.execute(text(
+                "INSERT INTO blobs (content_hash, payload_json, byte_size, token_count, created_at) "
+                "VALUES ('blob-1', '{\"text\":\"test\"}', 16, 2, :now)"
+            ), {"now": now})
+            for ch in ("a", "b"):
+                conn.execute(text(
+                    "INSERT INTO commits (commit_hash, tract_id, parent_hash, content_hash, "
+                    "content_type, operation, token_count, created_at) "
+                    "VALUES (:ch, 't1', NULL, 'blob-1', 'dialogue', 'APPEND', 1, :now)"
+                ), {"ch": ch, "now": now})
+            conn.execute(text(
+                "INSERT INTO compile_records (record_id, tract_id, head_hash, token_count, "
+                "commit_count, token_source, created_at) "
+                "VALUES ('rec', 't1', 'b', 2, 2, 'tiktoken:o200k_base', :now)"
+            ), {"now": now})
+            for pos, ch in enumerate(["a", "b"]):
+                conn.execute(text(
+                    "INSERT INTO compile_effectives (record_id, commit_hash, position) "
+                    "VALUES ('rec', :ch, :pos)"
+                ), {"ch": ch, "pos": pos})
+            conn.commit()
+        self._set_version(engine, "17")
+
+        init_db(engine)
+
+        assert _get_schema_version(engine) == "20"
+        with sessionmaker(bind=engine)() as session:
+            assert SqliteCompileRecordRepository(session).get_commit_hashes("rec") == ["a", "b"]
+        engine.dispose()
+
+    def test_v18_backfills_current_annotations(self):
+        """Starting from v18, init_db points each target at its newest annotation."""
+        engine = create_trace_engine(":memory:")
+        Base.metadata.create_all(engine)
+
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        with engine.connect() as conn:
+            conn.execute(text("DROP TABLE current_annotations"))
+            conn.execute(text(
+                "INSERT INTO blobs (content_hash, payload_json, byte_size, token_count, created_at) "
+                "VALUES ('blob-1', '{\"text\":\"test\"}', 16, 2, :now)"
+            ), {"now": now.isoformat()})
+            for ch in ("a", "b"):
+                conn.execute(text(
+                    "INSERT INTO commits (commit_hash, tract_id, parent_hash, content_hash, "
+                    "content_type, operation, token_count, created_at) "
+                    "VALUES (:ch, 't1', NULL, 'blob-1', 'dialogue', 'APPEND', 1, :now)"
+                ), {"ch": ch, "now": now.isoformat()})
+            # a: pinned then skip; b: two rows at the same time (higher id wins)
+            for target, priority, seconds in [
+                ("a", "PINNED", 0), ("a", "SKIP", 1), ("b", "NORMAL", 0), ("b", "IMPORTANT", 0),
+            ]:
+                conn.execute(text(
+                    "INSERT INTO annotations (tract_id, target_hash, priority, created_at) "
+                    "VALUES ('t1', :target, :priority, :created)"
+                ), {
+                    "target": target,
+                    "priority": priority,
+                    "created": (now + timedelta(seconds=seconds)).isoformat(" "),
+                })
+            conn.commit()
+        self._set_version(engine, "18")
+
+        init_db(engine)
+
+        assert _get_schema_version(engine) == "20"
+        with sessionmaker(bind=engine)() as session:
+            latest = SqliteAnnotationRepository(session).batch_get_latest(["a", "b"])
+        assert {h: row.priority.name for h, row in latest.items()} == {
+            "a": "SKIP", "b": "IMPORTANT",
+        }
+        engine.dispose()
+
+    def test_v19_backfills_tag_index(self):
+        """Starting from v19, init_db indexes immutable and annotation tags."""
+        engine = create_trace_engine(":memory:")
+        Base.metadata.create_all(engine)
+
+        now = datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+        with engine.connect() as conn:
+            conn.execute(text("DROP TABLE commit_tags"))
+            conn.execute(text(
+                "INSERT INTO blobs (content_hash, payload_json, byte_size, token_count, created_at) "
+                "VALUES ('blob-1', '{\"text\":\"test\"}', 16, 2, :now)"
+            ), {"now": now})
+            for ch, tags in [("a", '["x", "y"]'), ("b", None), ("c", '"bogus"')]:
+                conn.execute(text(
+                    "INSERT INTO commits (commit_hash, tract_id, parent_hash, content_hash, "
+                    "content_type, operation, token_count, tags_json, created_at) "
+                    "VALUES (:ch, 't1', NULL, 'blob-1', 'dialogue', 'APPEND', 1, :tags, :now)"
+                ), {"ch": ch, "tags": tags, "now": now})
+            conn.execute(text(
+                "INSERT INTO tag_annotations (tract_id, target_hash, tag, created_at) "
+                "VALUES ('t1', 'b', 'x', :now)"
+            ), {"now": now})
+            conn.commit()
+        self._set_version(engine, "19")
+
+        init_db(engine)
+
+        assert _get_schema_version(engine) == "20"
+        with engine.connect() as conn:
+            rows = conn.execute(text(
+                "SELECT commit_hash, tag, source FROM commit_tags ORDER BY commit_hash, tag"
+            )).fetchall()
+        assert [tuple(r) for r in rows] == [
+            ("a", "x", "commit"), ("a", "y", "commit"), ("b", "x", "annotation"),
+        ]
+        engine.dispose()
+
+    def test_v15_backfills_search_index(self):
+        """Starting from v15, init_db indexes every existing blob."""
+        engine = create_trace_engine(":memory:")
+        Base.metadata.create_all(engine)
+
+        now = datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+        with engine.connect() as conn:
+            conn.execute(text("DROP TABLE search_documents"))
+            for ch, body in [("blob-1", "alpha beta"), ("blob-2", "gamma delta")]:
+                conn.execute(text(
+                    "INSERT INTO blobs (content_hash, payload_json, byte_size, token_count, created_at) "
+                    "VALUES (:ch, :payload, 16, 2, :now)"
+                ), {"ch": ch, "payload": '{"text":"%s"}' % body, "now": now})
+            conn.commit()
+        self._set_version(engine, "15")
+
+        init_db(engine)
+
+        assert _get_schema_version(engine) == "20"
+        assert "search_documents" in _get_tables(engine)
+        with engine.connect() as conn:
+            rows = conn.execute(text(
+                "SELECT d.content_hash FROM blob_fts f "
+                "JOIN search_documents d ON d.doc_id = f.rowid "
+                "WHERE blob_fts MATCH '\"gamma\"'"
+            )).fetchall()
+        assert [r[0] for r in rows] == ["blob-2"]
+        engine.dispose()
+
 
 # ===========================================================================
 # Schema Evolution Tests
@@ -493,7 +716,7 @@ class TestSchemaEvolution:
         "compile_records", "compile_effectives", "spawn_pointers",
         "tool_definitions", "commit_tools", "tag_annotations",
         "tag_registry", "operation_configs", "config_change_log",
-        "behavioral_specs",
+        "behavioral_specs", "compile_snapshots", "search_documents",
     }
 
     @pytest.fixture
@@ -515,8 +738,8 @@ class TestSchemaEvolution:
         for expected in [
             "commit_hash", "tract_id", "parent_hash", "content_hash",
             "content_type", "operation", "edit_target", "message",
-            "token_count", "metadata_json", "generation_config_json",
-            "tags_json", "created_at",
+            "token_count", "chain_token_total", "generation", "metadata_json",
+            "generation_config_json", "tags_json", "created_at",
         ]:
             assert expected in cols, f"Missing column: {expected}"
 
@@ -584,7 +807,7 @@ class TestIdempotentMigration:
         engine = create_trace_engine(":memory:")
         init_db(engine)
         init_db(engine)
-        assert _get_schema_version(engine) == "13"
+        assert _get_schema_version(engine) == "20"
         engine.dispose()
 
     def test_double_init_db_preserves_tables(self):
@@ -627,7 +850,7 @@ class TestIdempotentMigration:
         engine = _create_v5_engine_with_compression_data()
 
         init_db(engine)
-        assert _get_schema_version(engine) == "13"
+        assert _get_schema_version(engine) == "20"
         tables_first = _get_tables(engine)
 
         # Old tables should be gone
@@ -635,7 +858,7 @@ class TestIdempotentMigration:
 
         # Second call should not raise
         init_db(engine)
-        assert _get_schema_version(engine) == "13"
+        assert _get_schema_version(engine) == "20"
         tables_second = _get_tables(engine)
         assert tables_first == tables_second
 
@@ -661,7 +884,7 @@ class TestIdempotentMigration:
 
         # First migration adds the column (or sees it already exists)
         init_db(engine)
-        assert _get_schema_version(engine) == "13"
+        assert _get_schema_version(engine) == "20"
 
         # Reset to v6 and try again -- the column already exists
         with Session() as session:
@@ -674,7 +897,7 @@ class TestIdempotentMigration:
 
         # Should not raise "duplicate column" error
         init_db(engine)
-        assert _get_schema_version(engine) == "13"
+        assert _get_schema_version(engine) == "20"
         assert "retention_json" in _get_columns(engine, "annotations")
         engine.dispose()
 
@@ -695,7 +918,7 @@ class TestEmptyDatabaseEdgeCases:
 
         init_db(engine)
 
-        assert _get_schema_version(engine) == "13"
+        assert _get_schema_version(engine) == "20"
         tables = _get_tables(engine)
         assert "blobs" in tables
         assert "commits" in tables
@@ -759,7 +982,7 @@ class TestEmptyDatabaseEdgeCases:
 
         init_db(engine)
 
-        assert _get_schema_version(engine) == "13"
+        assert _get_schema_version(engine) == "20"
         # Old tables should be dropped
         tables = _get_tables(engine)
         assert "compressions" not in tables
@@ -808,7 +1031,7 @@ class TestEmptyDatabaseEdgeCases:
         # Should not crash despite missing compression_sources/compression_results
         init_db(engine)
 
-        assert _get_schema_version(engine) == "13"
+        assert _get_schema_version(engine) == "20"
         engine.dispose()
 
 
@@ -446,6 +446,75 @@ class TestTagQueries:
         assert info.commit_hash in hashes
 
 
+class TestTagIndex:
+    """Tag queries answered from the unified commit_tags index."""
+
+    def test_old_tagged_commit_found_beyond_scan_window(self):
+        """Tagged commits older than 500 ancestors are still found."""
+        t = make_tract()
+        old = t.user("early decision", tags=["decision"])
+        t.tag(old.commit_hash, "observation")
+        t.commit_many(DialogueContent(role="user", text=f"filler {i}") for i in range(600))
+
+        assert [r.commit_hash for r in t._tags_mgr.query(["decision"])] == [old.commit_hash]
+        assert [r.commit_hash for r in t.log(tags=["observation"])] == [old.commit_hash]
+        assert [r.commit_hash for r in t.find(tag="decision")] == [old.commit_hash]
+        t.close()
+
+    def test_untag_keeps_immutable_membership(self):
+        """Removing an annotation tag leaves the same immutable tag indexed."""
+        t = make_tract()
+        both = t.user("both", tags=["observation"])
+        t.tag(both.commit_hash, "observation")
+        mutable = t.user("mutable only")
+        t.tag(mutable.commit_hash, "observation")
+
+        t.untag(both.commit_hash, "observation")
+        t.untag(mutable.commit_hash, "observation")
+
+        assert [r.commit_hash for r in t._tags_mgr.query(["observation"])] == [both.commit_hash]
+        assert "observation" not in t.get_tags(mutable.commit_hash)
+        t.close()
+
+    def test_list_counts_each_commit_once(self):
+        """A tag held both immutably and as an annotation counts one commit."""
+        t = make_tract()
+        info = t.user("msg", tags=["decision"])
+        t.tag(info.commit_hash, "decision")
+        t.tag(t.user("other").commit_hash, "decision")
+
+        counts = {entry["name"]: entry["count"] for entry in t.list_tags()}
+        assert counts["decision"] == 2
+        t.close()
+
+    def test_list_counts_match_query_scope(self):
+        """list() counts only commits reachable from HEAD, like query()."""
+        t = make_tract()
+        t.system("sys")
+        t.branch("side")
+        t.user("side", tags=["decision"])
+        t.switch("main")
+        t.user("main", tags=["decision"])
+
+        counts = {entry["name"]: entry["count"] for entry in t.list_tags()}
+        assert counts["decision"] == len(t._tags_mgr.query(["decision"])) == 1
+        t.close()
+
+    def test_query_is_scoped_to_current_branch(self):
+        """Tagged commits on other branches are not returned."""
+        t = make_tract()
+        t.system("sys")
+        t.branch("side")
+        side = t.user("side", tags=["decision"])
+        t.switch("main")
+        main = t.user("main", tags=["decision"])
+
+        assert [r.commit_hash for r in t._tags_mgr.query(["decision"])] == [main.commit_hash]
+        t.switch("side")
+        assert [r.commit_hash for r in t._tags_mgr.query(["decision"])] == [side.commit_hash]
+        t.close()
+
+
 # ---------------------------------------------------------------------------
 # Schema migration v9 -> v10
 # ---------------------------------------------------------------------------
@@ -467,7 +536,7 @@ class TestSchemaMigration:
             meta = session.execute(
                 select(TraceMetaRow).where(TraceMetaRow.key == "schema_version")
             ).scalar_one()
-            assert meta.value == "13"
+            assert meta.value == "20"
         engine.dispose()
 
     def test_v9_to_v10_migration_creates_tables(self):
@@ -526,7 +595,7 @@ class TestSchemaMigration:
             result = conn.execute(
                 text("SELECT value FROM _trace_meta WHERE key='schema_version'")
             ).scalar_one()
-            assert result == "13"
+            assert result == "20"
 
             # Check tag_annotations table exists
             tables = [
@@ -0,0 +1,213 @@
+"""Tests for tract.tracing and the instrumentation hooks on Tract."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from tract import DialogueContent, InstructionContent, Tract
+from tract.llm.testing import MockLLMClient
+from tract.tracing import SpanRecord, TraceCollector, Tracer
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _traced_tract() -> tuple[Tract, TraceCollector]:
+    t = Tract.open()
+    collector = TraceCollector()
+    t.tracer.add_sink(collector)
+    return t, collector
+
+
+def _names(collector: TraceCollector) -> list[str]:
+    return [s.name for s in collector.spans]
+
+
+# ---------------------------------------------------------------------------
+# Tracer
+# ---------------------------------------------------------------------------
+
+class TestTracer:
+    def test_disabled_without_sinks(self) -> None:
+        tracer = Tracer()
+        assert not tracer.enabled
+        with tracer.span("noop"):
+            pass
+        tracer.count("noop")  # no sink, nothing to do
+
+    def test_nested_spans_record_parent_and_depth(self) -> None:
+        tracer = Tracer()
+        collector = tracer.add_sink(TraceCollector())
+        with tracer.span("outer"), tracer.span("inner", size=3):
+            pass
+        inner, outer = collector.spans
+        assert (inner.name, inner.parent, inner.depth) == ("inner", "outer", 1)
+        assert inner.attributes == {"size": 3}
+        assert (outer.name, outer.parent, outer.depth) == ("outer", None, 0)
+        assert outer.duration_ms >= inner.duration_ms
+
+    def test_span_records_error_and_reraises(self) -> None:
+        tracer = Tracer()
+        collector = tracer.add_sink(TraceCollector())
+        with pytest.raises(KeyError), tracer.span("boom"):
+            raise KeyError("x")
+        assert collector.spans[0].error == "KeyError"
+
+    def test_failing_sink_does_not_break_operation(self) -> None:
+        class Broken:
+            def record_span(self, span: SpanRecord) -> None:
+                raise RuntimeError("sink down")
+
+            def record_count(self, name: str, value: int) -> None:
+                raise RuntimeError("sink down")
+
+        tracer = Tracer()
+        tracer.add_sink(Broken())
+        with tracer.span("ok"):
+            pass
+        tracer.count("ok")
+
+    def test_concurrent_threads_keep_their_own_parents(self) -> None:
+        tracer = Tracer()
+        collector = tracer.add_sink(TraceCollector())
+        barrier = threading.Barrier(2)
+
+        def work(label: str) -> None:
+            with tracer.span(f"outer.{label}"):
+                barrier.wait()
+                with tracer.span(f"inner.{label}"):
+                    barrier.wait()
+
+        threads = [threading.Thread(target=work, args=(label,)) for label in "ab"]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        parents = {s.name: (s.parent, s.depth) for s in collector.spans}
+        assert parents == {
+            "outer.a": (None, 0), "inner.a": ("outer.a", 1),
+            "outer.b": (None, 0), "inner.b": ("outer.b", 1),
+        }
+
+    def test_async_tasks_keep_their_own_parents(self) -> None:
+        tracer = Tracer()
+        collector = tracer.add_sink(TraceCollector())
+
+        async def work(label: str) -> None:
+            with tracer.span(f"outer.{label}"):
+                await asyncio.sleep(0)
+                with tracer.span(f"inner.{label}"):
+                    await asyncio.sleep(0)
+
+        async def main() -> None:
+            await asyncio.gather(work("a"), work("b"))
+
+        asyncio.run(main())
+        parents = {s.name: s.parent for s in collector.spans}
+        assert parents["inner.a"] == "outer.a"
+        assert parents["inner.b"] == "outer.b"
+
+    def test_rejects_non_sink(self) -> None:
+        with pytest.raises(TypeError):
+            Tracer().add_sink(object())  # type: ignore[arg-type]
+
+    def test_remove_sink_disables(self) -> None:
+        tracer = Tracer()
+        collector = tracer.add_sink(TraceCollector())
+        tracer.remove_sink(collector)
+        assert not tracer.enabled
+        with pytest.raises(ValueError):
+            tracer.remove_sink(collector)
+
+    def test_collector_summary(self) -> None:
+        collector = TraceCollector()
+        collector.record_span(SpanRecord("a", 2.0))
+        collector.record_span(SpanRecord("a", 4.0))
+        collector.record_count("hits", 2)
+        collector.record_count("hits", 1)
+        summary = collector.summary()
+        assert summary["a"] == {"count": 2, "total_ms": 6.0, "max_ms": 4.0, "mean_ms": 3.0}
+        assert collector.counters == {"hits": 3}
+
+
+# ---------------------------------------------------------------------------
+# Tract instrumentation
+# ---------------------------------------------------------------------------
+
+class TestTractTracing:
+    def test_compile_phases_nested_under_compile(self) -> None:
+        t, collector = _traced_tract()
+        t.commit(InstructionContent(text="System"))
+        t.commit(DialogueContent(role="user", text="Hi"))
+        t._cache.clear()
+        collector.clear()
+
+        t.compile()
+        phases = [s for s in collector.spans if s.name.startswith("compile.")]
+        assert {s.name for s in phases} >= {
+            "compile.walk", "compile.edit_map", "compile.priority",
+            "compile.effective", "compile.messages", "compile.blob_fetch",
+            "compile.tokenize",
+        }
+        assert all(s.parent == "compile" or s.parent == "compile.messages" for s in phases)
+        assert _names(collector)[-1] == "compile"
+
+    def test_storage_queries_are_traced(self) -> None:
+        t, collector = _traced_tract()
+        t.commit(InstructionContent(text="System"))
+        queries = [s for s in collector.spans if s.name == "storage.query"]
+        assert queries
+        assert any(q.parent == "commit" for q in queries)
+        assert {q.attributes["statement"] for q in queries} & {"INSERT", "SELECT"}
+
+    def test_cache_counters(self) -> None:
+        t, collector = _traced_tract()
+        t.commit(InstructionContent(text="System"))
+        t.compile()
+        t.compile()
+        assert collector.counters.get("compile_cache.hit", 0) >= 1
+
+    def test_middleware_and_llm_spans(self) -> None:
+        t, collector = _traced_tract()
+        t.middleware.add("pre_commit", lambda ctx: None)
+        t.commit(InstructionContent(text="System"))
+        for i in range(6):
+            t.commit(DialogueContent(role="user", text=f"Message {i}"))
+        t.config.configure_llm(MockLLMClient(["Summary."]))
+        t.compress()
+
+        names = _names(collector)
+        assert "middleware.pre_commit" in names
+        assert "compress" in names
+        llm = [s for s in collector.spans if s.name == "llm.chat"]
+        assert llm and llm[0].attributes["operation"] == "compress"
+
+    def test_async_compress_is_traced(self) -> None:
+        t, collector = _traced_tract()
+        t.commit(InstructionContent(text="System"))
+        for i in range(4):
+            t.commit(DialogueContent(role="user", text=f"Message {i}"))
+        t.config.configure_llm(MockLLMClient(["Summary."]))
+        collector.clear()
+
+        asyncio.run(t.acompress())
+        assert "compress" in _names(collector)
+        assert any(s.name == "storage.query" and s.parent == "compress" for s in collector.spans)
+        t.close()
+
+    def test_disabled_tracer_leaves_client_unwrapped(self) -> None:
+        client = MockLLMClient(["x"])
+        t = Tract.open(llm_client=client)
+        assert t.config._resolve_llm_client("chat") is client
+        t.close()
+
+    def test_removing_sink_stops_query_tracing(self) -> None:
+        t, collector = _traced_tract()
+        t.tracer.remove_sink(collector)
+        t.commit(InstructionContent(text="System"))
+        assert not collector.spans
+        t.close()
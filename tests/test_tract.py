@@ -240,6 +240,46 @@ class TestSC2CommitsAndAnnotations:
         history = tract.log(limit=20)
         assert len(history) == 10
 
+    def test_commit_many_matches_sequential(self, tract: Tract):
+        contents = [
+            InstructionContent(text="You are helpful."),
+            DialogueContent(role="user", text="Hi"),
+            DialogueContent(role="assistant", text="Hello!"),
+        ]
+        infos = tract.commit_many(contents)
+
+        assert [i.parent_hash for i in infos] == [
+            None, infos[0].commit_hash, infos[1].commit_hash,
+        ]
+        assert tract.head == infos[-1].commit_hash
+        assert all(i.message for i in infos)
+
+        sequential = Tract.open()
+        try:
+            for content in contents:
+                sequential.commit(content)
+            expected = sequential.compile()
+        finally:
+            sequential.close()
+
+        result = tract.compile()
+        assert result.to_dicts() == expected.to_dicts()
+        assert result.token_count == expected.token_count
+
+    def test_commit_many_dicts_and_tags(self, tract: Tract):
+        tract.register_tag("transcript")
+        infos = tract.commit_many(
+            [
+                {"content_type": "dialogue", "role": "user", "text": "one"},
+                {"content_type": "dialogue", "role": "assistant", "text": "two"},
+            ],
+            tags=["transcript"],
+        )
+        assert len(infos) == 2
+        for info in infos:
+            assert "transcript" in tract.get_commit(info.commit_hash).tags
+        assert len(tract.log(limit=10)) == 2
+
 
 # ===========================================================================
 # SC3: All content types preserved through compilation
@@ -980,6 +1020,21 @@ class TestGenerationConfig:
         result2 = tract.compile()
         assert result2.generation_configs[0] == expected
 
+    def test_cached_compile_reuses_materialized_messages(self, tract: Tract):
+        """Cache hits share frozen messages but return fresh, mutable lists."""
+        tract.commit(DialogueContent(role="user", text="Hi"))
+        tract.compile()
+        first = tract.compile()
+        second = tract.compile()
+        assert second.messages is not first.messages
+        assert second.messages[0] is first.messages[0]
+        first.messages.append(first.messages[0])
+        first.commit_hashes.clear()
+        third = tract.compile()
+        assert len(third.messages) == 1
+        assert len(third.commit_hashes) == 1
+        assert third.to_dicts() == [{"role": "user", "content": "Hi"}]
+
 
 # ===========================================================================
 # LRU Compile Cache and Snapshot Patching (Phase 1.4)
@@ -1178,6 +1233,20 @@ class TestLRUCompileCacheAndPatching:
             assert len(snapshot.commit_hashes) == 2
             assert snapshot.commit_hashes[1] == c2.commit_hash
 
+    def test_append_shares_parent_snapshot_storage(self):
+        """An appended snapshot reuses the parent's vectors instead of copying."""
+        with Tract.open() as t:
+            for i in range(100):
+                t.commit(DialogueContent(role="user", text=f"m{i}"))
+            t.compile()
+            parent = t._cache.get(t.head)
+            t.commit(DialogueContent(role="assistant", text="reply"))
+            child = t._cache.get(t.head)
+            assert parent is not None and child is not None
+            assert len(child.messages) == len(parent.messages) + 1
+            assert child.messages._root is parent.messages._root
+            assert child.commit_hashes._root is parent.commit_hashes._root
+
     def test_consecutive_same_role_with_edit_patching(self):
         """EDIT patching works correctly with consecutive same-role messages (no aggregation)."""
         with Tract.open(verify_cache=True) as t:
@@ -1474,6 +1543,109 @@ class TestAnnotateNoOpSkipsClear:
             assert t._cache.get(h) is not None
 
 
+class TestPersistentCompileSnapshots:
+    """Tests for the on-disk compile snapshot tier (compile_cache_persist)."""
+
+    @staticmethod
+    def _open(db_path: str, tract_id: str, **kwargs) -> Tract:
+        config = TractConfig(db_path=db_path, compile_cache_persist=True)
+        return Tract.open(db_path, tract_id=tract_id, config=config, **kwargs)
+
+    @staticmethod
+    def _count_full_compiles(t: Tract) -> list[str]:
+        calls: list[str] = []
+        original = t._compiler.compile
+
+        def _compile(tract_id, head_hash, **kwargs):
+            calls.append(head_hash)
+            return original(tract_id, head_hash, **kwargs)
+
+        t._compiler.compile = _compile
+        return calls
+
+    def test_reopen_reuses_snapshot(self, tmp_path):
+        """A new process resumes from the stored snapshot without recompiling."""
+        db = str(tmp_path / "snap.db")
+        with self._open(db, "t1") as t:
+            t.commit(InstructionContent(text="System"))
+            t.commit(DialogueContent(role="user", text="Hello"))
+            expected = t.compile()
+
+        with self._open(db, "t1") as t:
+            calls = self._count_full_compiles(t)
+            result = t.compile()
+            assert calls == []
+            assert result.to_dicts() == expected.to_dicts()
+            assert result.token_count == expected.token_count
+            assert result.commit_hashes == expected.commit_hashes
+
+    def test_resume_extends_through_appends_and_edits(self, tmp_path):
+        """Commits made after the snapshot are replayed incrementally."""
+        db = str(tmp_path / "snap.db")
+        with self._open(db, "t1") as t:
+            t.commit(InstructionContent(text="System"))
+            c2 = t.commit(DialogueContent(role="user", text="Hello"))
+            t.compile()
+
+        with self._open(db, "t1") as t:
+            t.commit(DialogueContent(role="assistant", text="Hi there"))
+            t.commit(
+                DialogueContent(role="user", text="Hello, edited"),
+                operation=CommitOperation.EDIT,
+                edit_target=c2.commit_hash,
+            )
+            calls = self._count_full_compiles(t)
+            result = t.compile()
+            assert calls == []
+            fresh = t._compiler.compile(t.tract_id, t.head)
+            assert [m.content for m in result.messages] == [m.content for m in fresh.messages]
+            assert result.token_count == fresh.token_count
+            assert result.messages[1].content == "Hello, edited"
+
+    def test_annotation_change_forces_full_compile(self, tmp_path):
+        """A priority change after the snapshot invalidates it."""
+        db = str(tmp_path / "snap.db")
+        with self._open(db, "t1") as t:
+            t.commit(InstructionContent(text="System"))
+            c2 = t.commit(DialogueContent(role="user", text="Hello"))
+            t.compile()
+
+        with self._open(db, "t1") as t:
+            t.annotate(c2.commit_hash, Priority.SKIP)
+            calls = self._count_full_compiles(t)
+            result = t.compile()
+            assert calls == [t.head]
+            assert [m.content for m in result.messages] == ["System"]
+
+    def test_api_calibration_survives_reopen(self, tmp_path):
+        """record_usage() calibration is stored with the snapshot."""
+        db = str(tmp_path / "snap.db")
+        with self._open(db, "t1") as t:
+            t.commit(InstructionContent(text="System"))
+            t.compile()
+            t.record_usage({"prompt_tokens": 150, "completion_tokens": 20, "total_tokens": 170})
+
+        with self._open(db, "t1") as t:
+            result = t.compile()
+            assert result.token_count == 170
+            assert result.token_source.startswith("api:")
+
+    def test_disabled_by_default(self, tmp_path):
+        """Without compile_cache_persist nothing is written to disk."""
+        from sqlalchemy import func, select
+
+        from tract.storage.schema import CompileSnapshotRow
+
+        db = str(tmp_path / "snap.db")
+        with Tract.open(db) as t:
+            t.commit(InstructionContent(text="System"))
+            t.compile()
+            count = t._session.execute(
+                select(func.count()).select_from(CompileSnapshotRow)
+            ).scalar()
+            assert count == 0
+
+
 # ===========================================================================
 # Priority enrichment in log() and convenience filters
 # ===========================================================================